@@ -8,6 +8,8 @@ from alembic import context
 from app.core.config import settings
 from app.db import models  # noqa: F401 - necessário para Alembic detectar os modelos
 from app.db.base import Base
+from app.db.fts import FTS_TABLE
+from app.db.partitions import LEDGER_VIEW, PARTITION_NAME
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -25,6 +27,18 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names) -> bool:
+    """Ignorar o índice FTS5, a view do livro-caixa e as partições anuais.
+
+    Todos são criados pelas migrações e pelo roteamento de services/ledger.py,
+    não pelo metadata.
+    """
+    if type_ != "table" or name is None:
+        return True
+    return not (name.startswith(FTS_TABLE) or name == LEDGER_VIEW or PARTITION_NAME.match(name))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -47,6 +61,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -69,7 +84,9 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection, target_metadata=target_metadata, include_name=include_name
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,30 @@
+"""transaction fingerprint
+
+Revision ID: 3f1a9c2d7b10
+Revises: c6d8e0a58a94
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f1a9c2d7b10"
+down_revision = "c6d8e0a58a94"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("transactions", sa.Column("fingerprint", sa.String(length=64), nullable=True))
+    op.create_index(
+        op.f("ix_transactions_fingerprint"), "transactions", ["fingerprint"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_transactions_fingerprint"), table_name="transactions")
+    with op.batch_alter_table("transactions") as batch_op:
+        batch_op.drop_column("fingerprint")
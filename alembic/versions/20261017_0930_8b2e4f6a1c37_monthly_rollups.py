@@ -0,0 +1,46 @@
+"""monthly rollups
+
+Revision ID: 8b2e4f6a1c37
+Revises: 3f1a9c2d7b10
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b2e4f6a1c37"
+down_revision = "3f1a9c2d7b10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("amount_sum", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("tx_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "month", "account_id", "category_id", "kind", name="pk_monthly_rollups"
+        ),
+    )
+    # Backfill from the existing ledger
+    op.execute(
+        """
+        INSERT INTO monthly_rollups (month, account_id, category_id, kind, amount_sum, tx_count)
+        SELECT strftime('%Y-%m', date), account_id, coalesce(category_id, 0), kind,
+               sum(amount), count(*)
+        FROM transactions
+        GROUP BY strftime('%Y-%m', date), account_id, coalesce(category_id, 0), kind
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_rollups")
@@ -0,0 +1,38 @@
+"""account balance
+
+Revision ID: d41c7e9b2a56
+Revises: 8b2e4f6a1c37
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d41c7e9b2a56"
+down_revision = "8b2e4f6a1c37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "accounts",
+        sa.Column("balance", sa.Numeric(precision=14, scale=2), server_default="0", nullable=False),
+    )
+    # Backfill from the existing ledger
+    op.execute(
+        """
+        UPDATE accounts SET balance = (
+            SELECT coalesce(sum(amount), 0) FROM transactions
+            WHERE transactions.account_id = accounts.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("accounts") as batch_op:
+        batch_op.drop_column("balance")
@@ -0,0 +1,63 @@
+"""composite indexes
+
+Revision ID: 5e7a2c9d4f18
+Revises: d41c7e9b2a56
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5e7a2c9d4f18"
+down_revision = "d41c7e9b2a56"
+branch_labels = None
+depends_on = None
+
+_ROLLUP_COLUMNS = "month, account_id, category_id, kind, amount_sum, tx_count"
+
+
+def _rebuild_rollups(*, with_rowid: bool) -> None:
+    # SQLite cannot toggle WITHOUT ROWID in place: copy into a new table and swap
+    op.create_table(
+        "monthly_rollups_new",
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("amount_sum", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("tx_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "month", "account_id", "category_id", "kind", name="pk_monthly_rollups"
+        ),
+        sqlite_with_rowid=with_rowid,
+    )
+    op.execute(
+        f"INSERT INTO monthly_rollups_new ({_ROLLUP_COLUMNS}) "
+        f"SELECT {_ROLLUP_COLUMNS} FROM monthly_rollups"
+    )
+    op.drop_table("monthly_rollups")
+    op.rename_table("monthly_rollups_new", "monthly_rollups")
+
+
+def upgrade() -> None:
+    op.create_index("ix_transactions_account_date", "transactions", ["account_id", "date"])
+    op.create_index("ix_transactions_category_date", "transactions", ["category_id", "date"])
+    op.create_index("ix_transactions_kind_date", "transactions", ["kind", "date"])
+    # Left-prefixes of the composite indexes above
+    op.drop_index("ix_transactions_account_id", table_name="transactions")
+    op.drop_index("ix_transactions_category_id", table_name="transactions")
+
+    _rebuild_rollups(with_rowid=False)
+
+
+def downgrade() -> None:
+    _rebuild_rollups(with_rowid=True)
+
+    op.create_index("ix_transactions_category_id", "transactions", ["category_id"])
+    op.create_index("ix_transactions_account_id", "transactions", ["account_id"])
+    op.drop_index("ix_transactions_kind_date", table_name="transactions")
+    op.drop_index("ix_transactions_category_date", table_name="transactions")
+    op.drop_index("ix_transactions_account_date", table_name="transactions")
@@ -0,0 +1,30 @@
+"""data versions
+
+Revision ID: a93f1d6b8e24
+Revises: 5e7a2c9d4f18
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a93f1d6b8e24"
+down_revision = "5e7a2c9d4f18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_versions",
+        sa.Column("key", sa.String(length=40), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("data_versions")
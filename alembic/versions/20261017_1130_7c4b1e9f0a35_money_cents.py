@@ -0,0 +1,75 @@
+"""money as integer cents
+
+Revision ID: 7c4b1e9f0a35
+Revises: a93f1d6b8e24
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c4b1e9f0a35"
+down_revision = "a93f1d6b8e24"
+branch_labels = None
+depends_on = None
+
+# (table, old decimal column, new cents column, old precision)
+COLUMNS = (
+    ("transactions", "amount", "amount_cents", 12),
+    ("accounts", "balance", "balance_cents", 14),
+    ("budgets", "amount_planned", "amount_planned_cents", 12),
+    ("monthly_rollups", "amount_sum", "amount_sum_cents", 14),
+)
+# Rows per UPDATE, so a large ledger is not rewritten in one huge statement
+BACKFILL_CHUNK = 50_000
+
+
+def _backfill(table: str, expression: str, target: str) -> None:
+    conn = op.get_bind()
+    if table == "monthly_rollups":
+        # WITHOUT ROWID and no integer key to walk; one rollup row per month/account/category
+        conn.execute(sa.text(f"UPDATE {table} SET {target} = {expression}"))
+        return
+
+    low, high = conn.execute(sa.text(f"SELECT min(id), max(id) FROM {table}")).one()
+    if low is None:
+        return
+    for start in range(low, high + 1, BACKFILL_CHUNK):
+        conn.execute(
+            sa.text(f"UPDATE {table} SET {target} = {expression} WHERE id >= :lo AND id < :hi"),
+            {"lo": start, "hi": start + BACKFILL_CHUNK},
+        )
+
+
+def upgrade() -> None:
+    for table, old, new, _ in COLUMNS:
+        op.add_column(table, sa.Column(new, sa.BigInteger(), nullable=True))
+        # round() first: REAL values such as 0.29 * 100 are 28.999999999999996
+        _backfill(table, f"CAST(round({old} * 100) AS BIGINT)", new)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                new,
+                existing_type=sa.BigInteger(),
+                nullable=False,
+                server_default="0" if table in ("accounts", "monthly_rollups") else None,
+            )
+            batch_op.drop_column(old)
+
+
+def downgrade() -> None:
+    for table, old, new, precision in COLUMNS:
+        op.add_column(
+            table, sa.Column(old, sa.Numeric(precision=precision, scale=2), nullable=True)
+        )
+        _backfill(table, f"{new} / 100.0", old)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                old,
+                existing_type=sa.Numeric(precision=precision, scale=2),
+                nullable=False,
+                server_default="0" if table == "accounts" else None,
+            )
+            batch_op.drop_column(new)
@@ -0,0 +1,42 @@
+"""closed months
+
+Revision ID: e2b7d5a1c943
+Revises: 7c4b1e9f0a35
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e2b7d5a1c943"
+down_revision = "7c4b1e9f0a35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "closed_months",
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("file_name", sa.String(length=255), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("closed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("month"),
+    )
+    # AUTOINCREMENT needs a table rebuild; it keeps the ids of archived rows from
+    # being reused, so a reopened month can put them back
+    with op.batch_alter_table(
+        "transactions", recreate="always", table_kwargs={"sqlite_autoincrement": True}
+    ):
+        pass
+
+
+def downgrade() -> None:
+    with op.batch_alter_table(
+        "transactions", recreate="always", table_kwargs={"sqlite_autoincrement": False}
+    ):
+        pass
+    op.drop_table("closed_months")
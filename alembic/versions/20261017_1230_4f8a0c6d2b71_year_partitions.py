@@ -0,0 +1,34 @@
+"""year partitions
+
+Revision ID: 4f8a0c6d2b71
+Revises: e2b7d5a1c943
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4f8a0c6d2b71"
+down_revision = "e2b7d5a1c943"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Months closed before this revision keep NULL ID bounds: lookups always open them
+    with op.batch_alter_table("closed_months") as batch:
+        batch.add_column(sa.Column("min_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("max_id", sa.Integer(), nullable=True))
+        batch.add_column(
+            sa.Column("detached", sa.Boolean(), server_default=sa.false(), nullable=False)
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("closed_months") as batch:
+        batch.drop_column("detached")
+        batch.drop_column("max_id")
+        batch.drop_column("min_id")
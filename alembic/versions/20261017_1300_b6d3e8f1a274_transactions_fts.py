@@ -0,0 +1,75 @@
+"""transactions fts
+
+Revision ID: b6d3e8f1a274
+Revises: 4f8a0c6d2b71
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b6d3e8f1a274"
+down_revision = "4f8a0c6d2b71"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = "date, description, amount_cents, kind, account_id, category_id, transfer_pair_id"
+_NEW = ", ".join(f"new.{c}" for c in _COLUMNS.split(", "))
+
+
+def _open_month(row: str) -> str:
+    return f"NOT EXISTS (SELECT 1 FROM closed_months WHERE month = substr({row}.date, 1, 7))"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        """CREATE VIRTUAL TABLE transactions_fts USING fts5(
+            description,
+            date UNINDEXED,
+            amount_cents UNINDEXED,
+            kind UNINDEXED,
+            account_id UNINDEXED,
+            category_id UNINDEXED,
+            transfer_pair_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )"""
+    )
+    op.execute(
+        f"""CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions
+        WHEN {_open_month("new")}
+        BEGIN
+            INSERT INTO transactions_fts (rowid, {_COLUMNS}) VALUES (new.id, {_NEW});
+        END"""
+    )
+    op.execute(
+        f"""CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions
+        WHEN {_open_month("old")}
+        BEGIN
+            DELETE FROM transactions_fts WHERE rowid = old.id;
+        END"""
+    )
+    op.execute(
+        f"""CREATE TRIGGER transactions_fts_update AFTER UPDATE ON transactions
+        BEGIN
+            DELETE FROM transactions_fts WHERE rowid = old.id;
+            INSERT INTO transactions_fts (rowid, {_COLUMNS}) VALUES (new.id, {_NEW});
+        END"""
+    )
+    # Rows already in closed months' archives are indexed by
+    # "python -m app.cli search rebuild"
+    op.execute(
+        f"INSERT INTO transactions_fts (rowid, {_COLUMNS}) SELECT id, {_COLUMNS} FROM transactions"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS transactions_fts_insert")
+    op.execute("DROP TABLE transactions_fts")
@@ -0,0 +1,44 @@
+"""category rules
+
+Revision ID: 9d2f6b4e8c15
+Revises: b6d3e8f1a274
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9d2f6b4e8c15"
+down_revision = "b6d3e8f1a274"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("match", sa.String(length=20), nullable=True),
+        sa.Column("pattern", sa.String(length=255), nullable=True),
+        sa.Column("account_id", sa.Integer(), nullable=True),
+        sa.Column("min_amount_cents", sa.BigInteger(), nullable=True),
+        sa.Column("max_amount_cents", sa.BigInteger(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_category_rules_category_id"), "category_rules", ["category_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_category_rules_category_id"), table_name="category_rules")
+    op.drop_table("category_rules")
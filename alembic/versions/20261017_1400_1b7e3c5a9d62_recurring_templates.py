@@ -0,0 +1,51 @@
+"""recurring templates
+
+Revision ID: 1b7e3c5a9d62
+Revises: 9d2f6b4e8c15
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1b7e3c5a9d62"
+down_revision = "9d2f6b4e8c15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recurring_templates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=False),
+        sa.Column("amount_cents", sa.BigInteger(), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("unit", sa.String(length=10), nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "recurring_occurrences",
+        sa.Column("template_id", sa.Integer(), nullable=False),
+        sa.Column("occurrence_date", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(["template_id"], ["recurring_templates.id"]),
+        sa.PrimaryKeyConstraint("template_id", "occurrence_date", name="pk_recurring_occurrences"),
+        sqlite_with_rowid=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("recurring_occurrences")
+    op.drop_table("recurring_templates")
@@ -0,0 +1,26 @@
+"""category rule keyword
+
+Revision ID: 6a0e4c2f9b83
+Revises: 1b7e3c5a9d62
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6a0e4c2f9b83"
+down_revision = "1b7e3c5a9d62"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("category_rules", sa.Column("keyword", sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("category_rules") as batch_op:
+        batch_op.drop_column("keyword")
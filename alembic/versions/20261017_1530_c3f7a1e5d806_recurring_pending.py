@@ -0,0 +1,35 @@
+"""recurring pending occurrences
+
+Revision ID: c3f7a1e5d806
+Revises: 6a0e4c2f9b83
+Create Date: 2026-10-17 15:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c3f7a1e5d806"
+down_revision = "6a0e4c2f9b83"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Closed-month occurrences recorded before this revision have no transaction
+    # and cannot be told apart from deleted ones, so they stay as they are
+    op.add_column(
+        "recurring_occurrences",
+        sa.Column("pending", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.create_index(
+        "ix_recurring_occurrences_pending", "recurring_occurrences", ["pending", "occurrence_date"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recurring_occurrences_pending", table_name="recurring_occurrences")
+    with op.batch_alter_table("recurring_occurrences") as batch_op:
+        batch_op.drop_column("pending")
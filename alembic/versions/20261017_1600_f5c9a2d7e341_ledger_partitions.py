@@ -0,0 +1,185 @@
+"""ledger partitions
+
+Revision ID: f5c9a2d7e341
+Revises: c3f7a1e5d806
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f5c9a2d7e341"
+down_revision = "c3f7a1e5d806"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    "id, date, description, amount_cents, kind, account_id, category_id, "
+    "transfer_pair_id, fingerprint, created_at"
+)
+_FTS_COLUMNS = "date, description, amount_cents, kind, account_id, category_id, transfer_pair_id"
+_NEW = ", ".join(f"new.{c}" for c in _FTS_COLUMNS.split(", "))
+# (suffix, columns, unique) of the ledger indexes, named ix_<table>_<suffix>
+_INDEXES = (
+    ("date", ["date"], False),
+    ("transfer_pair_id", ["transfer_pair_id"], False),
+    ("fingerprint", ["fingerprint"], True),
+    ("account_date", ["account_id", "date"], False),
+    ("category_date", ["category_id", "date"], False),
+    ("kind_date", ["kind", "date"], False),
+)
+_EMPTY_VIEW = (
+    "SELECT CAST(NULL AS INTEGER) AS id, CAST(NULL AS DATE) AS date, "
+    "CAST(NULL AS VARCHAR(255)) AS description, CAST(NULL AS BIGINT) AS amount_cents, "
+    "CAST(NULL AS VARCHAR(20)) AS kind, CAST(NULL AS INTEGER) AS account_id, "
+    "CAST(NULL AS INTEGER) AS category_id, CAST(NULL AS VARCHAR(36)) AS transfer_pair_id, "
+    "CAST(NULL AS VARCHAR(64)) AS fingerprint, CAST(NULL AS DATETIME) AS created_at "
+    "WHERE 0 = 1"
+)
+
+
+def _columns(*, autoincrement: bool) -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=autoincrement),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=False),
+        sa.Column("amount_cents", sa.BigInteger(), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=True),
+        sa.Column("transfer_pair_id", sa.String(length=36), nullable=True),
+        sa.Column("fingerprint", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def _create_indexes(table: str) -> None:
+    for suffix, columns, unique in _INDEXES:
+        op.create_index(f"ix_{table}_{suffix}", table, columns, unique=unique)
+
+
+def _create_fts_triggers(table: str) -> None:
+    def open_month(row: str) -> str:
+        return f"NOT EXISTS (SELECT 1 FROM closed_months WHERE month = substr({row}.date, 1, 7))"
+
+    op.execute(
+        f"""CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table}
+        WHEN {open_month("new")}
+        BEGIN
+            INSERT INTO transactions_fts (rowid, {_FTS_COLUMNS}) VALUES (new.id, {_NEW});
+        END"""
+    )
+    op.execute(
+        f"""CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table}
+        WHEN {open_month("old")}
+        BEGIN
+            DELETE FROM transactions_fts WHERE rowid = old.id;
+        END"""
+    )
+    op.execute(
+        f"""CREATE TRIGGER {table}_fts_update AFTER UPDATE ON {table}
+        BEGIN
+            DELETE FROM transactions_fts WHERE rowid = old.id;
+            INSERT INTO transactions_fts (rowid, {_FTS_COLUMNS}) VALUES (new.id, {_NEW});
+        END"""
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    sqlite = bind.dialect.name == "sqlite"
+    op.create_table(
+        "ledger_partitions",
+        sa.Column("year", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("min_id", sa.Integer(), nullable=False),
+        sa.Column("max_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("year"),
+    )
+    op.create_table(
+        "ledger_sequence",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("last_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # IDs of deleted rows (AUTOINCREMENT's high-water mark) and of archived
+    # months are never handed out again
+    used = [
+        bind.scalar(sa.text("SELECT max(id) FROM transactions")),
+        bind.scalar(sa.text("SELECT max(max_id) FROM closed_months")),
+    ]
+    if sqlite:
+        used.append(
+            bind.scalar(sa.text("SELECT seq FROM sqlite_sequence WHERE name = 'transactions'"))
+        )
+    op.execute(
+        sa.text("INSERT INTO ledger_sequence (id, last_id) VALUES (1, :last_id)").bindparams(
+            last_id=max((value or 0 for value in used), default=0)
+        )
+    )
+
+    ledger = sa.table("transactions", sa.column("date", sa.Date()))
+    years = sorted(
+        int(year) for year in bind.scalars(sa.select(sa.extract("year", ledger.c.date)).distinct())
+    )
+    for year in years:
+        table = f"transactions_{year:04d}"
+        first, last = f"{year:04d}-01-01", f"{year:04d}-12-31"
+        op.create_table(
+            table,
+            *_columns(autoincrement=False),
+            sa.CheckConstraint(f"date BETWEEN '{first}' AND '{last}'", name=f"ck_{table}_year"),
+        )
+        op.execute(
+            f"INSERT INTO {table} ({_COLUMNS}) SELECT {_COLUMNS} FROM transactions "
+            f"WHERE date BETWEEN '{first}' AND '{last}'"
+        )
+        _create_indexes(table)
+        op.execute(
+            f"INSERT INTO ledger_partitions (year, min_id, max_id) "
+            f"SELECT {year}, min(id), max(id) FROM {table}"
+        )
+        if sqlite:
+            # Rows were copied first: the search index already holds them
+            _create_fts_triggers(table)
+
+    # The old triggers go with the table
+    op.drop_table("transactions")
+    arms = [f"SELECT {_COLUMNS} FROM transactions_{year:04d}" for year in years]
+    op.execute(f"CREATE VIEW transactions AS {' UNION ALL '.join(arms) or _EMPTY_VIEW}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    sqlite = bind.dialect.name == "sqlite"
+    years = list(bind.scalars(sa.text("SELECT year FROM ledger_partitions ORDER BY year")))
+    last_id = bind.scalar(sa.text("SELECT last_id FROM ledger_sequence")) or 0
+
+    op.execute("DROP VIEW transactions")
+    op.create_table(
+        "transactions",
+        *_columns(autoincrement=True),
+        sqlite_autoincrement=True,
+    )
+    for year in years:
+        op.execute(
+            f"INSERT INTO transactions ({_COLUMNS}) SELECT {_COLUMNS} FROM transactions_{year:04d}"
+        )
+    _create_indexes("transactions")
+    if sqlite:
+        # AUTOINCREMENT resumes after every ID the sequence handed out
+        op.execute("DELETE FROM sqlite_sequence WHERE name = 'transactions'")
+        op.execute(
+            sa.text(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES ('transactions', :last_id)"
+            ).bindparams(last_id=last_id)
+        )
+        _create_fts_triggers("transactions")
+
+    for year in years:
+        op.drop_table(f"transactions_{year:04d}")
+    op.drop_table("ledger_sequence")
+    op.drop_table("ledger_partitions")
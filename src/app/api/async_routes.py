@@ -0,0 +1,112 @@
+"""Async mode routing - every sync endpoint served through AsyncSession.run_sync.
+
+With ``DB_MODE=async`` the app mounts no sync endpoint. Endpoints with a native
+async twin (the ``async_router`` of a router module) are mounted as they are.
+Every other endpoint of a router is mounted through run_sync_routes: it gets an
+``async def`` variant that takes an AsyncSession instead of ``get_db``'s Session
+and runs the endpoint body through ``AsyncSession.run_sync``. The body, its
+validation and its HTTP errors are unchanged, but every statement it issues,
+commits included, goes through the async driver and is awaited on the event
+loop, so no threadpool thread is held while the database works.
+"""
+
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, get_db
+
+
+def _session_parameter(endpoint: Callable[..., Any]) -> str | None:
+    """Return the name of the parameter that takes ``get_db``'s Session, if any."""
+    for param in inspect.signature(endpoint).parameters.values():
+        if getattr(param.default, "dependency", None) is get_db:
+            return param.name
+    return None
+
+
+def run_sync_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Build the async variant of a sync endpoint that depends on ``get_db``.
+
+    Args:
+        endpoint: Sync endpoint function
+
+    Returns:
+        Coroutine function with the same parameters, except that the session
+        parameter takes an AsyncSession from ``get_async_db``
+    """
+    name = _session_parameter(endpoint)
+    if name is None:
+        raise ValueError(f"{endpoint.__name__} does not depend on get_db")
+    signature = inspect.signature(endpoint)
+    parameters = [
+        param.replace(default=Depends(get_async_db), annotation=AsyncSession)
+        if param.name == name
+        else param
+        for param in signature.parameters.values()
+    ]
+
+    async def variant(**kwargs: Any) -> Any:
+        db: AsyncSession = kwargs.pop(name)
+        return await db.run_sync(lambda session: endpoint(**kwargs, **{name: session}))
+
+    # Not functools.wraps: FastAPI would follow __wrapped__ to the sync function
+    variant.__signature__ = signature.replace(parameters=parameters)  # type: ignore[attr-defined]
+    variant.__name__ = f"{endpoint.__name__}_async"
+    variant.__qualname__ = variant.__name__
+    variant.__doc__ = endpoint.__doc__
+    variant.__module__ = endpoint.__module__
+    return variant
+
+
+def run_sync_routes(router: APIRouter, *, native: APIRouter | None = None) -> APIRouter:
+    """Mirror a sync router with async variants of its endpoints.
+
+    Args:
+        router: Router of sync endpoints
+        native: Router of the module's native async endpoints; routes it already
+            serves (same path and method) are left out
+
+    Returns:
+        Router with one route per remaining route of ``router``, at the same path
+        with the same response settings. Endpoints that do not use the database
+        are mounted as they are.
+    """
+    served = {
+        (route.path, method)
+        for route in (native.routes if native is not None else [])
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    mirror = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        methods = sorted(route.methods - {m for p, m in served if p == route.path})
+        if not methods:
+            continue
+        endpoint = route.endpoint
+        if _session_parameter(endpoint) is not None:
+            endpoint = run_sync_endpoint(endpoint)
+        mirror.add_api_route(
+            route.path,
+            endpoint,
+            methods=methods,
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+            name=f"{route.name}_async",
+        )
+    return mirror
@@ -1,12 +1,18 @@
 """API dependencies - database session and API key verification."""
 
-from collections.abc import Generator
+import tempfile
+from collections.abc import AsyncGenerator, Generator
+from typing import IO
 
-from fastapi import Header
+from fastapi import Header, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.security import verify_api_key
-from app.db.session import get_session
+from app.db.session import get_async_session, get_session
+
+# Request bodies larger than this are spooled to disk instead of memory
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
 
 
 def require_api_key(x_api_key: str | None = Header(default=None)) -> None:
@@ -27,5 +33,31 @@ def get_db() -> Generator[Session]:
     Yields:
         Database session
     """
-    with get_session() as db:
+    with get_session(expire_on_commit=False) as db:
+        yield db
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession]:
+    """Get asyncio database session.
+
+    Yields:
+        Asyncio database session
+    """
+    async with get_async_session() as db:
         yield db
+
+
+async def spooled_body(request: Request) -> AsyncGenerator[IO[bytes]]:
+    """Spool the raw request body to a temporary file as it arrives.
+
+    Small bodies stay in memory; large uploads roll over to disk, so endpoints can
+    parse them incrementally without holding the whole payload in RAM.
+
+    Yields:
+        Binary file positioned at the start of the body
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as fp:
+        async for chunk in request.stream():
+            fp.write(chunk)
+        fp.seek(0)
+        yield fp
@@ -1,5 +1,5 @@
 """API routers."""
 
-from . import accounts, budgets, categories, reports, transactions
+from . import accounts, budgets, categories, imports, reports, transactions
 
-__all__ = ["accounts", "budgets", "categories", "reports", "transactions"]
+__all__ = ["accounts", "budgets", "categories", "imports", "reports", "transactions"]
@@ -1,13 +1,18 @@
 """Accounts router - CRUD for accounts."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
 from app.db.models import Account
 from app.schemas.accounts import AccountCreate, AccountOut, AccountUpdate
+from app.services.refdata import mark_reference_data_changed
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
+# Native async endpoints for DB_MODE=async (the others: see api/async_routes.py)
+async_router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 
 @router.get("", response_model=list[AccountOut])
@@ -23,6 +28,59 @@ def list_accounts(db: Session = Depends(get_db)) -> list[Account]:
     return db.query(Account).order_by(Account.id.asc()).all()
 
 
+@router.get("/{account_id}", response_model=AccountOut)
+def get_account(account_id: int, db: Session = Depends(get_db)) -> Account:
+    """Get a single account with its current balance.
+
+    Args:
+        account_id: Account ID
+        db: Database session
+
+    Returns:
+        Account
+
+    Raises:
+        HTTPException: If account not found
+    """
+    acc = db.get(Account, account_id)
+    if not acc:
+        raise HTTPException(status_code=404, detail="Conta não encontrada")
+    return acc
+
+
+@async_router.get("", response_model=list[AccountOut])
+async def list_accounts_async(db: AsyncSession = Depends(get_async_db)) -> list[Account]:
+    """List all accounts (async mode).
+
+    Args:
+        db: Asyncio database session
+
+    Returns:
+        List of accounts
+    """
+    return list(await db.scalars(select(Account).order_by(Account.id.asc())))
+
+
+@async_router.get("/{account_id}", response_model=AccountOut)
+async def get_account_async(account_id: int, db: AsyncSession = Depends(get_async_db)) -> Account:
+    """Get a single account with its current balance (async mode).
+
+    Args:
+        account_id: Account ID
+        db: Asyncio database session
+
+    Returns:
+        Account
+
+    Raises:
+        HTTPException: If account not found
+    """
+    acc = await db.get(Account, account_id)
+    if not acc:
+        raise HTTPException(status_code=404, detail="Conta não encontrada")
+    return acc
+
+
 @router.post("", response_model=AccountOut, status_code=201)
 def create_account(payload: AccountCreate, db: Session = Depends(get_db)) -> Account:
     """Create a new account.
@@ -34,10 +92,11 @@ def create_account(payload: AccountCreate, db: Session = Depends(get_db)) -> Acc
     Returns:
         Created account
     """
-    acc = Account(name=payload.name, type=payload.type)
-    db.add(acc)
+    mark_reference_data_changed(db)
+    acc = db.scalars(
+        insert(Account).values(name=payload.name, type=payload.type).returning(Account)
+    ).one()
     db.commit()
-    db.refresh(acc)
     return acc
 
 
@@ -69,8 +128,8 @@ def update_account(
     if payload.active is not None:
         acc.active = payload.active
 
+    mark_reference_data_changed(db)
     db.commit()
-    db.refresh(acc)
     return acc
 
 
@@ -90,4 +149,5 @@ def delete_account(account_id: int, db: Session = Depends(get_db)) -> None:
         raise HTTPException(status_code=404, detail="Conta não encontrada")
 
     acc.active = False
+    mark_reference_data_changed(db)
     db.commit()
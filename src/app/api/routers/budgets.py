@@ -2,14 +2,22 @@
 
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.db.models import Budget, Category
-from app.schemas.budgets import BudgetOut, BudgetUpsert
+from app.api.deps import get_async_db, get_db
+from app.api.routers.reports import MONTH_PATTERN
+from app.db.models import Budget
+from app.schemas.budgets import BudgetBulkResult, BudgetCopyResult, BudgetOut, BudgetUpsert
+from app.services.archive import ensure_months_open
+from app.services.budgets import copy_budgets, upsert_budget, upsert_budgets
+from app.services.versions import mark_changed, month_version_key
 
 router = APIRouter(prefix="/budgets", tags=["budgets"])
+# Native async endpoints for DB_MODE=async (the others: see api/async_routes.py)
+async_router = APIRouter(prefix="/budgets", tags=["budgets"])
 
 
 @router.get("", response_model=list[BudgetOut])
@@ -26,8 +34,23 @@ def list_budgets(month: str, db: Session = Depends(get_db)) -> list[Budget]:
     return db.query(Budget).filter(Budget.month == month).order_by(Budget.id.asc()).all()
 
 
+@async_router.get("", response_model=list[BudgetOut])
+async def list_budgets_async(month: str, db: AsyncSession = Depends(get_async_db)) -> list[Budget]:
+    """List all budgets for a given month (async mode).
+
+    Args:
+        month: Month in YYYY-MM format
+        db: Asyncio database session
+
+    Returns:
+        List of budgets for the month
+    """
+    stmt = select(Budget).where(Budget.month == month).order_by(Budget.id.asc())
+    return list(await db.scalars(stmt))
+
+
 @router.post("", response_model=BudgetOut, status_code=201)
-def upsert_budget(payload: BudgetUpsert, db: Session = Depends(get_db)) -> Budget:
+def create_or_update_budget(payload: BudgetUpsert, db: Session = Depends(get_db)) -> Budget:
     """Create or update a budget for a category in a month.
 
     Args:
@@ -39,45 +62,59 @@ def upsert_budget(payload: BudgetUpsert, db: Session = Depends(get_db)) -> Budge
 
     Raises:
         HTTPException: For validation errors
+        ClosedMonthError: If the month is closed (409)
     """
-    # Validate category exists, is active, and is EXPENSE
-    cat = (
-        db.query(Category)
-        .filter(Category.id == payload.category_id, Category.active == True)  # noqa: E712
-        .one_or_none()
-    )
-    if not cat:
-        raise HTTPException(status_code=400, detail="Categoria inválida/inativa")
-
-    if cat.kind != "EXPENSE":
-        raise HTTPException(
-            status_code=400,
-            detail="Orçamento só é suportado para categorias de despesa no MVP",
-        )
-
-    # Check if budget already exists (upsert logic)
-    existing = (
-        db.query(Budget)
-        .filter(Budget.month == payload.month, Budget.category_id == payload.category_id)
-        .one_or_none()
-    )
-
-    if existing:
-        existing.amount_planned = Decimal(str(payload.amount_planned))
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    # Create new budget
-    bud = Budget(
-        month=payload.month,
-        category_id=payload.category_id,
-        amount_planned=Decimal(str(payload.amount_planned)),
-    )
-    db.add(bud)
-    db.commit()
-    db.refresh(bud)
-    return bud
+    try:
+        return upsert_budget(db, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.post("/bulk", response_model=BudgetBulkResult)
+def bulk_upsert(payloads: list[BudgetUpsert], db: Session = Depends(get_db)) -> dict:
+    """Create or update many budgets in one request (JSON array of BudgetUpsert).
+
+    Valid items are written by a single INSERT ... ON CONFLICT statement; items
+    with an invalid category or a closed month are skipped and reported by index.
+
+    Args:
+        payloads: Budget data
+        db: Database session
+
+    Returns:
+        Dict with upserted count and per-item errors
+    """
+    return upsert_budgets(db, payloads)
+
+
+@router.post("/copy", response_model=BudgetCopyResult)
+def copy(
+    from_month: str = Query(alias="from", pattern=MONTH_PATTERN),
+    to_month: str = Query(alias="to", pattern=MONTH_PATTERN),
+    scale: Decimal = Query(default=Decimal(1), gt=0, le=100, decimal_places=4),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Copy every budget of a month into another month, optionally scaled.
+
+    Budgets the target month already has for the same categories are overwritten.
+
+    Args:
+        from_month: Source month (YYYY-MM)
+        to_month: Target month (YYYY-MM)
+        scale: Factor applied to the amounts, e.g. 1.05 for +5%
+        db: Database session
+
+    Returns:
+        Dict with the number of copied budgets
+
+    Raises:
+        HTTPException: If both months are the same
+        ClosedMonthError: If the target month is closed (409)
+    """
+    try:
+        return copy_budgets(db, from_month, to_month, scale)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
 
 @router.delete("/{budget_id}", status_code=204)
@@ -90,10 +127,14 @@ def delete_budget(budget_id: int, db: Session = Depends(get_db)) -> None:
 
     Raises:
         HTTPException: If budget not found
+        ClosedMonthError: If the budget's month is closed (409)
     """
     bud = db.query(Budget).filter(Budget.id == budget_id).one_or_none()
     if not bud:
         raise HTTPException(status_code=404, detail="Orçamento não encontrado")
 
+    ensure_months_open(db, [bud.month])
+
+    mark_changed(db, [month_version_key(bud.month)])
     db.delete(bud)
     db.commit()
@@ -1,13 +1,18 @@
 """Categories router - CRUD for categories."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
 from app.db.models import Category
 from app.schemas.categories import CategoryCreate, CategoryOut, CategoryUpdate
+from app.services.refdata import mark_reference_data_changed
 
 router = APIRouter(prefix="/categories", tags=["categories"])
+# Native async endpoints for DB_MODE=async (the others: see api/async_routes.py)
+async_router = APIRouter(prefix="/categories", tags=["categories"])
 
 
 @router.get("", response_model=list[CategoryOut])
@@ -23,6 +28,19 @@ def list_categories(db: Session = Depends(get_db)) -> list[Category]:
     return db.query(Category).order_by(Category.id.asc()).all()
 
 
+@async_router.get("", response_model=list[CategoryOut])
+async def list_categories_async(db: AsyncSession = Depends(get_async_db)) -> list[Category]:
+    """List all categories (async mode).
+
+    Args:
+        db: Asyncio database session
+
+    Returns:
+        List of categories
+    """
+    return list(await db.scalars(select(Category).order_by(Category.id.asc())))
+
+
 @router.post("", response_model=CategoryOut, status_code=201)
 def create_category(payload: CategoryCreate, db: Session = Depends(get_db)) -> Category:
     """Create a new category.
@@ -41,10 +59,10 @@ def create_category(payload: CategoryCreate, db: Session = Depends(get_db)) -> C
     if exists:
         raise HTTPException(status_code=409, detail="Categoria já existe")
 
-    cat = Category(name=payload.name, kind=payload.kind.value, group=payload.group.value)
-    db.add(cat)
+    mark_reference_data_changed(db)
+    values = {"name": payload.name, "kind": payload.kind.value, "group": payload.group.value}
+    cat = db.scalars(insert(Category).values(**values).returning(Category)).one()
     db.commit()
-    db.refresh(cat)
     return cat
 
 
@@ -78,8 +96,8 @@ def update_category(
     if payload.active is not None:
         cat.active = payload.active
 
+    mark_reference_data_changed(db)
     db.commit()
-    db.refresh(cat)
     return cat
 
 
@@ -99,4 +117,5 @@ def delete_category(category_id: int, db: Session = Depends(get_db)) -> None:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
 
     cat.active = False
+    mark_reference_data_changed(db)
     db.commit()
@@ -0,0 +1,63 @@
+"""Imports router - bank statement ingestion."""
+
+from typing import IO
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, spooled_body
+from app.core.config import settings
+from app.schemas.imports import ImportResult, StatementFormat
+from app.services.imports import import_statement, iter_csv_records, iter_ofx_records
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+
+@router.post("/statement", response_model=ImportResult)
+def import_bank_statement(
+    account_id: int,
+    income_category_id: int | None = None,
+    expense_category_id: int | None = None,
+    fmt: StatementFormat = Query(alias="format"),
+    encoding: str = "utf-8",
+    body: IO[bytes] = Depends(spooled_body),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Import an OFX or CSV bank statement (raw file as request body).
+
+    Lines already imported (same account, date, amount and normalized description)
+    are skipped, so overlapping statements can be re-imported safely. Each line goes
+    to the category of the first matching rule (see /rules), else to the given
+    income/expense category; lines with neither are reported as errors.
+
+    Args:
+        account_id: Account the statement belongs to
+        income_category_id: Category for credits no rule matches
+        expense_category_id: Category for debits no rule matches
+        fmt: Statement format (ofx or csv)
+        encoding: Text encoding for CSV files (OFX declares its own)
+        body: Spooled request body
+        db: Database session
+
+    Returns:
+        Dict with inserted and duplicate counts and per-line errors
+
+    Raises:
+        HTTPException: For invalid references or unreadable files
+    """
+    try:
+        records = (
+            iter_ofx_records(body)
+            if fmt == StatementFormat.OFX
+            else iter_csv_records(body, encoding=encoding)
+        )
+        return import_statement(
+            db,
+            records,
+            account_id=account_id,
+            income_category_id=income_category_id,
+            expense_category_id=expense_category_id,
+            chunk_size=settings.bulk_insert_chunk_size,
+        )
+    except (ValueError, LookupError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
@@ -0,0 +1,121 @@
+"""Months router - close finished months into archives, reopen and detach them."""
+
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.api.routers.reports import MONTH_PATTERN
+from app.db.models import ClosedMonth
+from app.schemas.months import ClosedMonthOut, ReopenResult, YearStorageResult
+from app.services.archive import ArchiveError
+from app.services.closing import attach_year, close_month, detach_year, reopen_month
+
+YEAR_PATTERN = r"^\d{4}$"
+
+router = APIRouter(prefix="/months", tags=["months"])
+
+
+@router.get("/closed", response_model=list[ClosedMonthOut])
+def list_closed_months(db: Session = Depends(get_db)) -> list[ClosedMonth]:
+    """List the closed months.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Closed months, ascending
+    """
+    return list(db.scalars(select(ClosedMonth).order_by(ClosedMonth.month)))
+
+
+@router.post("/{month}/close", response_model=ClosedMonthOut)
+def close(month: str = Path(pattern=MONTH_PATTERN), db: Session = Depends(get_db)) -> ClosedMonth:
+    """Close a past month: move its transactions and summary into an archive file.
+
+    Reports, listings and exports keep returning the month, read from the archive;
+    writes to it are rejected with 409 until it is reopened.
+
+    Args:
+        month: Month in YYYY-MM format
+        db: Database session
+
+    Returns:
+        The closed month
+
+    Raises:
+        HTTPException: If the month is not in the past (400)
+        ClosedMonthError: If the month is already closed (409)
+    """
+    try:
+        return close_month(db, month)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.post("/{month}/reopen", response_model=ReopenResult)
+def reopen(month: str = Path(pattern=MONTH_PATTERN), db: Session = Depends(get_db)) -> dict:
+    """Reopen a closed month: put its transactions back and delete the archive file.
+
+    Args:
+        month: Month in YYYY-MM format
+        db: Database session
+
+    Returns:
+        Dict with month and the number of restored transactions
+
+    Raises:
+        HTTPException: If the month is not closed (404) or its file is unreadable (500)
+    """
+    try:
+        restored = reopen_month(db, month)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except ArchiveError as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    return {"month": month, "row_count": restored}
+
+
+@router.post("/{year}/detach", response_model=YearStorageResult)
+def detach(year: str = Path(pattern=YEAR_PATTERN), db: Session = Depends(get_db)) -> dict:
+    """Move the archive files of a fully closed year to cold storage (ARCHIVE_COLD_DIR).
+
+    Args:
+        year: Year in YYYY format
+        db: Database session
+
+    Returns:
+        Dict with year and the months whose files were moved
+
+    Raises:
+        HTTPException: If a month of the year is open (400) or a file cannot be
+            copied (500)
+    """
+    try:
+        months = detach_year(db, year)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ArchiveError as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    return {"year": year, "months": months}
+
+
+@router.post("/{year}/attach", response_model=YearStorageResult)
+def attach(year: str = Path(pattern=YEAR_PATTERN), db: Session = Depends(get_db)) -> dict:
+    """Bring the archive files of a detached year back to ARCHIVE_DIR.
+
+    Args:
+        year: Year in YYYY format
+        db: Database session
+
+    Returns:
+        Dict with year and the months whose files were moved
+
+    Raises:
+        HTTPException: If a file cannot be copied (500)
+    """
+    try:
+        months = attach_year(db, year)
+    except ArchiveError as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    return {"year": year, "months": months}
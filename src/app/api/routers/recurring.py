@@ -0,0 +1,91 @@
+"""Recurring router - recurring transaction templates and their materialization."""
+
+import datetime as dt
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.db.models import RecurringTemplate
+from app.schemas.recurring import MaterializeResult, RecurringCreate, RecurringOut
+from app.services.recurring import create_template, materialize
+
+router = APIRouter(prefix="/recurring", tags=["recurring"])
+
+
+@router.get("", response_model=list[RecurringOut])
+def list_templates(db: Session = Depends(get_db)) -> list[RecurringTemplate]:
+    """List all recurring templates.
+
+    Args:
+        db: Database session
+
+    Returns:
+        List of templates
+    """
+    return list(db.scalars(select(RecurringTemplate).order_by(RecurringTemplate.id)))
+
+
+@router.post("", response_model=RecurringOut, status_code=201)
+def create(payload: RecurringCreate, db: Session = Depends(get_db)) -> RecurringTemplate:
+    """Create a recurring template.
+
+    Occurrences are generated by POST /recurring/materialize (or the scheduler).
+
+    Args:
+        payload: Template data
+        db: Database session
+
+    Returns:
+        Created template
+
+    Raises:
+        HTTPException: For validation errors
+    """
+    try:
+        return create_template(db, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.delete("/{template_id}", status_code=204)
+def deactivate(template_id: int, db: Session = Depends(get_db)) -> None:
+    """Stop a recurring template (transactions already generated are kept).
+
+    Args:
+        template_id: Template ID
+        db: Database session
+
+    Raises:
+        HTTPException: If the template is not found
+    """
+    template = db.get(RecurringTemplate, template_id)
+    if template is None:
+        raise HTTPException(status_code=404, detail="Recorrência não encontrada")
+    template.active = False
+    db.commit()
+
+
+@router.post("/materialize", response_model=MaterializeResult)
+def materialize_occurrences(until: dt.date | None = None, db: Session = Depends(get_db)) -> dict:
+    """Generate every due occurrence of the active templates.
+
+    Idempotent: each (template, date) becomes a transaction at most once, so the
+    call can be repeated or overlap with the scheduler.
+
+    Args:
+        until: Last date to generate (default: today)
+        db: Database session
+
+    Returns:
+        Dict with the number of generated transactions and occurrences skipped
+        because their month is closed
+
+    Raises:
+        HTTPException: If until is past the maximum horizon
+    """
+    try:
+        return materialize(db, until if until is not None else dt.date.today())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
@@ -1,20 +1,80 @@
 """Reports router - Financial reports and summaries."""
 
-from fastapi import APIRouter, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.services.reports import monthly_summary
+from app.api.deps import get_async_db, get_db
+from app.core.jsonenc import dumps
+from app.services.analytics import (
+    MAX_ANALYTICS_MONTHS,
+    AnalyticsUnavailableError,
+    LedgerArrays,
+    daily_series,
+    expense_percentiles,
+    group_totals,
+    ledger_arrays,
+)
+from app.services.reports import (
+    MAX_RANGE_MONTHS,
+    cached_monthly_summary,
+    iter_months,
+    monthly_summary_etag,
+    range_summary,
+)
 
 router = APIRouter(prefix="/reports", tags=["reports"])
+# Native async endpoints for DB_MODE=async (the others: see api/async_routes.py)
+async_router = APIRouter(prefix="/reports", tags=["reports"])
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _check_range(from_month: str, to_month: str, max_months: int = MAX_RANGE_MONTHS) -> None:
+    if from_month > to_month:
+        raise HTTPException(status_code=400, detail="from deve ser anterior ou igual a to")
+    if len(iter_months(from_month, to_month)) > max_months:
+        raise HTTPException(status_code=400, detail=f"Intervalo máximo de {max_months} meses")
+
+
+def _analytics_arrays(db: Session, from_month: str, to_month: str) -> LedgerArrays:
+    _check_range(from_month, to_month, MAX_ANALYTICS_MONTHS)
+    try:
+        return ledger_arrays(db, from_month, to_month)
+    except AnalyticsUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+
 
+def _json(payload: dict) -> Response:
+    return Response(dumps(payload), media_type="application/json")
 
-@router.get("/monthly-summary")
-def report_monthly_summary(month: str, db: Session = Depends(get_db)) -> dict:
+
+@router.get("/monthly-summary", response_model=None)
+def report_monthly_summary(
+    month: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+) -> dict | Response:
     """Get monthly financial summary with budget comparison.
 
+    Responses carry an ``ETag`` derived from the month's data version. Sending it
+    back in ``If-None-Match`` returns 304 while the month is unchanged, and
+    unchanged months are served from an in-process LRU cache.
+
     Args:
         month: Month in YYYY-MM format
+        response: Outgoing response (used to set the ETag header)
+        if_none_match: ETag(s) the client already holds
         db: Database session
 
     Returns:
@@ -24,5 +84,173 @@ def report_monthly_summary(month: str, db: Session = Depends(get_db)) -> dict:
         - expense_total: Total expenses (absolute value)
         - balance: Net balance (income - expenses)
         - by_category: List of categories with planned vs realized vs deviation
+        or an empty 304 response when the client's copy is current
+    """
+    etag = monthly_summary_etag(db, month)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return cached_monthly_summary(db, month, etag)
+
+
+@router.get("/range")
+def report_range(
+    from_month: str = Query(alias="from", pattern=MONTH_PATTERN),
+    to_month: str = Query(alias="to", pattern=MONTH_PATTERN),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Get the monthly summary of every month in a range, computed in one query.
+
+    Args:
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+        db: Database session
+
+    Returns:
+        Dict with from, to and months (one monthly-summary dict per month)
+
+    Raises:
+        HTTPException: If the range is inverted or longer than MAX_RANGE_MONTHS
+    """
+    _check_range(from_month, to_month)
+    return {"from": from_month, "to": to_month, "months": range_summary(db, from_month, to_month)}
+
+
+@router.get("/analytics/totals", response_model=None)
+def analytics_totals(
+    from_month: str = Query(alias="from", pattern=MONTH_PATTERN),
+    to_month: str = Query(alias="to", pattern=MONTH_PATTERN),
+    group_by: Literal["category", "account"] = "category",
+    db: Session = Depends(get_db),
+) -> Response:
+    """Get income and expense totals per category or account over a long period.
+
+    Args:
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+        group_by: "category" or "account"
+        db: Database session
+
+    Returns:
+        JSON with from, to, group_by and groups (income, expense, net, count each)
+
+    Raises:
+        HTTPException: If the range is invalid (400) or NumPy is not installed (503)
+    """
+    arrays = _analytics_arrays(db, from_month, to_month)
+    groups = group_totals(db, arrays, group_by)
+    return _json({"from": from_month, "to": to_month, "group_by": group_by, "groups": groups})
+
+
+@router.get("/analytics/daily", response_model=None)
+def analytics_daily(
+    from_month: str = Query(alias="from", pattern=MONTH_PATTERN),
+    to_month: str = Query(alias="to", pattern=MONTH_PATTERN),
+    window: int = Query(default=30, ge=1, le=366),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Get the daily cash flow of a period with a trailing rolling sum.
+
+    Args:
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+        window: Days in the rolling sum of the net flow
+        db: Database session
+
+    Returns:
+        JSON with from, to, window and days (income, expense, net, rolling_net each)
+
+    Raises:
+        HTTPException: If the range is invalid (400) or NumPy is not installed (503)
+    """
+    arrays = _analytics_arrays(db, from_month, to_month)
+    days = daily_series(arrays, window)
+    return _json({"from": from_month, "to": to_month, "window": window, "days": days})
+
+
+@router.get("/analytics/percentiles", response_model=None)
+def analytics_percentiles(
+    from_month: str = Query(alias="from", pattern=MONTH_PATTERN),
+    to_month: str = Query(alias="to", pattern=MONTH_PATTERN),
+    q: list[float] = Query(default=[50, 90, 99]),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Get percentiles of expense amounts, overall and per category.
+
+    Args:
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+        q: Percentiles to compute (repeat the parameter), each between 0 and 100
+        db: Database session
+
+    Returns:
+        JSON with from, to, count, overall and by_category percentile maps
+
+    Raises:
+        HTTPException: If the range or a percentile is invalid (400) or NumPy is not
+            installed (503)
+    """
+    if not all(0 <= value <= 100 for value in q):
+        raise HTTPException(status_code=400, detail="Percentis devem estar entre 0 e 100")
+    arrays = _analytics_arrays(db, from_month, to_month)
+    result = expense_percentiles(db, arrays, q)
+    return _json({"from": from_month, "to": to_month, **result})
+
+
+# The report services are plain sync code; run_sync executes them on the async
+# connection (I/O is awaited, no threadpool thread is held)
+
+
+@async_router.get("/monthly-summary", response_model=None)
+async def report_monthly_summary_async(
+    month: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> dict | Response:
+    """Get monthly financial summary with budget comparison (async mode).
+
+    Same ETag/304 and caching behavior as the sync endpoint.
+
+    Args:
+        month: Month in YYYY-MM format
+        response: Outgoing response (used to set the ETag header)
+        if_none_match: ETag(s) the client already holds
+        db: Asyncio database session
+
+    Returns:
+        Monthly summary dict, or an empty 304 response when the client's copy is current
+    """
+    etag = await db.run_sync(monthly_summary_etag, month)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return await db.run_sync(cached_monthly_summary, month, etag)
+
+
+@async_router.get("/range")
+async def report_range_async(
+    from_month: str = Query(alias="from", pattern=MONTH_PATTERN),
+    to_month: str = Query(alias="to", pattern=MONTH_PATTERN),
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """Get the monthly summary of every month in a range (async mode).
+
+    Args:
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+        db: Asyncio database session
+
+    Returns:
+        Dict with from, to and months (one monthly-summary dict per month)
+
+    Raises:
+        HTTPException: If the range is inverted or longer than MAX_RANGE_MONTHS
     """
-    return monthly_summary(db, month)
+    _check_range(from_month, to_month)
+    months = await db.run_sync(range_summary, from_month, to_month)
+    return {"from": from_month, "to": to_month, "months": months}
@@ -0,0 +1,116 @@
+"""Rules router - CRUD for auto-categorization rules."""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.db.models import CategoryRule
+from app.schemas.rules import RuleCreate, RuleOut, RuleUpdate
+from app.services.refdata import get_reference_data
+from app.services.rules import mark_rules_changed
+
+router = APIRouter(prefix="/rules", tags=["rules"])
+
+
+def _check_refs(db: Session, payload: RuleCreate) -> None:
+    ref = get_reference_data(db)
+    if ref.category_kind(payload.category_id) is None:
+        raise HTTPException(status_code=400, detail="Categoria inválida/inativa")
+    if payload.account_id is not None and not ref.account_active(payload.account_id):
+        raise HTTPException(status_code=400, detail="Conta inválida/inativa")
+
+
+def _values(payload: RuleCreate) -> dict[str, Any]:
+    return {
+        "category_id": payload.category_id,
+        "match": payload.match.value if payload.match is not None else None,
+        "pattern": payload.pattern,
+        "keyword": payload.keyword,
+        "account_id": payload.account_id,
+        "min_amount_cents": payload.min_amount,
+        "max_amount_cents": payload.max_amount,
+        "priority": payload.priority,
+    }
+
+
+@router.get("", response_model=list[RuleOut])
+def list_rules(db: Session = Depends(get_db)) -> list[CategoryRule]:
+    """List all rules, in the order they are tried.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Rules ordered by priority, then ID
+    """
+    return list(db.scalars(select(CategoryRule).order_by(CategoryRule.priority, CategoryRule.id)))
+
+
+@router.post("", response_model=RuleOut, status_code=201)
+def create_rule(payload: RuleCreate, db: Session = Depends(get_db)) -> CategoryRule:
+    """Create a rule.
+
+    Args:
+        payload: Rule creation data
+        db: Database session
+
+    Returns:
+        Created rule
+
+    Raises:
+        HTTPException: If the category or account is invalid/inactive
+    """
+    _check_refs(db, payload)
+    mark_rules_changed(db)
+    rule = db.scalars(insert(CategoryRule).values(**_values(payload)).returning(CategoryRule)).one()
+    db.commit()
+    return rule
+
+
+@router.put("/{rule_id}", response_model=RuleOut)
+def update_rule(rule_id: int, payload: RuleUpdate, db: Session = Depends(get_db)) -> CategoryRule:
+    """Replace a rule.
+
+    Args:
+        rule_id: Rule ID
+        payload: New rule data
+        db: Database session
+
+    Returns:
+        Updated rule
+
+    Raises:
+        HTTPException: If the rule is not found or the category/account is invalid
+    """
+    rule = db.get(CategoryRule, rule_id)
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Regra não encontrada")
+    _check_refs(db, payload)
+    for name, value in _values(payload).items():
+        setattr(rule, name, value)
+    rule.active = payload.active
+    mark_rules_changed(db)
+    db.commit()
+    return rule
+
+
+@router.delete("/{rule_id}", status_code=204)
+def delete_rule(rule_id: int, db: Session = Depends(get_db)) -> None:
+    """Delete a rule.
+
+    Args:
+        rule_id: Rule ID
+        db: Database session
+
+    Raises:
+        HTTPException: If the rule is not found
+    """
+    rule = db.get(CategoryRule, rule_id)
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Regra não encontrada")
+    db.delete(rule)
+    mark_rules_changed(db)
+    db.commit()
@@ -1,62 +1,356 @@
 """Transactions router - CRUD for transactions including transfers."""
 
 import datetime as dt
-from decimal import Decimal
+from collections.abc import Sequence
+from typing import IO, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.db.models import Account, Category, Transaction
-from app.schemas.transactions import TransactionCreate, TransactionOut, TransferCreate, TxKind
-from app.services.transfers import create_transfer
+from app.api.deps import get_async_db, get_db, spooled_body
+from app.core.config import settings
+from app.db.models import Transaction
+from app.schemas.rules import RecategorizeResult
+from app.schemas.transactions import (
+    BulkInsertResult,
+    BulkTransferResult,
+    ExportFormat,
+    TransactionCreate,
+    TransactionOut,
+    TransactionPage,
+    TransferCreate,
+    TxKind,
+)
+from app.services.archive import (
+    ClosedMonthError,
+    RowFilter,
+    get_archive_index,
+    merge_archived,
+    row_position,
+)
+from app.services.exports import (
+    aiter_csv,
+    aiter_export_batches,
+    aiter_ndjson,
+    iter_csv,
+    iter_export_rows,
+    iter_ndjson,
+    render_json,
+    render_page,
+)
+from app.services.ledger import (
+    delete_transactions,
+    find_transaction,
+    find_transfer,
+    insert_rows,
+    record_inserts,
+)
+from app.services.refdata import get_reference_data
+from app.services.rules import recategorize
+from app.services.search import SearchUnavailableError, search_transactions
+from app.services.transactions import (
+    bulk_create_transactions,
+    check_transaction_fields,
+    check_transaction_refs,
+    decode_cursor,
+    encode_cursor,
+    iter_bulk_payloads,
+    list_transaction_rows,
+)
+from app.services.transfers import bulk_create_transfers, create_transfer
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
+# Native async endpoints for DB_MODE=async (the others: see api/async_routes.py)
+async_router = APIRouter(prefix="/transactions", tags=["transactions"])
 
+MAX_PAGE_SIZE = 1000
+SEARCH_PAGE_SIZE = 50
 
-@router.get("", response_model=list[TransactionOut])
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/x-jsonlines")
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _require_date_pair(from_date: dt.date | None, to_date: dt.date | None) -> None:
+    if (from_date is None) ^ (to_date is None):
+        raise HTTPException(status_code=400, detail="Informe from_date e to_date juntos")
+
+
+def _list_filter(
+    from_date: dt.date | None,
+    to_date: dt.date | None,
+    account_id: int | None,
+    category_id: int | None,
+    kind: TxKind | None,
+    limit: int | None,
+    cursor: str | None,
+) -> RowFilter:
+    _require_date_pair(from_date, to_date)
+
+    if cursor is not None and limit is None:
+        raise HTTPException(status_code=400, detail="cursor requer limit")
+
+    try:
+        after = decode_cursor(cursor) if cursor is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return RowFilter(
+        from_date=from_date,
+        to_date=to_date,
+        account_id=account_id,
+        category_id=category_id,
+        kind=kind.value if kind is not None else None,
+        after=after,
+    )
+
+
+def _list_response(rows: Sequence[Sequence[Any]], limit: int | None, envelope: bool) -> Response:
+    # Rendered straight to JSON bytes; returning a Response skips the per-row
+    # validation FastAPI would otherwise run through response_model
+    headers = {}
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*row_position(rows[-1]))
+        headers["X-Next-Cursor"] = next_cursor
+    body = render_page(rows, next_cursor) if envelope else render_json(rows)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@router.get("", response_model=list[TransactionOut] | TransactionPage)
 def list_transactions(
     from_date: dt.date | None = Query(default=None),
     to_date: dt.date | None = Query(default=None),
     account_id: int | None = None,
     category_id: int | None = None,
     kind: TxKind | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    envelope: bool = False,
     db: Session = Depends(get_db),
-) -> list[Transaction]:
+) -> Response:
     """List transactions with optional filters.
 
+    Without ``limit`` every matching row is returned. With ``limit`` the result is a
+    page ordered by (date, id) descending; when more rows exist, the ``X-Next-Cursor``
+    response header carries the cursor to pass back for the next page. With
+    ``envelope`` the body is a TransactionPage, which also carries that cursor as
+    ``next_cursor`` (null on the last page). Only the year partitions the dates
+    overlap are read; rows of closed months are read from their archives and
+    merged in order.
+
     Args:
         from_date: Start date filter
         to_date: End date filter
         account_id: Filter by account
         category_id: Filter by category
         kind: Filter by transaction kind
+        limit: Page size (enables keyset pagination)
+        cursor: Cursor returned by the previous page
+        envelope: Wrap the rows in a TransactionPage object
         db: Database session
 
     Returns:
-        List of transactions matching filters
+        JSON array of the transactions matching filters (TransactionOut items), or a
+        TransactionPage with ``envelope``
+
+    Raises:
+        HTTPException: If from_date or to_date provided without the other, or if the
+            cursor is invalid or sent without limit
+    """
+    flt = _list_filter(from_date, to_date, account_id, category_id, kind, limit, cursor)
+    rows = merge_archived(get_archive_index(db), list_transaction_rows(db, flt, limit), flt, limit)
+    return _list_response(rows, limit, envelope)
+
+
+@async_router.get("", response_model=list[TransactionOut] | TransactionPage)
+async def list_transactions_async(
+    from_date: dt.date | None = Query(default=None),
+    to_date: dt.date | None = Query(default=None),
+    account_id: int | None = None,
+    category_id: int | None = None,
+    kind: TxKind | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    envelope: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """List transactions with optional filters (async mode).
+
+    Same filters, pagination and errors as the sync endpoint.
+
+    Args:
+        from_date: Start date filter
+        to_date: End date filter
+        account_id: Filter by account
+        category_id: Filter by category
+        kind: Filter by transaction kind
+        limit: Page size (enables keyset pagination)
+        cursor: Cursor returned by the previous page
+        envelope: Wrap the rows in a TransactionPage object
+        db: Asyncio database session
+
+    Returns:
+        JSON array of the transactions matching filters (TransactionOut items), or a
+        TransactionPage with ``envelope``
+    """
+    flt = _list_filter(from_date, to_date, account_id, category_id, kind, limit, cursor)
+    rows = await db.run_sync(list_transaction_rows, flt, limit)
+    index = await db.run_sync(get_archive_index)
+    return _list_response(merge_archived(index, rows, flt, limit), limit, envelope)
+
+
+@router.get("/search", response_model=list[TransactionOut])
+def search(
+    q: str = Query(min_length=1, max_length=200),
+    from_date: dt.date | None = Query(default=None),
+    to_date: dt.date | None = Query(default=None),
+    account_id: int | None = None,
+    category_id: int | None = None,
+    kind: TxKind | None = None,
+    limit: int = Query(default=SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Full-text search over transaction descriptions, best match (bm25) first.
+
+    Every term must appear in the description (accents and case are ignored);
+    ``term*`` matches words starting with ``term``. Closed months are searched
+    too. When more matches exist, the ``X-Next-Offset`` response header carries
+    the offset of the next page.
+
+    Args:
+        q: Search terms, e.g. ``ifood`` or ``mercad*``
+        from_date: Start date filter
+        to_date: End date filter
+        account_id: Filter by account
+        category_id: Filter by category
+        kind: Filter by transaction kind
+        limit: Page size
+        offset: Matches to skip
+        db: Database session
+
+    Returns:
+        JSON array of the matching transactions (TransactionOut items)
+
+    Raises:
+        HTTPException: If the dates are not sent together or the query has no
+            searchable term (400), or the database has no FTS5 index (503)
+    """
+    _require_date_pair(from_date, to_date)
+    flt = RowFilter(
+        from_date=from_date,
+        to_date=to_date,
+        account_id=account_id,
+        category_id=category_id,
+        kind=kind.value if kind is not None else None,
+    )
+    try:
+        rows = search_transactions(db, q, flt, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Offset"] = str(offset + limit)
+    return Response(render_json(rows), media_type="application/json", headers=headers)
+
+
+@router.get("/export")
+def export_transactions(
+    fmt: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    from_date: dt.date | None = Query(default=None),
+    to_date: dt.date | None = Query(default=None),
+    account_id: int | None = None,
+    category_id: int | None = None,
+    kind: TxKind | None = None,
+) -> StreamingResponse:
+    """Stream every transaction matching the filters as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written out as they arrive, so
+    memory stays flat regardless of ledger size. Rows of closed months are merged in
+    from their archives.
+
+    Args:
+        fmt: Output format (ndjson or csv)
+        from_date: Start date filter
+        to_date: End date filter
+        account_id: Filter by account
+        category_id: Filter by category
+        kind: Filter by transaction kind
+
+    Returns:
+        Streaming response with the exported rows
 
     Raises:
         HTTPException: If from_date or to_date provided without the other
     """
-    q = db.query(Transaction)
+    _require_date_pair(from_date, to_date)
+
+    flt = RowFilter(
+        from_date=from_date,
+        to_date=to_date,
+        account_id=account_id,
+        category_id=category_id,
+        kind=kind.value if kind is not None else None,
+    )
+    chunk_size = settings.export_chunk_size
+    rows = iter_export_rows(flt, chunk_size)
+    body = iter_csv(rows, chunk_size) if fmt == ExportFormat.CSV else iter_ndjson(rows, chunk_size)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{fmt.value}"'},
+    )
 
-    if (from_date is None) ^ (to_date is None):
-        raise HTTPException(status_code=400, detail="Informe from_date e to_date juntos")
 
-    if from_date and to_date:
-        q = q.filter(Transaction.date.between(from_date, to_date))
+@async_router.get("/export")
+async def export_transactions_async(
+    fmt: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    from_date: dt.date | None = Query(default=None),
+    to_date: dt.date | None = Query(default=None),
+    account_id: int | None = None,
+    category_id: int | None = None,
+    kind: TxKind | None = None,
+) -> StreamingResponse:
+    """Stream every transaction matching the filters as NDJSON or CSV (async mode).
 
-    if account_id is not None:
-        q = q.filter(Transaction.account_id == account_id)
+    Same output as the sync endpoint; each chunk is fetched through the async
+    driver, so the stream holds no threadpool thread while it waits on the database.
 
-    if category_id is not None:
-        q = q.filter(Transaction.category_id == category_id)
+    Args:
+        fmt: Output format (ndjson or csv)
+        from_date: Start date filter
+        to_date: End date filter
+        account_id: Filter by account
+        category_id: Filter by category
+        kind: Filter by transaction kind
 
-    if kind is not None:
-        q = q.filter(Transaction.kind == kind.value)
+    Returns:
+        Streaming response with the exported rows
 
-    return q.order_by(Transaction.date.desc(), Transaction.id.desc()).all()
+    Raises:
+        HTTPException: If from_date or to_date provided without the other
+    """
+    flt = _list_filter(from_date, to_date, account_id, category_id, kind, None, None)
+    batches = aiter_export_batches(flt, settings.export_chunk_size)
+    body = aiter_csv(batches) if fmt == ExportFormat.CSV else aiter_ndjson(batches)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{fmt.value}"'},
+    )
 
 
 @router.post("", response_model=TransactionOut, status_code=201)
@@ -75,56 +369,100 @@ def create_transaction(payload: TransactionCreate, db: Session = Depends(get_db)
     Raises:
         HTTPException: For validation errors
     """
-    if payload.kind == TxKind.TRANSFER:
-        raise HTTPException(
-            status_code=400, detail="Use /transactions/transfer para transferências"
+    try:
+        check_transaction_fields(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    # Validate account and category against the cached reference data
+    ref = get_reference_data(db)
+    try:
+        check_transaction_refs(
+            payload,
+            account_active=ref.account_active(payload.account_id),
+            category_kind=ref.category_kind(payload.category_id),
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
-    if payload.kind == TxKind.INCOME and payload.amount <= 0:
-        raise HTTPException(status_code=400, detail="INCOME requer amount > 0")
+    values = {
+        "date": payload.date,
+        "description": payload.description,
+        "amount_cents": payload.amount,
+        "kind": payload.kind.value,
+        "account_id": payload.account_id,
+        "category_id": payload.category_id,
+    }
+    record_inserts(db, [values])
+    insert_rows(db, [values])
+    db.commit()
+    return Transaction(**values)
 
-    if payload.kind == TxKind.EXPENSE and payload.amount >= 0:
-        raise HTTPException(status_code=400, detail="EXPENSE requer amount < 0")
 
-    if payload.category_id is None:
-        raise HTTPException(status_code=400, detail="category_id é obrigatório para INCOME/EXPENSE")
+@router.post("/bulk", response_model=BulkInsertResult)
+def bulk_create(
+    body: IO[bytes] = Depends(spooled_body),
+    content_type: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Create many INCOME/EXPENSE transactions in one request.
 
-    # Validate account exists and is active
-    acc = (
-        db.query(Account)
-        .filter(Account.id == payload.account_id, Account.active == True)  # noqa: E712
-        .one_or_none()
-    )
-    if not acc:
-        raise HTTPException(status_code=400, detail="Conta inválida/inativa")
-
-    # Validate category exists, is active, and matches kind
-    cat = (
-        db.query(Category)
-        .filter(Category.id == payload.category_id, Category.active == True)  # noqa: E712
-        .one_or_none()
-    )
-    if not cat:
-        raise HTTPException(status_code=400, detail="Categoria inválida/inativa")
-
-    if payload.kind == TxKind.INCOME and cat.kind != "INCOME":
-        raise HTTPException(status_code=400, detail="Categoria incompatível com INCOME")
-    if payload.kind == TxKind.EXPENSE and cat.kind != "EXPENSE":
-        raise HTTPException(status_code=400, detail="Categoria incompatível com EXPENSE")
-
-    # Convert float to Decimal safely
-    tx = Transaction(
-        date=payload.date,
-        description=payload.description,
-        amount=Decimal(str(payload.amount)),
-        kind=payload.kind.value,
-        account_id=payload.account_id,
-        category_id=payload.category_id,
+    The body is either a JSON array or NDJSON (``Content-Type: application/x-ndjson``)
+    of TransactionCreate items. Each row gets the same validation as POST /transactions,
+    but against one preloaded set of active accounts and categories. Valid rows are
+    inserted together; invalid rows are skipped and reported by index.
+
+    Args:
+        body: Spooled request body
+        content_type: Content-Type header (selects JSON array or NDJSON parsing)
+        db: Database session
+
+    Returns:
+        Dict with inserted count and per-row errors
+
+    Raises:
+        HTTPException: If the body is not a JSON array or NDJSON
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    payloads = iter_bulk_payloads(body, ndjson=media_type in NDJSON_MEDIA_TYPES)
+    try:
+        return bulk_create_transactions(db, payloads, chunk_size=settings.bulk_insert_chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.post("/recategorize", response_model=RecategorizeResult)
+def recategorize_transactions(
+    from_date: dt.date,
+    to_date: dt.date,
+    account_id: int | None = None,
+    category_id: int | None = None,
+    db: Session = Depends(get_db),
+) -> dict:
+    """Apply the category rules again to the INCOME/EXPENSE transactions of a period.
+
+    Transactions no rule matches keep their category; closed months are skipped.
+
+    Args:
+        from_date: First date of the period
+        to_date: Last date of the period
+        account_id: Only transactions of this account
+        category_id: Only transactions currently in this category
+        db: Database session
+
+    Returns:
+        Dict with the number of scanned and updated transactions
+
+    Raises:
+        HTTPException: If from_date is after to_date
+    """
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=400, detail="from_date deve ser anterior ou igual a to_date"
+        )
+    return recategorize(
+        db, from_date=from_date, to_date=to_date, account_id=account_id, category_id=category_id
     )
-    db.add(tx)
-    db.commit()
-    db.refresh(tx)
-    return tx
 
 
 @router.post("/transfer", status_code=201)
@@ -148,7 +486,7 @@ def transfer(payload: TransferCreate, db: Session = Depends(get_db)) -> dict:
             db,
             date=payload.date,
             description=payload.description,
-            amount_abs=Decimal(str(payload.amount_abs)),
+            amount_abs_cents=payload.amount_abs,
             from_account_id=payload.from_account_id,
             to_account_id=payload.to_account_id,
         )
@@ -156,6 +494,40 @@ def transfer(payload: TransferCreate, db: Session = Depends(get_db)) -> dict:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
+@router.post("/transfers/bulk", response_model=BulkTransferResult)
+def bulk_transfer(
+    body: IO[bytes] = Depends(spooled_body),
+    content_type: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Create many transfers in one request.
+
+    The body is either a JSON array or NDJSON (``Content-Type: application/x-ndjson``)
+    of TransferCreate items. Each item gets the same validation as
+    POST /transactions/transfer; valid transfers are created together and invalid
+    ones are skipped and reported by index.
+
+    Args:
+        body: Spooled request body
+        content_type: Content-Type header (selects JSON array or NDJSON parsing)
+        db: Database session
+
+    Returns:
+        Dict with the number of created transfers, their pair IDs and per-item errors
+
+    Raises:
+        HTTPException: If the body is not a JSON array or NDJSON
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    payloads = iter_bulk_payloads(
+        body, ndjson=media_type in NDJSON_MEDIA_TYPES, model=TransferCreate
+    )
+    try:
+        return bulk_create_transfers(db, payloads, chunk_size=settings.bulk_insert_chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
 @router.delete("/{transaction_id}", status_code=204)
 def delete_transaction(transaction_id: int, db: Session = Depends(get_db)) -> None:
     """Delete a transaction.
@@ -168,19 +540,18 @@ def delete_transaction(transaction_id: int, db: Session = Depends(get_db)) -> No
 
     Raises:
         HTTPException: If transaction not found
+        ClosedMonthError: If the transaction belongs to a closed month (409)
     """
-    tx = db.query(Transaction).filter(Transaction.id == transaction_id).one_or_none()
-    if not tx:
+    tx = find_transaction(db, transaction_id)
+    if tx is None:
+        month = get_archive_index(db).find(transaction_id)
+        if month is not None:
+            raise ClosedMonthError(f"Mês {month} está fechado; reabra-o para alterar")
         raise HTTPException(status_code=404, detail="Transação não encontrada")
 
-    # If it's a transfer, delete the entire pair
-    if tx.kind == "TRANSFER" and tx.transfer_pair_id:
-        db.query(Transaction).filter(Transaction.transfer_pair_id == tx.transfer_pair_id).delete(
-            synchronize_session=False
-        )
-        db.commit()
-        return None
-
-    # Regular transaction: just delete it
-    db.delete(tx)
+    # If it's a transfer, delete the entire pair (both legs share the date and partition)
+    rows = [tx]
+    if tx["kind"] == "TRANSFER" and tx["transfer_pair_id"]:
+        rows = find_transfer(db, tx["transfer_pair_id"], tx["date"])
+    delete_transactions(db, rows)
     db.commit()
@@ -0,0 +1,6 @@
+"""Benchmark suite - synthetic ledgers and timing of endpoints and services.
+
+Usage:
+    python -m app.bench run --sizes 10000,100000 --out results.json
+    python -m app.bench compare baseline.json results.json [--threshold 0.2]
+"""
@@ -0,0 +1,120 @@
+"""Command line of the benchmark suite (see app.bench)."""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+from app.bench.suite import CASES, DEFAULT_THRESHOLD, compare_results, run_benchmarks
+
+
+def _parse_sizes(raw: str) -> list[int]:
+    try:
+        sizes = [int(part.replace("_", "")) for part in raw.split(",") if part.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"Tamanhos inválidos: {raw!r}") from e
+    if not sizes or min(sizes) < 100:
+        raise argparse.ArgumentTypeError("Cada tamanho deve ser >= 100")
+    return sizes
+
+
+def _run(args: argparse.Namespace) -> int:
+    cases = [case for case in CASES if not args.only or any(p in case.name for p in args.only)]
+    if not cases:
+        print("Nenhum caso selecionado", file=sys.stderr)
+        return 2
+
+    # One access-log line per request would drown the report
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        results = run_benchmarks(args.sizes, Path(workdir), repeat=args.repeat, cases=cases)
+
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    for size, entry in results["results"].items():
+        print(f"# {size} transações (gerado em {entry['generate_s']}s)")
+        for name, timing in entry["cases"].items():
+            print(
+                f"{name:40} median {timing['median_ms']:9.3f} ms   p95 {timing['p95_ms']:9.3f} ms"
+            )
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    rows = compare_results(baseline, current, threshold=args.threshold)
+
+    regressions = [row for row in rows if row["regression"]]
+    for row in rows:
+        mark = "REGRESSÃO" if row["regression"] else ""
+        print(
+            f"{row['size']:>10} {row['case']:40} {row['baseline_ms']:9.3f} -> "
+            f"{row['current_ms']:9.3f} ms  x{row['ratio']:.2f} {mark}"
+        )
+    if regressions:
+        print(
+            f"{len(regressions)} caso(s) mais de {args.threshold:.0%} mais lento(s)",
+            file=sys.stderr,
+        )
+        return 1
+    print("Sem regressões")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the benchmark commands.
+
+    Returns:
+        Configured ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.bench")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Gera ledgers sintéticos e mede os casos")
+    run.add_argument(
+        "--sizes",
+        type=_parse_sizes,
+        default=[10_000, 100_000],
+        help="Tamanhos do ledger separados por vírgula (padrão: 10000,100000)",
+    )
+    run.add_argument("--repeat", type=int, default=20, help="Execuções medidas por caso")
+    run.add_argument("--out", help="Arquivo JSON de resultados")
+    run.add_argument("--only", action="append", help="Roda só casos cujo nome contém o texto")
+    run.add_argument("--workdir", help="Diretório para os bancos temporários")
+    run.set_defaults(func=_run)
+
+    compare = commands.add_parser("compare", help="Compara resultados com uma baseline")
+    compare.add_argument("baseline", help="JSON de referência")
+    compare.add_argument("current", help="JSON a comparar")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Aumento relativo da mediana tratado como regressão (padrão: 0.2)",
+    )
+    compare.set_defaults(func=_compare)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a benchmark command.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code (1 when compare finds regressions)
+    """
+    args = build_parser().parse_args(argv)
+    func: Callable[[argparse.Namespace], int] = args.func
+    return func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
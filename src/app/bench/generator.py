@@ -0,0 +1,196 @@
+"""Synthetic ledger generator for benchmarks.
+
+Builds a realistic, deterministic ledger (accounts, categories, budgets, income,
+expenses and transfer pairs) of any size. Rows are written with chunked
+executemany inserts that bypass the per-write ledger hooks. Derived data (monthly
+rollups and balances) is then rebuilt once with set-based queries, which keeps
+10M-row ledgers practical.
+"""
+
+import datetime as dt
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, Budget, Category, new_pair_id
+from app.services.balances import reconcile_balances
+from app.services.ledger import insert_rows
+from app.services.rollups import rebuild_rollups
+
+ACCOUNTS = [
+    ("Conta Corrente", "BANK"),
+    ("Poupança", "BANK"),
+    ("Carteira", "CASH"),
+    ("Cartão", "CARD"),
+]
+INCOME_CATEGORIES = ["Salário", "Freelance", "Rendimentos"]
+EXPENSE_CATEGORIES = [
+    ("Moradia", "ESSENTIAL"),
+    ("Alimentação", "ESSENTIAL"),
+    ("Transporte", "ESSENTIAL"),
+    ("Saúde", "ESSENTIAL"),
+    ("Educação", "FUTURE"),
+    ("Lazer", "LIFESTYLE"),
+    ("Restaurantes", "LIFESTYLE"),
+    ("Assinaturas", "LIFESTYLE"),
+    ("Viagens", "LIFESTYLE"),
+    ("Outros", "OTHER"),
+]
+DESCRIPTIONS = [
+    "Supermercado",
+    "Padaria",
+    "Uber",
+    "Farmácia",
+    "Aluguel",
+    "Conta de luz",
+    "Internet",
+    "Streaming",
+    "Restaurante",
+    "Posto de gasolina",
+]
+
+TRANSFER_SHARE = 0.05
+INCOME_SHARE = 0.10
+INSERT_CHUNK = 50_000
+
+
+@dataclass(frozen=True, slots=True)
+class Ledger:
+    """IDs and date span of a generated ledger."""
+
+    size: int
+    account_ids: list[int]
+    income_category_ids: list[int]
+    expense_category_ids: list[int]
+    start: dt.date
+    months: list[str]
+
+
+def _months_for(size: int) -> int:
+    # Roughly 2k rows per month, between 1 and 20 years of history
+    return max(12, min(240, size // 2000))
+
+
+def _month_list(start: dt.date, count: int) -> list[str]:
+    months = []
+    year, month = start.year, start.month
+    for _ in range(count):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _iter_rows(ledger: Ledger, rng: random.Random, span_days: int) -> Iterator[dict[str, Any]]:
+    produced = 0
+    while produced < ledger.size:
+        date = ledger.start + dt.timedelta(days=rng.randrange(span_days))
+        roll = rng.random()
+        if roll < TRANSFER_SHARE and ledger.size - produced >= 2:
+            src, dst = rng.sample(ledger.account_ids, 2)
+            amount = rng.randrange(5_000, 300_000)
+            pair = new_pair_id()
+            for account_id, signed in ((src, -amount), (dst, amount)):
+                yield {
+                    "date": date,
+                    "description": "Transferência",
+                    "amount_cents": signed,
+                    "kind": "TRANSFER",
+                    "account_id": account_id,
+                    "category_id": None,
+                    "transfer_pair_id": pair,
+                }
+            produced += 2
+            continue
+
+        if roll < TRANSFER_SHARE + INCOME_SHARE:
+            amount = rng.randrange(50_000, 1_500_000)
+            yield {
+                "date": date,
+                "description": "Recebimento",
+                "amount_cents": amount,
+                "kind": "INCOME",
+                "account_id": ledger.account_ids[0],
+                "category_id": rng.choice(ledger.income_category_ids),
+                "transfer_pair_id": None,
+            }
+        else:
+            # Log-normal spend: many small purchases, a few large ones
+            amount = int(min(rng.lognormvariate(8.0, 1.1), 2_000_000))
+            yield {
+                "date": date,
+                "description": rng.choice(DESCRIPTIONS),
+                "amount_cents": -max(amount, 1),
+                "kind": "EXPENSE",
+                "account_id": rng.choice(ledger.account_ids),
+                "category_id": rng.choice(ledger.expense_category_ids),
+                "transfer_pair_id": None,
+            }
+        produced += 1
+
+
+def generate_ledger(db: Session, size: int, *, seed: int = 42) -> Ledger:
+    """Populate an empty database with a synthetic ledger of ``size`` transactions.
+
+    Args:
+        db: Database session on an empty schema (committed here)
+        size: Number of transaction rows (transfers count as two)
+        seed: Random seed, so equal sizes produce equal ledgers
+
+    Returns:
+        Ledger description with the generated IDs and months
+    """
+    rng = random.Random(seed)
+
+    accounts = [Account(name=name, type=kind) for name, kind in ACCOUNTS]
+    incomes = [Category(name=name, kind="INCOME", group="ESSENTIAL") for name in INCOME_CATEGORIES]
+    expenses = [
+        Category(name=name, kind="EXPENSE", group=group) for name, group in EXPENSE_CATEGORIES
+    ]
+    db.add_all([*accounts, *incomes, *expenses])
+    db.flush()
+
+    month_count = _months_for(size)
+    today = dt.date.today()
+    start = dt.date(today.year - (month_count - 1) // 12 - 1, 1, 1)
+    months = _month_list(start, month_count)
+    end = dt.date.fromisoformat(f"{months[-1]}-28")
+
+    ledger = Ledger(
+        size=size,
+        account_ids=[a.id for a in accounts],
+        income_category_ids=[c.id for c in incomes],
+        expense_category_ids=[c.id for c in expenses],
+        start=start,
+        months=months,
+    )
+
+    db.execute(
+        insert(Budget.__table__),
+        [
+            {
+                "month": month,
+                "category_id": cid,
+                "amount_planned_cents": rng.randrange(20_000, 200_000),
+            }
+            for month in months
+            for cid in ledger.expense_category_ids
+        ],
+    )
+
+    chunk: list[dict[str, Any]] = []
+    for row in _iter_rows(ledger, rng, (end - start).days + 1):
+        chunk.append(row)
+        if len(chunk) >= INSERT_CHUNK:
+            insert_rows(db, chunk)
+            chunk = []
+    insert_rows(db, chunk)
+    db.commit()
+
+    # Derived data in two set-based passes instead of per-chunk deltas
+    rebuild_rollups(db)
+    reconcile_balances(db, fix=True)
+    return ledger
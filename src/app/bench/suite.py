@@ -0,0 +1,504 @@
+"""Benchmark cases, runner and baseline comparison."""
+
+import datetime as dt
+import platform
+import sqlite3
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.bench.generator import Ledger, generate_ledger
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import get_engine, get_session
+from app.schemas.transactions import TransactionCreate
+from app.services.analytics import analytics_cache
+from app.services.archive import RowFilter, archive_store
+from app.services.ledger import delete_transactions, find_transaction
+from app.services.refdata import reference_cache
+from app.services.reports import monthly_summary, range_summary, report_cache
+from app.services.rules import rule_cache
+from app.services.transactions import bulk_create_transactions, list_transaction_rows
+from app.services.transfers import create_transfer
+from app.services.versions import version_tracker
+
+DEFAULT_THRESHOLD = 0.20
+# Differences below this are timer noise, whatever the ratio
+MIN_DELTA_MS = 0.5
+
+
+@dataclass
+class BenchContext:
+    """Everything a case needs: the API client, a session and the generated ledger."""
+
+    client: TestClient
+    headers: dict[str, str]
+    db: Session
+    ledger: Ledger
+
+    @property
+    def month(self) -> str:
+        """A month in the middle of the ledger."""
+        return self.ledger.months[len(self.ledger.months) // 2]
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    """One timed operation. ``setup`` runs untimed before each run; its result is passed on."""
+
+    name: str
+    run: Callable[[BenchContext, Any], Any]
+    setup: Callable[[BenchContext], Any] | None = None
+
+
+def _expect(response: Any, status: int) -> Any:
+    if response.status_code != status:
+        raise RuntimeError(f"{response.request.url}: {response.status_code} {response.text}")
+    return response
+
+
+def _month_bounds(month: str) -> tuple[str, str]:
+    start = dt.date.fromisoformat(f"{month}-01")
+    end = (start + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+    return start.isoformat(), end.isoformat()
+
+
+def _range_12m(ctx: BenchContext) -> tuple[str, str]:
+    months = ctx.ledger.months
+    last = len(months) // 2
+    return months[max(0, last - 11)], months[last]
+
+
+def _full_range(ctx: BenchContext) -> tuple[str, str]:
+    return ctx.ledger.months[0], ctx.ledger.months[-1]
+
+
+def _second_page_cursor(ctx: BenchContext) -> str:
+    r = _expect(ctx.client.get("/transactions?limit=100", headers=ctx.headers), 200)
+    return r.headers["X-Next-Cursor"]
+
+
+def _new_expense(ctx: BenchContext) -> int:
+    r = ctx.client.post(
+        "/transactions",
+        json={
+            "date": f"{ctx.month}-15",
+            "description": "bench",
+            "amount": -12.34,
+            "kind": "EXPENSE",
+            "account_id": ctx.ledger.account_ids[0],
+            "category_id": ctx.ledger.expense_category_ids[0],
+        },
+        headers=ctx.headers,
+    )
+    return _expect(r, 201).json()["id"]
+
+
+def _clear_reports(ctx: BenchContext) -> None:
+    report_cache.clear()
+
+
+def _full_range_cold(ctx: BenchContext) -> tuple[str, str]:
+    analytics_cache.clear()
+    archive_store.invalidate()
+    return _full_range(ctx)
+
+
+def _delete_service(ctx: BenchContext, tx_id: int) -> None:
+    delete_transactions(ctx.db, [find_transaction(ctx.db, tx_id)])
+    ctx.db.commit()
+
+
+def _bulk_payloads(ctx: BenchContext) -> list[tuple[int, TransactionCreate]]:
+    return [
+        (
+            i,
+            TransactionCreate(
+                date=dt.date.fromisoformat(f"{ctx.month}-10"),
+                description="bench bulk",
+                amount=-1.0 - i % 50,
+                kind="EXPENSE",
+                account_id=ctx.ledger.account_ids[i % len(ctx.ledger.account_ids)],
+                category_id=ctx.ledger.expense_category_ids[0],
+            ),
+        )
+        for i in range(1000)
+    ]
+
+
+CASES = [
+    Case(
+        "api.list_transactions.first_page",
+        lambda ctx, _: _expect(ctx.client.get("/transactions?limit=100", headers=ctx.headers), 200),
+    ),
+    Case(
+        "api.list_transactions.next_page",
+        lambda ctx, cursor: _expect(
+            ctx.client.get(f"/transactions?limit=100&cursor={cursor}", headers=ctx.headers), 200
+        ),
+        setup=_second_page_cursor,
+    ),
+    Case(
+        "api.list_transactions.account_month",
+        lambda ctx, bounds: _expect(
+            ctx.client.get(
+                f"/transactions?account_id={ctx.ledger.account_ids[0]}"
+                f"&from_date={bounds[0]}&to_date={bounds[1]}",
+                headers=ctx.headers,
+            ),
+            200,
+        ),
+        setup=lambda ctx: _month_bounds(ctx.month),
+    ),
+    Case(
+        "api.list_transactions.unpaged_12m",
+        lambda ctx, span: _expect(
+            ctx.client.get(
+                f"/transactions?from_date={span[0]}-01&to_date={span[1]}-28", headers=ctx.headers
+            ),
+            200,
+        ),
+        setup=_range_12m,
+    ),
+    Case(
+        "api.search.term",
+        lambda ctx, _: _expect(
+            ctx.client.get("/transactions/search?q=padaria", headers=ctx.headers), 200
+        ),
+    ),
+    Case(
+        "api.search.prefix",
+        lambda ctx, _: _expect(
+            ctx.client.get("/transactions/search?q=s*", headers=ctx.headers), 200
+        ),
+    ),
+    Case(
+        "api.monthly_summary.cold",
+        lambda ctx, _: _expect(
+            ctx.client.get(f"/reports/monthly-summary?month={ctx.month}", headers=ctx.headers), 200
+        ),
+        setup=_clear_reports,
+    ),
+    Case(
+        "api.monthly_summary.cached",
+        lambda ctx, _: _expect(
+            ctx.client.get(f"/reports/monthly-summary?month={ctx.month}", headers=ctx.headers), 200
+        ),
+    ),
+    Case(
+        "api.reports_range.12m",
+        lambda ctx, span: _expect(
+            ctx.client.get(f"/reports/range?from={span[0]}&to={span[1]}", headers=ctx.headers),
+            200,
+        ),
+        setup=_range_12m,
+    ),
+    Case(
+        "api.analytics_totals.all.cold",
+        lambda ctx, span: _expect(
+            ctx.client.get(
+                f"/reports/analytics/totals?from={span[0]}&to={span[1]}", headers=ctx.headers
+            ),
+            200,
+        ),
+        setup=_full_range_cold,
+    ),
+    Case(
+        "api.analytics_totals.all",
+        lambda ctx, span: _expect(
+            ctx.client.get(
+                f"/reports/analytics/totals?from={span[0]}&to={span[1]}", headers=ctx.headers
+            ),
+            200,
+        ),
+        setup=_full_range,
+    ),
+    Case(
+        "api.analytics_percentiles.all",
+        lambda ctx, span: _expect(
+            ctx.client.get(
+                f"/reports/analytics/percentiles?from={span[0]}&to={span[1]}", headers=ctx.headers
+            ),
+            200,
+        ),
+        setup=_full_range,
+    ),
+    Case(
+        "api.create_transfer",
+        lambda ctx, _: _expect(
+            ctx.client.post(
+                "/transactions/transfer",
+                json={
+                    "date": f"{ctx.month}-20",
+                    "description": "bench",
+                    "amount_abs": 10.0,
+                    "from_account_id": ctx.ledger.account_ids[0],
+                    "to_account_id": ctx.ledger.account_ids[1],
+                },
+                headers=ctx.headers,
+            ),
+            201,
+        ),
+    ),
+    Case(
+        "api.upsert_budget",
+        lambda ctx, _: _expect(
+            ctx.client.post(
+                "/budgets",
+                json={
+                    "month": ctx.month,
+                    "category_id": ctx.ledger.expense_category_ids[0],
+                    "amount_planned": 321.0,
+                },
+                headers=ctx.headers,
+            ),
+            201,
+        ),
+    ),
+    Case(
+        "api.transfers.bulk",
+        lambda ctx, _: _expect(
+            ctx.client.post(
+                "/transactions/transfers/bulk",
+                json=[
+                    {
+                        "date": f"{ctx.month}-10",
+                        "description": "bench transfer",
+                        "amount_abs": 1.0 + i % 50,
+                        "from_account_id": ctx.ledger.account_ids[0],
+                        "to_account_id": ctx.ledger.account_ids[1],
+                    }
+                    for i in range(500)
+                ],
+                headers=ctx.headers,
+            ),
+            200,
+        ),
+    ),
+    Case(
+        "api.budgets.bulk",
+        lambda ctx, _: _expect(
+            ctx.client.post(
+                "/budgets/bulk",
+                json=[
+                    {"month": ctx.month, "category_id": category_id, "amount_planned": 321.0}
+                    for category_id in ctx.ledger.expense_category_ids
+                ],
+                headers=ctx.headers,
+            ),
+            200,
+        ),
+    ),
+    Case(
+        "api.delete_transaction",
+        lambda ctx, tx_id: _expect(
+            ctx.client.delete(f"/transactions/{tx_id}", headers=ctx.headers), 204
+        ),
+        setup=_new_expense,
+    ),
+    Case(
+        "service.list_transactions",
+        lambda ctx, _: list_transaction_rows(
+            ctx.db, RowFilter(account_id=ctx.ledger.account_ids[0]), 100
+        ),
+    ),
+    Case("service.monthly_summary", lambda ctx, _: monthly_summary(ctx.db, ctx.month)),
+    Case(
+        "service.range_summary.12m",
+        lambda ctx, span: range_summary(ctx.db, *span),
+        setup=_range_12m,
+    ),
+    Case(
+        "service.create_transfer",
+        lambda ctx, _: create_transfer(
+            ctx.db,
+            date=dt.date.fromisoformat(f"{ctx.month}-21"),
+            description="bench",
+            amount_abs_cents=1000,
+            from_account_id=ctx.ledger.account_ids[1],
+            to_account_id=ctx.ledger.account_ids[0],
+        ),
+    ),
+    Case("service.delete_transaction", _delete_service, setup=_new_expense),
+    Case(
+        "service.bulk_insert_1k",
+        lambda ctx, payloads: bulk_create_transactions(ctx.db, iter(payloads), chunk_size=1000),
+        setup=_bulk_payloads,
+    ),
+]
+
+
+def _reset_process_state() -> None:
+    get_engine().dispose()
+    get_engine.cache_clear()
+    version_tracker.invalidate()
+    reference_cache.invalidate()
+    report_cache.clear()
+    analytics_cache.clear()
+    rule_cache.invalidate()
+
+
+@contextmanager
+def bench_database(path: Path) -> Iterator[None]:
+    """Point the app (engine and in-process caches) at a benchmark database.
+
+    Args:
+        path: SQLite file to use; the previous database URL is restored on exit
+    """
+    original = settings.database_url
+    _reset_process_state()
+    settings.database_url = f"sqlite:///{path}"
+    try:
+        yield
+    finally:
+        _reset_process_state()
+        settings.database_url = original
+
+
+def _remove_database(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+
+def time_case(case: Case, ctx: BenchContext, repeat: int) -> dict:
+    """Run a case once to warm up, then ``repeat`` timed runs.
+
+    Args:
+        case: Case to run
+        ctx: Benchmark context
+        repeat: Number of timed runs
+
+    Returns:
+        Dict with runs, min_ms, median_ms and p95_ms
+    """
+    samples = []
+    for i in range(repeat + 1):
+        state = case.setup(ctx) if case.setup is not None else None
+        started = time.perf_counter()
+        case.run(ctx, state)
+        elapsed = (time.perf_counter() - started) * 1000
+        if i:
+            samples.append(elapsed)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+
+def run_size(
+    size: int, workdir: Path, *, repeat: int, cases: list[Case] | None = None, seed: int = 42
+) -> dict:
+    """Generate a ledger of ``size`` rows and time every case against it.
+
+    Args:
+        size: Number of transactions to generate
+        workdir: Directory for the benchmark database
+        repeat: Timed runs per case
+        cases: Cases to run (defaults to CASES)
+        seed: Generator seed
+
+    Returns:
+        Dict with generation time and per-case timings
+    """
+    from app.main import create_app
+
+    path = workdir / f"bench_{size}.db"
+    _remove_database(path)
+    try:
+        with bench_database(path):
+            Base.metadata.create_all(get_engine())
+            started = time.perf_counter()
+            with get_session() as db:
+                ledger = generate_ledger(db, size, seed=seed)
+            generate_s = time.perf_counter() - started
+
+            headers = {"X-API-Key": settings.api_key}
+            with TestClient(create_app()) as client, get_session() as db:
+                ctx = BenchContext(client=client, headers=headers, db=db, ledger=ledger)
+                timings = {case.name: time_case(case, ctx, repeat) for case in cases or CASES}
+    finally:
+        _remove_database(path)
+
+    return {"generate_s": round(generate_s, 2), "cases": timings}
+
+
+def run_benchmarks(
+    sizes: list[int], workdir: Path, *, repeat: int, cases: list[Case] | None = None
+) -> dict:
+    """Run the suite at several ledger sizes.
+
+    Args:
+        sizes: Ledger sizes
+        workdir: Directory for the benchmark databases
+        repeat: Timed runs per case
+        cases: Cases to run (defaults to CASES)
+
+    Returns:
+        Results document (meta plus results keyed by size), ready for JSON
+    """
+    results = {str(size): run_size(size, workdir, repeat=repeat, cases=cases) for size in sizes}
+    return {
+        "meta": {
+            "created": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = MIN_DELTA_MS,
+) -> list[dict]:
+    """Compare median timings of two result documents.
+
+    Only (size, case) pairs present in both documents are compared.
+
+    Args:
+        baseline: Stored results document
+        current: New results document
+        threshold: Relative slowdown that counts as a regression (0.2 = 20%)
+        min_delta_ms: Absolute slowdown below which differences are ignored
+
+    Returns:
+        One row per compared pair with baseline/current medians, ratio and a
+        ``regression`` flag
+    """
+    rows = []
+    for size, entry in current["results"].items():
+        base_entry = baseline["results"].get(size)
+        if base_entry is None:
+            continue
+        for name, timing in entry["cases"].items():
+            base = base_entry["cases"].get(name)
+            if base is None:
+                continue
+            before, after = base["median_ms"], timing["median_ms"]
+            ratio = after / before if before else float("inf")
+            rows.append(
+                {
+                    "size": int(size),
+                    "case": name,
+                    "baseline_ms": before,
+                    "current_ms": after,
+                    "ratio": round(ratio, 3),
+                    "regression": ratio > 1 + threshold and after - before > min_delta_ms,
+                }
+            )
+    return rows
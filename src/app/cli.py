@@ -0,0 +1,219 @@
+"""Command-line maintenance tasks.
+
+Usage:
+    python -m app.cli rollups rebuild
+    python -m app.cli rollups check
+    python -m app.cli balances reconcile [--fix]
+    python -m app.cli months close YYYY-MM
+    python -m app.cli months reopen YYYY-MM
+    python -m app.cli months list
+    python -m app.cli months detach YYYY
+    python -m app.cli months attach YYYY
+    python -m app.cli search rebuild
+    python -m app.cli recurring materialize [--until YYYY-MM-DD]
+"""
+
+import argparse
+import datetime as dt
+import json
+import sys
+from collections.abc import Callable
+
+from sqlalchemy import select
+
+from app.db.models import ClosedMonth
+from app.db.session import get_session
+from app.services.archive import ArchiveError, ClosedMonthError
+from app.services.balances import reconcile_balances
+from app.services.closing import attach_year, close_month, detach_year, reopen_month
+from app.services.recurring import materialize
+from app.services.rollups import check_rollups, rebuild_rollups
+from app.services.search import rebuild_search_index
+
+
+def _rollups_rebuild(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        written = rebuild_rollups(db)
+    print(f"monthly_rollups reconstruída: {written} linhas")
+    return 0
+
+
+def _rollups_check(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        drift = check_rollups(db)
+    for item in drift:
+        print(json.dumps(item, default=str, ensure_ascii=False))
+    if drift:
+        print(f"{len(drift)} divergência(s) em monthly_rollups", file=sys.stderr)
+        return 1
+    print("monthly_rollups consistente com transactions")
+    return 0
+
+
+def _balances_reconcile(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        drift = reconcile_balances(db, fix=args.fix)
+    for item in drift:
+        print(json.dumps(item, default=str, ensure_ascii=False))
+    if not drift:
+        print("Saldos consistentes com transactions")
+        return 0
+    if args.fix:
+        print(f"{len(drift)} saldo(s) corrigido(s)", file=sys.stderr)
+        return 0
+    print(f"{len(drift)} saldo(s) divergente(s)", file=sys.stderr)
+    return 1
+
+
+def _months_close(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        try:
+            closed = close_month(db, args.month)
+        except (ValueError, ClosedMonthError) as e:
+            print(e, file=sys.stderr)
+            return 1
+    print(f"{closed.month} fechado: {closed.row_count} transações em {closed.file_name}")
+    return 0
+
+
+def _months_reopen(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        try:
+            restored = reopen_month(db, args.month)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+    print(f"{args.month} reaberto: {restored} transações restauradas")
+    return 0
+
+
+def _months_list(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        for closed in db.scalars(select(ClosedMonth).order_by(ClosedMonth.month)):
+            storage = "frio" if closed.detached else ""
+            print(
+                f"{closed.month}  {closed.row_count:>8}  {closed.closed_at:%Y-%m-%d %H:%M}"
+                f"  {storage}".rstrip()
+            )
+    return 0
+
+
+def _months_detach(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        try:
+            months = detach_year(db, args.year)
+        except (ValueError, ArchiveError) as e:
+            print(e, file=sys.stderr)
+            return 1
+    print(f"{args.year} desanexado: {len(months)} mês(es) movido(s) para o armazenamento frio")
+    return 0
+
+
+def _months_attach(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        try:
+            months = attach_year(db, args.year)
+        except ArchiveError as e:
+            print(e, file=sys.stderr)
+            return 1
+    print(f"{args.year} reanexado: {len(months)} mês(es) de volta ao arquivo")
+    return 0
+
+
+def _search_rebuild(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        indexed = rebuild_search_index(db)
+    print(f"Índice de busca reconstruído: {indexed} transações")
+    return 0
+
+
+def _recurring_materialize(args: argparse.Namespace) -> int:
+    with get_session() as db:
+        try:
+            result = materialize(db, args.until)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+    print(
+        f"{result['generated']} transações recorrentes geradas até {args.until}"
+        f" ({result['skipped']} em meses fechados ignoradas)"
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with all maintenance commands.
+
+    Returns:
+        Configured ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    groups = parser.add_subparsers(dest="group", required=True)
+
+    rollups = groups.add_parser("rollups", help="Tabela de agregados mensais")
+    actions = rollups.add_subparsers(dest="action", required=True)
+    actions.add_parser("rebuild", help="Recalcula tudo a partir de transactions").set_defaults(
+        func=_rollups_rebuild
+    )
+    actions.add_parser("check", help="Compara com transactions (exit 1 se divergir)").set_defaults(
+        func=_rollups_check
+    )
+
+    balances = groups.add_parser("balances", help="Saldos das contas")
+    actions = balances.add_subparsers(dest="action", required=True)
+    reconcile = actions.add_parser("reconcile", help="Recalcula a partir de transactions")
+    reconcile.add_argument("--fix", action="store_true", help="Corrige os saldos divergentes")
+    reconcile.set_defaults(func=_balances_reconcile)
+
+    months = groups.add_parser("months", help="Fechamento de meses")
+    actions = months.add_subparsers(dest="action", required=True)
+    close = actions.add_parser("close", help="Arquiva as transações de um mês passado")
+    close.add_argument("month", help="Mês no formato YYYY-MM")
+    close.set_defaults(func=_months_close)
+    reopen = actions.add_parser("reopen", help="Devolve um mês fechado a transactions")
+    reopen.add_argument("month", help="Mês no formato YYYY-MM")
+    reopen.set_defaults(func=_months_reopen)
+    actions.add_parser("list", help="Lista os meses fechados").set_defaults(func=_months_list)
+    detach = actions.add_parser("detach", help="Move um ano fechado para ARCHIVE_COLD_DIR")
+    detach.add_argument("year", help="Ano no formato YYYY")
+    detach.set_defaults(func=_months_detach)
+    attach = actions.add_parser("attach", help="Traz um ano desanexado de volta")
+    attach.add_argument("year", help="Ano no formato YYYY")
+    attach.set_defaults(func=_months_attach)
+
+    search = groups.add_parser("search", help="Índice de busca textual")
+    actions = search.add_subparsers(dest="action", required=True)
+    actions.add_parser("rebuild", help="Reindexa transactions e os meses fechados").set_defaults(
+        func=_search_rebuild
+    )
+
+    recurring = groups.add_parser("recurring", help="Transações recorrentes")
+    actions = recurring.add_subparsers(dest="action", required=True)
+    run = actions.add_parser("materialize", help="Gera as ocorrências vencidas")
+    run.add_argument(
+        "--until",
+        type=dt.date.fromisoformat,
+        default=dt.date.today(),
+        help="Última data gerada, YYYY-MM-DD (padrão: hoje)",
+    )
+    run.set_defaults(func=_recurring_materialize)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a maintenance command.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    func: Callable[[argparse.Namespace], int] = args.func
+    return func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
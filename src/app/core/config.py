@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,5 +11,52 @@ class Settings(BaseSettings):
     api_key: str = "CHANGE_ME_LOCAL"
     log_level: str = "INFO"
 
+    # SQLite connection profile, applied by PRAGMA on every new connection
+    sqlite_journal_mode: str = "WAL"  # readers no longer block behind the writer
+    sqlite_synchronous: str = "NORMAL"  # with WAL: fsync at checkpoints, not every commit
+    sqlite_cache_size: int = -64000  # negative = KiB (64 MB of page cache)
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_temp_store: str = "MEMORY"
+    sqlite_busy_timeout: int = 5000  # ms to wait on a locked database before failing
+    sqlite_foreign_keys: bool = True
+
+    # Connection pool (ignored for in-memory SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 3600  # seconds; -1 disables
+
+    # Statements slower than this are logged by app.slow_query (0 disables)
+    slow_query_ms: float = 200.0
+    # Attach EXPLAIN QUERY PLAN to slow SELECTs (SQLite only; costs one extra query)
+    slow_query_explain: bool = False
+    # Minimum seconds between two log entries for the same statement fingerprint
+    slow_query_log_interval: float = 60.0
+    # "async" serves every endpoint through AsyncSession (needs the [async] extra):
+    # the list, export and report reads natively, the rest via run_sync
+    db_mode: Literal["sync", "async"] = "sync"
+
+    # Rows fetched per round trip when streaming exports
+    export_chunk_size: int = 1000
+    # Rows per executemany batch on bulk inserts
+    bulk_insert_chunk_size: int = 5000
+    # Seconds between re-reads of a shared data version (0 = every request)
+    version_check_interval: float = 1.0
+    # Monthly summaries kept in the in-process report cache (LRU)
+    report_cache_size: int = 256
+    # Periods whose column arrays are kept by the analytics service (LRU)
+    analytics_cache_size: int = 8
+    # Search ranks only the N most recently recorded matches by bm25 (0 = rank every match)
+    search_rank_window: int = 0
+    # Directory of the columnar files of closed months (see services/archive.py)
+    archive_dir: str = "./archive"
+    # Where detached years are moved to (slower/cheaper storage; see services/closing.py)
+    archive_cold_dir: str = "./archive_cold"
+    # Seconds between in-process runs of the recurring materializer (0 = only on demand)
+    recurring_interval_seconds: float = 0.0
+    # Scheduled runs generate occurrences up to today plus this many days
+    recurring_horizon_days: int = 0
+    # Furthest a run may generate, in days past today (bounds the dates computed per run)
+    recurring_max_horizon_days: int = 1830
+
 
 settings = Settings()
@@ -0,0 +1,29 @@
+"""JSON encoding for hot response paths.
+
+Uses orjson when it is installed (``pip install -e ".[fast]"``) and falls back
+to the standard library otherwise. Both produce compact UTF-8 bytes; callers pass
+only JSON-native values (dates already rendered as ISO strings), so the output is
+the same either way.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a value to compact JSON bytes.
+
+    Args:
+        value: JSON-native value (dict, list, str, int, float, bool, None)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
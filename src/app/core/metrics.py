@@ -0,0 +1,308 @@
+"""Prometheus metrics - request latency, SQL counters and pool usage.
+
+A small in-process registry rendered in the Prometheus text format, so the app
+needs no client library. Each sample is a float in a dict keyed by its label
+values; recording a request only increments existing entries.
+
+SQL statements are attributed to the route that ran them through a context
+variable set by MetricsMiddleware. Sync endpoints and streaming bodies run in
+the threadpool with a copy of that context, so their queries are counted too.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+Labels = tuple[str, ...]
+M = TypeVar("M", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """Add to the counter for one label combination."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        """Return the current value for one label combination."""
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_label_text(self.labelnames, labels)} {_number(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        """Subtract from the gauge for one label combination."""
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Labels = (), buckets: Iterable = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: [count per bucket..., +Inf count, sum]
+        self._values: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record one observation."""
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 2)
+            row[slot] += 1
+            row[-1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        """Return the number of observations for one label combination."""
+        row = self._values.get(labels)
+        return int(sum(row[:-1])) if row else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((labels, list(row)) for labels, row in self._values.items())
+        lines = []
+        for labels, row in items:
+            cumulative = 0
+            bounds = [*(_number(b) for b in self.buckets), "+Inf"]
+            for bound, hits in zip(bounds, row[:-1], strict=True):
+                cumulative += hits
+                le = _label_text(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {_number(cumulative)}")
+            text = _label_text(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{text} {_number(row[-1])}")
+            lines.append(f"{self.name}_count{text} {_number(cumulative)}")
+        return lines
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: M) -> M:
+        """Add a metric and return it."""
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter(
+        "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+    )
+)
+HTTP_LATENCY = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency",
+        ("method", "route"),
+        LATENCY_BUCKETS,
+    )
+)
+HTTP_IN_PROGRESS = REGISTRY.register(
+    Gauge("http_requests_in_progress", "HTTP requests being served")
+)
+DB_QUERIES = REGISTRY.register(
+    Counter("db_queries_total", "SQL statements executed, by route", ("route",))
+)
+DB_TIME = REGISTRY.register(
+    Counter("db_query_duration_seconds_total", "Time spent in SQL statements, by route", ("route",))
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.register(
+    Histogram(
+        "db_queries_per_request",
+        "SQL statements per HTTP request (high counts point at N+1 patterns)",
+        ("route",),
+        QUERY_COUNT_BUCKETS,
+    )
+)
+DB_POOL_CHECKOUTS = REGISTRY.register(
+    Counter("db_pool_checkouts_total", "Connections checked out of the engine pool")
+)
+DB_POOL_IN_USE = REGISTRY.register(
+    Gauge("db_pool_connections_in_use", "Connections currently checked out of the engine pool")
+)
+
+NO_ROUTE = "<none>"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """SQL counters of the request being served."""
+
+    __slots__ = ("queries", "db_time", "scope")
+
+    def __init__(self, scope: dict) -> None:
+        self.queries = 0
+        self.db_time = 0.0
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        """Path template of the matched route (set once routing has run)."""
+        return _route_template(self.scope)
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: Any, *args: Any) -> None:
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: Any, *args: Any) -> None:
+    elapsed = time.perf_counter() - conn.info.pop("query_started", time.perf_counter())
+    stats = current_request.get()
+    if stats is None:
+        # Outside a request (CLI, startup); counted under a fixed label
+        DB_QUERIES.inc((NO_ROUTE,))
+        DB_TIME.inc((NO_ROUTE,), elapsed)
+        return
+    stats.queries += 1
+    stats.db_time += elapsed
+
+
+def _on_checkout(*_args: Any) -> None:
+    DB_POOL_CHECKOUTS.inc()
+    DB_POOL_IN_USE.inc()
+
+
+def _on_checkin(*_args: Any) -> None:
+    DB_POOL_IN_USE.dec()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Hook SQL timing and pool checkout events of an engine into the registry.
+
+    Args:
+        engine: Sync engine (for an AsyncEngine pass ``engine.sync_engine``)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
+
+
+def _route_template(scope: dict) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and SQL counters per route.
+
+    Routes are labeled by their path template (``/transactions/{transaction_id}``),
+    never by the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status = "500"
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_PROGRESS.dec()
+            current_request.reset(token)
+
+            route = stats.route
+            method = scope["method"]
+            HTTP_REQUESTS.inc((method, route, status))
+            HTTP_LATENCY.observe(elapsed, (method, route))
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, (route,))
+            if stats.queries:
+                DB_QUERIES.inc((route,), stats.queries)
+                DB_TIME.inc((route,), stats.db_time)
@@ -0,0 +1,118 @@
+"""Money as integer cents.
+
+Amounts are stored in BIGINT ``*_cents`` columns and handled as ``int`` cents by
+every service, so sums and deltas are exact integer arithmetic in SQL and in
+Python. Conversion happens only at the edges:
+
+- Input: ``Money`` fields accept JSON numbers or decimal strings ("12.34") and
+  validate them into cents without going through binary floating point; values
+  with more than two decimal places are rejected.
+- Output: ``Money``/``Cents`` fields, reports and exports render cents as an
+  exact two-decimal string such as ``"-12.34"`` (see to_wire); no amount ever
+  goes through a binary float on the way out.
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator, PlainSerializer, WithJsonSchema
+
+CENT = Decimal("0.01")
+# Same range as the former Numeric(12, 2) columns: |amount| < 10^10 units
+MAX_CENTS = 10**12
+
+
+def to_cents(value: Any) -> int:
+    """Convert an amount in currency units to integer cents, exactly.
+
+    Args:
+        value: Amount as Decimal, int, decimal string or float (floats are read
+            through their shortest repr, so 0.1 means 10 cents)
+
+    Returns:
+        Amount in cents
+
+    Raises:
+        ValueError: If the value is not a finite number with at most 2 decimal places,
+            or is beyond MAX_CENTS
+    """
+    if isinstance(value, bool):
+        raise ValueError("Valor monetário inválido")
+    if isinstance(value, int):
+        return _check_range(value * 100)
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except InvalidOperation as e:
+        raise ValueError(f"Valor monetário inválido: {value!r}") from e
+    if not amount.is_finite():
+        raise ValueError(f"Valor monetário inválido: {value!r}")
+    cents = amount.scaleb(2)
+    if cents != cents.to_integral_value():
+        raise ValueError("Valor monetário deve ter no máximo 2 casas decimais")
+    return _check_range(int(cents))
+
+
+def _check_range(cents: int) -> int:
+    if abs(cents) >= MAX_CENTS:
+        raise ValueError("Valor monetário fora do intervalo permitido")
+    return cents
+
+
+def to_decimal(cents: int) -> Decimal:
+    """Convert cents to a Decimal amount with two decimal places.
+
+    Args:
+        cents: Amount in cents
+
+    Returns:
+        Decimal amount (e.g. Decimal("-12.34"))
+    """
+    return Decimal(cents).scaleb(-2).quantize(CENT)
+
+
+def format_cents(cents: int) -> str:
+    """Render cents as an exact decimal string.
+
+    Args:
+        cents: Amount in cents
+
+    Returns:
+        Amount text such as "-12.34"
+    """
+    return str(to_decimal(cents))
+
+
+def to_wire(cents: int) -> str:
+    """Render cents as the wire amount: an exact two-decimal string.
+
+    Args:
+        cents: Amount in cents
+
+    Returns:
+        Amount in currency units, e.g. "-12.34"
+    """
+    return format_cents(cents)
+
+
+def _validate_money(value: Any) -> int:
+    if isinstance(value, (int, float, str, Decimal)):
+        return to_cents(value)
+    raise ValueError("Valor monetário inválido")
+
+
+_WIRE_SCHEMA = {"type": "string", "pattern": r"^-?\d+\.\d{2}$", "examples": ["-12.34"]}
+
+# Amount received in currency units, held as integer cents
+Money = Annotated[
+    int,
+    BeforeValidator(_validate_money),
+    PlainSerializer(to_wire, return_type=str, when_used="json"),
+    WithJsonSchema({"anyOf": [{"type": "number"}, {"type": "string"}]}, mode="validation"),
+    WithJsonSchema(_WIRE_SCHEMA, mode="serialization"),
+]
+# Amount already in integer cents (read from the database), sent in currency units
+Cents = Annotated[
+    int,
+    PlainSerializer(to_wire, return_type=str, when_used="json"),
+    WithJsonSchema(_WIRE_SCHEMA, mode="serialization"),
+]
@@ -0,0 +1,154 @@
+"""Slow-query log - SQL statements over a threshold, with route and query plan.
+
+Entries go to the ``app.slow_query`` logger as structured JSON fields: the
+statement, the shape (types, not values) of its parameters, the duration, the
+route being served and, optionally, the ``EXPLAIN QUERY PLAN`` of the statement.
+Statements are grouped by a fingerprint (literals and IN lists folded) and each
+fingerprint is logged at most once per ``SLOW_QUERY_LOG_INTERVAL``; the number
+of suppressed occurrences is reported with the next entry.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import NO_ROUTE, current_request
+
+logger = logging.getLogger("app.slow_query")
+
+MAX_TRACKED_FINGERPRINTS = 1000
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so executions differing only in literals group together.
+
+    Args:
+        statement: SQL text
+
+    Returns:
+        Statement with whitespace collapsed, literals as ``?`` and IN lists as ``(?+)``
+    """
+    text = _LITERAL.sub("?", _SPACES.sub(" ", statement).strip())
+    return _IN_LIST.sub("(?+)", text)
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> Any:
+    """Describe bound parameters by type only, so no values reach the logs.
+
+    Args:
+        parameters: DBAPI parameters (sequence or mapping, or a list of them)
+        executemany: Whether parameters holds one entry per row
+
+    Returns:
+        Type names in the same layout, with the row count for executemany
+    """
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "row": parameter_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, list | tuple):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class _RateLimiter:
+    """Per-fingerprint log throttle with a bounded number of tracked fingerprints."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # fingerprint -> [last logged at, suppressed since]
+        self._seen: OrderedDict[str, list] = OrderedDict()
+
+    def admit(self, key: str, now: float) -> int | None:
+        """Return the suppressed count if this occurrence may be logged, else None."""
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < settings.slow_query_log_interval:
+                entry[1] += 1
+                return None
+            suppressed = entry[1] if entry is not None else 0
+            self._seen[key] = [now, 0]
+            self._seen.move_to_end(key)
+            while len(self._seen) > MAX_TRACKED_FINGERPRINTS:
+                self._seen.popitem(last=False)
+            return suppressed
+
+    def reset(self) -> None:
+        """Forget every fingerprint."""
+        with self._lock:
+            self._seen.clear()
+
+
+rate_limiter = _RateLimiter()
+
+
+def _explain(conn: Any, statement: str, parameters: Any) -> list[str] | None:
+    verb = statement.split(None, 1)[0].upper() if statement.strip() else ""
+    if conn.dialect.name != "sqlite" or verb not in ("SELECT", "WITH"):
+        return None
+    try:
+        # Raw DBAPI cursor on the same connection: sees the same transaction and
+        # fires no engine events (so the plan query is never logged itself)
+        plan_cursor = conn.connection.cursor()
+        try:
+            plan_cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            return [row[3] for row in plan_cursor.fetchall()]
+        finally:
+            plan_cursor.close()
+    except Exception as e:  # the plan is best effort, never fail the query
+        return [f"<explain failed: {e}>"]
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: Any, *args: Any) -> None:
+    conn.info["slow_query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    now = time.perf_counter()
+    elapsed_ms = (now - conn.info.pop("slow_query_started", now)) * 1000
+    if settings.slow_query_ms <= 0 or elapsed_ms < settings.slow_query_ms:
+        return
+
+    key = fingerprint(statement)
+    suppressed = rate_limiter.admit(key, now)
+    if suppressed is None:
+        return
+
+    stats = current_request.get()
+    fields = {
+        "sql": statement,
+        "fingerprint": key,
+        "params": parameter_shape(parameters, executemany),
+        "duration_ms": round(elapsed_ms, 2),
+        "route": stats.route if stats is not None else NO_ROUTE,
+        "suppressed": suppressed,
+    }
+    if settings.slow_query_explain and not executemany:
+        plan = _explain(conn, statement, parameters)
+        if plan is not None:
+            fields["plan"] = plan
+    logger.warning("slow query", extra={"fields": fields})
+
+
+def log_slow_queries(engine: Engine) -> None:
+    """Log slow statements executed through an engine.
+
+    Args:
+        engine: Sync engine (for an AsyncEngine pass ``engine.sync_engine``)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,20 @@
+"""Text normalization shared by statement imports and category rules."""
+
+import re
+import unicodedata
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_description(text: str) -> str:
+    """Normalize a description for matching (accents, case and spacing).
+
+    Args:
+        text: Raw description
+
+    Returns:
+        Normalized description
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", stripped).strip().casefold()
@@ -0,0 +1,94 @@
+"""Full-text index over transaction descriptions (SQLite FTS5).
+
+``transactions_fts`` holds the description of every transaction plus the listing
+columns (UNINDEXED: stored, filterable, not tokenized), so a search is answered
+from the index alone. SQLite triggers on every year partition of the ledger
+(see db/partitions.py) keep it in sync, whatever the write path.
+
+Rows of closed months are left in the index: the triggers skip rows whose month
+is in ``closed_months``, so closing a month (insert into closed_months, then
+delete the rows) and reopening it (insert the rows, then delete from
+closed_months) do not touch it, and archived transactions stay searchable.
+
+A migration that rebuilds a partition (batch_alter_table recreate) drops the
+triggers with the old table and has to create them again.
+"""
+
+from sqlalchemy import DDL, MetaData, event
+
+FTS_TABLE = "transactions_fts"
+
+# Same order as exports.EXPORT_FIELDS, the rowid standing for id
+FTS_COLUMNS = (
+    "date",
+    "description",
+    "amount_cents",
+    "kind",
+    "account_id",
+    "category_id",
+    "transfer_pair_id",
+)
+
+_VALUES = ", ".join(FTS_COLUMNS)
+_NEW = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+_OLD = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+
+def _open_month(row: str) -> str:
+    return f"NOT EXISTS (SELECT 1 FROM closed_months WHERE month = substr({row}.date, 1, 7))"
+
+
+# unicode61 with diacritics removed: "cafe" finds "Café"; prefix indexes make
+# 2- and 3-character prefix queries ("if*") index lookups
+CREATE_INDEX = f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+    description,
+    date UNINDEXED,
+    amount_cents UNINDEXED,
+    kind UNINDEXED,
+    account_id UNINDEXED,
+    category_id UNINDEXED,
+    transfer_pair_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)"""
+
+
+def trigger_statements(table: str) -> tuple[str, ...]:
+    """Return the CREATE TRIGGER statements that feed the index from a ledger table.
+
+    Args:
+        table: Name of a year partition (``transactions_<YYYY>``)
+
+    Returns:
+        Insert, delete and update triggers, named after the table
+    """
+    return (
+        f"""CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table}
+        WHEN {_open_month("new")}
+        BEGIN
+            INSERT INTO {FTS_TABLE} (rowid, {_VALUES}) VALUES (new.id, {_NEW});
+        END""",
+        f"""CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table}
+        WHEN {_open_month("old")}
+        BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        END""",
+        f"""CREATE TRIGGER {table}_fts_update AFTER UPDATE ON {table}
+        BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+            INSERT INTO {FTS_TABLE} (rowid, {_VALUES}) VALUES (new.id, {_NEW});
+        END""",
+    )
+
+
+def register(metadata: MetaData) -> None:
+    """Create and drop the index together with the schema (SQLite only).
+
+    The triggers come with each partition (see db/partitions.py).
+
+    Args:
+        metadata: Metadata of the models
+    """
+    drop_index = DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    event.listen(metadata, "after_create", DDL(CREATE_INDEX).execute_if(dialect="sqlite"))
+    event.listen(metadata, "before_drop", drop_index.execute_if(dialect="sqlite"))
@@ -2,20 +2,22 @@
 
 import datetime as dt
 import uuid
-from decimal import Decimal
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
-    Numeric,
+    PrimaryKeyConstraint,
     String,
     UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db import fts, partitions
 from app.db.base import Base
 
 
@@ -28,6 +30,8 @@ class Account(Base):
     name: Mapped[str] = mapped_column(String(120), nullable=False)
     type: Mapped[str] = mapped_column(String(40), default="BANK", nullable=False)
     active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Current balance in cents, adjusted by every ledger insert/delete (see services/ledger.py)
+    balance_cents: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime, default=dt.datetime.utcnow, nullable=False
     )
@@ -49,22 +53,37 @@ class Category(Base):
 
 
 class Transaction(Base):
-    """Financial transaction (income, expense, or transfer)."""
+    """Financial transaction (income, expense, or transfer).
+
+    Mapped to the ``transactions`` view over one table per year: read through
+    the model, written through services/ledger.py (see db/partitions.py).
+    """
 
     __tablename__ = "transactions"
+    # Composite indexes match the list filters: equality on the filter column, then
+    # date. The implicit rowid suffix satisfies ORDER BY (date, id) without a sort.
+    __table_args__ = (
+        Index("ix_transactions_account_date", "account_id", "date"),
+        Index("ix_transactions_category_date", "category_id", "date"),
+        Index("ix_transactions_kind_date", "kind", "date"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Handed out by ledger_sequence, unique across the year partitions
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
     date: Mapped[dt.date] = mapped_column(Date, index=True, nullable=False)
     description: Mapped[str] = mapped_column(String(255), default="", nullable=False)
-    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    # Money is stored as integer cents everywhere (see core/money.py)
+    amount_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     kind: Mapped[str] = mapped_column(String(20), nullable=False)  # INCOME | EXPENSE | TRANSFER
-    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), index=True, nullable=False)
-    category_id: Mapped[int | None] = mapped_column(
-        ForeignKey("categories.id"), index=True, nullable=True
-    )
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
+    category_id: Mapped[int | None] = mapped_column(ForeignKey("categories.id"), nullable=True)
 
     transfer_pair_id: Mapped[str | None] = mapped_column(String(36), index=True, nullable=True)
+    # Hash of (account, date, amount, normalized description) for statement imports
+    fingerprint: Mapped[str | None] = mapped_column(
+        String(64), index=True, unique=True, nullable=True
+    )
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime, default=dt.datetime.utcnow, nullable=False
     )
@@ -73,6 +92,36 @@ class Transaction(Base):
     category = relationship("Category")
 
 
+# The model's table is the template of the year partitions (see db/partitions.py),
+# each of which feeds the full-text index through triggers (see db/fts.py)
+partitions.register(Transaction.__table__)
+fts.register(Base.metadata)
+
+
+class LedgerPartition(Base):
+    """Year of the ledger stored in its own ``transactions_<YYYY>`` table."""
+
+    __tablename__ = "ledger_partitions"
+
+    year: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    # ID range of the rows ever written to the year, so lookups by ID skip the others
+    min_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class LedgerSequence(Base):
+    """Last transaction ID handed out (a single row).
+
+    IDs stay unique across the year partitions and are never reused, not even
+    those of rows deleted or moved to a month archive.
+    """
+
+    __tablename__ = "ledger_sequence"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    last_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class Budget(Base):
     """Monthly budget for a category."""
 
@@ -84,11 +133,143 @@ class Budget(Base):
     category_id: Mapped[int] = mapped_column(
         ForeignKey("categories.id"), index=True, nullable=False
     )
-    amount_planned: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    amount_planned_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     category = relationship("Category")
 
 
+class MonthlyRollup(Base):
+    """Per-month totals of transactions, maintained on every ledger write."""
+
+    __tablename__ = "monthly_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "month", "account_id", "category_id", "kind", name="pk_monthly_rollups"
+        ),
+        # Clustered on the key, so month-range reads never visit a separate table b-tree
+        {"sqlite_with_rowid": False},
+    )
+
+    month: Mapped[str] = mapped_column(String(7), nullable=False)  # YYYY-MM
+    account_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # 0 stands for "no category" (transfers) so the key stays NOT NULL and upsertable
+    category_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    amount_sum_cents: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    tx_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
 def new_pair_id() -> str:
     """Generate a new UUID for transfer pair tracking."""
     return str(uuid.uuid4())
+
+
+class DataVersion(Base):
+    """Change counter per cached data set, bumped in the same transaction as the change.
+
+    Lets every worker process notice that its in-memory copy is stale with a
+    single primary-key read.
+    """
+
+    __tablename__ = "data_versions"
+
+    key: Mapped[str] = mapped_column(String(40), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class ClosedMonth(Base):
+    """Month whose transactions were moved out of ``transactions`` into an archive file.
+
+    See services/archive.py for the file format.
+    """
+
+    __tablename__ = "closed_months"
+
+    month: Mapped[str] = mapped_column(String(7), primary_key=True)  # YYYY-MM
+    file_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # ID range of the archived rows, so lookups by ID only open the months that can match
+    min_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    max_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # File moved to ARCHIVE_COLD_DIR together with the rest of its year
+    detached: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    closed_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, default=dt.datetime.utcnow, nullable=False
+    )
+
+
+class CategoryRule(Base):
+    """Auto-categorization rule for imported and recategorized transactions.
+
+    Every condition that is set must hold. See services/rules.py for how the
+    rules are compiled and matched.
+    """
+
+    __tablename__ = "category_rules"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("categories.id"), index=True, nullable=False
+    )
+    match: Mapped[str | None] = mapped_column(
+        String(20), nullable=True
+    )  # CONTAINS | PREFIX | REGEX
+    pattern: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # REGEX only: text the description must also contain (indexed by the matcher)
+    keyword: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    account_id: Mapped[int | None] = mapped_column(ForeignKey("accounts.id"), nullable=True)
+    # Compared with the absolute amount, so the same range fits credits and debits
+    min_amount_cents: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    max_amount_cents: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Lower values win when several rules match
+    priority: Mapped[int] = mapped_column(Integer, default=100, nullable=False)
+    active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, default=dt.datetime.utcnow, nullable=False
+    )
+
+
+class RecurringTemplate(Base):
+    """Transaction repeated on a schedule (rent, salary, subscriptions).
+
+    Occurrences are generated by services/recurring.py.
+    """
+
+    __tablename__ = "recurring_templates"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    description: Mapped[str] = mapped_column(String(255), default="", nullable=False)
+    # Signed, as in transactions
+    amount_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)  # INCOME | EXPENSE
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
+    unit: Mapped[str] = mapped_column(String(10), nullable=False)  # DAY | WEEK | MONTH
+    # Units between occurrences ("every 2 WEEK")
+    interval: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    start_date: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[dt.date | None] = mapped_column(Date, nullable=True)
+    active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, default=dt.datetime.utcnow, nullable=False
+    )
+
+
+class RecurringOccurrence(Base):
+    """Occurrence of a recurring template already turned into a transaction.
+
+    The key makes generation idempotent: a date is materialized at most once per
+    template, even if its transaction is later deleted. Occurrences due in a
+    closed month are kept ``pending`` until the month is reopened.
+    """
+
+    __tablename__ = "recurring_occurrences"
+    __table_args__ = (
+        PrimaryKeyConstraint("template_id", "occurrence_date", name="pk_recurring_occurrences"),
+        Index("ix_recurring_occurrences_pending", "pending", "occurrence_date"),
+        {"sqlite_with_rowid": False},
+    )
+
+    template_id: Mapped[int] = mapped_column(ForeignKey("recurring_templates.id"), nullable=False)
+    occurrence_date: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    pending: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
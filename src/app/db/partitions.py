@@ -0,0 +1,183 @@
+"""Year partitions of the ledger.
+
+Every year of transactions lives in its own table, ``transactions_<YYYY>``,
+built from the ``Transaction`` model: same columns, the model's indexes renamed
+after the table, a CHECK that keeps each row inside its year and the search
+index triggers (see db/fts.py). ``transactions`` itself is a view, the UNION ALL
+of the partitions, so reads over the whole ledger keep querying the model:
+SQLite pushes their WHERE terms into each partition's indexes and merges the
+ordered arms without a sort. Writes never target the view; services/ledger.py
+routes each row to the table of its year, and the listing and deletes only
+name the partitions they need.
+
+The model's own table is only the template of the partitions. It is taken out
+of the metadata, so create_all/drop_all and Alembic never create it as a table.
+Partitions are created by the first write of their year, in the writer's
+transaction, together with a new version of the view.
+"""
+
+import re
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import (
+    CheckConstraint,
+    Connection,
+    MetaData,
+    Table,
+    cast,
+    event,
+    false,
+    inspect,
+    null,
+    select,
+    text,
+    union_all,
+)
+
+from app.db import fts
+
+LEDGER_VIEW = "transactions"
+PARTITION_NAME = re.compile(rf"^{LEDGER_VIEW}_(\d{{4}})$")
+
+# Partition tables, plus copies of the tables their foreign keys point to
+_metadata = MetaData()
+_templates: list[Table] = []
+_tables: dict[int, Table] = {}
+_lock = threading.Lock()
+
+
+def partition_name(year: int) -> str:
+    """Return the table name of a year partition."""
+    return f"{LEDGER_VIEW}_{year:04d}"
+
+
+def register(table: Table) -> None:
+    """Make a model table the template of the year partitions.
+
+    The table leaves its metadata; creating the schema creates the (empty) view
+    in its place, and dropping it drops the view and every partition.
+
+    Args:
+        table: The ``Transaction`` model table
+    """
+    _templates.append(table)
+    for fk in table.foreign_keys:
+        fk.column.table.to_metadata(_metadata)
+    metadata = table.metadata
+    metadata.remove(table)
+    event.listen(metadata, "after_create", _create_view)
+    event.listen(metadata, "before_drop", _drop_partitions)
+
+
+def partition_table(year: int) -> Table:
+    """Return the Table of a year partition, whether or not it exists yet.
+
+    Args:
+        year: Calendar year
+
+    Returns:
+        Table named ``transactions_<YYYY>`` with the model's columns and indexes
+    """
+    table = _tables.get(year)
+    if table is None:
+        with _lock:
+            table = _tables.get(year)
+            if table is None:
+                name = partition_name(year)
+                table = _templates[0].to_metadata(_metadata, name=name)
+                for index in table.indexes:
+                    if not index.name.startswith(f"ix_{name}_"):
+                        index.name = index.name.replace(f"ix_{LEDGER_VIEW}_", f"ix_{name}_", 1)
+                table.append_constraint(
+                    CheckConstraint(
+                        f"date BETWEEN '{year:04d}-01-01' AND '{year:04d}-12-31'",
+                        name=f"ck_{name}_year",
+                    )
+                )
+                _tables[year] = table
+    return table
+
+
+def create_partition(connection: Connection, year: int) -> Table:
+    """Create a year's table with its indexes and search triggers.
+
+    Args:
+        connection: Connection of the writer's transaction
+        year: Calendar year
+
+    Returns:
+        The partition table
+    """
+    table = partition_table(year)
+    table.create(connection, checkfirst=True)
+    if connection.dialect.name == "sqlite":
+        for statement in fts.trigger_statements(table.name):
+            connection.exec_driver_sql(statement)
+    return table
+
+
+def drop_partition(connection: Connection, year: int) -> None:
+    """Drop a year's table (its indexes and triggers go with it).
+
+    Args:
+        connection: Connection of the writer's transaction
+        year: Calendar year
+    """
+    partition_table(year).drop(connection, checkfirst=True)
+
+
+def view_statement(connection: Connection, years: Iterable[int]) -> str:
+    """Build the CREATE VIEW statement of ``transactions`` over some partitions.
+
+    Args:
+        connection: Connection whose dialect renders the statement
+        years: Years whose partitions exist
+
+    Returns:
+        SQL text of the statement
+    """
+    arms = [select(*partition_table(year).c) for year in sorted(years)]
+    if not arms:
+        # No partition yet: an empty view with the model's columns
+        arms = [
+            select(*(cast(null(), c.type).label(c.name) for c in _templates[0].c)).where(false())
+        ]
+    query = arms[0] if len(arms) == 1 else union_all(*arms)
+    compiled = query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    return f"CREATE VIEW {LEDGER_VIEW} AS {compiled}"
+
+
+def replace_view(connection: Connection, years: Iterable[int]) -> None:
+    """Recreate ``transactions`` over the given partitions.
+
+    Args:
+        connection: Connection of the writer's transaction
+        years: Years whose partitions exist
+    """
+    connection.execute(text(f"DROP VIEW IF EXISTS {LEDGER_VIEW}"))
+    connection.execute(text(view_statement(connection, years)))
+
+
+def existing_years(connection: Connection) -> list[int]:
+    """Return the years whose partition table exists in the database.
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        Years, in ascending order
+    """
+    names = inspect(connection).get_table_names()
+    return sorted(int(m.group(1)) for m in map(PARTITION_NAME.match, names) if m is not None)
+
+
+def _create_view(target: MetaData, connection: Connection, **kw: Any) -> None:
+    replace_view(connection, existing_years(connection))
+
+
+def _drop_partitions(target: MetaData, connection: Connection, **kw: Any) -> None:
+    connection.execute(text(f"DROP VIEW IF EXISTS {LEDGER_VIEW}"))
+    for year in existing_years(connection):
+        drop_partition(connection, year)
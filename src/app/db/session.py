@@ -1,25 +1,104 @@
 """Database session management."""
 
 from functools import lru_cache
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.slow_queries import log_slow_queries
+
+
+def sqlite_pragmas() -> dict[str, str]:
+    """Return the PRAGMAs of the configured SQLite profile, in application order."""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "cache_size": str(settings.sqlite_cache_size),
+        "mmap_size": str(settings.sqlite_mmap_size),
+        "temp_store": settings.sqlite_temp_store,
+        "busy_timeout": str(settings.sqlite_busy_timeout),
+        "foreign_keys": "ON" if settings.sqlite_foreign_keys else "OFF",
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _engine_options(url: str) -> dict[str, Any]:
+    parsed = make_url(url)
+    options: dict[str, Any] = {}
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; pool sizing does not apply
+            return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
+
+
+def _configure(engine: Engine) -> Engine:
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    instrument_engine(engine)
+    log_slow_queries(engine)
+    return engine
 
 
 @lru_cache(maxsize=1)
 def get_engine() -> Engine:
     """Get or create the database engine (cached)."""
     url = settings.database_url
-    connect_args = {}
-    if url.startswith("sqlite"):
-        connect_args = {"check_same_thread": False}
-    return create_engine(url, future=True, connect_args=connect_args)
+    return _configure(create_engine(url, future=True, **_engine_options(url)))
 
 
-def get_session() -> Session:
-    """Create a new database session."""
+def get_session(*, expire_on_commit: bool = True) -> Session:
+    """Create a new database session.
+
+    Args:
+        expire_on_commit: Expire loaded objects on commit. Request sessions turn it
+            off: what a request wrote is what it returns, without a reload query
+    """
     engine = get_engine()
-    return Session(engine, autoflush=False, autocommit=False, future=True)
+    return Session(
+        engine, autoflush=False, autocommit=False, expire_on_commit=expire_on_commit, future=True
+    )
+
+
+def async_database_url(url: str) -> str:
+    """Map a database URL to its asyncio driver (aiosqlite / asyncpg)."""
+    for prefix, driver in (
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+    ):
+        if url.startswith(prefix):
+            return driver + url.removeprefix(prefix)
+    return url
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Get or create the asyncio database engine (cached)."""
+    url = async_database_url(settings.database_url)
+    engine = create_async_engine(url, **_engine_options(url))
+    _configure(engine.sync_engine)
+    return engine
+
+
+def get_async_session() -> AsyncSession:
+    """Create a new asyncio database session."""
+    return AsyncSession(get_async_engine(), autoflush=False, expire_on_commit=False)
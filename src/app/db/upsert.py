@@ -0,0 +1,23 @@
+"""Dialect-aware INSERT ... ON CONFLICT support."""
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+
+
+def upsert_insert(db: Session, table: Table | type[Base]) -> sqlite.Insert | postgresql.Insert:
+    """Build an INSERT for the session's dialect that supports ``on_conflict_do_*``.
+
+    Args:
+        db: Database session
+        table: Target table, or a mapped class for an ORM-enabled INSERT (which
+            can return ORM objects through ``returning(Model)``)
+
+    Returns:
+        Dialect-specific Insert construct
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
@@ -1,10 +1,52 @@
 """Main FastAPI application factory and setup."""
 
-from fastapi import Depends, FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
 
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api.async_routes import run_sync_routes
 from app.api.deps import require_api_key
-from app.api.routers import accounts, budgets, categories, reports, transactions
+from app.api.routers import (
+    accounts,
+    budgets,
+    categories,
+    imports,
+    months,
+    recurring,
+    reports,
+    rules,
+    transactions,
+)
+from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.metrics import REGISTRY, MetricsMiddleware
+from app.db.session import get_async_engine
+from app.services.archive import ClosedMonthError
+from app.services.recurring import run_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run the recurring scheduler if enabled; close pooled async connections on shutdown."""
+    scheduler = None
+    if settings.recurring_interval_seconds > 0:
+        scheduler = asyncio.create_task(run_scheduler(settings.recurring_interval_seconds))
+    yield
+    if scheduler is not None:
+        scheduler.cancel()
+        with suppress(asyncio.CancelledError):
+            await scheduler
+    # Pooled async connections belong to this event loop
+    if settings.db_mode == "async":
+        await get_async_engine().dispose()
+
+
+async def closed_month_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Answer writes to a closed month with 409 Conflict."""
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
 
 
 def create_app() -> FastAPI:
@@ -19,19 +61,45 @@ def create_app() -> FastAPI:
         title="APP-GERENCIADOR-FINANCEIRO",
         version="0.1.0",
         description="MVP API-only para controle financeiro pessoal (single-user local)",
+        lifespan=lifespan,
     )
+    app.add_middleware(MetricsMiddleware)
+    # Raised from any write path (see services/ledger.py), not just one router
+    app.add_exception_handler(ClosedMonthError, closed_month_handler)
 
     @app.get("/health")
     def health() -> dict:
         """Health check endpoint."""
         return {"status": "ok"}
 
-    # Include all routers with API key protection
-    app.include_router(accounts.router, dependencies=[Depends(require_api_key)])
-    app.include_router(categories.router, dependencies=[Depends(require_api_key)])
-    app.include_router(transactions.router, dependencies=[Depends(require_api_key)])
-    app.include_router(budgets.router, dependencies=[Depends(require_api_key)])
-    app.include_router(reports.router, dependencies=[Depends(require_api_key)])
+    @app.get("/metrics", dependencies=[Depends(require_api_key)])
+    def metrics() -> PlainTextResponse:
+        """Prometheus metrics (text exposition format)."""
+        return PlainTextResponse(
+            REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    # Include all routers with API key protection. In async mode the native async
+    # endpoints come first and every other endpoint runs through run_sync (see
+    # api/async_routes.py), so no route is left on the threadpool
+    for module in (
+        accounts,
+        categories,
+        transactions,
+        budgets,
+        reports,
+        imports,
+        months,
+        rules,
+        recurring,
+    ):
+        router = module.router
+        if settings.db_mode == "async":
+            native = getattr(module, "async_router", None)
+            if native is not None:
+                app.include_router(native, dependencies=[Depends(require_api_key)])
+            router = run_sync_routes(router, native=native)
+        app.include_router(router, dependencies=[Depends(require_api_key)])
 
     return app
 
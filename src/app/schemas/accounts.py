@@ -1,6 +1,8 @@
 """Account schemas."""
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.core.money import Cents
 
 
 class AccountCreate(BaseModel):
@@ -27,3 +29,4 @@ class AccountOut(BaseModel):
     name: str
     type: str
     active: bool
+    balance: Cents = Field(validation_alias="balance_cents")
@@ -2,13 +2,16 @@
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.money import Cents, Money
+from app.schemas.transactions import BulkRowError
+
 
 class BudgetUpsert(BaseModel):
     """Schema for creating/updating a budget."""
 
     month: str = Field(..., pattern=r"^\d{4}-\d{2}$")
     category_id: int
-    amount_planned: float = Field(..., gt=0)
+    amount_planned: Money = Field(..., gt=0)
 
 
 class BudgetOut(BaseModel):
@@ -19,4 +22,17 @@ class BudgetOut(BaseModel):
     id: int
     month: str
     category_id: int
-    amount_planned: float
+    amount_planned: Cents = Field(validation_alias="amount_planned_cents")
+
+
+class BudgetBulkResult(BaseModel):
+    """Schema for bulk budget upsert response."""
+
+    upserted: int
+    errors: list[BulkRowError]
+
+
+class BudgetCopyResult(BaseModel):
+    """Schema for budget copy response."""
+
+    copied: int
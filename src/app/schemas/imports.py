@@ -0,0 +1,22 @@
+"""Statement import schemas."""
+
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+from app.schemas.transactions import BulkRowError
+
+
+class StatementFormat(StrEnum):
+    """Bank statement file format enum."""
+
+    OFX = "ofx"
+    CSV = "csv"
+
+
+class ImportResult(BaseModel):
+    """Schema for statement import response."""
+
+    inserted: int
+    duplicates: int
+    errors: list[BulkRowError]
@@ -0,0 +1,30 @@
+"""Closed month schemas."""
+
+import datetime as dt
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ClosedMonthOut(BaseModel):
+    """Schema for a closed month."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    month: str
+    row_count: int
+    detached: bool
+    closed_at: dt.datetime
+
+
+class ReopenResult(BaseModel):
+    """Schema for the result of reopening a month."""
+
+    month: str
+    row_count: int
+
+
+class YearStorageResult(BaseModel):
+    """Schema for the result of detaching or attaching a year."""
+
+    year: str
+    months: list[str]
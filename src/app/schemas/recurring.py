@@ -0,0 +1,79 @@
+"""Recurring transaction schemas."""
+
+import datetime as dt
+from enum import StrEnum
+from typing import Self
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.core.money import Cents, Money
+from app.schemas.transactions import TransactionCreate, TxKind
+
+
+class RecurrenceUnit(StrEnum):
+    """Unit of a recurrence interval."""
+
+    DAY = "DAY"
+    WEEK = "WEEK"
+    MONTH = "MONTH"
+
+
+class RecurringCreate(BaseModel):
+    """Schema for creating a recurring transaction template.
+
+    Monthly occurrences keep the day of ``start_date``, moved back to the last day
+    of shorter months (a template starting on the 31st falls on Feb 28/29).
+    """
+
+    description: str = ""
+    amount: Money = Field(..., description="Despesa < 0; Receita > 0. Número ou texto decimal.")
+    kind: TxKind
+    account_id: int
+    category_id: int
+    unit: RecurrenceUnit = RecurrenceUnit.MONTH
+    interval: int = Field(default=1, ge=1, le=366)
+    start_date: dt.date
+    end_date: dt.date | None = None
+
+    @model_validator(mode="after")
+    def _check_dates(self) -> Self:
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date deve ser posterior ou igual a start_date")
+        return self
+
+    def as_transaction(self) -> TransactionCreate:
+        """Return the first occurrence, for the usual transaction checks."""
+        # Already validated: amount is in cents and must not be converted again
+        return TransactionCreate.model_construct(
+            date=self.start_date,
+            description=self.description,
+            amount=self.amount,
+            kind=self.kind,
+            account_id=self.account_id,
+            category_id=self.category_id,
+        )
+
+
+class RecurringOut(BaseModel):
+    """Schema for recurring template response."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    description: str
+    amount: Cents = Field(validation_alias="amount_cents")
+    kind: TxKind
+    account_id: int
+    category_id: int
+    unit: RecurrenceUnit
+    interval: int
+    start_date: dt.date
+    end_date: dt.date | None
+    active: bool
+
+
+class MaterializeResult(BaseModel):
+    """Schema for materialize response."""
+
+    generated: int
+    skipped: int
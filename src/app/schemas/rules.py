@@ -0,0 +1,99 @@
+"""Category rule schemas."""
+
+import re
+from enum import StrEnum
+from typing import Self
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.core.money import Cents, Money
+from app.core.text import normalize_description
+
+
+class RuleMatch(StrEnum):
+    """How a rule's pattern is matched against the description."""
+
+    CONTAINS = "CONTAINS"
+    PREFIX = "PREFIX"
+    REGEX = "REGEX"
+
+
+class RuleCreate(BaseModel):
+    """Schema for creating a category rule.
+
+    ``CONTAINS`` and ``PREFIX`` ignore case, accents and repeated spaces; ``REGEX``
+    is searched in the raw description, ignoring case. A ``REGEX`` rule may also
+    name a ``keyword`` the description must contain (compared like ``CONTAINS``):
+    rules with one are only tried on descriptions holding it, the others on
+    every row.
+    """
+
+    category_id: int
+    match: RuleMatch | None = None
+    pattern: str | None = Field(default=None, min_length=1, max_length=255)
+    keyword: str | None = Field(default=None, min_length=1, max_length=255)
+    account_id: int | None = None
+    min_amount: Money | None = Field(default=None, ge=0)
+    max_amount: Money | None = Field(default=None, ge=0)
+    priority: int = 100
+
+    @model_validator(mode="after")
+    def _check_conditions(self) -> Self:
+        if (self.match is None) != (self.pattern is None):
+            raise ValueError("Informe match e pattern juntos")
+        conditions = (self.pattern, self.account_id, self.min_amount, self.max_amount)
+        if all(condition is None for condition in conditions):
+            raise ValueError("Informe ao menos uma condição")
+        if self.keyword is not None:
+            if self.match != RuleMatch.REGEX:
+                raise ValueError("keyword só se aplica a regras REGEX")
+            if not normalize_description(self.keyword):
+                raise ValueError("keyword não pode ser vazio")
+        if self.match == RuleMatch.REGEX:
+            try:
+                regex = re.compile(self.pattern, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Expressão regular inválida: {e}") from e
+            # Such a pattern matches every description
+            if regex.search("") is not None:
+                raise ValueError("Expressão regular não pode casar com texto vazio")
+        elif self.pattern is not None and not normalize_description(self.pattern):
+            # Blank once normalized, so it would match every description
+            raise ValueError("pattern não pode ser vazio")
+        if (
+            self.min_amount is not None
+            and self.max_amount is not None
+            and self.min_amount > self.max_amount
+        ):
+            raise ValueError("min_amount deve ser menor ou igual a max_amount")
+        return self
+
+
+class RuleUpdate(RuleCreate):
+    """Schema for replacing a category rule."""
+
+    active: bool = True
+
+
+class RuleOut(BaseModel):
+    """Schema for category rule response."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    category_id: int
+    match: RuleMatch | None
+    pattern: str | None
+    keyword: str | None
+    account_id: int | None
+    min_amount: Cents | None = Field(validation_alias="min_amount_cents")
+    max_amount: Cents | None = Field(validation_alias="max_amount_cents")
+    priority: int
+    active: bool
+
+
+class RecategorizeResult(BaseModel):
+    """Schema for recategorize response."""
+
+    scanned: int
+    updated: int
@@ -5,6 +5,8 @@ from enum import StrEnum
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.money import Cents, Money
+
 
 class TxKind(StrEnum):
     """Transaction kind enum."""
@@ -14,12 +16,19 @@ class TxKind(StrEnum):
     TRANSFER = "TRANSFER"
 
 
+class ExportFormat(StrEnum):
+    """Transaction export format enum."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class TransactionCreate(BaseModel):
     """Schema for creating a transaction."""
 
     date: dt.date
     description: str = ""
-    amount: float = Field(..., description="Despesa < 0; Receita > 0.")
+    amount: Money = Field(..., description="Despesa < 0; Receita > 0. Número ou texto decimal.")
     kind: TxKind
     account_id: int
     category_id: int | None = None
@@ -33,18 +42,52 @@ class TransactionOut(BaseModel):
     id: int
     date: dt.date
     description: str
-    amount: float
+    amount: Cents = Field(validation_alias="amount_cents")
     kind: TxKind
     account_id: int
     category_id: int | None
     transfer_pair_id: str | None
 
 
+class TransactionPage(BaseModel):
+    """Schema for a page of the transaction list (``envelope=true``)."""
+
+    items: list[TransactionOut]
+    next_cursor: str | None
+
+
 class TransferCreate(BaseModel):
     """Schema for creating a transfer."""
 
     date: dt.date
     description: str = ""
-    amount_abs: float = Field(..., gt=0)
+    amount_abs: Money = Field(..., gt=0)
     from_account_id: int
     to_account_id: int
+
+
+class BulkRowError(BaseModel):
+    """Schema for a rejected row of a bulk request."""
+
+    index: int
+    detail: str
+
+
+class BulkInsertResult(BaseModel):
+    """Schema for bulk insert response."""
+
+    inserted: int
+    errors: list[BulkRowError]
+
+
+class TransferPair(BaseModel):
+    """Schema for a transfer created by a bulk request."""
+
+    index: int
+    pair_id: str
+
+
+class BulkTransferResult(BulkInsertResult):
+    """Schema for bulk transfer response (inserted counts transfers, not rows)."""
+
+    pairs: list[TransferPair]
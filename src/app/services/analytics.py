@@ -0,0 +1,326 @@
+"""Analytics service - vectorized reports over long periods.
+
+The transactions of a period are loaded once into NumPy column arrays (day
+ordinal, amount in cents, category, account and kind codes), sorted by day.
+Group-bys are ``bincount``, rolling windows are ``cumsum`` differences and
+date/group boundaries are ``searchsorted`` lookups, so a report over ten years
+of data never loops over rows in Python nor goes back to SQL.
+
+Closed months come straight from their archive files: ``np.frombuffer`` over
+the mapped columns, with no SQL and no per-row decoding.
+
+Arrays are cached per period in an LRU keyed by the data versions of every month
+in it; any write to one of those months moves a version and the next request
+reloads the period.
+
+NumPy is optional (``pip install -e ".[analytics]"``); without it the functions
+here raise AnalyticsUnavailableError.
+"""
+
+import datetime as dt
+import itertools
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.money import to_wire
+from app.db.models import Account, Category, Transaction
+from app.services.archive import KINDS, get_archive_index
+from app.services.reports import ReportCache, iter_months
+from app.services.rollups import NO_CATEGORY
+from app.services.versions import month_version_key, version_tracker
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the installed extras
+    np = None
+
+MAX_ANALYTICS_MONTHS = 240
+# Same codes as the kind column of archive files
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+INCOME, EXPENSE, TRANSFER = (KIND_CODES[kind] for kind in ("INCOME", "EXPENSE", "TRANSFER"))
+# date.toordinal() of day 0 of datetime64[D]
+_EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+_COLUMNS = 5
+# Archive sections in LedgerArrays column order
+_ARCHIVE_COLUMNS = (
+    ("day", "int32"),
+    ("amount", "int64"),
+    ("category", "int32"),
+    ("account", "int32"),
+    ("kind", "uint8"),
+)
+
+
+class AnalyticsUnavailableError(RuntimeError):
+    """Raised when NumPy is not installed."""
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerArrays:
+    """Column arrays of the transactions of a period, sorted by day (read-only)."""
+
+    from_month: str
+    to_month: str
+    first_day: int  # ordinal of the first day of from_month
+    last_day: int  # ordinal of the last day of to_month
+    day: Any  # int32 date ordinals
+    amount: Any  # int64 cents
+    category: Any  # int32, NO_CATEGORY for transfers
+    account: Any  # int32
+    kind: Any  # int8, see KIND_CODES
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise AnalyticsUnavailableError("Analytics requer numpy (pip install -e '.[analytics]')")
+
+
+def _month_bounds(from_month: str, to_month: str) -> tuple[dt.date, dt.date]:
+    start = dt.date.fromisoformat(f"{from_month}-01")
+    first_of_to = dt.date.fromisoformat(f"{to_month}-01")
+    end = (first_of_to + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+    return start, end
+
+
+def ledger_query(start: dt.date, end: dt.date) -> Select:
+    """Build the query load_ledger_arrays runs (portable SQL, no dialect functions).
+
+    Args:
+        start: First day of the period
+        end: Last day of the period
+
+    Returns:
+        Query of (date, amount, category code, account, kind code) rows sorted by date
+    """
+    return (
+        select(
+            Transaction.date,
+            Transaction.amount_cents,
+            func.coalesce(Transaction.category_id, NO_CATEGORY),
+            Transaction.account_id,
+            case(KIND_CODES, value=Transaction.kind, else_=len(KIND_CODES)),
+        )
+        .where(Transaction.date.between(start, end))
+        .order_by(Transaction.date)
+    )
+
+
+def load_ledger_arrays(db: Session, from_month: str, to_month: str) -> LedgerArrays:
+    """Load the transactions of a period into column arrays with one query.
+
+    Codes and amounts are integers in SQL and go into one flat int64 buffer; the
+    dates become day ordinals through a ``datetime64[D]`` array, so the query
+    runs unchanged on every supported database.
+
+    Args:
+        db: Database session
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+
+    Returns:
+        Column arrays of the period
+    """
+    _require_numpy()
+    start, end = _month_bounds(from_month, to_month)
+    rows = db.execute(ledger_query(start, end)).all()
+    days = np.array([row[0] for row in rows], dtype="datetime64[D]").astype(np.int64)
+    flat = np.fromiter(
+        itertools.chain.from_iterable(row[1:] for row in rows),
+        dtype=np.int64,
+        count=len(rows) * (_COLUMNS - 1),
+    ).reshape(-1, _COLUMNS - 1)
+
+    columns = (
+        (days + _EPOCH_ORDINAL).astype(np.int32),
+        flat[:, 0].copy(),
+        flat[:, 1].astype(np.int32),
+        flat[:, 2].astype(np.int32),
+        flat[:, 3].astype(np.int8),
+    )
+
+    index = get_archive_index(db)
+    archives = [index.open(month) for month in index.months_between(from_month, to_month)]
+    if archives:
+        parts = [columns] + [
+            tuple(
+                np.frombuffer(archive.column(name), dtype=dtype) for name, dtype in _ARCHIVE_COLUMNS
+            )
+            for archive in archives
+        ]
+        merged = [
+            np.concatenate([part[i] for part in parts]).astype(columns[i].dtype, copy=False)
+            for i in range(_COLUMNS)
+        ]
+        order = np.argsort(merged[0], kind="stable")
+        columns = tuple(column[order] for column in merged)
+
+    # Cached arrays are shared between requests
+    for column in columns:
+        column.flags.writeable = False
+    return LedgerArrays(from_month, to_month, start.toordinal(), end.toordinal(), *columns)
+
+
+analytics_cache = ReportCache(settings.analytics_cache_size)
+
+
+def ledger_arrays(db: Session, from_month: str, to_month: str) -> LedgerArrays:
+    """Return the column arrays of a period, loading them only when it changed.
+
+    Args:
+        db: Database session
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+
+    Returns:
+        Column arrays of the period (shared; read-only)
+    """
+    _require_numpy()
+    keys = [month_version_key(month) for month in iter_months(from_month, to_month)]
+    key = ("ledger", from_month, to_month, tuple(version_tracker.get_many(db, keys)))
+    arrays = analytics_cache.get(key)
+    if arrays is None:
+        arrays = load_ledger_arrays(db, from_month, to_month)
+        analytics_cache.put(key, arrays)
+    return arrays
+
+
+def _sums(codes: Any, weights: Any, size: int) -> Any:
+    # Summed in int64: bincount would add the cents as float64 and round large totals
+    sums = np.zeros(size, dtype=np.int64)
+    np.add.at(sums, codes, weights.astype(np.int64, copy=False))
+    return sums
+
+
+def group_totals(db: Session, arrays: LedgerArrays, group_by: str) -> list[dict]:
+    """Income and expense totals per category or per account.
+
+    Transfers are left out: they move money between accounts without being
+    income or expense.
+
+    Args:
+        db: Database session (only used for names)
+        arrays: Column arrays of the period
+        group_by: "category" or "account"
+
+    Returns:
+        One dict per group with income, expense (absolute), net and count, ordered
+        by expense descending
+    """
+    model = Category if group_by == "category" else Account
+    names = dict(db.execute(select(model.id, model.name)).tuples().all())
+
+    keep = arrays.kind != TRANSFER
+    codes = (arrays.category if group_by == "category" else arrays.account)[keep]
+    amount = arrays.amount[keep]
+    kind = arrays.kind[keep]
+    if not len(codes):
+        return []
+
+    size = int(codes.max()) + 1
+    income = _sums(codes, np.where(kind == INCOME, amount, 0), size)
+    expense = _sums(codes, np.where(kind == EXPENSE, amount, 0), size)
+    count = np.bincount(codes, minlength=size)
+
+    present = np.flatnonzero(count)
+    order = present[np.argsort(expense[present], kind="stable")]
+    return [
+        {
+            f"{group_by}_id": int(code),
+            f"{group_by}_name": names.get(int(code), "N/A"),
+            "income": to_wire(int(income[code])),
+            "expense": to_wire(-int(expense[code])),
+            "net": to_wire(int(income[code] + expense[code])),
+            "count": int(count[code]),
+        }
+        for code in order
+    ]
+
+
+def daily_series(arrays: LedgerArrays, window: int) -> list[dict]:
+    """Daily income, expense and net flow with a trailing rolling sum of the net.
+
+    Args:
+        arrays: Column arrays of the period
+        window: Days in the rolling window (the current day included)
+
+    Returns:
+        One dict per calendar day of the period, in ascending order
+    """
+    days = arrays.last_day - arrays.first_day + 1
+    offset = arrays.day - arrays.first_day
+    income = _sums(offset, np.where(arrays.kind == INCOME, arrays.amount, 0), days)
+    expense = _sums(offset, np.where(arrays.kind == EXPENSE, arrays.amount, 0), days)
+    net = income + expense
+
+    running = np.cumsum(net)
+    rolling = running.copy()
+    rolling[window:] -= running[:-window]
+
+    first = dt.date.fromordinal(arrays.first_day)
+    return [
+        {
+            "date": (first + dt.timedelta(days=i)).isoformat(),
+            "income": to_wire(int(income[i])),
+            "expense": to_wire(-int(expense[i])),
+            "net": to_wire(int(net[i])),
+            "rolling_net": to_wire(int(rolling[i])),
+        }
+        for i in range(days)
+    ]
+
+
+def expense_percentiles(
+    db: Session, arrays: LedgerArrays, percentiles: list[float]
+) -> dict[str, Any]:
+    """Percentiles of expense amounts, overall and per category.
+
+    Amounts are sorted once by (category, amount); ``searchsorted`` finds each
+    category's slice and the percentiles are read from it by nearest rank, so
+    every value is an actual transaction amount.
+
+    Args:
+        db: Database session (only used for names)
+        arrays: Column arrays of the period
+        percentiles: Percentiles to compute, each in [0, 100]
+
+    Returns:
+        Dict with ``overall`` and ``by_category`` percentile maps (absolute amounts)
+    """
+    names = dict(db.execute(select(Category.id, Category.name)).tuples().all())
+    expenses = arrays.kind == EXPENSE
+    amount = -arrays.amount[expenses]
+    category = arrays.category[expenses]
+
+    def _pick(values: Any) -> dict[str, str]:
+        found = np.percentile(values, percentiles, method="inverted_cdf")
+        return {f"p{q:g}": to_wire(int(v)) for q, v in zip(percentiles, found, strict=True)}
+
+    if not len(amount):
+        return {"count": 0, "overall": {}, "by_category": []}
+
+    order = np.lexsort((amount, category))
+    amount, category = amount[order], category[order]
+    groups = np.unique(category)
+    starts = np.searchsorted(category, groups, side="left")
+    ends = np.searchsorted(category, groups, side="right")
+
+    return {
+        "count": int(len(amount)),
+        "overall": _pick(amount),
+        "by_category": [
+            {
+                "category_id": int(code),
+                "category_name": names.get(int(code), "N/A"),
+                "count": int(end - start),
+                **_pick(amount[start:end]),
+            }
+            for code, start, end in zip(groups, starts, ends, strict=True)
+        ],
+    }
@@ -0,0 +1,584 @@
+"""Month archive - closed months stored as memory-mapped columnar files.
+
+Closing a month (see services/closing.py) moves its transactions out of the
+live ledger into one file, so the year partitions only hold open months and
+historical reads never touch them. Readers map the file and cast its sections
+to typed ``memoryview`` slices in place: nothing is parsed or copied until a row
+is actually rendered.
+
+File layout (integers in the writer's native byte order, recorded in the header;
+every section starts on an 8-byte boundary)::
+
+    header    magic, format version, byte order, month, row and summary counts
+    sections  (offset, length) of every entry of SECTIONS, in order
+    columns   id q, day i (date ordinal), amount q (cents), account i,
+              category i (0 = none), kind B (index in KINDS), created q (us since epoch)
+    strings   description, transfer pair and fingerprint: uint32 offsets plus one
+              UTF-8 blob each ("" stands for NULL in the two nullable ones)
+    summary   the month's range_summary rows: category i, income q, expense q, planned q
+
+Rows are sorted by (date, id), so date bounds are a bisect on the day column.
+Rows come out as tuples in the order of ``exports.EXPORT_FIELDS``.
+
+Storage is partitioned by year: files live in ``<ARCHIVE_DIR>/<YYYY>/`` and a
+whole year can be detached to ``ARCHIVE_COLD_DIR`` (same layout) without
+touching the database rows of open months. Readers route by date range (only
+the months overlapping a filter are mapped) and by ID range (the min/max ID of
+each month is kept in ``closed_months``), so detached years cost nothing until a
+query actually reaches them.
+"""
+
+import bisect
+import datetime as dt
+import heapq
+import itertools
+import mmap
+import os
+import shutil
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import ClosedMonth
+from app.services.rollups import NO_CATEGORY, month_key
+from app.services.versions import read_version
+
+ARCHIVE_KEY = "archive"
+KINDS = ("INCOME", "EXPENSE", "TRANSFER")
+MAGIC = b"FINARCH\x00"
+FORMAT_VERSION = 1
+FILE_SUFFIX = ".fmarc"
+
+SECTIONS: tuple[tuple[str, str], ...] = (
+    ("id", "q"),
+    ("day", "i"),
+    ("amount", "q"),
+    ("account", "i"),
+    ("category", "i"),
+    ("kind", "B"),
+    ("created", "q"),
+    ("description.offsets", "I"),
+    ("description", "B"),
+    ("pair.offsets", "I"),
+    ("pair", "B"),
+    ("fingerprint.offsets", "I"),
+    ("fingerprint", "B"),
+    ("summary.category", "i"),
+    ("summary.income", "q"),
+    ("summary.expense", "q"),
+    ("summary.planned", "q"),
+)
+# Archive string column -> transactions column
+STRING_COLUMNS = {
+    "description": "description",
+    "pair": "transfer_pair_id",
+    "fingerprint": "fingerprint",
+}
+
+# magic, format version, little-endian flag, month, row count, summary row count
+_HEADER = struct.Struct("<8sHB7sII")
+_SECTION = struct.Struct("<QQ")
+_ALIGN = 8
+_EPOCH = dt.datetime(1970, 1, 1)
+_MICROSECOND = dt.timedelta(microseconds=1)
+
+SummaryRow = tuple[int, int, int, int]
+
+
+class ArchiveError(RuntimeError):
+    """Raised when an archive file is missing, corrupt or from another platform."""
+
+
+class ClosedMonthError(Exception):
+    """Raised when a write targets a closed month (mapped to 409 by the API)."""
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _string_table(values: Iterable[str | None]) -> tuple[array, bytes]:
+    offsets = array("I", [0])
+    blob = bytearray()
+    for value in values:
+        blob += (value or "").encode()
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def write_archive(
+    path: Path,
+    month: str,
+    records: Sequence[Mapping[str, Any]],
+    summary: Sequence[SummaryRow],
+) -> None:
+    """Write the archive file of a month atomically (temporary file, fsync, rename).
+
+    Args:
+        path: Destination file
+        month: Month in YYYY-MM format
+        records: Transaction rows keyed by column name (id, date, description,
+            amount_cents, kind, account_id, category_id, transfer_pair_id,
+            fingerprint, created_at)
+        summary: (category_id, income, expense, planned) rows of the month, in cents
+    """
+    records = sorted(records, key=lambda r: (r["date"], r["id"]))
+    data: dict[str, Any] = {
+        "id": array("q", (r["id"] for r in records)),
+        "day": array("i", (r["date"].toordinal() for r in records)),
+        "amount": array("q", (r["amount_cents"] for r in records)),
+        "account": array("i", (r["account_id"] for r in records)),
+        "category": array("i", (r["category_id"] or NO_CATEGORY for r in records)),
+        "kind": array("B", (KINDS.index(r["kind"]) for r in records)),
+        "created": array("q", ((r["created_at"] - _EPOCH) // _MICROSECOND for r in records)),
+    }
+    for name, column in STRING_COLUMNS.items():
+        data[f"{name}.offsets"], data[name] = _string_table(r[column] for r in records)
+    for position, name in enumerate(("category", "income", "expense", "planned")):
+        code = "i" if name == "category" else "q"
+        data[f"summary.{name}"] = array(code, (row[position] for row in summary))
+
+    sections = []
+    offset = _aligned(_HEADER.size + _SECTION.size * len(SECTIONS))
+    for name, _ in SECTIONS:
+        length = memoryview(data[name]).nbytes
+        sections.append((offset, length))
+        offset = _aligned(offset + length)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fp:
+        little = sys.byteorder == "little"
+        fp.write(
+            _HEADER.pack(MAGIC, FORMAT_VERSION, little, month.encode(), len(records), len(summary))
+        )
+        for entry in sections:
+            fp.write(_SECTION.pack(*entry))
+        for (name, _), (start, _) in zip(SECTIONS, sections, strict=True):
+            fp.write(b"\0" * (start - fp.tell()))
+            fp.write(data[name])
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp, path)
+
+
+def copy_archive(src: Path, dst: Path) -> None:
+    """Copy an archive file atomically, possibly to another file system.
+
+    Args:
+        src: Existing archive file
+        dst: Destination file (parent directories are created)
+
+    Raises:
+        ArchiveError: If the file cannot be copied
+    """
+    tmp = dst.with_name(dst.name + ".tmp")
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        with open(src, "rb") as fin, open(tmp, "wb") as fout:
+            shutil.copyfileobj(fin, fout)
+            fout.flush()
+            os.fsync(fout.fileno())
+        os.replace(tmp, dst)
+    except OSError as e:
+        tmp.unlink(missing_ok=True)
+        raise ArchiveError(f"Não foi possível copiar {src} para {dst}: {e}") from e
+
+
+@dataclass(frozen=True, slots=True)
+class RowFilter:
+    """Filters of a transactions listing, applied to archived rows.
+
+    Same meaning as the arguments of ``transaction_list_query``.
+    """
+
+    from_date: dt.date | None = None
+    to_date: dt.date | None = None
+    account_id: int | None = None
+    category_id: int | None = None
+    kind: str | None = None
+    after: tuple[dt.date, int] | None = None
+
+    def covers(self, month: str) -> bool:
+        """Tell whether rows of a month can match the filter's dates."""
+        if self.from_date is not None and month < month_key(self.from_date):
+            return False
+        if self.to_date is not None and month > month_key(self.to_date):
+            return False
+        return self.after is None or month <= month_key(self.after[0])
+
+
+class MonthArchive:
+    """Read-only, memory-mapped view of one archive file."""
+
+    def __init__(self, path: Path) -> None:
+        try:
+            with open(path, "rb") as fp:
+                self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, little, month, rows, summary_rows = _HEADER.unpack_from(self._map)
+        except (OSError, ValueError, struct.error) as e:
+            raise ArchiveError(f"Arquivo de mês fechado ilegível: {path}") from e
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ArchiveError(f"Formato de arquivo desconhecido: {path}")
+        if bool(little) != (sys.byteorder == "little"):
+            raise ArchiveError(f"Arquivo gravado com outra ordem de bytes: {path}")
+
+        self.month: str = month.decode()
+        self.row_count: int = rows
+        self.summary_count: int = summary_rows
+        view = memoryview(self._map)
+        self._columns: dict[str, memoryview] = {}
+        for index, (name, code) in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(view, _HEADER.size + index * _SECTION.size)
+            self._columns[name] = view[offset : offset + length].cast(code)
+
+    def close(self) -> None:
+        """Unmap the file (for an archive not shared with any reader)."""
+        self._columns.clear()
+        self._map.close()
+
+    def column(self, name: str) -> memoryview:
+        """Return a typed, zero-copy view of a section (see SECTIONS)."""
+        return self._columns[name]
+
+    def text(self, name: str, index: int) -> str:
+        """Decode one value of a string column ("" for NULL)."""
+        offsets = self._columns[f"{name}.offsets"]
+        return str(self._columns[name][offsets[index] : offsets[index + 1]], "utf-8")
+
+    def row(self, index: int) -> tuple[Any, ...]:
+        """Return one row as a tuple in EXPORT_FIELDS order."""
+        columns = self._columns
+        return (
+            columns["id"][index],
+            dt.date.fromordinal(columns["day"][index]),
+            self.text("description", index),
+            columns["amount"][index],
+            KINDS[columns["kind"][index]],
+            columns["account"][index],
+            columns["category"][index] or None,
+            self.text("pair", index) or None,
+        )
+
+    def rows(self, flt: RowFilter) -> Iterator[tuple[Any, ...]]:
+        """Yield the rows matching a filter, ordered by (date, id) descending.
+
+        Args:
+            flt: Listing filters
+
+        Yields:
+            Row tuples in EXPORT_FIELDS order
+        """
+        ids, days = self._columns["id"], self._columns["day"]
+        accounts, categories = self._columns["account"], self._columns["category"]
+        kinds = self._columns["kind"]
+
+        low = 0 if flt.from_date is None else bisect.bisect_left(days, flt.from_date.toordinal())
+        high = len(days)
+        if flt.to_date is not None:
+            high = bisect.bisect_right(days, flt.to_date.toordinal())
+        after = None
+        if flt.after is not None:
+            after = (flt.after[0].toordinal(), flt.after[1])
+            high = min(high, bisect.bisect_right(days, after[0]))
+        kind = None if flt.kind is None else KINDS.index(flt.kind)
+
+        for i in range(high - 1, low - 1, -1):
+            if after is not None and (days[i], ids[i]) >= after:
+                continue
+            if flt.account_id is not None and accounts[i] != flt.account_id:
+                continue
+            if flt.category_id is not None and categories[i] != flt.category_id:
+                continue
+            if kind is not None and kinds[i] != kind:
+                continue
+            yield self.row(i)
+
+    def records(self) -> list[dict[str, Any]]:
+        """Return every row with all of its transactions columns (used to reopen).
+
+        Returns:
+            Dicts keyed by Transaction column name
+        """
+        columns = self._columns
+        return [
+            {
+                "id": columns["id"][i],
+                "date": dt.date.fromordinal(columns["day"][i]),
+                "description": self.text("description", i),
+                "amount_cents": columns["amount"][i],
+                "kind": KINDS[columns["kind"][i]],
+                "account_id": columns["account"][i],
+                "category_id": columns["category"][i] or None,
+                "transfer_pair_id": self.text("pair", i) or None,
+                "fingerprint": self.text("fingerprint", i) or None,
+                "created_at": _EPOCH + columns["created"][i] * _MICROSECOND,
+            }
+            for i in range(self.row_count)
+        ]
+
+    def summary(self) -> list[SummaryRow]:
+        """Return the stored (category_id, income, expense, planned) rows, in cents."""
+        return list(
+            zip(
+                self._columns["summary.category"],
+                self._columns["summary.income"],
+                self._columns["summary.expense"],
+                self._columns["summary.planned"],
+                strict=True,
+            )
+        )
+
+    def account_totals(self) -> dict[int, int]:
+        """Sum the amounts of every row per account, in cents."""
+        totals: dict[int, int] = {}
+        for account_id, amount in zip(
+            self._columns["account"], self._columns["amount"], strict=True
+        ):
+            totals[account_id] = totals.get(account_id, 0) + amount
+        return totals
+
+    def __contains__(self, tx_id: object) -> bool:
+        return tx_id in self._columns["id"]
+
+
+def archive_path(file_name: str, *, detached: bool = False) -> Path:
+    """Return the path of an archive file inside ARCHIVE_DIR or ARCHIVE_COLD_DIR.
+
+    Args:
+        file_name: File name recorded in closed_months (relative, "YYYY/...")
+        detached: Whether the file's year was moved to cold storage
+
+    Returns:
+        Absolute or working-directory relative path
+    """
+    return Path(settings.archive_cold_dir if detached else settings.archive_dir) / file_name
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveIndex:
+    """Snapshot of the closed months, opening (mapping) their files on first use."""
+
+    version: int
+    paths: dict[str, Path]  # month -> archive file
+    id_ranges: dict[str, tuple[int | None, int | None]]  # month -> (min ID, max ID)
+    _opened: dict[str, MonthArchive] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _closed: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+
+    def open(self, month: str) -> MonthArchive:
+        """Return the mapped archive of a closed month.
+
+        Raises:
+            ArchiveError: If the file cannot be read
+        """
+        archive = self._opened.get(month)
+        if archive is None:
+            with self._lock:
+                archive = self._opened.get(month)
+                if archive is None:
+                    archive = MonthArchive(self.paths[month])
+                    # A replaced snapshot keeps no new mapping alive
+                    if not self._closed.is_set():
+                        self._opened[month] = archive
+        return archive
+
+    def close(self) -> None:
+        """Release the mappings of a replaced snapshot.
+
+        The index holds the only long-lived references to its archives, so the
+        ones no reader is using are unmapped right away (letting their files be
+        replaced or removed, which Windows refuses for a mapped file); those a
+        request is still iterating go with its last reference.
+        """
+        with self._lock:
+            self._closed.set()
+            self._opened.clear()
+
+    def months(self, flt: RowFilter | None = None) -> list[str]:
+        """List the closed months (those a filter's dates can match), ascending."""
+        return sorted(m for m in self.paths if flt is None or flt.covers(m))
+
+    def months_between(self, from_month: str, to_month: str) -> list[str]:
+        """List the closed months inside a month range, ascending."""
+        return sorted(m for m in self.paths if from_month <= m <= to_month)
+
+    def find(self, tx_id: int) -> str | None:
+        """Return the closed month holding a transaction ID, if any.
+
+        Only the months whose ID range contains the ID are opened.
+        """
+        for month in self.months():
+            low, high = self.id_ranges[month]
+            if (low is None or low <= tx_id) and (high is None or tx_id <= high):
+                if tx_id in self.open(month):
+                    return month
+        return None
+
+
+class ArchiveStore:
+    """Process-wide index of closed months, reloaded when the ``archive`` version moves."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._index: ArchiveIndex | None = None
+
+    def get(self, db: Session) -> ArchiveIndex:
+        """Return the current index, reloading it if a month was closed or reopened.
+
+        The version is read on every call, not through the throttled
+        VersionTracker: a snapshot older than another worker's close, reopen or
+        detach would miss rows, show them twice or point at removed files.
+
+        Args:
+            db: Database session used for the version check and reload
+
+        Returns:
+            Archive index snapshot
+        """
+        version = read_version(db, ARCHIVE_KEY)
+        index = self._index
+        if index is not None and index.version == version:
+            return index
+
+        # Read outside the lock: under AsyncSession.run_sync the query yields to the
+        # event loop, and a request running on the same thread would block on it
+        closed = db.execute(
+            select(
+                ClosedMonth.month,
+                ClosedMonth.file_name,
+                ClosedMonth.detached,
+                ClosedMonth.min_id,
+                ClosedMonth.max_id,
+            )
+        ).all()
+        paths = {c.month: archive_path(c.file_name, detached=c.detached) for c in closed}
+        id_ranges = {c.month: (c.min_id, c.max_id) for c in closed}
+        old = None
+        with self._lock:
+            if self._index is None or self._index.version != version:
+                old, self._index = self._index, ArchiveIndex(version, paths, id_ranges)
+            index = self._index
+        if old is not None:
+            old.close()
+        return index
+
+    def invalidate(self) -> None:
+        """Drop the index (releasing its mappings) so the next get() reloads it."""
+        with self._lock:
+            old, self._index = self._index, None
+        if old is not None:
+            old.close()
+
+
+archive_store = ArchiveStore()
+
+
+def get_archive_index(db: Session) -> ArchiveIndex:
+    """Return the cached index of closed months (see ArchiveStore.get).
+
+    Args:
+        db: Database session
+
+    Returns:
+        Archive index snapshot
+    """
+    return archive_store.get(db)
+
+
+def closed_months(db: Session) -> set[str]:
+    """Read the closed months straight from the database (no cache).
+
+    Args:
+        db: Database session
+
+    Returns:
+        Months in YYYY-MM format
+    """
+    return set(db.scalars(select(ClosedMonth.month)).all())
+
+
+def ensure_months_open(db: Session, months: Iterable[str]) -> None:
+    """Reject a write to closed months.
+
+    Reads ``closed_months`` inside the caller's transaction rather than the cached
+    index, so a month closed by another process a moment ago is still caught.
+
+    Args:
+        db: Database session
+        months: Months the write touches
+
+    Raises:
+        ClosedMonthError: If any of them is closed
+    """
+    months = sorted(set(months))
+    if not months:
+        return
+    closed = db.scalars(
+        select(ClosedMonth.month).where(ClosedMonth.month.in_(months)).order_by(ClosedMonth.month)
+    ).first()
+    if closed is not None:
+        raise ClosedMonthError(f"Mês {closed} está fechado; reabra-o para alterar")
+
+
+def row_position(row: Sequence[Any]) -> tuple[dt.date, int]:
+    """Return the (date, id) sort key of a row in EXPORT_FIELDS order."""
+    return row[1], row[0]
+
+
+def iter_archived_rows(index: ArchiveIndex, flt: RowFilter) -> Iterator[tuple[Any, ...]]:
+    """Yield the archived rows matching a filter, ordered by (date, id) descending.
+
+    Args:
+        index: Archive index snapshot
+        flt: Listing filters
+
+    Yields:
+        Row tuples in EXPORT_FIELDS order
+    """
+    for month in reversed(index.months(flt)):
+        yield from index.open(month).rows(flt)
+
+
+def merge_rows(
+    hot: Iterable[Sequence[Any]], archived: Iterable[Sequence[Any]]
+) -> Iterator[Sequence[Any]]:
+    """Merge two row streams ordered by (date, id) descending, lazily.
+
+    Args:
+        hot: Rows read from ``transactions``
+        archived: Rows read from archives
+
+    Returns:
+        Iterator over both, in (date, id) descending order
+    """
+    return heapq.merge(hot, archived, key=row_position, reverse=True)
+
+
+def merge_archived(
+    index: ArchiveIndex, rows: Sequence[Sequence[Any]], flt: RowFilter, limit: int | None
+) -> Sequence[Sequence[Any]]:
+    """Add the archived rows matching a filter to a page of ``transactions`` rows.
+
+    Args:
+        index: Archive index snapshot
+        rows: Rows already read from ``transactions`` (at most limit + 1)
+        flt: Listing filters
+        limit: Page size, or None for every row
+
+    Returns:
+        The rows unchanged when no closed month can match, else the merged page
+        (at most limit + 1 rows, so the caller can still detect a next page)
+    """
+    if not index.months(flt):
+        return rows
+    merged = merge_rows(rows, iter_archived_rows(index, flt))
+    return list(merged if limit is None else itertools.islice(merged, limit + 1))
@@ -0,0 +1,106 @@
+"""Balance service - stored account balances and their reconciliation."""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.money import to_decimal
+from app.db.models import Account, Transaction
+from app.services.archive import get_archive_index
+
+
+def balance_deltas(rows: Iterable[Mapping[str, Any]], sign: int) -> dict[int, int]:
+    """Aggregate transaction rows into per-account balance deltas.
+
+    Args:
+        rows: Transaction values (account_id, amount_cents)
+        sign: +1 for inserted rows, -1 for deleted rows
+
+    Returns:
+        Dict of account ID -> balance delta in cents
+    """
+    deltas: dict[int, int] = {}
+    for row in rows:
+        account_id = int(row["account_id"])
+        deltas[account_id] = deltas.get(account_id, 0) + sign * row["amount_cents"]
+    return deltas
+
+
+def apply_balance_deltas(db: Session, deltas: Mapping[int, int]) -> None:
+    """Adjust stored balances in place with one executemany UPDATE.
+
+    The increment happens in SQL (``balance_cents = balance_cents + delta``), so concurrent
+    writers never overwrite each other's adjustments.
+
+    Args:
+        db: Database session (the caller commits)
+        deltas: Output of balance_deltas
+    """
+    params = [
+        {"b_id": account_id, "b_delta": delta} for account_id, delta in deltas.items() if delta
+    ]
+    if not params:
+        return
+    table = Account.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(balance_cents=table.c.balance_cents + bindparam("b_delta")),
+        params,
+    )
+
+
+def reconcile_balances(db: Session, *, fix: bool = False) -> list[dict]:
+    """Recompute every balance from the ledger and report accounts that drifted.
+
+    The ledger is ``transactions`` plus the archives of closed months.
+
+    Args:
+        db: Database session
+        fix: Whether to overwrite drifted balances with the ledger value (and commit)
+
+    Returns:
+        List of drifted accounts with stored and ledger balances (as Decimal)
+    """
+    ledger = (
+        select(Transaction.account_id, func.sum(Transaction.amount_cents).label("total"))
+        .group_by(Transaction.account_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(Account.id, Account.balance_cents, func.coalesce(ledger.c.total, 0)).outerjoin(
+            ledger, ledger.c.account_id == Account.id
+        )
+    ).all()
+
+    archived: dict[int, int] = {}
+    index = get_archive_index(db)
+    for month in index.months():
+        for account_id, total in index.open(month).account_totals().items():
+            archived[account_id] = archived.get(account_id, 0) + total
+
+    drift = []
+    for account_id, stored, total in rows:
+        total += archived.get(account_id, 0)
+        if stored != total:
+            drift.append({"account_id": account_id, "stored_cents": stored, "ledger_cents": total})
+
+    if fix and drift:
+        db.execute(
+            update(Account.__table__)
+            .where(Account.__table__.c.id == bindparam("b_id"))
+            .values(balance_cents=bindparam("b_balance")),
+            [{"b_id": d["account_id"], "b_balance": d["ledger_cents"]} for d in drift],
+        )
+        db.commit()
+
+    return [
+        {
+            "account_id": d["account_id"],
+            "stored": to_decimal(d["stored_cents"]),
+            "ledger": to_decimal(d["ledger_cents"]),
+        }
+        for d in drift
+    ]
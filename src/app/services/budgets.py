@@ -0,0 +1,166 @@
+"""Budget service - upserts and month copies as single ON CONFLICT statements.
+
+Budgets are unique per (month, category_id). Writing them with
+``INSERT ... ON CONFLICT (month, category_id) DO UPDATE`` lets the database
+decide between insert and update, so concurrent writers to the same budget
+never collide on ``uq_budget_month_category`` and no SELECT precedes a write.
+Categories are checked against the cached reference data (see
+services/refdata.py), never with a query per budget.
+"""
+
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import BigInteger, Select, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.money import MAX_CENTS
+from app.db.models import Budget
+from app.db.upsert import upsert_insert
+from app.schemas.budgets import BudgetUpsert
+from app.services.archive import closed_months, ensure_months_open
+from app.services.refdata import get_reference_data
+from app.services.versions import mark_changed, month_version_key
+
+
+def check_budget_category(category_kind: str | None) -> None:
+    """Validate the category of a budget.
+
+    Args:
+        category_kind: Kind of the category if it exists and is active, else None
+
+    Raises:
+        ValueError: If the category is invalid/inactive or not an EXPENSE category
+    """
+    if category_kind is None:
+        raise ValueError("Categoria inválida/inativa")
+    if category_kind != "EXPENSE":
+        raise ValueError("Orçamento só é suportado para categorias de despesa no MVP")
+
+
+def _upsert(db: Session, source: Select | None = None) -> Any:
+    stmt = upsert_insert(db, Budget)
+    if source is not None:
+        stmt = stmt.from_select(["month", "category_id", "amount_planned_cents"], source)
+    return stmt.on_conflict_do_update(
+        index_elements=["month", "category_id"],
+        set_={"amount_planned_cents": stmt.excluded.amount_planned_cents},
+    )
+
+
+def upsert_budget(db: Session, payload: BudgetUpsert) -> Budget:
+    """Create or update the budget of a category in a month.
+
+    Args:
+        db: Database session (committed here)
+        payload: Budget data
+
+    Returns:
+        Created or updated budget
+
+    Raises:
+        ValueError: If the category is invalid/inactive or not an EXPENSE category
+        ClosedMonthError: If the month is closed
+    """
+    check_budget_category(get_reference_data(db).category_kind(payload.category_id))
+    ensure_months_open(db, [payload.month])
+    mark_changed(db, [month_version_key(payload.month)])
+    stmt = _upsert(db).values(
+        month=payload.month,
+        category_id=payload.category_id,
+        amount_planned_cents=payload.amount_planned,
+    )
+    budget = db.scalars(stmt.returning(Budget), execution_options={"populate_existing": True}).one()
+    db.commit()
+    return budget
+
+
+def upsert_budgets(db: Session, payloads: Iterable[BudgetUpsert]) -> dict:
+    """Create or update many budgets with one statement.
+
+    Invalid items (category invalid/inactive or not EXPENSE, month closed) are
+    skipped and reported by index; when the same (month, category) appears more
+    than once, the last item wins.
+
+    Args:
+        db: Database session (committed here)
+        payloads: Budget data
+
+    Returns:
+        Dict with the number of upserted budgets and per-item errors
+    """
+    ref = get_reference_data(db)
+    closed = closed_months(db)
+
+    errors: list[dict] = []
+    rows: dict[tuple[str, int], dict[str, Any]] = {}
+    for index, payload in enumerate(payloads):
+        try:
+            check_budget_category(ref.category_kind(payload.category_id))
+        except ValueError as e:
+            errors.append({"index": index, "detail": str(e)})
+            continue
+        if payload.month in closed:
+            errors.append({"index": index, "detail": f"Mês {payload.month} está fechado"})
+            continue
+        # One row per key: PostgreSQL rejects a statement that updates a row twice
+        rows[(payload.month, payload.category_id)] = {
+            "month": payload.month,
+            "category_id": payload.category_id,
+            "amount_planned_cents": payload.amount_planned,
+        }
+
+    if rows:
+        mark_changed(db, [month_version_key(month) for month, _ in rows])
+        db.execute(_upsert(db), list(rows.values()))
+    db.commit()
+    return {"upserted": len(rows), "errors": errors}
+
+
+def copy_budgets(db: Session, from_month: str, to_month: str, scale: Decimal) -> dict:
+    """Copy a month's budgets into another month with one INSERT ... SELECT.
+
+    Budgets already set in the target month for the same categories are
+    overwritten; budgets of categories no longer active are not copied.
+
+    Args:
+        db: Database session (committed here)
+        from_month: Source month (YYYY-MM)
+        to_month: Target month (YYYY-MM)
+        scale: Factor applied to every amount (rounded half up to the cent); at
+            most 4 decimal places keep ``amount * numerator`` within BIGINT
+
+    Returns:
+        Dict with the number of copied budgets
+
+    Raises:
+        ValueError: If both months are the same
+        ClosedMonthError: If the target month is closed
+    """
+    if from_month == to_month:
+        raise ValueError("Meses de origem e destino devem ser diferentes")
+    ensure_months_open(db, [to_month])
+    ref = get_reference_data(db)
+    expense_ids = [
+        cid for cid, entry in ref.categories.items() if entry.active and entry.kind == "EXPENSE"
+    ]
+
+    amount = Budget.amount_planned_cents
+    if scale != 1:
+        # Exact integer arithmetic on the scale's rational parts, rounding half up
+        # (planned amounts are positive, so floor division is the truncation wanted)
+        num, den = scale.as_integer_ratio()
+        amount = (amount * literal(num, BigInteger) + literal(den // 2, BigInteger)) // literal(
+            den, BigInteger
+        )
+    source = select(literal(to_month), Budget.category_id, amount).where(
+        Budget.month == from_month,
+        Budget.category_id.in_(expense_ids),
+        # A scaled amount past the money range would be rejected everywhere else
+        amount < MAX_CENTS,
+    )
+    mark_changed(db, [month_version_key(to_month)])
+    copied = db.execute(_upsert(db, source)).rowcount
+    db.commit()
+    return {"copied": copied}
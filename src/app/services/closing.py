@@ -0,0 +1,282 @@
+"""Month closing - moves finished months between ``transactions`` and archive files.
+
+Closing writes the month's rows and its monthly summary to an archive file (see
+services/archive.py), then deletes the rows and the month's rollups in the same
+DB transaction that records the month in ``closed_months``. Stored balances are
+left alone: the money is still in the accounts, it just no longer lives in the
+live ledger. Reopening reverses it, putting the rows back with their original
+IDs.
+
+Archive files are grouped by year. Once every month of a year is closed, the
+year can be detached: its files move to ARCHIVE_COLD_DIR and only the
+``detached`` flag changes in the database. Reads keep finding them there.
+
+Open months are split by year as well: the live ledger keeps one table per year
+(see db/partitions.py), so closing and reopening a month only touch the table of
+its year.
+"""
+
+import datetime as dt
+import filecmp
+import uuid
+from pathlib import Path
+
+from sqlalchemy import delete, not_, select
+from sqlalchemy.orm import Session
+
+from app.db.models import ClosedMonth, MonthlyRollup, Transaction
+from app.services.archive import (
+    ARCHIVE_KEY,
+    FILE_SUFFIX,
+    ClosedMonthError,
+    MonthArchive,
+    archive_path,
+    archive_store,
+    copy_archive,
+    write_archive,
+)
+from app.services.ledger import insert_rows, ledger_tables
+from app.services.recurring import backfill_pending
+from app.services.reports import range_summary_query
+from app.services.rollups import apply_rollup_deltas, month_key, rollup_deltas
+from app.services.versions import mark_changed, month_version_key
+
+
+def _month_dates(month: str) -> tuple[dt.date, dt.date]:
+    start = dt.date.fromisoformat(f"{month}-01")
+    end = (start + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+    return start, end
+
+
+def _year_months(year: str) -> list[str]:
+    return [f"{year}-{month:02d}" for month in range(1, 13)]
+
+
+def close_month(db: Session, month: str, *, today: dt.date | None = None) -> ClosedMonth:
+    """Move a past month's transactions into its archive file.
+
+    The ``closed_months`` row is written first, so the month is locked against
+    other writers before its rows are read.
+
+    Args:
+        db: Database session (committed here)
+        month: Month in YYYY-MM format
+        today: Reference date for "past month" (defaults to the current date)
+
+    Returns:
+        The closed_months record
+
+    Raises:
+        ValueError: If the month is the current one or in the future, or a
+            transfer of the month has its other leg in another month
+        ClosedMonthError: If the month is already closed
+    """
+    if month >= month_key(today or dt.date.today()):
+        raise ValueError("Só meses anteriores ao atual podem ser fechados")
+    if db.get(ClosedMonth, month) is not None:
+        raise ClosedMonthError(f"Mês {month} já está fechado")
+
+    closed = ClosedMonth(
+        month=month,
+        file_name=f"{month[:4]}/{month}.{uuid.uuid4().hex[:12]}{FILE_SUFFIX}",
+        row_count=0,
+    )
+    db.add(closed)
+    db.flush()
+
+    start, end = _month_dates(month)
+    # Both legs of a transfer share a date; a pair split across partitions could
+    # never be deleted as a whole again
+    in_month = Transaction.date.between(start, end)
+    split = db.scalar(
+        select(Transaction.transfer_pair_id)
+        .where(
+            Transaction.transfer_pair_id.in_(
+                select(Transaction.transfer_pair_id).where(
+                    in_month, Transaction.transfer_pair_id.is_not(None)
+                )
+            ),
+            not_(in_month),
+        )
+        .limit(1)
+    )
+    if split is not None:
+        db.rollback()
+        raise ValueError(f"Transferência {split} tem lançamentos fora de {month}")
+
+    # A month lies in a single year, so at most one partition holds its rows.
+    # Every column is archived, so a reopened month is restored exactly
+    tables = ledger_tables(db, start, end)
+    records = [
+        dict(row)
+        for table in tables
+        for row in db.execute(select(table).where(table.c.date.between(start, end))).mappings()
+    ]
+    summary = [
+        (int(cid), income or 0, expense or 0, planned or 0)
+        for _, cid, _, income, expense, planned in db.execute(range_summary_query(month, month))
+    ]
+
+    path = archive_path(closed.file_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_archive(path, month, records, summary)
+    try:
+        for table in tables:
+            db.execute(delete(table).where(table.c.date.between(start, end)))
+        db.execute(delete(MonthlyRollup.__table__).where(MonthlyRollup.month == month))
+        closed.row_count = len(records)
+        if records:
+            closed.min_id = min(r["id"] for r in records)
+            closed.max_id = max(r["id"] for r in records)
+        mark_changed(db, [ARCHIVE_KEY, month_version_key(month)])
+        db.commit()
+    except Exception:
+        db.rollback()
+        path.unlink(missing_ok=True)
+        raise
+    db.refresh(closed)
+    return closed
+
+
+def reopen_month(db: Session, month: str) -> int:
+    """Move a closed month's rows back into the ledger and drop its archive.
+
+    Recurring occurrences recorded as pending while the month was closed get
+    their transactions in the same DB transaction.
+
+    Args:
+        db: Database session (committed here)
+        month: Month in YYYY-MM format
+
+    Returns:
+        Number of transactions restored
+
+    Raises:
+        ValueError: If the month is not closed
+        ArchiveError: If the archive file cannot be read
+    """
+    closed = db.get(ClosedMonth, month)
+    if closed is None:
+        raise ValueError(f"Mês {month} não está fechado")
+
+    path = archive_path(closed.file_name, detached=closed.detached)
+    archive = MonthArchive(path)
+    try:
+        records = archive.records()
+    finally:
+        archive.close()
+
+    # Rows go back while the month is still marked closed, so the search index
+    # triggers leave their (kept) entries alone
+    insert_rows(db, records)
+    db.delete(closed)
+    # Balances never left the accounts; only the month's rollups come back
+    apply_rollup_deltas(db, rollup_deltas(records, +1))
+    mark_changed(db, [ARCHIVE_KEY, month_version_key(month)])
+    # Recurring occurrences that fell due while the month was closed (the flush
+    # makes the month read as open)
+    db.flush()
+    backfill_pending(db)
+    db.commit()
+
+    # This process's mapping of the file must go before the file can be removed
+    archive_store.invalidate()
+    path.unlink(missing_ok=True)
+    return len(records)
+
+
+def _move_archives(db: Session, closed: list[ClosedMonth], *, detached: bool) -> list[str]:
+    """Copy the files of some closed months between ARCHIVE_DIR and ARCHIVE_COLD_DIR.
+
+    The copies are made first and the old files are removed only after the flag
+    change is committed, so every index snapshot points at a file that exists.
+    Old files are removed by _remove_stale_copies, over every given month: a move
+    interrupted between the commit and the removal is finished by the next call.
+    """
+    pending = [c for c in closed if c.detached != detached]
+    copied: list[Path] = []
+    try:
+        for c in pending:
+            dst = archive_path(c.file_name, detached=detached)
+            copy_archive(archive_path(c.file_name, detached=not detached), dst)
+            copied.append(dst)
+            c.detached = detached
+        if pending:
+            mark_changed(db, [ARCHIVE_KEY])
+        db.commit()
+    except Exception:
+        db.rollback()
+        for path in copied:
+            path.unlink(missing_ok=True)
+        raise
+
+    archive_store.invalidate()
+    _remove_stale_copies(closed)
+    return [c.month for c in pending]
+
+
+def _remove_stale_copies(closed: list[ClosedMonth]) -> None:
+    """Remove the file of each month on the side its ``detached`` flag does not use.
+
+    A file is only removed once the one in use is verified to be identical.
+    """
+    for c in closed:
+        stale = archive_path(c.file_name, detached=not c.detached)
+        current = archive_path(c.file_name, detached=c.detached)
+        if stale.exists() and current.exists() and filecmp.cmp(current, stale, shallow=False):
+            stale.unlink()
+
+
+def detach_year(db: Session, year: str) -> list[str]:
+    """Move the archive files of a fully closed year to ARCHIVE_COLD_DIR.
+
+    Open months and their rows are not touched. Detached months stay readable
+    (from the cold directory) and are only opened by queries that reach them.
+
+    Args:
+        db: Database session (committed here)
+        year: Year in YYYY format
+
+    Returns:
+        Months whose files were moved (empty if the year was already detached)
+
+    Raises:
+        ValueError: If any month of the year is still open
+        ArchiveError: If a file cannot be copied
+    """
+    months = _year_months(year)
+    closed = list(
+        db.scalars(
+            select(ClosedMonth).where(ClosedMonth.month.in_(months)).order_by(ClosedMonth.month)
+        )
+    )
+    still_open = sorted(set(months) - {c.month for c in closed})
+    if still_open:
+        raise ValueError(
+            f"Feche todos os meses de {year} antes de desanexá-lo (abertos: "
+            f"{', '.join(still_open)})"
+        )
+    return _move_archives(db, closed, detached=True)
+
+
+def attach_year(db: Session, year: str) -> list[str]:
+    """Bring the detached archive files of a year back to ARCHIVE_DIR.
+
+    Args:
+        db: Database session (committed here)
+        year: Year in YYYY format
+
+    Returns:
+        Months whose files were moved (empty if none was detached)
+
+    Raises:
+        ArchiveError: If a file cannot be copied
+    """
+    closed = list(
+        db.scalars(
+            select(ClosedMonth)
+            .where(ClosedMonth.month.in_(_year_months(year)))
+            .order_by(ClosedMonth.month)
+        )
+    )
+    return _move_archives(db, closed, detached=False)
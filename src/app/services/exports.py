@@ -0,0 +1,219 @@
+"""Export service - streams transactions as NDJSON or CSV.
+
+Also renders the JSON of the list endpoint. Both work on plain Core row tuples
+(see transactions.listing_columns) instead of ORM objects, so large results cost neither identity
+map bookkeeping nor per-row pydantic validation. Archived rows of closed months
+(see services/archive.py) come in the same tuple shape.
+"""
+
+import csv
+import io
+import itertools
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import Any
+
+from app.core.jsonenc import dumps
+from app.core.money import format_cents, to_wire
+from app.db.models import Transaction
+from app.db.session import get_async_session, get_session
+from app.services.archive import (
+    RowFilter,
+    get_archive_index,
+    iter_archived_rows,
+    merge_rows,
+    row_position,
+)
+from app.services.transactions import listing_columns, listing_queries
+
+# Same fields, in the same order, as TransactionOut
+EXPORT_FIELDS = tuple(col.key for col in listing_columns(Transaction.__table__))
+_AMOUNT = EXPORT_FIELDS.index("amount")
+
+
+def iter_export_rows(flt: RowFilter, chunk_size: int) -> Iterator[tuple[Any, ...]]:
+    """Stream the rows matching a filter through server-side cursors.
+
+    The year partitions the filter overlaps are read one after the other, newest
+    first (see transactions.listing_queries), and matching rows of closed months
+    are merged in from their archives. The session is opened here rather than
+    taken from the request, because the response body is produced after the
+    endpoint has returned.
+
+    Args:
+        flt: Listing filters
+        chunk_size: Rows fetched from the driver per round trip
+
+    Yields:
+        Row tuples in EXPORT_FIELDS order
+    """
+    with get_session() as db:
+        rows: Iterable[Any] = itertools.chain.from_iterable(
+            db.execute(stmt.execution_options(yield_per=chunk_size, stream_results=True)).tuples()
+            for stmt in listing_queries(db, flt)
+        )
+        index = get_archive_index(db)
+        if index.months(flt):
+            rows = merge_rows(rows, iter_archived_rows(index, flt))
+        yield from rows
+
+
+async def aiter_export_batches(flt: RowFilter, chunk_size: int) -> AsyncIterator[list[Any]]:
+    """Stream the rows matching a filter through the async driver (DB_MODE=async).
+
+    Same rows and order as iter_export_rows. Each chunk fetched from a partition
+    is awaited, so a long export holds no threadpool thread; archived rows are
+    merged into the chunk they sort into.
+
+    Args:
+        flt: Listing filters
+        chunk_size: Rows fetched from the driver per round trip
+
+    Yields:
+        Batches of row tuples in EXPORT_FIELDS order
+    """
+    async with get_async_session() as db:
+        queries = await db.run_sync(listing_queries, flt)
+        index = await db.run_sync(get_archive_index)
+        archived = iter_archived_rows(index, flt) if index.months(flt) else iter(())
+        pending = next(archived, None)
+        for stmt in queries:
+            result = await db.stream(stmt.execution_options(yield_per=chunk_size))
+            async for chunk in result.tuples().partitions(chunk_size):
+                bound = row_position(chunk[-1])
+                before = []
+                while pending is not None and row_position(pending) > bound:
+                    before.append(pending)
+                    pending = next(archived, None)
+                yield list(merge_rows(chunk, before)) if before else list(chunk)
+        rest = itertools.chain(() if pending is None else (pending,), archived)
+        for batch in _batched(rest, chunk_size):
+            yield batch
+
+
+def _batched(rows: Iterable[tuple[Any, ...]], size: int) -> Iterator[list[tuple[Any, ...]]]:
+    batch: list[tuple[Any, ...]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def transaction_record(row: tuple[Any, ...]) -> dict[str, Any]:
+    """Map a row tuple to its JSON object (the TransactionOut shape).
+
+    Args:
+        row: Row tuple in EXPORT_FIELDS order
+
+    Returns:
+        Dict of JSON-native values
+    """
+    tx_id, date, description, amount, kind, account_id, category_id, pair_id = row
+    return {
+        "id": tx_id,
+        "date": date.isoformat(),
+        "description": description,
+        "amount": to_wire(amount),
+        "kind": kind,
+        "account_id": account_id,
+        "category_id": category_id,
+        "transfer_pair_id": pair_id,
+    }
+
+
+def render_json(rows: Iterable[tuple[Any, ...]]) -> bytes:
+    """Render rows as one JSON array of transactions.
+
+    Args:
+        rows: Row tuples in EXPORT_FIELDS order
+
+    Returns:
+        Encoded JSON array
+    """
+    return dumps([transaction_record(row) for row in rows])
+
+
+def render_page(rows: Iterable[tuple[Any, ...]], next_cursor: str | None) -> bytes:
+    """Render rows as a page object with the cursor of the next page.
+
+    Args:
+        rows: Row tuples in EXPORT_FIELDS order
+        next_cursor: Cursor of the next page, or None on the last one
+
+    Returns:
+        Encoded JSON object (TransactionPage)
+    """
+    return dumps({"items": [transaction_record(row) for row in rows], "next_cursor": next_cursor})
+
+
+def iter_ndjson(rows: Iterable[tuple[Any, ...]], chunk_size: int) -> Iterator[bytes]:
+    """Render rows as newline-delimited JSON, one body chunk per batch.
+
+    Args:
+        rows: Row tuples in EXPORT_FIELDS order
+        chunk_size: Rows per yielded chunk
+
+    Yields:
+        Encoded NDJSON chunks
+    """
+    for batch in _batched(rows, chunk_size):
+        yield _ndjson_lines(batch)
+
+
+async def aiter_ndjson(batches: AsyncIterator[list[Any]]) -> AsyncIterator[bytes]:
+    """Render batches of rows as newline-delimited JSON, one body chunk per batch.
+
+    Args:
+        batches: Batches of row tuples in EXPORT_FIELDS order
+
+    Yields:
+        Encoded NDJSON chunks
+    """
+    async for batch in batches:
+        yield _ndjson_lines(batch)
+
+
+def _ndjson_lines(batch: list[Any]) -> bytes:
+    return b"".join(dumps(transaction_record(row)) + b"\n" for row in batch)
+
+
+def _csv_lines(batch: list[Any], header: bool = False) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(
+        (*row[:_AMOUNT], format_cents(row[_AMOUNT]), *row[_AMOUNT + 1 :]) for row in batch
+    )
+    return buf.getvalue().encode()
+
+
+def iter_csv(rows: Iterable[tuple[Any, ...]], chunk_size: int) -> Iterator[bytes]:
+    """Render rows as CSV with a header line, one body chunk per batch.
+
+    Args:
+        rows: Row tuples in EXPORT_FIELDS order
+        chunk_size: Rows per yielded chunk
+
+    Yields:
+        Encoded CSV chunks
+    """
+    yield _csv_lines([], header=True)
+    for batch in _batched(rows, chunk_size):
+        yield _csv_lines(batch)
+
+
+async def aiter_csv(batches: AsyncIterator[list[Any]]) -> AsyncIterator[bytes]:
+    """Render batches of rows as CSV with a header line, one body chunk per batch.
+
+    Args:
+        batches: Batches of row tuples in EXPORT_FIELDS order
+
+    Yields:
+        Encoded CSV chunks
+    """
+    yield _csv_lines([], header=True)
+    async for batch in batches:
+        yield _csv_lines(batch)
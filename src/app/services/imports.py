@@ -0,0 +1,357 @@
+"""Import service - streams bank statements (OFX/CSV) into the ledger.
+
+Statements are parsed one record at a time and every imported row carries a
+fingerprint of (account, date, amount, normalized description). The fingerprint
+column has a unique index, so re-importing an overlapping statement only costs
+one indexed lookup per chunk instead of a comparison against the whole ledger.
+"""
+
+import codecs
+import csv
+import datetime as dt
+import hashlib
+import io
+import re
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.money import to_cents
+from app.core.text import normalize_description
+from app.services.archive import closed_months
+from app.services.ledger import insert_transactions, ledger_tables
+from app.services.rollups import month_key
+from app.services.rules import get_rule_matcher
+from app.services.transactions import load_reference_data
+
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+_OFX_READ_SIZE = 64 * 1024
+
+_CSV_DATE_COLUMNS = ("data", "date", "data lancamento", "data de lancamento", "dt")
+_CSV_DESCRIPTION_COLUMNS = ("descricao", "description", "historico", "lancamento", "memo")
+_CSV_AMOUNT_COLUMNS = ("valor", "amount", "value", "valor (r$)")
+_CSV_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y")
+
+
+@dataclass(frozen=True, slots=True)
+class StatementRecord:
+    """One parsed statement line."""
+
+    date: dt.date
+    amount: Decimal
+    description: str
+
+
+def fingerprint(
+    account_id: int, date: dt.date, amount: Decimal, description: str, occurrence: int = 0
+) -> str:
+    """Compute the dedupe fingerprint of a statement line.
+
+    ``occurrence`` tells apart identical lines within the same statement (two equal
+    coffees on the same day), so they are not collapsed into one.
+
+    Args:
+        account_id: Account the statement belongs to
+        date: Posting date
+        amount: Signed amount
+        description: Raw description
+        occurrence: Number of identical lines seen before this one in the statement
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    key = (
+        f"{account_id}|{date.isoformat()}|{amount.quantize(Decimal('0.01'))}|"
+        f"{normalize_description(description)}|{occurrence}"
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def parse_amount(raw: str) -> Decimal:
+    """Parse a bank amount in either Brazilian (1.234,56) or dotted (1,234.56) notation.
+
+    Args:
+        raw: Amount text, optionally with currency symbol
+
+    Returns:
+        Decimal amount
+
+    Raises:
+        ValueError: If the text is not a number
+    """
+    text = raw.replace("R$", "").replace(" ", "").replace("\xa0", "")
+    if "," in text and "." in text:
+        # Whichever separator comes last is the decimal one
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "," in text:
+        text = text.replace(",", ".")
+    try:
+        return Decimal(text)
+    except InvalidOperation as e:
+        raise ValueError(f"Valor inválido: {raw!r}") from e
+
+
+def _parse_ofx_date(raw: str) -> dt.date:
+    # DTPOSTED looks like 20260105, 20260105120000 or 20260105120000[-3:BRT]
+    try:
+        return dt.datetime.strptime(raw[:8], "%Y%m%d").date()
+    except ValueError as e:
+        raise ValueError(f"Data inválida: {raw!r}") from e
+
+
+def _sniff_ofx_encoding(head: bytes) -> str:
+    upper = head.upper()
+    if b"CHARSET:1252" in upper:
+        return "cp1252"
+    if b"CHARSET:ISO-8859-1" in upper or b"CHARSET:8859-1" in upper:
+        return "latin-1"
+    return "utf-8"
+
+
+def _iter_ofx_tokens(fp: IO[bytes]) -> Iterator[tuple[bool, str, str]]:
+    head = fp.read(_OFX_READ_SIZE)
+    decoder = codecs.getincrementaldecoder(_sniff_ofx_encoding(head))(errors="replace")
+    pending = decoder.decode(head)
+
+    while True:
+        chunk = fp.read(_OFX_READ_SIZE)
+        pending += decoder.decode(chunk, final=not chunk)
+        # Only tokenize up to the last "<" so a tag split across reads is kept whole
+        cut = len(pending) if not chunk else pending.rfind("<")
+        if cut > 0:
+            for m in _OFX_TOKEN.finditer(pending, 0, cut):
+                yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+            pending = pending[cut:]
+        if not chunk:
+            return
+
+
+def iter_ofx_records(fp: IO[bytes]) -> Iterator[tuple[int, StatementRecord | str]]:
+    """Stream the transactions of an OFX (1.x SGML or 2.x XML) statement.
+
+    Args:
+        fp: Binary file with the statement
+
+    Yields:
+        Tuples of (record index, parsed record or error message)
+    """
+    index = 0
+    current: dict[str, str] | None = None
+
+    for closing, tag, value in _iter_ofx_tokens(fp):
+        if tag == "STMTTRN":
+            if not closing:
+                current = {}
+                continue
+            if current is not None:
+                yield index, _ofx_record(current)
+                index += 1
+            current = None
+        elif current is not None and not closing and value:
+            current[tag] = value
+
+
+def _ofx_record(fields: dict[str, str]) -> StatementRecord | str:
+    try:
+        date = _parse_ofx_date(fields.get("DTPOSTED", ""))
+        amount = parse_amount(fields.get("TRNAMT", ""))
+    except ValueError as e:
+        return str(e)
+    parts = [fields[k] for k in ("NAME", "MEMO") if fields.get(k)]
+    if len(parts) == 2 and parts[0] == parts[1]:
+        parts = parts[:1]
+    return StatementRecord(date=date, amount=amount, description=" - ".join(parts))
+
+
+def _normalize_header(name: str) -> str:
+    return normalize_description(name.lstrip("\ufeff"))
+
+
+def _pick_column(header: list[str], candidates: tuple[str, ...]) -> int | None:
+    for i, name in enumerate(header):
+        if name in candidates:
+            return i
+    return None
+
+
+def _parse_csv_date(raw: str) -> dt.date:
+    for fmt in _CSV_DATE_FORMATS:
+        try:
+            return dt.datetime.strptime(raw.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida: {raw!r}")
+
+
+def iter_csv_records(
+    fp: IO[bytes], encoding: str = "utf-8"
+) -> Iterator[tuple[int, StatementRecord | str]]:
+    """Stream the lines of a bank CSV statement.
+
+    The delimiter (``;`` or ``,``) is detected from the header, and columns are
+    found by name (data/date, descrição/histórico/description, valor/amount).
+
+    Args:
+        fp: Binary file with the statement
+        encoding: Text encoding of the file
+
+    Yields:
+        Tuples of (record index, parsed record or error message)
+
+    Raises:
+        ValueError: If the header lacks a date, description or amount column
+    """
+    text = io.TextIOWrapper(fp, encoding=encoding, errors="replace", newline="")
+    try:
+        first = text.readline()
+        delimiter = ";" if first.count(";") > first.count(",") else ","
+        header = [_normalize_header(h) for h in next(csv.reader([first], delimiter=delimiter))]
+
+        date_col = _pick_column(header, _CSV_DATE_COLUMNS)
+        desc_col = _pick_column(header, _CSV_DESCRIPTION_COLUMNS)
+        amount_col = _pick_column(header, _CSV_AMOUNT_COLUMNS)
+        if date_col is None or desc_col is None or amount_col is None:
+            raise ValueError("CSV deve ter colunas de data, descrição e valor")
+
+        width = max(date_col, desc_col, amount_col) + 1
+        for index, row in enumerate(csv.reader(text, delimiter=delimiter)):
+            if len(row) < width:
+                yield index, "Linha com colunas faltando"
+                continue
+            try:
+                record = StatementRecord(
+                    date=_parse_csv_date(row[date_col]),
+                    amount=parse_amount(row[amount_col]),
+                    description=row[desc_col].strip(),
+                )
+            except ValueError as e:
+                yield index, str(e)
+                continue
+            yield index, record
+    finally:
+        # Leave the underlying file to its owner
+        text.detach()
+
+
+def import_statement(
+    db: Session,
+    records: Iterator[tuple[int, StatementRecord | str]],
+    *,
+    account_id: int,
+    income_category_id: int | None,
+    expense_category_id: int | None,
+    chunk_size: int,
+) -> dict:
+    """Import statement records into an account, skipping lines already imported.
+
+    Credits become INCOME and debits become EXPENSE, in the category of the first
+    matching category rule (see services/rules.py) or else in
+    ``income_category_id``/``expense_category_id``; a line with neither is reported
+    as an error. Each chunk costs one indexed fingerprint lookup plus one
+    executemany insert; everything is committed together at the end.
+
+    Args:
+        db: Database session
+        records: Parsed records as produced by iter_ofx_records/iter_csv_records
+        account_id: Target account
+        income_category_id: Category for credits no rule matches
+        expense_category_id: Category for debits no rule matches
+        chunk_size: Records per dedupe lookup / insert batch
+
+    Returns:
+        Dict with inserted and duplicate counts and per-record errors
+
+    Raises:
+        ValueError: If the account or categories are invalid/inactive or of the wrong kind
+    """
+    accounts, categories = load_reference_data(db)
+    if account_id not in accounts:
+        raise ValueError("Conta inválida/inativa")
+    if income_category_id is not None and categories.get(income_category_id) != "INCOME":
+        raise ValueError("Categoria de receita inválida/inativa")
+    if expense_category_id is not None and categories.get(expense_category_id) != "EXPENSE":
+        raise ValueError("Categoria de despesa inválida/inativa")
+    closed = closed_months(db)
+    matcher = get_rule_matcher(db)
+
+    inserted = 0
+    duplicates = 0
+    errors: list[dict] = []
+    occurrences: Counter[tuple[dt.date, Decimal, str]] = Counter()
+    chunk: list[dict[str, Any]] = []
+
+    def flush() -> None:
+        nonlocal inserted, duplicates
+        if not chunk:
+            return
+        # The fingerprint covers the date, so a duplicate is in the partition of its year
+        fingerprints = [row["fingerprint"] for row in chunk]
+        dates = [row["date"] for row in chunk]
+        existing: set[str] = set()
+        for table in ledger_tables(db, min(dates), max(dates)):
+            existing.update(
+                db.scalars(select(table.c.fingerprint).where(table.c.fingerprint.in_(fingerprints)))
+            )
+        fresh = [row for row in chunk if row["fingerprint"] not in existing]
+        insert_transactions(db, fresh)
+        inserted += len(fresh)
+        duplicates += len(chunk) - len(fresh)
+        chunk.clear()
+
+    for index, record in records:
+        if isinstance(record, str):
+            errors.append({"index": index, "detail": record})
+            continue
+        if record.amount == 0:
+            errors.append({"index": index, "detail": "Valor zero não é importado"})
+            continue
+        if month_key(record.date) in closed:
+            errors.append({"index": index, "detail": f"Mês {month_key(record.date)} está fechado"})
+            continue
+
+        amount = record.amount.quantize(Decimal("0.01"))
+        try:
+            cents = to_cents(amount)
+        except ValueError as e:
+            errors.append({"index": index, "detail": str(e)})
+            continue
+        description = record.description[:255]
+        kind = "INCOME" if amount > 0 else "EXPENSE"
+        category_id = matcher.match(description, kind, account_id, cents)
+        if category_id is None:
+            category_id = income_category_id if kind == "INCOME" else expense_category_id
+        if category_id is None:
+            errors.append({"index": index, "detail": "Nenhuma regra de categoria aplicável"})
+            continue
+        key = (record.date, amount, normalize_description(description))
+        occurrence = occurrences[key]
+        occurrences[key] += 1
+
+        chunk.append(
+            {
+                "date": record.date,
+                "description": description,
+                "amount_cents": cents,
+                "kind": kind,
+                "account_id": account_id,
+                "category_id": category_id,
+                "fingerprint": fingerprint(
+                    account_id, record.date, amount, description, occurrence
+                ),
+            }
+        )
+        if len(chunk) >= chunk_size:
+            flush()
+
+    flush()
+    db.commit()
+
+    return {"inserted": inserted, "duplicates": duplicates, "errors": errors}
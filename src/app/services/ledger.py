@@ -0,0 +1,267 @@
+"""Ledger service - single entry point for writes to ``transactions``.
+
+The ledger is stored as one table per year (see db/partitions.py), and this
+module is its routing layer: rows are written to, looked up in and deleted from
+the partition of their date, and readers ask it which partitions overlap their
+dates instead of reading the ``transactions`` view. A partition is created by
+the first write of its year.
+
+Every path that inserts or deletes transactions goes through these functions,
+so data derived from the ledger (monthly rollups, account balances and the data
+versions of the touched months) is updated in the same DB transaction as the
+rows themselves. Writes to closed months are rejected here as well.
+"""
+
+import datetime as dt
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sqlalchemy import RowMapping, Table, bindparam, case, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import LedgerPartition, LedgerSequence
+from app.db.partitions import create_partition, partition_table, replace_view
+from app.db.upsert import upsert_insert
+from app.services.archive import ensure_months_open
+from app.services.balances import apply_balance_deltas, balance_deltas
+from app.services.rollups import apply_rollup_deltas, month_key, rollup_deltas
+from app.services.versions import mark_changed, month_version_key
+
+
+def partition_years(
+    db: Session, from_date: dt.date | None = None, to_date: dt.date | None = None
+) -> list[int]:
+    """Return the years whose partition overlaps a date range, newest first.
+
+    Args:
+        db: Database session
+        from_date: First date of the range (None for no lower bound)
+        to_date: Last date of the range (None for no upper bound)
+
+    Returns:
+        Years with a partition table
+    """
+    stmt = select(LedgerPartition.year).order_by(LedgerPartition.year.desc())
+    if from_date is not None:
+        stmt = stmt.where(LedgerPartition.year >= from_date.year)
+    if to_date is not None:
+        stmt = stmt.where(LedgerPartition.year <= to_date.year)
+    return list(db.scalars(stmt))
+
+
+def ledger_tables(
+    db: Session, from_date: dt.date | None = None, to_date: dt.date | None = None
+) -> list[Table]:
+    """Return the partition tables overlapping a date range, newest first.
+
+    Partitions hold disjoint years, so reading them in this order and each one
+    by (date, id) descending yields the whole range in that order.
+
+    Args:
+        db: Database session
+        from_date: First date of the range (None for no lower bound)
+        to_date: Last date of the range (None for no upper bound)
+
+    Returns:
+        Partition tables
+    """
+    return [partition_table(year) for year in partition_years(db, from_date, to_date)]
+
+
+def _allocate_ids(db: Session, count: int) -> int:
+    """Reserve ``count`` consecutive transaction IDs and return the first one."""
+    table = LedgerSequence.__table__
+    stmt = (
+        upsert_insert(db, table)
+        .values(id=1, last_id=count)
+        .on_conflict_do_update(
+            index_elements=[table.c.id], set_={"last_id": table.c.last_id + count}
+        )
+        .returning(table.c.last_id)
+    )
+    return db.execute(stmt).scalar_one() - count + 1
+
+
+def _claim_ids(db: Session, year: int, ids: list[int]) -> None:
+    """Widen a year's recorded ID range, creating its partition on the first write."""
+    low, high = min(ids), max(ids)
+    table = LedgerPartition.__table__
+    widened = db.execute(
+        update(table)
+        .where(table.c.year == year)
+        .values(
+            min_id=case((table.c.min_id > low, low), else_=table.c.min_id),
+            max_id=case((table.c.max_id < high, high), else_=table.c.max_id),
+        )
+    ).rowcount
+    if widened:
+        return
+    connection = db.connection()
+    create_partition(connection, year)
+    db.execute(insert(table).values(year=year, min_id=low, max_id=high))
+    replace_view(connection, partition_years(db))
+
+
+def _by_year(rows: Iterable[Mapping[str, Any]]) -> dict[int, list[Mapping[str, Any]]]:
+    groups: dict[int, list[Mapping[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(row["date"].year, []).append(row)
+    return groups
+
+
+def insert_rows(db: Session, rows: list[dict[str, Any]]) -> None:
+    """Write rows to the partitions of their years, leaving derived data alone.
+
+    Rows without an ``id`` get the next ones from ``ledger_sequence`` (set in
+    their dicts, so callers can read them back).
+
+    Args:
+        db: Database session (the caller commits)
+        rows: Column values keyed by Transaction attribute name
+    """
+    if not rows:
+        return
+    fresh = [row for row in rows if row.get("id") is None]
+    if fresh:
+        first = _allocate_ids(db, len(fresh))
+        for offset, row in enumerate(fresh):
+            row["id"] = first + offset
+    for year, group in sorted(_by_year(rows).items()):
+        _claim_ids(db, year, [row["id"] for row in group])
+        db.execute(insert(partition_table(year)), group)
+
+
+def delete_rows(db: Session, rows: Iterable[Mapping[str, Any]]) -> None:
+    """Delete rows by ID from the partitions of their dates, leaving derived data alone.
+
+    Args:
+        db: Database session (the caller commits)
+        rows: Rows with at least id and date
+    """
+    for year, group in sorted(_by_year(rows).items()):
+        table = partition_table(year)
+        db.execute(delete(table).where(table.c.id.in_([row["id"] for row in group])))
+
+
+def set_categories(db: Session, rows: list[Mapping[str, Any]]) -> None:
+    """Change the category of rows in place, one executemany per partition.
+
+    Derived data is the caller's (a category change is a delete plus an insert
+    for the rollups).
+
+    Args:
+        db: Database session (the caller commits)
+        rows: Rows with id, date and the new category_id
+    """
+    for year, group in sorted(_by_year(rows).items()):
+        table = partition_table(year)
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("tx_id"))
+            .values(category_id=bindparam("new_category_id"))
+        )
+        db.execute(stmt, [{"tx_id": r["id"], "new_category_id": r["category_id"]} for r in group])
+
+
+def find_transaction(db: Session, tx_id: int) -> RowMapping | None:
+    """Look a transaction up by ID in the partitions whose ID range contains it.
+
+    Args:
+        db: Database session
+        tx_id: Transaction ID
+
+    Returns:
+        Every column of the row, or None if no open month holds it
+    """
+    years = db.scalars(
+        select(LedgerPartition.year)
+        .where(LedgerPartition.min_id <= tx_id, LedgerPartition.max_id >= tx_id)
+        .order_by(LedgerPartition.year.desc())
+    ).all()
+    for year in years:
+        table = partition_table(year)
+        row = db.execute(select(table).where(table.c.id == tx_id)).mappings().one_or_none()
+        if row is not None:
+            return row
+    return None
+
+
+def find_transfer(db: Session, pair_id: str, date: dt.date) -> list[RowMapping]:
+    """Return both legs of a transfer (they share the date, hence the partition).
+
+    Args:
+        db: Database session
+        pair_id: Transfer pair ID
+        date: Date of the transfer
+
+    Returns:
+        Every column of each leg
+    """
+    table = partition_table(date.year)
+    stmt = select(table).where(table.c.transfer_pair_id == pair_id, table.c.date == date)
+    return list(db.execute(stmt).mappings())
+
+
+def _touch_months(db: Session, rows: list[Mapping[str, Any]]) -> None:
+    months = {month_key(row["date"]) for row in rows}
+    ensure_months_open(db, months)
+    mark_changed(db, [month_version_key(month) for month in months])
+
+
+def record_inserts(db: Session, rows: Iterable[Mapping[str, Any]]) -> None:
+    """Update derived data for rows just added to the ledger.
+
+    Args:
+        db: Database session (the caller commits)
+        rows: Transaction values (date, account_id, category_id, kind, amount_cents)
+
+    Raises:
+        ClosedMonthError: If a row falls in a closed month
+    """
+    rows = list(rows)
+    _touch_months(db, rows)
+    apply_rollup_deltas(db, rollup_deltas(rows, +1))
+    apply_balance_deltas(db, balance_deltas(rows, +1))
+
+
+def record_deletes(db: Session, rows: Iterable[Mapping[str, Any]]) -> None:
+    """Update derived data for rows just removed from the ledger.
+
+    Args:
+        db: Database session (the caller commits)
+        rows: Transaction values (date, account_id, category_id, kind, amount_cents)
+
+    Raises:
+        ClosedMonthError: If a row falls in a closed month
+    """
+    rows = list(rows)
+    _touch_months(db, rows)
+    apply_rollup_deltas(db, rollup_deltas(rows, -1))
+    apply_balance_deltas(db, balance_deltas(rows, -1))
+
+
+def insert_transactions(db: Session, rows: list[dict[str, Any]]) -> None:
+    """Insert transaction rows (one executemany per year) and update derived data.
+
+    Args:
+        db: Database session (the caller commits)
+        rows: Column values keyed by Transaction attribute name; each dict gets its ``id``
+    """
+    if not rows:
+        return
+    insert_rows(db, rows)
+    record_inserts(db, rows)
+
+
+def delete_transactions(db: Session, rows: list[Mapping[str, Any]]) -> None:
+    """Delete transaction rows from their partitions and update derived data.
+
+    Args:
+        db: Database session (the caller commits)
+        rows: Rows as returned by find_transaction / find_transfer
+
+    Raises:
+        ClosedMonthError: If a row falls in a closed month
+    """
+    record_deletes(db, rows)
+    delete_rows(db, rows)
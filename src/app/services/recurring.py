@@ -0,0 +1,317 @@
+"""Recurring transactions - templates and batched materialization of their occurrences.
+
+A run computes every due date of every active template in memory, starting
+after the last date already materialized, and writes them with one
+``INSERT ... ON CONFLICT DO NOTHING RETURNING`` into ``recurring_occurrences``.
+Only the occurrences that statement actually inserted become transactions
+(through the ledger's executemany insert), so concurrent or repeated runs never
+create the same occurrence twice, and years of occurrences cost a handful of
+statements.
+
+Occurrences due in a closed month are recorded as ``pending``, without a
+transaction. Reopening the month (and any later run) turns the pending
+occurrences of open months into transactions, so none is lost.
+
+Runs happen on demand (POST /recurring/materialize, ``python -m app.cli
+recurring materialize``) or from the in-process scheduler started by the app
+when RECURRING_INTERVAL_SECONDS is set.
+"""
+
+import asyncio
+import calendar
+import datetime as dt
+import itertools
+import logging
+import threading
+from typing import Any
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import RecurringOccurrence, RecurringTemplate
+from app.db.session import get_session
+from app.db.upsert import upsert_insert
+from app.schemas.recurring import RecurrenceUnit, RecurringCreate
+from app.services.archive import closed_months
+from app.services.ledger import insert_transactions
+from app.services.refdata import RefData, get_reference_data
+from app.services.rollups import month_key
+from app.services.transactions import check_transaction_fields, check_transaction_refs
+
+logger = logging.getLogger("app.recurring")
+
+# The scheduler and on-demand runs of one process take turns instead of
+# contending for the SQLite write lock
+_run_lock = threading.Lock()
+
+
+def _add_months(date: dt.date, months: int) -> dt.date:
+    total = date.year * 12 + date.month - 1 + months
+    year, month = divmod(total, 12)
+    day = min(date.day, calendar.monthrange(year, month + 1)[1])
+    return dt.date(year, month + 1, day)
+
+
+def occurrence_dates(
+    template: RecurringTemplate, *, after: dt.date | None, until: dt.date
+) -> list[dt.date]:
+    """List the due dates of a template in a period.
+
+    Occurrence ``k`` is ``start_date`` plus ``k * interval`` units; monthly dates
+    keep the start day, moved back to the last day of shorter months.
+
+    Args:
+        template: Recurring template
+        after: Only dates after this one (None = from ``start_date``)
+        until: Last date to include
+
+    Returns:
+        Due dates, ascending
+    """
+    start, every = template.start_date, template.interval
+    last = min(until, template.end_date) if template.end_date is not None else until
+    if template.unit == RecurrenceUnit.MONTH:
+
+        def nth(k: int) -> dt.date:
+            return _add_months(start, k * every)
+
+        elapsed = 0 if after is None else (after.year - start.year) * 12 + after.month - start.month
+    else:
+        unit_days = 7 if template.unit == RecurrenceUnit.WEEK else 1
+
+        def nth(k: int) -> dt.date:
+            return start + dt.timedelta(days=k * every * unit_days)
+
+        elapsed = 0 if after is None else (after - start).days // unit_days
+
+    # Jump to the last occurrence not after ``after``, then step forward
+    k = max(elapsed // every, 0)
+    dates: list[dt.date] = []
+    while (date := nth(k)) <= last:
+        if after is None or date > after:
+            dates.append(date)
+        k += 1
+    return dates
+
+
+def create_template(db: Session, payload: RecurringCreate) -> RecurringTemplate:
+    """Create a recurring template after the checks POST /transactions applies.
+
+    Args:
+        db: Database session (committed here)
+        payload: Template data
+
+    Returns:
+        Created template (nothing is materialized yet)
+
+    Raises:
+        ValueError: For an invalid kind/amount or an invalid/inactive account or category
+    """
+    first = payload.as_transaction()
+    check_transaction_fields(first)
+    ref = get_reference_data(db)
+    check_transaction_refs(
+        first,
+        account_active=ref.account_active(payload.account_id),
+        category_kind=ref.category_kind(payload.category_id),
+    )
+    stmt = insert(RecurringTemplate).values(
+        description=payload.description,
+        amount_cents=payload.amount,
+        kind=payload.kind.value,
+        account_id=payload.account_id,
+        category_id=payload.category_id,
+        unit=payload.unit.value,
+        interval=payload.interval,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+    )
+    template = db.scalars(stmt.returning(RecurringTemplate)).one()
+    db.commit()
+    return template
+
+
+def check_until(until: dt.date) -> None:
+    """Validate the last date of a run.
+
+    Args:
+        until: Last date to generate
+
+    Raises:
+        ValueError: If the date is more than RECURRING_MAX_HORIZON_DAYS past today
+    """
+    limit = dt.date.today() + dt.timedelta(days=settings.recurring_max_horizon_days)
+    if until > limit:
+        raise ValueError(f"until deve ser no máximo {limit.isoformat()}")
+
+
+def materialize(db: Session, until: dt.date) -> dict:
+    """Generate every due occurrence of the active templates up to a date.
+
+    Templates whose account or category is no longer active are left for a later
+    run. Dates falling in closed months are recorded as pending occurrences and
+    counted as skipped by the run that found them; their transactions are created
+    once the month is reopened (see backfill_pending).
+
+    Args:
+        db: Database session (committed here)
+        until: Last date to generate
+
+    Returns:
+        Dict with the number of generated transactions (pending occurrences of
+        reopened months included) and newly skipped occurrences
+
+    Raises:
+        ValueError: If ``until`` is past the maximum horizon (see check_until)
+    """
+    check_until(until)
+    with _run_lock:
+        return _materialize(db, until)
+
+
+def _active_templates(db: Session, until: dt.date | None = None) -> dict[int, RecurringTemplate]:
+    stmt = select(RecurringTemplate).where(RecurringTemplate.active.is_(True))
+    if until is not None:
+        stmt = stmt.where(RecurringTemplate.start_date <= until)
+    return {t.id: t for t in db.scalars(stmt)}
+
+
+def _refs_active(template: RecurringTemplate, ref: RefData) -> bool:
+    return ref.account_active(template.account_id) and (
+        ref.category_kind(template.category_id) == template.kind
+    )
+
+
+def _transaction_row(template: RecurringTemplate, date: dt.date) -> dict[str, Any]:
+    return {
+        "date": date,
+        "description": template.description,
+        "amount_cents": template.amount_cents,
+        "kind": template.kind,
+        "account_id": template.account_id,
+        "category_id": template.category_id,
+    }
+
+
+def _backfill(
+    db: Session,
+    templates: dict[int, RecurringTemplate],
+    ref: RefData,
+    closed: set[str],
+) -> int:
+    table = RecurringOccurrence.__table__
+    pending = db.execute(
+        select(table.c.template_id, table.c.occurrence_date).where(table.c.pending.is_(True))
+    ).all()
+    keys: list[dict[str, Any]] = []
+    rows: list[dict[str, Any]] = []
+    for template_id, date in pending:
+        template = templates.get(template_id)
+        if template is None or month_key(date) in closed or not _refs_active(template, ref):
+            continue
+        keys.append({"t": template_id, "d": date})
+        rows.append(_transaction_row(template, date))
+    if keys:
+        db.execute(
+            update(table)
+            .where(table.c.template_id == bindparam("t"), table.c.occurrence_date == bindparam("d"))
+            .values(pending=False),
+            keys,
+        )
+    insert_transactions(db, rows)
+    return len(rows)
+
+
+def backfill_pending(db: Session) -> int:
+    """Create the transactions of pending occurrences whose month is open again.
+
+    Occurrences of inactive templates, or of templates whose account or category
+    is inactive, stay pending for a later run.
+
+    Args:
+        db: Database session (the caller commits)
+
+    Returns:
+        Number of transactions created
+    """
+    with _run_lock:
+        return _backfill(db, _active_templates(db), get_reference_data(db), closed_months(db))
+
+
+def _materialize(db: Session, until: dt.date) -> dict:
+    templates = _active_templates(db, until)
+    last_dates = dict(
+        db.execute(
+            select(RecurringOccurrence.template_id, func.max(RecurringOccurrence.occurrence_date))
+            .where(RecurringOccurrence.template_id.in_(list(templates)))
+            .group_by(RecurringOccurrence.template_id)
+        ).all()
+    )
+    ref = get_reference_data(db)
+    closed = closed_months(db)
+    generated = _backfill(db, templates, ref, closed)
+
+    due: list[dict[str, Any]] = []
+    for template in templates.values():
+        if not _refs_active(template, ref):
+            continue
+        for date in occurrence_dates(template, after=last_dates.get(template.id), until=until):
+            due.append(
+                {
+                    "template_id": template.id,
+                    "occurrence_date": date,
+                    "pending": month_key(date) in closed,
+                }
+            )
+
+    skipped = 0
+    table = RecurringOccurrence.__table__
+    stmt = (
+        upsert_insert(db, table)
+        .on_conflict_do_nothing(index_elements=["template_id", "occurrence_date"])
+        .returning(table.c.template_id, table.c.occurrence_date, table.c.pending)
+    )
+    chunks = iter(due)
+    while chunk := list(itertools.islice(chunks, settings.bulk_insert_chunk_size)):
+        # Occurrences another run inserted first come back absent and are not repeated
+        rows = []
+        for template_id, date, pending in db.execute(stmt, chunk):
+            if pending:
+                skipped += 1
+            else:
+                rows.append(_transaction_row(templates[template_id], date))
+        insert_transactions(db, rows)
+        generated += len(rows)
+    db.commit()
+    return {"generated": generated, "skipped": skipped}
+
+
+def materialize_due() -> dict:
+    """Materialize up to today plus RECURRING_HORIZON_DAYS in a new session.
+
+    Returns:
+        Result of materialize
+    """
+    days = min(settings.recurring_horizon_days, settings.recurring_max_horizon_days)
+    until = dt.date.today() + dt.timedelta(days=days)
+    with get_session() as db:
+        return materialize(db, until)
+
+
+async def run_scheduler(interval_seconds: float) -> None:
+    """Materialize due occurrences periodically until cancelled.
+
+    The work runs in a worker thread, so the event loop keeps serving requests.
+
+    Args:
+        interval_seconds: Pause between two runs
+    """
+    while True:
+        try:
+            result = await asyncio.to_thread(materialize_due)
+            if result["generated"]:
+                logger.info("recurring: %d transações geradas", result["generated"])
+        except Exception:
+            logger.exception("recurring: falha ao gerar ocorrências")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,117 @@
+"""Reference-data cache - active accounts and categories kept in memory.
+
+Accounts and categories are a few dozen rows that rarely change but are checked
+on every ledger write. Each process keeps a snapshot of them and reloads it only
+when the ``refdata`` data version moves (see ``app.services.versions``), so the
+insert path normally runs no queries at all.
+
+``PRAGMA data_version`` is not used because it changes on every commit from any
+connection, ledger inserts included, which would invalidate the cache constantly.
+"""
+
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, Category
+from app.services.versions import mark_changed, version_tracker
+
+REFDATA_KEY = "refdata"
+
+
+@dataclass(frozen=True, slots=True)
+class RefEntry:
+    """Cached view of one account or category."""
+
+    id: int
+    kind: str
+    active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class RefData:
+    """Snapshot of every account and category."""
+
+    version: int
+    accounts: dict[int, RefEntry]
+    categories: dict[int, RefEntry]
+
+    def account_active(self, account_id: int | None) -> bool:
+        """Tell whether an account exists and is active."""
+        entry = self.accounts.get(account_id) if account_id is not None else None
+        return entry is not None and entry.active
+
+    def category_kind(self, category_id: int | None) -> str | None:
+        """Return the kind of an active category, or None if missing/inactive."""
+        entry = self.categories.get(category_id) if category_id is not None else None
+        return entry.kind if entry is not None and entry.active else None
+
+
+def _load(db: Session, version: int) -> RefData:
+    accounts = {
+        int(aid): RefEntry(int(aid), kind, bool(active))
+        for aid, kind, active in db.execute(select(Account.id, Account.type, Account.active))
+    }
+    categories = {
+        int(cid): RefEntry(int(cid), kind, bool(active))
+        for cid, kind, active in db.execute(select(Category.id, Category.kind, Category.active))
+    }
+    return RefData(version=version, accounts=accounts, categories=categories)
+
+
+class ReferenceCache:
+    """Process-wide snapshot of reference data, reloaded when its version moves."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data: RefData | None = None
+
+    def get(self, db: Session) -> RefData:
+        """Return the current snapshot, reloading it if any writer changed the data.
+
+        Args:
+            db: Database session used for the version check and reload
+
+        Returns:
+            Reference data snapshot
+        """
+        version = version_tracker.get(db, REFDATA_KEY)
+        data = self._data
+        if data is not None and data.version == version:
+            return data
+
+        with self._lock:
+            if self._data is None or self._data.version != version:
+                self._data = _load(db, version)
+            return self._data
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next get() reloads it."""
+        with self._lock:
+            self._data = None
+
+
+reference_cache = ReferenceCache()
+
+
+def get_reference_data(db: Session) -> RefData:
+    """Return the cached reference data (see ReferenceCache.get).
+
+    Args:
+        db: Database session
+
+    Returns:
+        Reference data snapshot
+    """
+    return reference_cache.get(db)
+
+
+def mark_reference_data_changed(db: Session) -> None:
+    """Record an account/category change made in the current DB transaction.
+
+    Args:
+        db: Database session (the caller commits)
+    """
+    mark_changed(db, [REFDATA_KEY])
@@ -1,28 +1,156 @@
 """Report service - generates financial reports."""
 
-import calendar
-import datetime as dt
+import threading
+from collections import OrderedDict
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import BigInteger, Select, case, func, literal, select, union_all
 from sqlalchemy.orm import Session
 
-from app.db.models import Budget, Category, Transaction
+from app.core.config import settings
+from app.core.money import to_wire
+from app.db.models import Budget, Category, MonthlyRollup
+from app.services.archive import get_archive_index
+from app.services.refdata import REFDATA_KEY
+from app.services.versions import month_version_key, version_tracker
 
+MAX_RANGE_MONTHS = 120
 
-def _month_range(month: str) -> tuple[dt.date, dt.date]:
-    """Get first and last day of a month.
+
+def iter_months(from_month: str, to_month: str) -> list[str]:
+    """List every month between two months, inclusive.
 
     Args:
-        month: Month in YYYY-MM format
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
 
     Returns:
-        Tuple of (first_day, last_day)
+        Months in YYYY-MM format, in ascending order
     """
-    y, m = month.split("-")
-    year = int(y)
-    mon = int(m)
-    last_day = calendar.monthrange(year, mon)[1]
-    return dt.date(year, mon, 1), dt.date(year, mon, last_day)
+    year, mon = (int(p) for p in from_month.split("-"))
+    end_year, end_mon = (int(p) for p in to_month.split("-"))
+    months = []
+    while (year, mon) <= (end_year, end_mon):
+        months.append(f"{year:04d}-{mon:02d}")
+        year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return months
+
+
+def range_summary_query(from_month: str, to_month: str) -> Select:
+    """Build the per-(month, category) aggregation behind range_summary.
+
+    Rollup rows and budgets are combined with UNION ALL and folded by a single
+    GROUP BY (month, category) with conditional SUMs. A UNION is used instead of a
+    join so budgets are not multiplied by the per-account rollup rows, and planned
+    categories with no spending still show up. Amounts are integer cents, so every
+    sum is exact integer arithmetic.
+
+    Args:
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+
+    Returns:
+        Select yielding (month, category_id, name, income, expense, planned), in cents
+    """
+    realized = select(
+        MonthlyRollup.month,
+        MonthlyRollup.category_id,
+        MonthlyRollup.kind,
+        MonthlyRollup.amount_sum_cents.label("amount"),
+        literal(0, BigInteger).label("planned"),
+    ).where(
+        MonthlyRollup.month.between(from_month, to_month),
+        MonthlyRollup.kind.in_(("INCOME", "EXPENSE")),
+    )
+    planned = select(
+        Budget.month,
+        Budget.category_id,
+        literal("BUDGET").label("kind"),
+        literal(0, BigInteger).label("amount"),
+        Budget.amount_planned_cents.label("planned"),
+    ).where(Budget.month.between(from_month, to_month))
+    rows = union_all(realized, planned).subquery()
+
+    return (
+        select(
+            rows.c.month,
+            rows.c.category_id,
+            Category.name,
+            func.sum(case((rows.c.kind == "INCOME", rows.c.amount), else_=0)).label("income"),
+            func.sum(case((rows.c.kind == "EXPENSE", rows.c.amount), else_=0)).label("expense"),
+            func.sum(rows.c.planned).label("planned"),
+        )
+        # Outer join keeps history for categories that were removed (name shows as N/A)
+        .outerjoin(Category, Category.id == rows.c.category_id)
+        .group_by(rows.c.month, rows.c.category_id, Category.name)
+        .order_by(rows.c.month, rows.c.category_id)
+    )
+
+
+def range_summary(db: Session, from_month: str, to_month: str) -> list[dict]:
+    """Generate the monthly summary of every month in a range with one query.
+
+    The number of round trips does not depend on how many months are requested.
+    Closed months are read from the summary stored in their archive file.
+
+    Args:
+        db: Database session
+        from_month: First month in YYYY-MM format
+        to_month: Last month in YYYY-MM format
+
+    Returns:
+        One summary dict per month (same shape as monthly_summary), ascending
+    """
+    summaries = {
+        month: {"income": 0, "expense": 0, "by_category": []}
+        for month in iter_months(from_month, to_month)
+    }
+    index = get_archive_index(db)
+    archived = index.months_between(from_month, to_month)
+
+    rows: list = []
+    if len(archived) < len(summaries):
+        stmt = range_summary_query(from_month, to_month)
+        rows = [row for row in db.execute(stmt).all() if row[0] not in index.paths]
+    if archived:
+        names = dict(db.execute(select(Category.id, Category.name)).tuples().all())
+        for month in archived:
+            rows.extend(
+                (month, cid, names.get(cid), income, expense, planned)
+                for cid, income, expense, planned in index.open(month).summary()
+            )
+
+    for month, cid, name, income, expense, planned in rows:
+        summary = summaries[month]
+        income, expense, planned = income or 0, expense or 0, planned or 0
+        summary["income"] += income
+        summary["expense"] += expense
+
+        # Only expense categories (planned or realized) go into the breakdown
+        if expense == 0 and planned == 0:
+            continue
+        realized = abs(expense)
+        summary["by_category"].append(
+            {
+                "category_id": int(cid),
+                "category_name": name if name is not None else "N/A",
+                "planned": to_wire(planned),
+                "realized": to_wire(realized),
+                "deviation": to_wire(realized - planned),
+            }
+        )
+
+    # Cents become wire amounts only here, once per figure
+    return [
+        {
+            "month": month,
+            "income_total": to_wire(summary["income"]),
+            "expense_total": to_wire(abs(summary["expense"])),
+            "balance": to_wire(summary["income"] + summary["expense"]),
+            "by_category": summary["by_category"],
+        }
+        for month, summary in summaries.items()
+    ]
 
 
 def monthly_summary(db: Session, month: str) -> dict:
@@ -35,70 +163,94 @@ def monthly_summary(db: Session, month: str) -> dict:
     Returns:
         Dict with income_total, expense_total, balance, and by_category breakdown
     """
-    start, end = _month_range(month)
-
-    # Total income
-    income_total = db.execute(
-        select(func.coalesce(func.sum(Transaction.amount), 0))
-        .where(Transaction.kind == "INCOME")
-        .where(Transaction.date.between(start, end))
-    ).scalar_one()
-
-    # Total expenses (signed, will be negative)
-    expense_total_signed = db.execute(
-        select(func.coalesce(func.sum(Transaction.amount), 0))
-        .where(Transaction.kind == "EXPENSE")
-        .where(Transaction.date.between(start, end))
-    ).scalar_one()
-
-    # Get planned budgets
-    budgets = db.execute(
-        select(Budget.category_id, Budget.amount_planned).where(Budget.month == month)
-    ).all()
-    planned_map = {int(cid): float(val) for cid, val in budgets}
-
-    # Get realized expenses by category
-    realized = db.execute(
-        select(Transaction.category_id, func.coalesce(func.sum(Transaction.amount), 0))
-        .where(Transaction.kind == "EXPENSE")
-        .where(Transaction.category_id.is_not(None))
-        .where(Transaction.date.between(start, end))
-        .group_by(Transaction.category_id)
-    ).all()
-    realized_map = {int(cid): float(val) for cid, val in realized}
-
-    # Get all category IDs involved (planned or realized)
-    all_cat_ids = sorted(set(planned_map.keys()) | set(realized_map.keys()))
-
-    # Get category names (include inactive to preserve history)
-    if all_cat_ids:
-        categories = db.execute(
-            select(Category.id, Category.name).where(Category.id.in_(all_cat_ids))
-        ).all()
-    else:
-        categories = []
-
-    cat_name = {int(cid): name for cid, name in categories}
-
-    # Build by_category breakdown
-    by_category = []
-    for cid in all_cat_ids:
-        planned = planned_map.get(cid, 0.0)
-        realized_abs = abs(realized_map.get(cid, 0.0))
-        by_category.append(
-            {
-                "category_id": cid,
-                "category_name": cat_name.get(cid, "N/A"),
-                "planned": planned,
-                "realized": realized_abs,
-                "deviation": realized_abs - planned,
-            }
-        )
+    return range_summary(db, month, month)[0]
 
-    return {
-        "month": month,
-        "income_total": float(income_total),
-        "expense_total": abs(float(expense_total_signed)),
-        "balance": float(income_total + expense_total_signed),
-        "by_category": by_category,
-    }
+
+class ReportCache:
+    """Bounded LRU of computed reports, keyed by the data versions they were built from.
+
+    Keys embed the versions, so entries never need explicit invalidation: a write
+    moves the version and the old entry simply stops being asked for until it is
+    evicted. Cached values are shared and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+
+    def get(self, key: tuple) -> Any | None:
+        """Return a cached report and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached report, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: Any) -> None:
+        """Store a report, evicting the least recently used one beyond maxsize.
+
+        Args:
+            key: Cache key
+            value: Report to cache
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached report."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+report_cache = ReportCache(settings.report_cache_size)
+
+
+def monthly_summary_etag(db: Session, month: str) -> str:
+    """Build the ETag of a monthly summary from the versions of the data behind it.
+
+    The month's version moves with its transactions and budgets; the reference
+    data version covers category renames. With warm versions this runs no queries.
+
+    Args:
+        db: Database session
+        month: Month in YYYY-MM format
+
+    Returns:
+        Quoted strong ETag
+    """
+    month_version = version_tracker.get(db, month_version_key(month))
+    ref_version = version_tracker.get(db, REFDATA_KEY)
+    return f'"{month}.{month_version}.{ref_version}"'
+
+
+def cached_monthly_summary(db: Session, month: str, etag: str) -> dict:
+    """Return the monthly summary for an ETag, computing it only on a cache miss.
+
+    Args:
+        db: Database session
+        month: Month in YYYY-MM format
+        etag: Output of monthly_summary_etag for the month
+
+    Returns:
+        Monthly summary dict (shared; do not mutate)
+    """
+    key = ("monthly", month, etag)
+    summary = report_cache.get(key)
+    if summary is None:
+        summary = monthly_summary(db, month)
+        report_cache.put(key, summary)
+    return summary
@@ -0,0 +1,204 @@
+"""Rollup service - incrementally maintained monthly totals.
+
+``monthly_rollups`` holds one row per (month, account, category, kind) with the
+sum and count of its transactions. Write paths apply deltas through
+``app.services.ledger`` in the same DB transaction as the ledger change, so
+reports read a handful of rows per month instead of scanning ``transactions``.
+"""
+
+import datetime as dt
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sqlalchemy import Select, and_, bindparam, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.money import to_decimal
+from app.db.models import MonthlyRollup, Transaction
+from app.db.upsert import upsert_insert
+from app.services.versions import mark_changed, month_version_key
+
+RollupKey = tuple[str, int, int, str]
+
+NO_CATEGORY = 0
+
+
+def month_key(date: dt.date) -> str:
+    """Format a date as its YYYY-MM month key.
+
+    Args:
+        date: Any date
+
+    Returns:
+        Month in YYYY-MM format
+    """
+    return f"{date.year:04d}-{date.month:02d}"
+
+
+def rollup_deltas(rows: Iterable[Mapping[str, Any]], sign: int) -> dict[RollupKey, tuple[int, int]]:
+    """Aggregate transaction rows into per-rollup-key deltas.
+
+    Args:
+        rows: Transaction values (date, account_id, category_id, kind, amount_cents)
+        sign: +1 for inserted rows, -1 for deleted rows
+
+    Returns:
+        Dict of rollup key -> (amount delta in cents, count delta)
+    """
+    deltas: dict[RollupKey, tuple[int, int]] = {}
+    for row in rows:
+        key = (
+            month_key(row["date"]),
+            int(row["account_id"]),
+            int(row["category_id"] or NO_CATEGORY),
+            str(row["kind"]),
+        )
+        amount, count = deltas.get(key, (0, 0))
+        deltas[key] = (amount + sign * row["amount_cents"], count + sign)
+    return deltas
+
+
+def apply_rollup_deltas(db: Session, deltas: Mapping[RollupKey, tuple[int, int]]) -> None:
+    """Upsert rollup deltas with one executemany, dropping rows that reach zero.
+
+    Args:
+        db: Database session (the caller commits)
+        deltas: Output of rollup_deltas
+    """
+    if not deltas:
+        return
+
+    table = MonthlyRollup.__table__
+    params = [
+        {
+            "month": month,
+            "account_id": account_id,
+            "category_id": category_id,
+            "kind": kind,
+            "amount_sum_cents": amount,
+            "tx_count": count,
+        }
+        for (month, account_id, category_id, kind), (amount, count) in deltas.items()
+    ]
+    stmt = upsert_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["month", "account_id", "category_id", "kind"],
+        set_={
+            "amount_sum_cents": table.c.amount_sum_cents + stmt.excluded.amount_sum_cents,
+            "tx_count": table.c.tx_count + stmt.excluded.tx_count,
+        },
+    )
+    db.execute(stmt, params)
+
+    # Keys that only lost rows may have dropped to zero; remove them so the table
+    # stays proportional to the live ledger
+    emptied = [p for p in params if p["tx_count"] < 0]
+    if emptied:
+        db.execute(
+            delete(table).where(
+                and_(
+                    table.c.month == bindparam("b_month"),
+                    table.c.account_id == bindparam("b_account_id"),
+                    table.c.category_id == bindparam("b_category_id"),
+                    table.c.kind == bindparam("b_kind"),
+                    table.c.tx_count <= 0,
+                )
+            ),
+            [
+                {
+                    "b_month": p["month"],
+                    "b_account_id": p["account_id"],
+                    "b_category_id": p["category_id"],
+                    "b_kind": p["kind"],
+                }
+                for p in emptied
+            ],
+        )
+
+
+def _ledger_totals_query() -> Select:
+    month = func.strftime("%Y-%m", Transaction.date)
+    category = func.coalesce(Transaction.category_id, NO_CATEGORY)
+    return select(
+        month.label("month"),
+        Transaction.account_id,
+        category.label("category_id"),
+        Transaction.kind,
+        func.sum(Transaction.amount_cents).label("amount_sum_cents"),
+        func.count().label("tx_count"),
+    ).group_by(month, Transaction.account_id, category, Transaction.kind)
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute the whole rollup table from the ledger.
+
+    Args:
+        db: Database session (committed here)
+
+    Returns:
+        Number of rollup rows written
+    """
+    table = MonthlyRollup.__table__
+    months = set(db.scalars(select(table.c.month).distinct()).all())
+    db.execute(delete(table))
+    result = db.execute(
+        insert(table).from_select(
+            ["month", "account_id", "category_id", "kind", "amount_sum_cents", "tx_count"],
+            _ledger_totals_query(),
+        )
+    )
+    # Any month may have been corrected, so cached reports of all of them are dropped
+    months.update(db.scalars(select(table.c.month).distinct()).all())
+    mark_changed(db, [month_version_key(month) for month in months])
+    db.commit()
+    return result.rowcount
+
+
+def check_rollups(db: Session) -> list[dict]:
+    """Compare the rollup table against a fresh aggregation of the ledger.
+
+    Args:
+        db: Database session
+
+    Returns:
+        List of mismatches, each with the key plus expected and stored sum/count
+    """
+
+    def _load(stmt) -> dict[RollupKey, tuple[int, int]]:
+        return {
+            (month, int(acc), int(cat), kind): (int(total), int(count))
+            for month, acc, cat, kind, total, count in db.execute(stmt).all()
+        }
+
+    expected = _load(_ledger_totals_query())
+    stored = _load(
+        select(
+            MonthlyRollup.month,
+            MonthlyRollup.account_id,
+            MonthlyRollup.category_id,
+            MonthlyRollup.kind,
+            MonthlyRollup.amount_sum_cents,
+            MonthlyRollup.tx_count,
+        )
+    )
+
+    zero = (0, 0)
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        exp = expected.get(key, zero)
+        got = stored.get(key, zero)
+        if exp != got:
+            month, account_id, category_id, kind = key
+            drift.append(
+                {
+                    "month": month,
+                    "account_id": account_id,
+                    "category_id": category_id,
+                    "kind": kind,
+                    "expected_sum": to_decimal(exp[0]),
+                    "expected_count": exp[1],
+                    "stored_sum": to_decimal(got[0]),
+                    "stored_count": got[1],
+                }
+            )
+    return drift
@@ -0,0 +1,491 @@
+"""Category rules - compiled auto-categorization for imports and recategorization.
+
+Rules are compiled once into a RuleMatcher and kept per process until the
+``rules`` (or ``refdata``) data version moves, so applying them costs no query.
+
+Matching a row does not loop over the rules. Every ``CONTAINS``/``PREFIX``
+pattern, plus the ``keyword`` of the ``REGEX`` rules that name one, goes into
+one Aho-Corasick automaton; a single pass over the normalized description
+yields the few rules whose keyword occurs. The ``REGEX`` rules without a
+keyword are joined into one alternation, searched once per row (see
+_RegexTree), and the rules with no text condition at all are indexed by
+account, kind and amount range (see _AmountIndex). Only the rules found this
+way have their remaining conditions checked, so the cost per row grows with the
+description length and the number of hits, not with the number of rules.
+"""
+
+import datetime as dt
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.text import normalize_description
+from app.db.models import CategoryRule
+from app.schemas.rules import RuleMatch
+from app.services.ledger import ledger_tables, record_deletes, record_inserts, set_categories
+from app.services.refdata import REFDATA_KEY, get_reference_data
+from app.services.versions import mark_changed, version_tracker
+
+RULES_KEY = "rules"
+
+_UPDATE_CHUNK = 5000
+
+# Group references tie a pattern to its own group numbers and names
+_GROUP_REFERENCE = re.compile(r"\\(?:[1-9]|g<)|\(\?(?:P[<=]|\()")
+
+
+class _Automaton:
+    """Aho-Corasick automaton over a fixed set of keywords."""
+
+    def __init__(self, keywords: list[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (keyword_id,)
+
+        # Breadth-first, so every fail target is complete before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield (keyword index, index of its last character) for every occurrence."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword_id in out[state]:
+                yield keyword_id, end
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    """A rule reduced to the checks left once its keyword (if any) matched."""
+
+    id: int
+    priority: int
+    category_id: int
+    kind: str
+    account_id: int | None
+    min_cents: int | None
+    max_cents: int | None
+    regex: re.Pattern[str] | None
+
+    def accepts(self, description: str, kind: str, account_id: int, amount_cents: int) -> bool:
+        """Check the conditions not covered by the automaton."""
+        if kind != self.kind:
+            return False
+        if self.account_id is not None and account_id != self.account_id:
+            return False
+        amount = abs(amount_cents)
+        if self.min_cents is not None and amount < self.min_cents:
+            return False
+        if self.max_cents is not None and amount > self.max_cents:
+            return False
+        return self.regex is None or self.regex.search(description) is not None
+
+
+def _uncaptured(pattern: str) -> str | None:
+    """Rewrite a pattern with non-capturing groups so it can join an alternation.
+
+    Args:
+        pattern: Rule regular expression
+
+    Returns:
+        The rewritten pattern, or None if it uses group references or inline
+        global flags (those only work as a pattern of their own)
+    """
+    if _GROUP_REFERENCE.search(pattern):
+        return None
+    out: list[str] = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            out.append(pattern[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+            # "]" right after "[" or "[^" is a literal, not the end of the set
+            end = i + 1
+            if pattern.startswith("^", end):
+                end += 1
+            if pattern.startswith("]", end):
+                end += 1
+            out.append(pattern[i:end])
+            i = end
+            continue
+        elif ch == "(" and not pattern.startswith("?", i + 1):
+            ch = "(?:"
+        out.append(ch)
+        i += 1
+    rewritten = "".join(out)
+    try:
+        combined = re.compile(f"x|(?:{rewritten})", re.IGNORECASE)
+    except re.error:
+        return None
+    return rewritten if combined.groups == 0 else None
+
+
+class _RegexTree:
+    """Keyword-less REGEX rules searched as one alternation.
+
+    The root is the alternation of every pattern, so a description none of
+    them matches costs a single search. Below it, each node holds the
+    alternation of a slice of the patterns, and only the slices that match are
+    searched, down to the rules themselves. The alternations are
+    non-capturing: with one group per rule, CPython's ``re`` saves and restores
+    every group at each branch and the search slows down faster than the rule
+    count grows.
+    """
+
+    _FANOUT = 8
+
+    def __init__(self, entries: list[tuple[str, CompiledRule]]) -> None:
+        self._root = self._build(entries)
+
+    def _build(self, entries: list[tuple[str, CompiledRule]]) -> tuple:
+        regex = re.compile("|".join(f"(?:{pattern})" for pattern, _ in entries), re.IGNORECASE)
+        if len(entries) == 1:
+            return regex, entries[0][1], ()
+        size = -(-len(entries) // self._FANOUT)
+        children = tuple(
+            self._build(entries[start : start + size]) for start in range(0, len(entries), size)
+        )
+        return regex, None, children
+
+    def matches(self, description: str) -> Iterator[CompiledRule]:
+        """Yield every rule whose pattern occurs in the description."""
+        stack = [self._root]
+        while stack:
+            regex, rule, children = stack.pop()
+            if regex.search(description) is None:
+                continue
+            if rule is not None:
+                yield rule
+            stack.extend(children)
+
+
+class _AmountIndex:
+    """Rules without a text condition for one (account, kind), by amount range.
+
+    The absolute amount axis is cut at every rule bound and each segment keeps
+    the best rule (lowest priority, then ID) covering it, so a row costs one
+    bisect whatever the number of rules.
+    """
+
+    def __init__(self, rules: list[CompiledRule]) -> None:
+        bounds = {0}
+        for rule in rules:
+            if rule.min_cents is not None:
+                bounds.add(rule.min_cents)
+            if rule.max_cents is not None:
+                bounds.add(rule.max_cents + 1)
+        self._starts = sorted(bounds)
+        self._best: list[CompiledRule | None] = [None] * len(self._starts)
+
+        # Next segment still without a rule, at or after each index
+        free = list(range(len(self._starts) + 1))
+
+        def next_free(index: int) -> int:
+            while free[index] != index:
+                free[index] = free[free[index]]
+                index = free[index]
+            return index
+
+        for rule in sorted(rules, key=lambda r: (r.priority, r.id)):
+            low = bisect_left(self._starts, rule.min_cents or 0)
+            high = (
+                len(self._starts)
+                if rule.max_cents is None
+                else bisect_left(self._starts, rule.max_cents + 1)
+            )
+            index = next_free(low)
+            while index < high:
+                self._best[index] = rule
+                free[index] = index + 1
+                index = next_free(index + 1)
+
+    def best(self, amount: int) -> CompiledRule | None:
+        """Return the best rule covering an absolute amount, if any."""
+        return self._best[bisect_right(self._starts, amount) - 1]
+
+
+@dataclass(slots=True)
+class RuleMatcher:
+    """Every active rule compiled into one matcher."""
+
+    version: tuple[int, ...]
+    rule_count: int = 0
+    _automaton: _Automaton | None = None
+    # Per keyword: (rule, index where the keyword must end, -1 for anywhere)
+    _triggers: list[list[tuple[CompiledRule, int]]] = field(default_factory=list)
+    _regex_tree: _RegexTree | None = None
+    # REGEX rules without keyword that cannot join the alternation
+    _each: list[CompiledRule] = field(default_factory=list)
+    # Rules without text condition, per (account or None, kind)
+    _by_amount: dict[tuple[int | None, str], _AmountIndex] = field(default_factory=dict)
+
+    def candidates(
+        self, description: str, kind: str, account_id: int, amount_cents: int
+    ) -> list[CompiledRule]:
+        """Return the rules worth checking for a row (a superset of the matching ones).
+
+        Args:
+            description: Raw transaction description
+            kind: INCOME or EXPENSE
+            account_id: Transaction account
+            amount_cents: Signed amount in cents
+
+        Returns:
+            Rules left to check with CompiledRule.accepts
+        """
+        found = list(self._each)
+        for key in ((None, kind), (account_id, kind)):
+            index = self._by_amount.get(key)
+            rule = index.best(abs(amount_cents)) if index is not None else None
+            if rule is not None:
+                found.append(rule)
+        if self._regex_tree is not None:
+            found.extend(self._regex_tree.matches(description))
+        if self._automaton is not None:
+            for keyword_id, end in self._automaton.iter_matches(normalize_description(description)):
+                for rule, required_end in self._triggers[keyword_id]:
+                    if required_end < 0 or end == required_end:
+                        found.append(rule)
+        return found
+
+    def match(self, description: str, kind: str, account_id: int, amount_cents: int) -> int | None:
+        """Return the category of the best matching rule (lowest priority, then ID).
+
+        Args:
+            description: Raw transaction description
+            kind: INCOME or EXPENSE (only rules for categories of this kind apply)
+            account_id: Transaction account
+            amount_cents: Signed amount in cents
+
+        Returns:
+            Category ID, or None if no rule matches
+        """
+        best: CompiledRule | None = None
+        for rule in self.candidates(description, kind, account_id, amount_cents):
+            if best is not None and (rule.priority, rule.id) >= (best.priority, best.id):
+                continue
+            if rule.accepts(description, kind, account_id, amount_cents):
+                best = rule
+        return best.category_id if best is not None else None
+
+
+def compile_rules(
+    rules: list[CategoryRule], category_kinds: dict[int, str], version: tuple[int, ...]
+) -> RuleMatcher:
+    """Compile rules into a RuleMatcher.
+
+    Args:
+        rules: Active rules
+        category_kinds: Kind of every active category (rules for others are skipped)
+        version: Data versions the rules were read at
+
+    Returns:
+        Compiled matcher
+    """
+    matcher = RuleMatcher(version=version)
+    keywords: dict[str, int] = {}
+    alternation: list[tuple[str, CompiledRule]] = []
+    textless: dict[tuple[int | None, str], list[CompiledRule]] = {}
+    for rule in rules:
+        kind = category_kinds.get(rule.category_id)
+        if kind is None:
+            continue
+        keyword: str | None = None
+        regex = None
+        if rule.match == RuleMatch.REGEX:
+            regex = re.compile(rule.pattern, re.IGNORECASE)
+            keyword = normalize_description(rule.keyword) if rule.keyword else None
+        elif rule.match is not None:
+            keyword = normalize_description(rule.pattern) or None
+        compiled = CompiledRule(
+            id=rule.id,
+            priority=rule.priority,
+            category_id=rule.category_id,
+            kind=kind,
+            account_id=rule.account_id,
+            min_cents=rule.min_amount_cents,
+            max_cents=rule.max_amount_cents,
+            regex=regex,
+        )
+        matcher.rule_count += 1
+        if keyword is not None:
+            keyword_id = keywords.setdefault(keyword, len(keywords))
+            if keyword_id == len(matcher._triggers):
+                matcher._triggers.append([])
+            # A PREFIX keyword must end where it would if it started the description
+            required_end = len(keyword) - 1 if rule.match == RuleMatch.PREFIX else -1
+            matcher._triggers[keyword_id].append((compiled, required_end))
+        elif regex is not None:
+            rewritten = _uncaptured(rule.pattern)
+            if rewritten is None:
+                matcher._each.append(compiled)
+            else:
+                alternation.append((rewritten, compiled))
+        else:
+            textless.setdefault((rule.account_id, kind), []).append(compiled)
+    if keywords:
+        matcher._automaton = _Automaton(list(keywords))
+    if alternation:
+        matcher._regex_tree = _RegexTree(alternation)
+    matcher._by_amount = {key: _AmountIndex(group) for key, group in textless.items()}
+    return matcher
+
+
+class RuleCache:
+    """Process-wide compiled rules, rebuilt when the rules or reference data change."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._matcher: RuleMatcher | None = None
+
+    def get(self, db: Session) -> RuleMatcher:
+        """Return the compiled rules, recompiling them if any writer changed them.
+
+        Args:
+            db: Database session used for the version check and reload
+
+        Returns:
+            Compiled matcher
+        """
+        version = tuple(version_tracker.get_many(db, [RULES_KEY, REFDATA_KEY]))
+        matcher = self._matcher
+        if matcher is not None and matcher.version == version:
+            return matcher
+
+        with self._lock:
+            if self._matcher is None or self._matcher.version != version:
+                ref = get_reference_data(db)
+                kinds = {cid: entry.kind for cid, entry in ref.categories.items() if entry.active}
+                rules = list(db.scalars(select(CategoryRule).where(CategoryRule.active.is_(True))))
+                self._matcher = compile_rules(rules, kinds, version)
+            return self._matcher
+
+    def invalidate(self) -> None:
+        """Drop the compiled rules so the next get() recompiles them."""
+        with self._lock:
+            self._matcher = None
+
+
+rule_cache = RuleCache()
+
+
+def get_rule_matcher(db: Session) -> RuleMatcher:
+    """Return the cached compiled rules (see RuleCache.get).
+
+    Args:
+        db: Database session
+
+    Returns:
+        Compiled matcher
+    """
+    return rule_cache.get(db)
+
+
+def recategorize(
+    db: Session,
+    *,
+    from_date: dt.date,
+    to_date: dt.date,
+    account_id: int | None = None,
+    category_id: int | None = None,
+) -> dict:
+    """Apply the rules again to the INCOME/EXPENSE transactions of a period.
+
+    Rows no rule matches keep their category. Closed months are not touched
+    (their rows are archived, see services/closing.py).
+
+    Args:
+        db: Database session (committed here)
+        from_date: First date of the period
+        to_date: Last date of the period
+        account_id: Only transactions of this account
+        category_id: Only transactions currently in this category
+
+    Returns:
+        Dict with the number of scanned and updated transactions
+    """
+    matcher = get_rule_matcher(db)
+    scanned = 0
+    # Collected first: rows are not updated under the open cursor
+    changes: list[tuple[dict[str, Any], int]] = []
+    for table in ledger_tables(db, from_date, to_date):
+        c = table.c
+        stmt = select(
+            c.id, c.date, c.description, c.amount_cents, c.kind, c.account_id, c.category_id
+        ).where(c.date >= from_date, c.date <= to_date, c.kind.in_(("INCOME", "EXPENSE")))
+        if account_id is not None:
+            stmt = stmt.where(c.account_id == account_id)
+        if category_id is not None:
+            stmt = stmt.where(c.category_id == category_id)
+
+        for row in db.execute(stmt.execution_options(yield_per=_UPDATE_CHUNK)):
+            scanned += 1
+            tx_id, date, description, amount, kind, account, current = row
+            new = matcher.match(description, kind, account, amount)
+            if new is not None and new != current:
+                values = {
+                    "id": tx_id,
+                    "date": date,
+                    "account_id": account,
+                    "category_id": current,
+                    "kind": kind,
+                    "amount_cents": amount,
+                }
+                changes.append((values, new))
+
+    for start in range(0, len(changes), _UPDATE_CHUNK):
+        chunk = changes[start : start + _UPDATE_CHUNK]
+        moved = [{**values, "category_id": new} for values, new in chunk]
+        # Moving a row between categories is a delete plus an insert for the rollups
+        record_deletes(db, [values for values, _ in chunk])
+        record_inserts(db, moved)
+        set_categories(db, moved)
+    db.commit()
+    return {"scanned": scanned, "updated": len(changes)}
+
+
+def mark_rules_changed(db: Session) -> None:
+    """Record a rule change made in the current DB transaction.
+
+    Args:
+        db: Database session (the caller commits)
+    """
+    mark_changed(db, [RULES_KEY])
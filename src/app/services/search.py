@@ -0,0 +1,189 @@
+"""Search service - full-text search over transaction descriptions.
+
+Queries go to the FTS5 index (see db/fts.py), which also stores the listing
+columns: filters are applied to the matches inside the index and results are
+rendered without touching ``transactions`` or the archives.
+
+Every match is ranked by FTS5's bm25 and pages are cut from that order with
+LIMIT/OFFSET. bm25 costs a few microseconds per match, so a very broad query
+(``lo*`` over millions of rows) takes seconds. SEARCH_RANK_WINDOW trades
+relevance for speed: when set, only that many most recently recorded matches
+are ranked (walking the index by descending rowid is nearly free) and the
+others follow them, newest first, so paging still reaches every match in a
+stable order.
+"""
+
+import datetime as dt
+import itertools
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.fts import FTS_COLUMNS, FTS_TABLE
+from app.services.archive import RowFilter, get_archive_index
+
+# A term is a run of letters/digits, optionally ending in "*" (prefix query)
+_TERM = re.compile(r"(\w+)(\*?)")
+MAX_TERMS = 16
+_REBUILD_CHUNK = 5000
+
+
+class SearchUnavailableError(RuntimeError):
+    """Raised when the database has no FTS5 index (not SQLite)."""
+
+
+def match_expression(query: str) -> str:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every term must match (implicit AND); ``term*`` matches any word starting with
+    ``term``. Terms are quoted, so FTS5 operators and punctuation in user input
+    are never interpreted.
+
+    Args:
+        query: Text typed by the user, e.g. ``ifood pedi*``
+
+    Returns:
+        MATCH expression, e.g. ``"ifood" "pedi"*``
+
+    Raises:
+        ValueError: If the text has no searchable term or too many terms
+    """
+    terms = [f'"{word}"{star}' for word, star in _TERM.findall(query)]
+    if not terms:
+        raise ValueError("Informe ao menos um termo de busca")
+    if len(terms) > MAX_TERMS:
+        raise ValueError(f"Use no máximo {MAX_TERMS} termos")
+    return " ".join(terms)
+
+
+def _require_fts(db: Session) -> None:
+    if db.get_bind().dialect.name != "sqlite":
+        raise SearchUnavailableError("Busca textual requer SQLite (FTS5)")
+
+
+def search_transactions(
+    db: Session,
+    query: str,
+    flt: RowFilter,
+    *,
+    limit: int,
+    offset: int = 0,
+) -> list[tuple[Any, ...]]:
+    """Find transactions whose description matches a query, best match first.
+
+    Matches are ordered by bm25 (ties by date, newest first). With
+    SEARCH_RANK_WINDOW set, only that many most recently recorded matches are
+    ranked and any further matches follow them by recency.
+
+    Args:
+        db: Database session
+        query: Text typed by the user (see match_expression)
+        flt: Date, account, category and kind filters (``after`` is ignored)
+        limit: Page size
+        offset: Matches to skip
+
+    Returns:
+        Up to ``limit + 1`` row tuples in EXPORT_FIELDS order (the extra row tells
+        the caller another page exists)
+
+    Raises:
+        ValueError: If the query has no searchable term
+        SearchUnavailableError: If the database is not SQLite
+    """
+    _require_fts(db)
+    params: dict[str, Any] = {"match": match_expression(query)}
+    where = [f"{FTS_TABLE} MATCH :match"]
+    # UNINDEXED columns hold what the triggers copied: ISO dates, integer IDs
+    if flt.from_date is not None:
+        where.append("date >= :from_date")
+        params["from_date"] = flt.from_date.isoformat()
+    if flt.to_date is not None:
+        where.append("date <= :to_date")
+        params["to_date"] = flt.to_date.isoformat()
+    for column in ("account_id", "category_id", "kind"):
+        value = getattr(flt, column)
+        if value is not None:
+            where.append(f"{column} = :{column}")
+            params[column] = value
+    columns = f"rowid, {', '.join(FTS_COLUMNS)}"
+    condition = " AND ".join(where)
+
+    wanted = limit + 1
+    window = settings.search_rank_window
+    if window <= 0:
+        ranked = text(
+            f"SELECT {columns} FROM {FTS_TABLE} WHERE {condition} "
+            "ORDER BY rank, date DESC, rowid DESC LIMIT :limit OFFSET :offset"
+        )
+        rows = db.execute(ranked, {**params, "limit": wanted, "offset": offset}).all()
+        return [(row[0], dt.date.fromisoformat(row[1]), *row[2:]) for row in rows]
+
+    rows = []
+    if offset < window:
+        # rank is only computed for the rows the inner query returns
+        ranked = text(
+            f"SELECT {columns} FROM ("
+            f"SELECT {columns}, rank AS score FROM {FTS_TABLE} WHERE {condition} "
+            "ORDER BY rowid DESC LIMIT :window"
+            ") ORDER BY score, date DESC, rowid DESC LIMIT :limit OFFSET :offset"
+        )
+        page = {**params, "window": window, "limit": wanted, "offset": offset}
+        rows = db.execute(ranked, page).all()
+    if len(rows) < wanted:
+        recent = text(
+            f"SELECT {columns} FROM {FTS_TABLE} WHERE {condition} "
+            "ORDER BY rowid DESC LIMIT :limit OFFSET :offset"
+        )
+        skip = window + max(offset - window, 0)
+        rows.extend(db.execute(recent, {**params, "limit": wanted - len(rows), "offset": skip}))
+    return [(row[0], dt.date.fromisoformat(row[1]), *row[2:]) for row in rows]
+
+
+def _insert_rows(db: Session, rows: Iterable[tuple[Any, ...]]) -> int:
+    stmt = text(
+        f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) "
+        f"VALUES (:id, {', '.join(':' + c for c in FTS_COLUMNS)})"
+    )
+    written = 0
+    records = (
+        {"id": tx_id, **dict(zip(FTS_COLUMNS, (date.isoformat(), *values), strict=True))}
+        for tx_id, date, *values in rows
+    )
+    while batch := list(itertools.islice(records, _REBUILD_CHUNK)):
+        db.execute(stmt, batch)
+        written += len(batch)
+    return written
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Rebuild the search index from ``transactions`` and the closed months' archives.
+
+    Needed once after upgrading a database that already had closed months (the
+    migration can only index the rows still in ``transactions``).
+
+    Args:
+        db: Database session (committed here)
+
+    Returns:
+        Number of indexed transactions
+
+    Raises:
+        SearchUnavailableError: If the database is not SQLite
+    """
+    _require_fts(db)
+    db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    columns = ", ".join(FTS_COLUMNS)
+    written = db.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM transactions")
+    ).rowcount
+    index = get_archive_index(db)
+    for month in index.months():
+        written += _insert_rows(db, index.open(month).rows(RowFilter()))
+    # Merge the index b-trees built by the bulk load into one
+    db.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"))
+    db.commit()
+    return written
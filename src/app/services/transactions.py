@@ -0,0 +1,364 @@
+"""Transaction service - validation, listing queries, pagination and bulk ingestion."""
+
+import base64
+import binascii
+import datetime as dt
+import json
+from collections.abc import Iterator
+from decimal import Decimal
+from typing import IO, Any
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import ColumnElement, Row, Select, Table, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.schemas.transactions import TransactionCreate, TxKind
+from app.services.archive import RowFilter, closed_months
+from app.services.ledger import insert_transactions, ledger_tables
+from app.services.refdata import get_reference_data
+from app.services.rollups import month_key
+
+_create_adapter = TypeAdapter(TransactionCreate)
+_adapters: dict[type[BaseModel], TypeAdapter] = {TransactionCreate: _create_adapter}
+
+
+def check_transaction_fields(payload: TransactionCreate) -> None:
+    """Validate the rules of an INCOME/EXPENSE payload that need no database access.
+
+    Args:
+        payload: Transaction creation data
+
+    Raises:
+        ValueError: If kind, amount sign or category presence are invalid
+    """
+    if payload.kind == TxKind.TRANSFER:
+        raise ValueError("Use /transactions/transfer para transferências")
+
+    if payload.kind == TxKind.INCOME and payload.amount <= 0:
+        raise ValueError("INCOME requer amount > 0")
+
+    if payload.kind == TxKind.EXPENSE and payload.amount >= 0:
+        raise ValueError("EXPENSE requer amount < 0")
+
+    if payload.category_id is None:
+        raise ValueError("category_id é obrigatório para INCOME/EXPENSE")
+
+
+def check_transaction_refs(
+    payload: TransactionCreate, *, account_active: bool, category_kind: str | None
+) -> None:
+    """Validate the account and category referenced by a payload.
+
+    Args:
+        payload: Transaction creation data
+        account_active: Whether the account exists and is active
+        category_kind: Kind of the category if it exists and is active, else None
+
+    Raises:
+        ValueError: If the account or category is invalid/inactive or the kinds differ
+    """
+    if not account_active:
+        raise ValueError("Conta inválida/inativa")
+
+    if category_kind is None:
+        raise ValueError("Categoria inválida/inativa")
+
+    if payload.kind == TxKind.INCOME and category_kind != "INCOME":
+        raise ValueError("Categoria incompatível com INCOME")
+    if payload.kind == TxKind.EXPENSE and category_kind != "EXPENSE":
+        raise ValueError("Categoria incompatível com EXPENSE")
+
+
+def load_reference_data(db: Session) -> tuple[set[int], dict[int, str]]:
+    """Return the active account IDs and active category kinds from the cache.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Tuple of (active account IDs, {active category ID: kind})
+    """
+    ref = get_reference_data(db)
+    accounts = {aid for aid, entry in ref.accounts.items() if entry.active}
+    categories = {cid: entry.kind for cid, entry in ref.categories.items() if entry.active}
+    return accounts, categories
+
+
+def encode_cursor(date: dt.date, tx_id: int) -> str:
+    """Encode the position of the last returned row as an opaque cursor.
+
+    Args:
+        date: Date of the last row on the page
+        tx_id: ID of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{date.isoformat()}|{tx_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[dt.date, int]:
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Tuple of (date, id) of the last row already seen
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        date_part, id_part = raw.split("|")
+        return dt.date.fromisoformat(date_part), int(id_part)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Cursor inválido") from e
+
+
+def listing_columns(table: Table) -> tuple[ColumnElement[Any], ...]:
+    """Return the columns of a listing row: the TransactionOut fields, in order.
+
+    Args:
+        table: Ledger table (a year partition, or the ``transactions`` view)
+
+    Returns:
+        Columns, the amount in cents labelled with its public name
+    """
+    c = table.c
+    return (
+        c.id,
+        c.date,
+        c.description,
+        c.amount_cents.label("amount"),
+        c.kind,
+        c.account_id,
+        c.category_id,
+        c.transfer_pair_id,
+    )
+
+
+def transaction_list_query(
+    table: Table,
+    *,
+    from_date: dt.date | None = None,
+    to_date: dt.date | None = None,
+    account_id: int | None = None,
+    category_id: int | None = None,
+    kind: str | None = None,
+    after: tuple[dt.date, int] | None = None,
+) -> Select:
+    """Build the filtered listing query of one ledger table, ordered by (date, id) descending.
+
+    Args:
+        table: Year partition to read (see services/ledger.py)
+        from_date: Start date filter (inclusive)
+        to_date: End date filter (inclusive)
+        account_id: Filter by account
+        category_id: Filter by category
+        kind: Filter by transaction kind
+        after: Keyset position (date, id); only rows strictly after it are returned
+
+    Returns:
+        Select of listing_columns rows
+    """
+    c = table.c
+    stmt = select(*listing_columns(table))
+
+    if from_date is not None and to_date is not None:
+        stmt = stmt.where(c.date.between(from_date, to_date))
+
+    if account_id is not None:
+        stmt = stmt.where(c.account_id == account_id)
+
+    if category_id is not None:
+        stmt = stmt.where(c.category_id == category_id)
+
+    if kind is not None:
+        stmt = stmt.where(c.kind == kind)
+
+    # Seek past the last seen row instead of using OFFSET, so page N costs the same as page 1
+    if after is not None:
+        stmt = stmt.where(tuple_(c.date, c.id) < tuple_(*after))
+
+    return stmt.order_by(c.date.desc(), c.id.desc())
+
+
+def listing_queries(db: Session, flt: RowFilter) -> list[Select]:
+    """Build the listing query of every partition a filter can reach, newest first.
+
+    Args:
+        db: Database session
+        flt: Listing filters
+
+    Returns:
+        One query per overlapping year partition
+    """
+    upper = flt.to_date
+    if flt.after is not None and (upper is None or flt.after[0] < upper):
+        upper = flt.after[0]
+    return [
+        transaction_list_query(
+            table,
+            from_date=flt.from_date,
+            to_date=flt.to_date,
+            account_id=flt.account_id,
+            category_id=flt.category_id,
+            kind=flt.kind,
+            after=flt.after,
+        )
+        for table in ledger_tables(db, flt.from_date, upper)
+    ]
+
+
+def list_transaction_rows(db: Session, flt: RowFilter, limit: int | None = None) -> list[Row]:
+    """Read the listing rows of open months from the partitions the filter overlaps.
+
+    Partitions hold disjoint years and are read newest first, so their rows
+    follow one another in (date, id) descending order, and reading stops once
+    the page is full.
+
+    Args:
+        db: Database session
+        flt: Listing filters
+        limit: Page size; one extra row is read to tell whether another page exists
+
+    Returns:
+        Rows in listing_columns order (at most limit + 1)
+    """
+    rows: list[Row] = []
+    for stmt in listing_queries(db, flt):
+        if limit is not None:
+            stmt = stmt.limit(limit + 1 - len(rows))
+        rows.extend(db.execute(stmt).all())
+        if limit is not None and len(rows) > limit:
+            break
+    return rows
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    parts = []
+    for err in exc.errors():
+        loc = ".".join(str(p) for p in err["loc"])
+        parts.append(f"{loc}: {err['msg']}" if loc else err["msg"])
+    return "; ".join(parts)
+
+
+def iter_bulk_payloads(
+    body: IO[bytes], *, ndjson: bool, model: type[BaseModel] = TransactionCreate
+) -> Iterator[tuple[int, Any]]:
+    """Parse a bulk request body item by item.
+
+    NDJSON bodies are read line by line, so only one line is held in memory at a
+    time. JSON bodies must be a single array.
+
+    Args:
+        body: Binary file positioned at the start of the request body
+        ndjson: Whether the body is newline-delimited JSON
+        model: Item schema (TransactionCreate unless another bulk endpoint says otherwise)
+
+    Yields:
+        Tuples of (row index, parsed ``model`` instance or error message)
+
+    Raises:
+        ValueError: If a JSON body is not an array
+    """
+    adapter = _adapters.get(model)
+    if adapter is None:
+        adapter = _adapters[model] = TypeAdapter(model)
+    if ndjson:
+        index = 0
+        for line in body:
+            if not line.strip():
+                continue
+            try:
+                yield index, adapter.validate_json(line)
+            except ValidationError as e:
+                yield index, _format_validation_error(e)
+            index += 1
+        return
+
+    try:
+        # Decimal keeps amounts exact until they are converted to cents
+        items: Any = json.load(body, parse_float=Decimal)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError("Corpo JSON inválido") from e
+    if not isinstance(items, list):
+        raise ValueError("Corpo deve ser um array JSON ou NDJSON")
+
+    for index, item in enumerate(items):
+        try:
+            yield index, adapter.validate_python(item)
+        except ValidationError as e:
+            yield index, _format_validation_error(e)
+
+
+def bulk_create_transactions(
+    db: Session,
+    payloads: Iterator[tuple[int, TransactionCreate | str]],
+    *,
+    chunk_size: int,
+) -> dict:
+    """Validate and insert many INCOME/EXPENSE transactions in one DB transaction.
+
+    References are checked against one preloaded set of active accounts and
+    categories, and valid rows are written in chunks of ``chunk_size``. Invalid
+    rows, including rows dated in a closed month, are skipped and reported by index;
+    valid rows are committed together.
+
+    Args:
+        db: Database session
+        payloads: Parsed items as produced by iter_bulk_payloads
+        chunk_size: Rows per executemany batch
+
+    Returns:
+        Dict with inserted count and per-row errors
+    """
+    accounts, categories = load_reference_data(db)
+    closed = closed_months(db)
+
+    inserted = 0
+    errors: list[dict] = []
+    chunk: list[dict[str, Any]] = []
+
+    for index, payload in payloads:
+        if isinstance(payload, str):
+            errors.append({"index": index, "detail": payload})
+            continue
+        try:
+            check_transaction_fields(payload)
+            check_transaction_refs(
+                payload,
+                account_active=payload.account_id in accounts,
+                category_kind=categories.get(payload.category_id),
+            )
+        except ValueError as e:
+            errors.append({"index": index, "detail": str(e)})
+            continue
+        if month_key(payload.date) in closed:
+            errors.append({"index": index, "detail": f"Mês {month_key(payload.date)} está fechado"})
+            continue
+
+        chunk.append(
+            {
+                "date": payload.date,
+                "description": payload.description,
+                "amount_cents": payload.amount,
+                "kind": payload.kind.value,
+                "account_id": payload.account_id,
+                "category_id": payload.category_id,
+            }
+        )
+        if len(chunk) >= chunk_size:
+            insert_transactions(db, chunk)
+            inserted += len(chunk)
+            chunk = []
+
+    insert_transactions(db, chunk)
+    inserted += len(chunk)
+    db.commit()
+
+    return {"inserted": inserted, "errors": errors}
@@ -1,11 +1,77 @@
-"""Transfer service - handles transfer transactions."""
+"""Transfer service - handles transfer transactions.
+
+Both legs of a transfer share its date, so they are always written to the
+same year partition, by one executemany with IDs reserved up front (see
+services/ledger.py). The pair ID is generated before the insert as well, so
+creating a transfer costs no query besides the insert and the derived-data
+updates. Bulk transfers build the pairs up front too and go through the
+ledger's chunked executemany insert.
+"""
 
 import datetime as dt
-from decimal import Decimal
+from collections.abc import Iterator
+from typing import Any
 
 from sqlalchemy.orm import Session
 
-from app.db.models import Transaction, new_pair_id
+from app.db.models import new_pair_id
+from app.schemas.transactions import TransferCreate
+from app.services.archive import closed_months
+from app.services.ledger import insert_rows, insert_transactions, record_inserts
+from app.services.refdata import get_reference_data
+from app.services.rollups import month_key
+
+
+def check_transfer(
+    amount_abs_cents: int,
+    from_account_id: int,
+    to_account_id: int,
+    *,
+    from_active: bool,
+    to_active: bool,
+) -> None:
+    """Validate a transfer.
+
+    Args:
+        amount_abs_cents: Absolute amount in cents
+        from_account_id: Source account ID
+        to_account_id: Destination account ID
+        from_active: Whether the source account exists and is active
+        to_active: Whether the destination account exists and is active
+
+    Raises:
+        ValueError: If accounts are the same or invalid/inactive, or amount_abs_cents <= 0
+    """
+    if from_account_id == to_account_id:
+        raise ValueError("Conta origem e destino não podem ser iguais.")
+    if amount_abs_cents <= 0:
+        raise ValueError("amount_abs deve ser > 0")
+    if not from_active:
+        raise ValueError("Conta origem inválida/inativa")
+    if not to_active:
+        raise ValueError("Conta destino inválida/inativa")
+
+
+def _legs(
+    pair: str,
+    date: dt.date,
+    description: str,
+    amount_abs_cents: int,
+    from_account_id: int,
+    to_account_id: int,
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "date": date,
+            "description": description,
+            "amount_cents": sign * amount_abs_cents,
+            "kind": "TRANSFER",
+            "account_id": account_id,
+            "category_id": None,
+            "transfer_pair_id": pair,
+        }
+        for sign, account_id in ((-1, from_account_id), (1, to_account_id))
+    ]
 
 
 def create_transfer(
@@ -13,17 +79,17 @@ def create_transfer(
     *,
     date: dt.date,
     description: str,
-    amount_abs: Decimal,
+    amount_abs_cents: int,
     from_account_id: int,
     to_account_id: int,
 ) -> dict:
     """Create a transfer (2 linked transactions).
 
     Args:
-        db: Database session
+        db: Database session (committed here)
         date: Transfer date
         description: Transfer description
-        amount_abs: Absolute amount (must be > 0)
+        amount_abs_cents: Absolute amount in cents (must be > 0)
         from_account_id: Source account ID
         to_account_id: Destination account ID
 
@@ -31,37 +97,92 @@ def create_transfer(
         Dict with pair_id, out_id, and in_id
 
     Raises:
-        ValueError: If accounts are the same or amount_abs <= 0
+        ValueError: If accounts are the same or invalid/inactive, or amount_abs_cents <= 0
+        ClosedMonthError: If the month of the date is closed
     """
-    if from_account_id == to_account_id:
-        raise ValueError("Conta origem e destino não podem ser iguais.")
-    if amount_abs <= 0:
-        raise ValueError("amount_abs deve ser > 0")
+    ref = get_reference_data(db)
+    check_transfer(
+        amount_abs_cents,
+        from_account_id,
+        to_account_id,
+        from_active=ref.account_active(from_account_id),
+        to_active=ref.account_active(to_account_id),
+    )
 
     pair = new_pair_id()
+    rows = _legs(pair, date, description, amount_abs_cents, from_account_id, to_account_id)
+    record_inserts(db, rows)
+    insert_rows(db, rows)
+    db.commit()
 
-    out_tx = Transaction(
-        date=date,
-        description=description,
-        amount=-amount_abs,
-        kind="TRANSFER",
-        account_id=from_account_id,
-        category_id=None,
-        transfer_pair_id=pair,
-    )
-    in_tx = Transaction(
-        date=date,
-        description=description,
-        amount=amount_abs,
-        kind="TRANSFER",
-        account_id=to_account_id,
-        category_id=None,
-        transfer_pair_id=pair,
-    )
+    out_leg, in_leg = rows
+    return {"pair_id": pair, "out_id": out_leg["id"], "in_id": in_leg["id"]}
+
+
+def bulk_create_transfers(
+    db: Session,
+    payloads: Iterator[tuple[int, TransferCreate | str]],
+    *,
+    chunk_size: int,
+) -> dict:
+    """Validate and create many transfers in one DB transaction.
+
+    Accounts are checked against the cached reference data. Invalid items,
+    including transfers dated in a closed month, are skipped and reported by
+    index; valid ones are committed together.
+
+    Args:
+        db: Database session (committed here)
+        payloads: Parsed items as produced by iter_bulk_payloads
+        chunk_size: Rows per executemany batch (each transfer is two rows)
+
+    Returns:
+        Dict with the number of created transfers, their pair IDs by index and
+        per-item errors
+    """
+    ref = get_reference_data(db)
+    closed = closed_months(db)
+
+    pairs: list[dict] = []
+    errors: list[dict] = []
+    chunk: list[dict[str, Any]] = []
+
+    for index, payload in payloads:
+        if isinstance(payload, str):
+            errors.append({"index": index, "detail": payload})
+            continue
+        try:
+            check_transfer(
+                payload.amount_abs,
+                payload.from_account_id,
+                payload.to_account_id,
+                from_active=ref.account_active(payload.from_account_id),
+                to_active=ref.account_active(payload.to_account_id),
+            )
+        except ValueError as e:
+            errors.append({"index": index, "detail": str(e)})
+            continue
+        if month_key(payload.date) in closed:
+            errors.append({"index": index, "detail": f"Mês {month_key(payload.date)} está fechado"})
+            continue
+
+        pair = new_pair_id()
+        pairs.append({"index": index, "pair_id": pair})
+        chunk.extend(
+            _legs(
+                pair,
+                payload.date,
+                payload.description,
+                payload.amount_abs,
+                payload.from_account_id,
+                payload.to_account_id,
+            )
+        )
+        if len(chunk) >= chunk_size:
+            insert_transactions(db, chunk)
+            chunk = []
 
-    db.add_all([out_tx, in_tx])
+    insert_transactions(db, chunk)
     db.commit()
-    db.refresh(out_tx)
-    db.refresh(in_tx)
 
-    return {"pair_id": pair, "out_id": out_tx.id, "in_id": in_tx.id}
+    return {"inserted": len(pairs), "pairs": pairs, "errors": errors}
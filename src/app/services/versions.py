@@ -0,0 +1,167 @@
+"""Data versions - cheap change detection for in-process caches.
+
+``data_versions`` holds one counter per cached data set (``refdata`` for accounts
+and categories, ``month:YYYY-MM`` for the data behind a monthly report). Writers
+bump the counters in the same DB transaction as their change. Readers ask the
+process-wide ``version_tracker``, which re-reads a counter at most every
+``VERSION_CHECK_INTERVAL`` seconds and forgets it as soon as a write from this
+process commits, so a warm cache costs no queries at all.
+"""
+
+import threading
+import time
+from collections.abc import Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import DataVersion
+from app.db.upsert import upsert_insert
+
+
+def month_version_key(month: str) -> str:
+    """Return the data_versions key of a month.
+
+    Args:
+        month: Month in YYYY-MM format
+
+    Returns:
+        Version key
+    """
+    return f"month:{month}"
+
+
+def read_version(db: Session, key: str) -> int:
+    """Read the current version of a data set (0 if never bumped).
+
+    Args:
+        db: Database session
+        key: Data set key
+
+    Returns:
+        Version counter
+    """
+    return db.scalar(select(DataVersion.version).where(DataVersion.key == key)) or 0
+
+
+def read_versions(db: Session, keys: Iterable[str]) -> dict[str, int]:
+    """Read the current version of several data sets with one query.
+
+    Args:
+        db: Database session
+        keys: Data set keys
+
+    Returns:
+        Dict of key -> version counter (0 for keys never bumped)
+    """
+    keys = list(keys)
+    found = dict(
+        db.execute(select(DataVersion.key, DataVersion.version).where(DataVersion.key.in_(keys)))
+        .tuples()
+        .all()
+    )
+    return {key: found.get(key, 0) for key in keys}
+
+
+def bump_versions(db: Session, keys: Iterable[str]) -> None:
+    """Increment the version of each data set with one executemany upsert.
+
+    Args:
+        db: Database session (the caller commits)
+        keys: Data set keys
+    """
+    params = [{"key": key, "version": 1} for key in sorted(set(keys))]
+    if not params:
+        return
+    table = DataVersion.__table__
+    stmt = upsert_insert(db, table)
+    stmt = stmt.on_conflict_do_update(index_elements=["key"], set_={"version": table.c.version + 1})
+    db.execute(stmt, params)
+
+
+class VersionTracker:
+    """Process-wide view of data versions with a throttled re-read."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._versions: dict[str, tuple[int, float]] = {}
+
+    def get(self, db: Session, key: str) -> int:
+        """Return the version of a data set, re-reading it when the last read is stale.
+
+        Args:
+            db: Database session used when the counter must be re-read
+            key: Data set key
+
+        Returns:
+            Version counter
+        """
+        now = time.monotonic()
+        cached = self._versions.get(key)
+        if cached is not None and now - cached[1] < settings.version_check_interval:
+            return cached[0]
+
+        version = read_version(db, key)
+        with self._lock:
+            self._versions[key] = (version, now)
+        return version
+
+    def get_many(self, db: Session, keys: list[str]) -> list[int]:
+        """Return the versions of several data sets, re-reading the stale ones together.
+
+        Args:
+            db: Database session used when counters must be re-read
+            keys: Data set keys
+
+        Returns:
+            Version counters, in the order of ``keys``
+        """
+        now = time.monotonic()
+        fresh: dict[str, int] = {}
+        for key in keys:
+            cached = self._versions.get(key)
+            if cached is not None and now - cached[1] < settings.version_check_interval:
+                fresh[key] = cached[0]
+
+        stale = [key for key in keys if key not in fresh]
+        if stale:
+            read = read_versions(db, stale)
+            with self._lock:
+                for key, version in read.items():
+                    self._versions[key] = (version, now)
+            fresh.update(read)
+        return [fresh[key] for key in keys]
+
+    def invalidate(self, keys: Iterable[str] | None = None) -> None:
+        """Forget some (or all) versions so the next get() re-reads them.
+
+        Args:
+            keys: Data set keys, or None for every key
+        """
+        with self._lock:
+            if keys is None:
+                self._versions.clear()
+                return
+            for key in keys:
+                self._versions.pop(key, None)
+
+
+version_tracker = VersionTracker()
+
+
+def mark_changed(db: Session, keys: Iterable[str]) -> None:
+    """Record that data sets change in the current DB transaction.
+
+    Bumps the shared counters for other workers and makes this process re-read
+    them once the transaction commits.
+
+    Args:
+        db: Database session (the caller commits)
+        keys: Data set keys
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    bump_versions(db, keys)
+    event.listen(db, "after_commit", lambda _session: version_tracker.invalidate(keys), once=True)
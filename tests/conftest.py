@@ -1,6 +1,8 @@
 """Pytest configuration and fixtures for testing."""
 
 import os
+from dataclasses import dataclass
+from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
@@ -13,13 +15,21 @@ def set_test_env():
     os.environ["API_KEY_ENABLED"] = "true"
     os.environ["API_KEY"] = "TEST_KEY"
     os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["ARCHIVE_DIR"] = "./test_archive"
+    os.environ["ARCHIVE_COLD_DIR"] = "./test_archive_cold"
     yield
     # Cleanup test database after all tests
     import pathlib
+    import shutil
 
-    db_path = pathlib.Path("test_app.db")
-    if db_path.exists():
-        db_path.unlink()
+    shutil.rmtree("test_archive", ignore_errors=True)
+    shutil.rmtree("test_archive_cold", ignore_errors=True)
+
+    # WAL mode keeps -wal/-shm side files next to the database
+    for name in ("test_app.db", "test_app.db-wal", "test_app.db-shm"):
+        db_path = pathlib.Path(name)
+        if db_path.exists():
+            db_path.unlink()
 
 
 @pytest.fixture()
@@ -28,11 +38,24 @@ def client():
     from app.db.base import Base
     from app.db.session import get_engine
     from app.main import create_app
+    from app.services.analytics import analytics_cache
+    from app.services.archive import archive_store
+    from app.services.refdata import reference_cache
+    from app.services.reports import report_cache
+    from app.services.rules import rule_cache
+    from app.services.versions import version_tracker
 
     # Clear and recreate the database schema
     engine = get_engine()
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # In-process caches would otherwise outlive the database they mirror
+    version_tracker.invalidate()
+    reference_cache.invalidate()
+    report_cache.clear()
+    analytics_cache.clear()
+    archive_store.invalidate()
+    rule_cache.invalidate()
 
     app = create_app()
     with TestClient(app) as test_client:
@@ -46,3 +69,61 @@ def client():
 def headers():
     """Return headers with API key for authenticated requests."""
     return {"X-API-Key": "TEST_KEY"}
+
+
+@dataclass(frozen=True)
+class LedgerSetup:
+    """Accounts and categories created through the API by the ledger_setup fixture."""
+
+    client: TestClient
+    headers: dict[str, str]
+    account_id: int
+    wallet_id: int
+    income_id: int
+    expense_id: int
+
+    def category(self, name: str, kind: str = "EXPENSE", group: str = "OTHER") -> int:
+        """Create another category and return its ID."""
+        r = self.client.post(
+            "/categories", json={"name": name, "kind": kind, "group": group}, headers=self.headers
+        )
+        assert r.status_code == 201, r.text
+        return r.json()["id"]
+
+    def add(self, date: str, amount: Any, kind: str = "EXPENSE", **fields: Any) -> dict:
+        """Create an INCOME/EXPENSE transaction, by default in the main account.
+
+        The category defaults to the income or expense one, matching ``kind``.
+        """
+        body = {
+            "date": date,
+            "amount": amount,
+            "kind": kind,
+            "account_id": self.account_id,
+            "category_id": self.income_id if kind == "INCOME" else self.expense_id,
+            **fields,
+        }
+        r = self.client.post("/transactions", json=body, headers=self.headers)
+        assert r.status_code == 201, r.text
+        return r.json()
+
+
+@pytest.fixture()
+def ledger_setup(client, headers):
+    """Create a bank account, a cash wallet and one income and one expense category."""
+
+    def post(path: str, body: dict) -> int:
+        r = client.post(path, json=body, headers=headers)
+        assert r.status_code == 201, r.text
+        return r.json()["id"]
+
+    return LedgerSetup(
+        client=client,
+        headers=headers,
+        account_id=post("/accounts", {"name": "Banco", "type": "BANK"}),
+        wallet_id=post("/accounts", {"name": "Carteira", "type": "CASH"}),
+        income_id=post("/categories", {"name": "Salário", "kind": "INCOME", "group": "ESSENTIAL"}),
+        expense_id=post(
+            "/categories", {"name": "Alimentação", "kind": "EXPENSE", "group": "ESSENTIAL"}
+        ),
+    )
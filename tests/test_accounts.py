@@ -28,3 +28,117 @@ def test_account_requires_api_key(client):
     """Test that accounts endpoint requires API key."""
     r = client.get("/accounts")
     assert r.status_code == 401
+
+
+def test_account_balance_follows_ledger(client, headers):
+    """Test stored balances track inserts, transfers, bulk rows and deletes."""
+    a1 = client.post("/accounts", json={"name": "Banco", "type": "BANK"}, headers=headers).json()
+    a2 = client.post("/accounts", json={"name": "Carteira", "type": "CASH"}, headers=headers).json()
+    assert a1["balance"] == "0.00"
+
+    inc = client.post(
+        "/categories",
+        json={"name": "Salário", "kind": "INCOME", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+    exp = client.post(
+        "/categories",
+        json={"name": "Alimentação", "kind": "EXPENSE", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+
+    client.post(
+        "/transactions",
+        json={
+            "date": "2026-01-05",
+            "amount": 1000.0,
+            "kind": "INCOME",
+            "account_id": a1["id"],
+            "category_id": inc["id"],
+        },
+        headers=headers,
+    )
+    spent = client.post(
+        "/transactions",
+        json={
+            "date": "2026-01-06",
+            "amount": -120.25,
+            "kind": "EXPENSE",
+            "account_id": a1["id"],
+            "category_id": exp["id"],
+        },
+        headers=headers,
+    ).json()
+    transfer = client.post(
+        "/transactions/transfer",
+        json={
+            "date": "2026-01-07",
+            "amount_abs": 200.0,
+            "from_account_id": a1["id"],
+            "to_account_id": a2["id"],
+        },
+        headers=headers,
+    ).json()
+    client.post(
+        "/transactions/bulk",
+        json=[
+            {
+                "date": "2026-01-08",
+                "amount": -15.0,
+                "kind": "EXPENSE",
+                "account_id": a2["id"],
+                "category_id": exp["id"],
+            }
+        ],
+        headers=headers,
+    )
+
+    balances = {a["id"]: a["balance"] for a in client.get("/accounts", headers=headers).json()}
+    assert balances == {a1["id"]: "679.75", a2["id"]: "185.00"}
+
+    client.delete(f"/transactions/{transfer['in_id']}", headers=headers)
+    client.delete(f"/transactions/{spent['id']}", headers=headers)
+
+    assert client.get(f"/accounts/{a1['id']}", headers=headers).json()["balance"] == "1000.00"
+    assert client.get(f"/accounts/{a2['id']}", headers=headers).json()["balance"] == "-15.00"
+    assert client.get("/accounts/999", headers=headers).status_code == 404
+
+
+def test_balance_reconciliation(client, headers):
+    """Test reconciliation reports drift and fixes it on request."""
+    from sqlalchemy import update
+
+    from app.cli import main as cli_main
+    from app.db.models import Account
+    from app.db.session import get_session
+    from app.services.balances import reconcile_balances
+
+    acc = client.post("/accounts", json={"name": "Banco", "type": "BANK"}, headers=headers).json()
+    cat = client.post(
+        "/categories",
+        json={"name": "Salário", "kind": "INCOME", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+    client.post(
+        "/transactions",
+        json={
+            "date": "2026-01-05",
+            "amount": 300.0,
+            "kind": "INCOME",
+            "account_id": acc["id"],
+            "category_id": cat["id"],
+        },
+        headers=headers,
+    )
+
+    with get_session() as db:
+        assert reconcile_balances(db) == []
+        db.execute(update(Account).values(balance_cents=1))
+        db.commit()
+
+    assert cli_main(["balances", "reconcile"]) == 1
+    with get_session() as db:
+        drift = reconcile_balances(db, fix=True)
+    assert [(d["account_id"], float(d["ledger"])) for d in drift] == [(acc["id"], 300.0)]
+    assert cli_main(["balances", "reconcile"]) == 0
+    assert client.get(f"/accounts/{acc['id']}", headers=headers).json()["balance"] == "300.00"
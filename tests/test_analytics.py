@@ -0,0 +1,161 @@
+"""Tests for the vectorized analytics reports."""
+
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+
+def _seed(ledger):
+    ledger.add("2025-12-31", 1000, "INCOME")
+    ledger.add("2026-01-01", -10.1)
+    ledger.add("2026-01-15", -20.2, account_id=ledger.wallet_id)
+    ledger.add("2026-02-28", 3000, "INCOME")
+    ledger.add("2026-02-28", -30.3)
+    r = ledger.client.post(
+        "/transactions/transfer",
+        json={
+            "date": "2026-02-10",
+            "amount_abs": 50,
+            "from_account_id": ledger.account_id,
+            "to_account_id": ledger.wallet_id,
+        },
+        headers=ledger.headers,
+    )
+    assert r.status_code == 201, r.text
+
+
+def test_analytics_totals_match_range_report(client, headers, ledger_setup):
+    """Totals per category agree with the SQL reports and leave transfers out."""
+    _seed(ledger_setup)
+
+    r = client.get("/reports/analytics/totals?from=2026-01&to=2026-02", headers=headers)
+    assert r.status_code == 200, r.text
+    groups = {g["category_id"]: g for g in r.json()["groups"]}
+    assert set(groups) == {ledger_setup.expense_id, ledger_setup.income_id}
+    assert groups[ledger_setup.expense_id] == {
+        "category_id": ledger_setup.expense_id,
+        "category_name": "Alimentação",
+        "income": "0.00",
+        "expense": "60.60",
+        "net": "-60.60",
+        "count": 3,
+    }
+    assert groups[ledger_setup.income_id]["income"] == "3000.00"
+
+    months = client.get("/reports/range?from=2026-01&to=2026-02", headers=headers).json()
+    assert sum(Decimal(m["expense_total"]) for m in months["months"]) == Decimal("60.60")
+
+    r = client.get(
+        "/reports/analytics/totals?from=2026-01&to=2026-02&group_by=account", headers=headers
+    )
+    by_account = {g["account_id"]: g for g in r.json()["groups"]}
+    assert by_account[ledger_setup.account_id]["net"] == "2959.60"
+    assert by_account[ledger_setup.wallet_id]["expense"] == "20.20"
+
+
+def test_analytics_daily_series_and_rolling_sum(client, headers, ledger_setup):
+    """Every calendar day is present, including month edges, with a trailing window."""
+    _seed(ledger_setup)
+
+    r = client.get("/reports/analytics/daily?from=2026-01&to=2026-02&window=2", headers=headers)
+    assert r.status_code == 200, r.text
+    days = r.json()["days"]
+    assert len(days) == 31 + 28
+    assert days[0] == {
+        "date": "2026-01-01",
+        "income": "0.00",
+        "expense": "10.10",
+        "net": "-10.10",
+        "rolling_net": "-10.10",
+    }
+    assert days[1]["rolling_net"] == "-10.10"
+    assert days[2]["rolling_net"] == "0.00"
+    assert days[-1]["date"] == "2026-02-28"
+    assert days[-1]["net"] == "2969.70"
+    # The 2025-12-31 income is outside the period
+    assert sum(Decimal(d["income"]) for d in days) == Decimal("3000.00")
+
+
+def test_analytics_percentiles(client, headers, ledger_setup):
+    """Percentiles use nearest rank over expense amounts."""
+    _seed(ledger_setup)
+
+    r = client.get(
+        "/reports/analytics/percentiles?from=2026-01&to=2026-02&q=0&q=50&q=100", headers=headers
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["count"] == 3
+    assert body["overall"] == {"p0": "10.10", "p50": "20.20", "p100": "30.30"}
+    assert body["by_category"] == [
+        {
+            "category_id": ledger_setup.expense_id,
+            "category_name": "Alimentação",
+            "count": 3,
+            "p0": "10.10",
+            "p50": "20.20",
+            "p100": "30.30",
+        }
+    ]
+
+    r = client.get("/reports/analytics/percentiles?from=2026-01&to=2026-02&q=101", headers=headers)
+    assert r.status_code == 400
+
+
+def test_analytics_cache_follows_writes(client, headers, ledger_setup):
+    """A write to a month of the period reloads the cached arrays."""
+    from app.services.analytics import analytics_cache
+
+    _seed(ledger_setup)
+    url = "/reports/analytics/totals?from=2026-01&to=2026-02"
+
+    first = client.get(url, headers=headers).json()
+    assert client.get(url, headers=headers).json() == first
+    assert len(analytics_cache) == 1
+
+    ledger_setup.add("2026-02-01", -100)
+    groups = {g["category_id"]: g for g in client.get(url, headers=headers).json()["groups"]}
+    assert groups[ledger_setup.expense_id]["expense"] == "160.60"
+
+    # Writes outside the period keep the cached arrays
+    ledger_setup.add("2026-03-01", -1)
+    assert len(analytics_cache) == 2
+    client.get(url, headers=headers)
+    assert len(analytics_cache) == 2
+
+
+def test_analytics_range_validation(client, headers):
+    """Inverted and too long periods are rejected."""
+    r = client.get("/reports/analytics/daily?from=2026-02&to=2026-01", headers=headers)
+    assert r.status_code == 400
+    r = client.get("/reports/analytics/totals?from=2000-01&to=2026-01", headers=headers)
+    assert r.status_code == 400
+
+
+def test_analytics_load_is_portable_and_exact(client, headers, ledger_setup):
+    """The load query uses no SQLite-only function; days and sums stay exact."""
+    import datetime as dt
+
+    import numpy as np
+    from sqlalchemy.dialects import postgresql
+
+    from app.db.session import get_session
+    from app.services.analytics import _sums, ledger_query, load_ledger_arrays
+
+    sql = str(
+        ledger_query(dt.date(2024, 1, 1), dt.date(2024, 3, 31)).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "julianday" not in sql.lower()
+
+    ledger_setup.add("2024-02-29", -1)
+    with get_session() as db:
+        arrays = load_ledger_arrays(db, "2024-02", "2024-02")
+    assert arrays.day.tolist() == [dt.date(2024, 2, 29).toordinal()]
+
+    # float64 accumulation would round 2**53 + 1 down
+    sums = _sums(np.array([0, 0, 1]), np.array([2**53, 1, -(2**60)]), 2)
+    assert sums.tolist() == [2**53 + 1, -(2**60)]
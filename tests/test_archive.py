@@ -0,0 +1,344 @@
+"""Tests for closed months and their columnar archives."""
+
+import pytest
+
+
+def _seed(ledger):
+    ids = [
+        ledger.add(date, amount, description=description)["id"]
+        for date, amount, description in (
+            ("2026-01-05", -10.5, "Padaria São João"),
+            ("2026-01-20", -20.25, ""),
+            ("2026-02-03", -30.0, "Feira"),
+            ("2026-03-10", -40.0, "Açougue"),
+        )
+    ]
+    r = ledger.client.post(
+        "/transactions/transfer",
+        json={
+            "date": "2026-02-15",
+            "description": "Saque",
+            "amount_abs": 100,
+            "from_account_id": ledger.account_id,
+            "to_account_id": ledger.wallet_id,
+        },
+        headers=ledger.headers,
+    )
+    assert r.status_code == 201, r.text
+    ledger.client.post(
+        "/budgets",
+        json={"month": "2026-02", "category_id": ledger.expense_id, "amount_planned": 50},
+        headers=ledger.headers,
+    )
+    return ids
+
+
+def test_archive_file_round_trip(tmp_path):
+    """Rows, NULLs, non-ASCII text and the summary survive the columnar file."""
+    import datetime as dt
+
+    from app.services.archive import MonthArchive, RowFilter, write_archive
+
+    created = dt.datetime(2026, 1, 2, 3, 4, 5, 678901)
+    records = [
+        {
+            "id": 7,
+            "date": dt.date(2026, 1, 31),
+            "description": "Café ☕",
+            "amount_cents": -1234,
+            "kind": "EXPENSE",
+            "account_id": 1,
+            "category_id": 3,
+            "transfer_pair_id": None,
+            "fingerprint": "ab" * 32,
+            "created_at": created,
+        },
+        {
+            "id": 2,
+            "date": dt.date(2026, 1, 31),
+            "description": "",
+            "amount_cents": 500,
+            "kind": "TRANSFER",
+            "account_id": 2,
+            "category_id": None,
+            "transfer_pair_id": "pair-1",
+            "fingerprint": None,
+            "created_at": created,
+        },
+    ]
+    path = tmp_path / "2026-01.fmarc"
+    write_archive(path, "2026-01", records, [(3, 0, -1234, 2000)])
+
+    archive = MonthArchive(path)
+    assert archive.month == "2026-01"
+    assert sorted(archive.records(), key=lambda r: r["id"]) == sorted(
+        records, key=lambda r: r["id"]
+    )
+    assert archive.summary() == [(3, 0, -1234, 2000)]
+    assert archive.account_totals() == {1: -1234, 2: 500}
+    assert 7 in archive and 8 not in archive
+
+    # Descending (date, id), zero-copy filters on the columns
+    assert [row[0] for row in archive.rows(RowFilter())] == [7, 2]
+    assert list(archive.rows(RowFilter(kind="TRANSFER"))) == [
+        (2, dt.date(2026, 1, 31), "", 500, "TRANSFER", 2, None, "pair-1")
+    ]
+    assert [row[0] for row in archive.rows(RowFilter(after=(dt.date(2026, 1, 31), 7)))] == [2]
+
+    empty = tmp_path / "2025-12.fmarc"
+    write_archive(empty, "2025-12", [], [])
+    assert MonthArchive(empty).records() == []
+
+
+def test_close_month_keeps_reads_and_rejects_writes(client, headers, ledger_setup):
+    """A closed month leaves the live ledger but still shows up in every read."""
+    from sqlalchemy import func, select
+
+    from app.db.models import Transaction
+    from app.db.session import get_session
+
+    ids = _seed(ledger_setup)
+    before = {
+        "list": client.get("/transactions", headers=headers).json(),
+        "page": client.get("/transactions?limit=3", headers=headers).json(),
+        "summary": client.get("/reports/monthly-summary?month=2026-02", headers=headers).json(),
+        "range": client.get("/reports/range?from=2026-01&to=2026-03", headers=headers).json(),
+        "csv": client.get("/transactions/export?format=csv", headers=headers).text,
+    }
+
+    for month in ("2026-01", "2026-02"):
+        r = client.post(f"/months/{month}/close", headers=headers)
+        assert r.status_code == 200, r.text
+    assert r.json()["row_count"] == 3
+    assert [m["month"] for m in client.get("/months/closed", headers=headers).json()] == [
+        "2026-01",
+        "2026-02",
+    ]
+
+    with get_session() as db:
+        assert db.scalar(select(func.count()).select_from(Transaction)) == 1
+
+    assert client.get("/transactions", headers=headers).json() == before["list"]
+    assert client.get("/transactions?limit=3", headers=headers).json() == before["page"]
+    summary = client.get("/reports/monthly-summary?month=2026-02", headers=headers).json()
+    assert summary == before["summary"]
+    assert summary["by_category"][0]["planned"] == "50.00"
+    r = client.get("/reports/range?from=2026-01&to=2026-03", headers=headers)
+    assert r.json() == before["range"]
+    assert client.get("/transactions/export?format=csv", headers=headers).text == before["csv"]
+    assert (
+        client.get(f"/accounts/{ledger_setup.wallet_id}", headers=headers).json()["balance"]
+        == "100.00"
+    )
+
+    # Writes to a closed month are rejected until it is reopened
+    tx = {
+        "date": "2026-01-10",
+        "amount": -1,
+        "kind": "EXPENSE",
+        "account_id": ledger_setup.account_id,
+        "category_id": ledger_setup.expense_id,
+    }
+    assert client.post("/transactions", json=tx, headers=headers).status_code == 409
+    assert client.delete(f"/transactions/{ids[0]}", headers=headers).status_code == 409
+    r = client.post(
+        "/budgets",
+        json={"month": "2026-01", "category_id": ledger_setup.expense_id, "amount_planned": 10},
+        headers=headers,
+    )
+    assert r.status_code == 409
+    r = client.post("/transactions/bulk", json=[tx, {**tx, "date": "2026-03-11"}], headers=headers)
+    assert r.json()["inserted"] == 1
+    assert r.json()["errors"] == [{"index": 0, "detail": "Mês 2026-01 está fechado"}]
+
+    assert client.post("/months/2026-01/close", headers=headers).status_code == 409
+    assert client.post("/months/2099-01/close", headers=headers).status_code == 400
+
+
+def test_reopen_month_restores_rows(client, headers, ledger_setup):
+    """Reopening puts the rows back with their IDs and accepts writes again."""
+    from app.db.session import get_session
+    from app.services.balances import reconcile_balances
+    from app.services.rollups import check_rollups
+
+    ids = _seed(ledger_setup)
+    listing = client.get("/transactions", headers=headers).json()
+    client.post("/months/2026-01/close", headers=headers)
+
+    with get_session() as db:
+        assert reconcile_balances(db) == []
+        assert check_rollups(db) == []
+
+    # New rows never reuse the IDs of archived ones
+    r = client.post(
+        "/transactions",
+        json={
+            "date": "2026-03-12",
+            "amount": -5,
+            "kind": "EXPENSE",
+            "account_id": ledger_setup.account_id,
+            "category_id": ledger_setup.expense_id,
+        },
+        headers=headers,
+    )
+    assert r.json()["id"] > max(ids)
+    client.delete(f"/transactions/{r.json()['id']}", headers=headers)
+
+    r = client.post("/months/2026-01/reopen", headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json() == {"month": "2026-01", "row_count": 2}
+    assert client.get("/months/closed", headers=headers).json() == []
+    assert client.get("/transactions", headers=headers).json() == listing
+
+    with get_session() as db:
+        assert check_rollups(db) == []
+        assert reconcile_balances(db) == []
+
+    assert client.delete(f"/transactions/{ids[0]}", headers=headers).status_code == 204
+    assert client.post("/months/2026-01/reopen", headers=headers).status_code == 404
+
+
+def test_closed_months_feed_analytics(client, headers, ledger_setup):
+    """Analytics arrays include the mapped columns of closed months."""
+    pytest.importorskip("numpy")
+
+    _seed(ledger_setup)
+    url = "/reports/analytics/totals?from=2026-01&to=2026-03"
+    before = client.get(url, headers=headers).json()
+
+    client.post("/months/2026-02/close", headers=headers)
+    assert client.get(url, headers=headers).json() == before
+
+    daily = client.get("/reports/analytics/daily?from=2026-02&to=2026-02", headers=headers).json()
+    assert daily["days"][2] == {
+        "date": "2026-02-03",
+        "income": "0.00",
+        "expense": "30.00",
+        "net": "-30.00",
+        "rolling_net": "-30.00",
+    }
+
+
+def test_detach_year_moves_files_to_cold_storage(client, headers, ledger_setup):
+    """A fully closed year moves to ARCHIVE_COLD_DIR and stays readable."""
+    import shutil
+    from pathlib import Path
+
+    ids = _seed(ledger_setup)
+    r = client.post(
+        "/transactions",
+        json={
+            "date": "2025-06-10",
+            "description": "Antigo",
+            "amount": -7,
+            "kind": "EXPENSE",
+            "account_id": ledger_setup.account_id,
+            "category_id": ledger_setup.expense_id,
+        },
+        headers=headers,
+    )
+    old_id = r.json()["id"]
+    listing = client.get("/transactions", headers=headers).json()
+    summary = client.get("/reports/monthly-summary?month=2025-06", headers=headers).json()
+
+    for month in range(1, 12):
+        client.post(f"/months/2025-{month:02d}/close", headers=headers)
+    r = client.post("/months/2025/detach", headers=headers)
+    assert r.status_code == 400
+    assert "2025-12" in r.json()["detail"]
+
+    client.post("/months/2025-12/close", headers=headers)
+    r = client.post("/months/2025/detach", headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["months"] == [f"2025-{month:02d}" for month in range(1, 13)]
+    assert sorted(p.name[:7] for p in Path("test_archive_cold/2025").iterdir())[0] == "2025-01"
+    assert not any(Path("test_archive/2025").iterdir())
+    assert client.post("/months/2025/detach", headers=headers).json()["months"] == []
+
+    # A crash after the commit leaves the hot copy behind; detaching again removes it
+    cold = sorted(Path("test_archive_cold/2025").iterdir())[0]
+    shutil.copyfile(cold, Path("test_archive/2025") / cold.name)
+    assert client.post("/months/2025/detach", headers=headers).json()["months"] == []
+    assert not any(Path("test_archive/2025").iterdir())
+
+    # Reads reach the cold files; the open months were never touched
+    closed = client.get("/months/closed", headers=headers).json()
+    assert all(m["detached"] for m in closed)
+    assert client.get("/transactions", headers=headers).json() == listing
+    assert client.get("/reports/monthly-summary?month=2025-06", headers=headers).json() == summary
+    assert client.delete(f"/transactions/{old_id}", headers=headers).status_code == 409
+    assert client.delete(f"/transactions/{ids[0]}", headers=headers).status_code == 204
+
+    r = client.post("/months/2025/attach", headers=headers)
+    assert len(r.json()["months"]) == 12
+    assert not any(Path("test_archive_cold/2025").iterdir())
+    assert client.post("/months/2025-06/reopen", headers=headers).json()["row_count"] == 1
+
+
+def test_find_only_opens_months_in_id_range(client, headers, ledger_setup):
+    """Lookups by ID skip the archives whose ID range cannot contain it."""
+    from app.db.session import get_session
+    from app.services.archive import get_archive_index
+
+    ids = _seed(ledger_setup)
+    client.post("/months/2026-01/close", headers=headers)
+    client.post("/months/2026-02/close", headers=headers)
+
+    with get_session() as db:
+        index = get_archive_index(db)
+        assert index.id_ranges["2026-01"] == (ids[0], ids[1])
+        assert index.find(ids[2]) == "2026-02"
+        assert set(index._opened) == {"2026-02"}
+        assert index.find(ids[3]) is None
+        assert set(index._opened) == {"2026-02"}
+
+
+def test_index_sees_other_workers_and_releases_mappings(client, headers, ledger_setup, monkeypatch):
+    """The archive version is not throttled; a replaced index unmaps its unused files."""
+    import weakref
+
+    from app.core.config import settings
+    from app.db.session import get_session
+    from app.services.archive import get_archive_index
+    from app.services.versions import bump_versions
+
+    monkeypatch.setattr(settings, "version_check_interval", 60.0)
+    ids = _seed(ledger_setup)
+    client.post("/months/2026-01/close", headers=headers)
+
+    with get_session() as db:
+        old = get_archive_index(db)
+        archive = weakref.ref(old.open("2026-01"))
+        # Another worker's close/reopen: only the database version moves
+        bump_versions(db, ["archive"])
+        db.commit()
+        new = get_archive_index(db)
+
+    assert new is not old and new.version == old.version + 1
+    assert old._opened == {} and archive() is None
+    assert new.find(ids[0]) == "2026-01"
+
+
+def test_close_month_rejects_split_transfer(client, headers, ledger_setup):
+    """A transfer pair is never split across partitions."""
+    import datetime as dt
+
+    from sqlalchemy import update
+
+    from app.db.partitions import partition_table
+    from app.db.session import get_session
+
+    _seed(ledger_setup)
+    table = partition_table(2026)
+    with get_session() as db:
+        db.execute(
+            update(table)
+            .where(table.c.kind == "TRANSFER", table.c.account_id == ledger_setup.wallet_id)
+            .values(date=dt.date(2026, 3, 1))
+        )
+        db.commit()
+
+    r = client.post("/months/2026-02/close", headers=headers)
+    assert r.status_code == 400
+    assert "fora de 2026-02" in r.json()["detail"]
+    assert client.get("/months/closed", headers=headers).json() == []
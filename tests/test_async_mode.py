@@ -0,0 +1,216 @@
+"""Tests for the opt-in async database mode (DB_MODE=async)."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture()
+def async_client(client, monkeypatch):
+    """Create a test client for an app built in async mode (shares the fresh database)."""
+    from app.core.config import settings
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "db_mode", "async")
+    app = create_app()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _seed(ledger):
+    for day in range(1, 6):
+        ledger.add(f"2026-01-{day:02d}", -10.0 * day)
+    r = ledger.client.post(
+        "/budgets",
+        json={"month": "2026-01", "category_id": ledger.expense_id, "amount_planned": 200.0},
+        headers=ledger.headers,
+    )
+    assert r.status_code == 201, r.text
+
+
+READS = [
+    "/accounts",
+    "/categories",
+    "/budgets?month=2026-01",
+    "/transactions",
+    "/transactions?limit=2",
+    "/transactions?limit=2&envelope=true",
+    "/reports/monthly-summary?month=2026-01",
+    "/reports/range?from=2025-12&to=2026-02",
+]
+
+
+def test_async_reads_match_sync(client, async_client, headers, ledger_setup):
+    """Test every async read endpoint answers exactly like its sync twin."""
+    _seed(ledger_setup)
+    acc_id = ledger_setup.account_id
+
+    for path in [*READS, f"/accounts/{acc_id}"]:
+        sync = client.get(path, headers=headers)
+        aio = async_client.get(path, headers=headers)
+        assert aio.status_code == sync.status_code == 200, path
+        assert aio.json() == sync.json(), path
+
+    page = async_client.get("/transactions?limit=2", headers=headers)
+    cursor = page.headers["X-Next-Cursor"]
+    nxt = async_client.get(f"/transactions?limit=2&cursor={cursor}", headers=headers)
+    assert [t["date"] for t in nxt.json()] == ["2026-01-03", "2026-01-02"]
+
+    assert async_client.get("/transactions?cursor=abc", headers=headers).status_code == 400
+    assert async_client.get("/accounts/999", headers=headers).status_code == 404
+
+    etag = async_client.get("/reports/monthly-summary?month=2026-01", headers=headers).headers[
+        "ETag"
+    ]
+    r = async_client.get(
+        "/reports/monthly-summary?month=2026-01", headers={**headers, "If-None-Match": etag}
+    )
+    assert r.status_code == 304
+
+
+def test_async_mode_uses_only_the_async_engine(client, async_client, headers, ledger_setup):
+    """Test writes and the remaining reads run on the async engine too."""
+    from sqlalchemy import event
+
+    from app.db.session import get_async_engine, get_engine
+
+    _seed(ledger_setup)
+    acc_id, cat_id = ledger_setup.account_id, ledger_setup.expense_id
+    seen = {"sync": 0, "async": 0}
+
+    def counter(name):
+        def count(conn, cursor, statement, parameters, context, executemany):
+            seen[name] += 1
+
+        return count
+
+    engines = {"sync": get_engine(), "async": get_async_engine().sync_engine}
+    listeners = {name: counter(name) for name in engines}
+    for name, engine in engines.items():
+        event.listen(engine, "before_cursor_execute", listeners[name])
+    try:
+        r = async_client.post("/accounts", json={"name": "Caixa", "type": "CASH"}, headers=headers)
+        assert r.status_code == 201
+        r = async_client.post(
+            "/transactions",
+            json={
+                "date": "2026-02-03",
+                "description": "Feira",
+                "amount": -7.0,
+                "kind": "EXPENSE",
+                "account_id": acc_id,
+                "category_id": cat_id,
+            },
+            headers=headers,
+        )
+        assert r.status_code == 201
+        tx_id = r.json()["id"]
+        rule = {"category_id": cat_id, "match": "CONTAINS", "pattern": "mercado"}
+        assert async_client.post("/rules", json=rule, headers=headers).status_code == 201
+        statement = "Data;Descrição;Valor\n04/02/2026;Mercado;-80,10\n"
+        r = async_client.post(
+            f"/imports/statement?format=csv&account_id={acc_id}", content=statement, headers=headers
+        )
+        assert r.json()["inserted"] == 1
+        assert async_client.get("/transactions/search?q=feira", headers=headers).json()
+        assert async_client.delete(f"/transactions/{tx_id}", headers=headers).status_code == 204
+        assert async_client.post("/months/2026-01/close", headers=headers).status_code == 200
+        export = async_client.get("/transactions/export?format=csv", headers=headers).text
+        assert len(export.splitlines()) == 7  # header, 5 archived rows, the import
+        assert async_client.post("/months/2026-01/reopen", headers=headers).status_code == 200
+    finally:
+        for name, engine in engines.items():
+            event.remove(engine, "before_cursor_execute", listeners[name])
+
+    assert seen["sync"] == 0
+    assert seen["async"] > 0
+
+
+def test_async_export_matches_sync(client, async_client, headers, ledger_setup):
+    """Test the async export streams the same rows, archived months merged in order."""
+    _seed(ledger_setup)
+    assert client.post("/months/2026-01/close", headers=headers).status_code == 200
+    for day in (1, 3):
+        ledger_setup.add(f"2026-02-{day:02d}", -1.0)
+
+    for query in ("", "?format=csv", "?from_date=2026-01-02&to_date=2026-02-02"):
+        sync = client.get(f"/transactions/export{query}", headers=headers)
+        aio = async_client.get(f"/transactions/export{query}", headers=headers)
+        assert aio.status_code == sync.status_code == 200, query
+        assert aio.headers["content-type"] == sync.headers["content-type"]
+        assert aio.text == sync.text, query
+    assert (
+        async_client.get("/transactions/export?from_date=2026-01-01", headers=headers).status_code
+        == 400
+    )
+
+
+def test_async_mode_mounts_every_endpoint_as_coroutine():
+    """Test each sync route has an async counterpart at the same path and method."""
+    import inspect
+
+    from fastapi.routing import APIRoute
+
+    from app.api.async_routes import run_sync_routes
+    from app.api.routers import (
+        accounts,
+        budgets,
+        categories,
+        imports,
+        months,
+        recurring,
+        reports,
+        rules,
+        transactions,
+    )
+
+    def methods(routes):
+        return {
+            (route.path, method)
+            for route in routes
+            if isinstance(route, APIRoute)
+            for method in route.methods
+        }
+
+    for module in (
+        accounts,
+        categories,
+        transactions,
+        budgets,
+        reports,
+        imports,
+        months,
+        rules,
+        recurring,
+    ):
+        native = getattr(module, "async_router", None)
+        routes = [
+            *(native.routes if native else []),
+            *run_sync_routes(module.router, native=native).routes,
+        ]
+        assert methods(routes) == methods(module.router.routes), module.__name__
+        assert all(inspect.iscoroutinefunction(route.endpoint) for route in routes)
+
+
+def test_async_mode_serves_concurrent_requests(client, async_client, headers, ledger_setup):
+    """Test many in-flight requests on one event loop all complete."""
+    import httpx
+
+    from app.db.session import get_async_engine
+
+    _seed(ledger_setup)
+    transport = httpx.ASGITransport(app=async_client.app)
+
+    async def burst() -> list[int]:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            responses = await asyncio.gather(
+                *(http.get(READS[i % len(READS)], headers=headers) for i in range(100))
+            )
+        # ASGITransport skips the lifespan, so release this loop's connections here
+        await get_async_engine().dispose()
+        return [r.status_code for r in responses]
+
+    assert asyncio.run(burst()) == [200] * 100
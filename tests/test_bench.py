@@ -0,0 +1,92 @@
+"""Tests for the benchmark suite (generator, runner and baseline comparison)."""
+
+
+def test_generated_ledger_is_consistent(client):
+    """Generated ledgers have the requested size and matching rollups/balances."""
+    from sqlalchemy import func, select
+
+    from app.bench.generator import generate_ledger
+    from app.db.models import Budget, Transaction
+    from app.db.session import get_session
+    from app.services.balances import reconcile_balances
+    from app.services.rollups import check_rollups
+
+    with get_session() as db:
+        ledger = generate_ledger(db, 3000, seed=7)
+
+        assert db.scalar(select(func.count()).select_from(Transaction)) == 3000
+        assert db.scalar(select(func.count()).select_from(Budget)) == len(ledger.months) * len(
+            ledger.expense_category_ids
+        )
+        # Transfers come in balanced pairs
+        assert (
+            db.scalar(
+                select(func.sum(Transaction.amount_cents)).where(Transaction.kind == "TRANSFER")
+            )
+            == 0
+        )
+        assert check_rollups(db) == []
+        assert reconcile_balances(db) == []
+
+
+def test_generator_is_deterministic(client):
+    """The same seed produces the same ledger."""
+    from sqlalchemy import select
+
+    from app.bench.generator import generate_ledger
+    from app.db.base import Base
+    from app.db.models import Transaction
+    from app.db.session import get_engine, get_session
+
+    def snapshot():
+        with get_session() as db:
+            generate_ledger(db, 500, seed=3)
+            return db.execute(
+                select(Transaction.date, Transaction.amount_cents, Transaction.kind).order_by(
+                    Transaction.id
+                )
+            ).all()
+
+    first = snapshot()
+    Base.metadata.drop_all(get_engine())
+    Base.metadata.create_all(get_engine())
+    assert snapshot() == first
+
+
+def test_run_size_times_every_case(tmp_path):
+    """A run records timings for every case and leaves the app database untouched."""
+    from app.bench.suite import CASES, run_size
+    from app.core.config import settings
+
+    original = settings.database_url
+    result = run_size(300, tmp_path, repeat=2)
+
+    assert settings.database_url == original
+    assert set(result["cases"]) == {case.name for case in CASES}
+    for timing in result["cases"].values():
+        assert timing["runs"] == 2
+        assert 0 < timing["min_ms"] <= timing["median_ms"] <= timing["p95_ms"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_compare_flags_regressions():
+    """Only slowdowns above both the relative and absolute thresholds are regressions."""
+    from app.bench.suite import compare_results
+
+    def doc(**medians):
+        return {
+            "results": {
+                "1000": {"cases": {name: {"median_ms": ms} for name, ms in medians.items()}}
+            }
+        }
+
+    baseline = doc(slow=10.0, noisy=0.2, steady=5.0, gone=1.0)
+    current = doc(slow=13.0, noisy=0.4, steady=5.5, new=1.0)
+    rows = {row["case"]: row for row in compare_results(baseline, current, threshold=0.2)}
+
+    assert set(rows) == {"slow", "noisy", "steady"}
+    assert rows["slow"]["regression"] is True
+    assert rows["slow"]["ratio"] == 1.3
+    # 2x slower but only 0.2 ms: timer noise
+    assert rows["noisy"]["regression"] is False
+    assert rows["steady"]["regression"] is False
@@ -1,5 +1,7 @@
 """Tests for budgets and reports endpoints."""
 
+from decimal import Decimal
+
 
 def test_budget_upsert(client, headers):
     """Test creating and updating budgets."""
@@ -17,7 +19,7 @@ def test_budget_upsert(client, headers):
         headers=headers,
     )
     assert r.status_code == 201
-    assert r.json()["amount_planned"] == 500.0
+    assert r.json()["amount_planned"] == "500.00"
 
     # Update (upsert)
     r = client.post(
@@ -26,7 +28,7 @@ def test_budget_upsert(client, headers):
         headers=headers,
     )
     assert r.status_code == 201
-    assert r.json()["amount_planned"] == 600.0
+    assert r.json()["amount_planned"] == "600.00"
 
     # List budgets for month
     r = client.get("/budgets?month=2026-01", headers=headers)
@@ -106,15 +108,15 @@ def test_monthly_summary_report(client, headers):
     data = r.json()
 
     assert data["month"] == "2026-01"
-    assert data["income_total"] == 3000.0
-    assert data["expense_total"] == 450.0
-    assert data["balance"] == 2550.0
+    assert data["income_total"] == "3000.00"
+    assert data["expense_total"] == "450.00"
+    assert data["balance"] == "2550.00"
 
     # Check category breakdown
     cat_data = next(c for c in data["by_category"] if c["category_id"] == cat_expense["id"])
-    assert cat_data["planned"] == 500.0
-    assert cat_data["realized"] == 450.0
-    assert cat_data["deviation"] == -50.0  # spent less than planned
+    assert cat_data["planned"] == "500.00"
+    assert cat_data["realized"] == "450.00"
+    assert cat_data["deviation"] == "-50.00"  # spent less than planned
 
 
 def test_monthly_summary_empty_month(client, headers):
@@ -123,7 +125,231 @@ def test_monthly_summary_empty_month(client, headers):
     assert r.status_code == 200
     data = r.json()
 
-    assert data["income_total"] == 0.0
-    assert data["expense_total"] == 0.0
-    assert data["balance"] == 0.0
+    assert data["income_total"] == "0.00"
+    assert data["expense_total"] == "0.00"
+    assert data["balance"] == "0.00"
     assert len(data["by_category"]) == 0
+
+
+def test_range_report(client, headers):
+    """Test multi-month report returns every month, including empty ones."""
+    acc = client.post("/accounts", json={"name": "Banco", "type": "BANK"}, headers=headers).json()
+    cat_income = client.post(
+        "/categories",
+        json={"name": "Salário", "kind": "INCOME", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+    cat_expense = client.post(
+        "/categories",
+        json={"name": "Alimentação", "kind": "EXPENSE", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+    cat_leisure = client.post(
+        "/categories",
+        json={"name": "Lazer", "kind": "EXPENSE", "group": "LIFESTYLE"},
+        headers=headers,
+    ).json()
+
+    for month in ("2025-12", "2026-02"):
+        client.post(
+            "/budgets",
+            json={"month": month, "category_id": cat_expense["id"], "amount_planned": 300.0},
+            headers=headers,
+        )
+    client.post(
+        "/budgets",
+        json={"month": "2026-02", "category_id": cat_leisure["id"], "amount_planned": 100.0},
+        headers=headers,
+    )
+    for date, amount, kind, cat in [
+        ("2025-12-05", 1000.0, "INCOME", cat_income),
+        ("2025-12-10", -120.0, "EXPENSE", cat_expense),
+        ("2026-02-05", 1100.0, "INCOME", cat_income),
+        ("2026-02-11", -350.0, "EXPENSE", cat_expense),
+    ]:
+        client.post(
+            "/transactions",
+            json={
+                "date": date,
+                "amount": amount,
+                "kind": kind,
+                "account_id": acc["id"],
+                "category_id": cat["id"],
+            },
+            headers=headers,
+        )
+
+    r = client.get("/reports/range?from=2025-12&to=2026-02", headers=headers)
+    assert r.status_code == 200
+    months = r.json()["months"]
+    assert [m["month"] for m in months] == ["2025-12", "2026-01", "2026-02"]
+
+    dec, jan, feb = months
+    assert (dec["income_total"], dec["expense_total"], dec["balance"]) == (
+        "1000.00",
+        "120.00",
+        "880.00",
+    )
+    assert jan == {
+        "month": "2026-01",
+        "income_total": "0.00",
+        "expense_total": "0.00",
+        "balance": "0.00",
+        "by_category": [],
+    }
+    assert feb["balance"] == "750.00"
+    by_cat = {c["category_id"]: c for c in feb["by_category"]}
+    assert set(by_cat) == {cat_expense["id"], cat_leisure["id"]}
+    assert by_cat[cat_expense["id"]]["deviation"] == "50.00"
+    assert by_cat[cat_leisure["id"]]["realized"] == "0.00"
+
+    # Single-month report is the same computation
+    single = client.get("/reports/monthly-summary?month=2026-02", headers=headers).json()
+    assert single == feb
+
+
+def test_range_report_validation(client, headers):
+    """Test inverted, malformed and oversized ranges are rejected."""
+    assert client.get("/reports/range?from=2026-03&to=2026-01", headers=headers).status_code == 400
+    assert client.get("/reports/range?from=2026-13&to=2027-01", headers=headers).status_code == 422
+    assert client.get("/reports/range?from=2000-01&to=2026-01", headers=headers).status_code == 400
+
+
+def test_budget_bulk_upsert(client, headers):
+    """Bulk upsert writes valid items in one go and reports the invalid ones."""
+    food = client.post(
+        "/categories",
+        json={"name": "Alimentação", "kind": "EXPENSE", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+    fun = client.post(
+        "/categories",
+        json={"name": "Lazer", "kind": "EXPENSE", "group": "LIFESTYLE"},
+        headers=headers,
+    ).json()
+    salary = client.post(
+        "/categories",
+        json={"name": "Salário", "kind": "INCOME", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+    client.post(
+        "/budgets",
+        json={"month": "2026-01", "category_id": food["id"], "amount_planned": 100},
+        headers=headers,
+    )
+
+    r = client.post(
+        "/budgets/bulk",
+        json=[
+            {"month": "2026-01", "category_id": food["id"], "amount_planned": 500},
+            {"month": "2026-01", "category_id": fun["id"], "amount_planned": 200},
+            {"month": "2026-01", "category_id": salary["id"], "amount_planned": 1},
+            {"month": "2026-01", "category_id": 999, "amount_planned": 1},
+            {"month": "2026-02", "category_id": fun["id"], "amount_planned": 250},
+            {"month": "2026-02", "category_id": fun["id"], "amount_planned": "260.50"},
+        ],
+        headers=headers,
+    )
+    assert r.status_code == 200
+    assert r.json() == {
+        "upserted": 3,
+        "errors": [
+            {
+                "index": 2,
+                "detail": "Orçamento só é suportado para categorias de despesa no MVP",
+            },
+            {"index": 3, "detail": "Categoria inválida/inativa"},
+        ],
+    }
+    jan = client.get("/budgets?month=2026-01", headers=headers).json()
+    assert {b["category_id"]: b["amount_planned"] for b in jan} == {
+        food["id"]: "500.00",
+        fun["id"]: "200.00",
+    }
+    feb = client.get("/budgets?month=2026-02", headers=headers).json()
+    assert [b["amount_planned"] for b in feb] == ["260.50"]
+
+    # The report cache follows the new plans
+    report = client.get("/reports/monthly-summary?month=2026-01", headers=headers).json()
+    planned = {c["category_id"]: c["planned"] for c in report["by_category"]}
+    assert planned[food["id"]] == "500.00"
+
+
+def test_budget_copy_with_scale(client, headers):
+    """Copy takes a month's budgets to another, scaled, skipping inactive categories."""
+    ids = []
+    for name in ("Alimentação", "Lazer", "Antiga"):
+        ids.append(
+            client.post(
+                "/categories",
+                json={"name": name, "kind": "EXPENSE", "group": "OTHER"},
+                headers=headers,
+            ).json()["id"]
+        )
+    food, fun, old = ids
+    client.post(
+        "/budgets/bulk",
+        json=[
+            {"month": "2026-01", "category_id": food, "amount_planned": "1000.10"},
+            {"month": "2026-01", "category_id": fun, "amount_planned": 200},
+            {"month": "2026-01", "category_id": old, "amount_planned": 50},
+            {"month": "2026-02", "category_id": fun, "amount_planned": 999},
+        ],
+        headers=headers,
+    )
+    client.delete(f"/categories/{old}", headers=headers)
+
+    r = client.post("/budgets/copy?from=2026-01&to=2026-02&scale=1.05", headers=headers)
+    assert r.status_code == 200
+    assert r.json() == {"copied": 2}
+    feb = client.get("/budgets?month=2026-02", headers=headers).json()
+    assert {b["category_id"]: b["amount_planned"] for b in feb} == {
+        food: "1050.11",
+        fun: "210.00",
+    }
+
+    r = client.post("/budgets/copy?from=2026-01&to=2026-03", headers=headers)
+    assert r.json() == {"copied": 2}
+    mar = client.get("/budgets?month=2026-03", headers=headers).json()
+    assert sorted((b["amount_planned"] for b in mar), key=Decimal) == ["200.00", "1000.10"]
+
+    assert client.post("/budgets/copy?from=2026-01&to=2026-01", headers=headers).status_code == 400
+    assert client.post("/budgets/copy?from=2026-01&to=2026-13", headers=headers).status_code == 422
+    r = client.post("/budgets/copy?from=2026-01&to=2026-04&scale=0", headers=headers)
+    assert r.status_code == 422
+    r = client.post("/budgets/copy?from=2026-01&to=2026-04&scale=1.00001", headers=headers)
+    assert r.status_code == 422
+
+
+def test_budget_copy_rounds_half_up_exactly(client, headers):
+    """Scaling uses the exact decimal factor: 1.00 * 1.005 is 1.01, not 1.00."""
+    cats = [
+        client.post(
+            "/categories",
+            json={"name": name, "kind": "EXPENSE", "group": "OTHER"},
+            headers=headers,
+        ).json()["id"]
+        for name in ("Café", "Reserva")
+    ]
+    client.post(
+        "/budgets/bulk",
+        json=[
+            # 100 * 1.005 is 100.49999999999999 in floats
+            {"month": "2026-01", "category_id": cats[0], "amount_planned": "1.00"},
+            {"month": "2026-01", "category_id": cats[1], "amount_planned": "9999999999.00"},
+        ],
+        headers=headers,
+    )
+    r = client.post("/budgets/copy?from=2026-01&to=2026-02&scale=0.333", headers=headers)
+    assert r.json() == {"copied": 2}
+    r = client.post("/budgets/copy?from=2026-01&to=2026-03&scale=1.005", headers=headers)
+    assert r.json() == {"copied": 1}  # the other one would leave the money range
+
+    feb = {
+        b["category_id"]: b["amount_planned"]
+        for b in client.get("/budgets?month=2026-02", headers=headers).json()
+    }
+    # 999999999900 * 0.333 = 332999999966.7 cents
+    assert feb == {cats[0]: "0.33", cats[1]: "3329999999.67"}
+    mar = client.get("/budgets?month=2026-03", headers=headers).json()
+    assert [b["amount_planned"] for b in mar] == ["1.01"]
@@ -0,0 +1,102 @@
+"""Tests for bulk transaction ingestion."""
+
+import json
+
+
+def test_bulk_json_array_reports_row_errors(client, headers, ledger_setup):
+    """Test valid rows are inserted and invalid ones reported by index."""
+    acc, income, expense = ledger_setup.account_id, ledger_setup.income_id, ledger_setup.expense_id
+
+    items = [
+        {
+            "date": "2026-01-05",
+            "amount": 3000.0,
+            "kind": "INCOME",
+            "account_id": acc,
+            "category_id": income,
+        },
+        {
+            "date": "2026-01-06",
+            "amount": 10.0,
+            "kind": "EXPENSE",
+            "account_id": acc,
+            "category_id": expense,
+        },
+        {
+            "date": "2026-01-07",
+            "amount": -20.0,
+            "kind": "EXPENSE",
+            "account_id": 999,
+            "category_id": expense,
+        },
+        {
+            "date": "2026-01-08",
+            "amount": -20.0,
+            "kind": "EXPENSE",
+            "account_id": acc,
+            "category_id": income,
+        },
+        {"date": "not-a-date", "amount": -1.0, "kind": "EXPENSE", "account_id": acc},
+        {
+            "date": "2026-01-09",
+            "description": "Mercado",
+            "amount": -45.5,
+            "kind": "EXPENSE",
+            "account_id": acc,
+            "category_id": expense,
+        },
+    ]
+    r = client.post("/transactions/bulk", json=items, headers=headers)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["inserted"] == 2
+    assert [e["index"] for e in data["errors"]] == [1, 2, 3, 4]
+    assert data["errors"][0]["detail"] == "EXPENSE requer amount < 0"
+    assert data["errors"][1]["detail"] == "Conta inválida/inativa"
+    assert data["errors"][2]["detail"] == "Categoria incompatível com EXPENSE"
+    assert data["errors"][3]["detail"].startswith("date:")
+
+    txs = client.get("/transactions", headers=headers).json()
+    assert sorted(t["amount"] for t in txs) == ["-45.50", "3000.00"]
+
+
+def test_bulk_ndjson(client, headers, ledger_setup):
+    """Test NDJSON bodies are parsed line by line."""
+    acc, expense = ledger_setup.account_id, ledger_setup.expense_id
+
+    lines = [
+        json.dumps(
+            {
+                "date": f"2026-02-{day:02d}",
+                "amount": -float(day),
+                "kind": "EXPENSE",
+                "account_id": acc,
+                "category_id": expense,
+            }
+        )
+        for day in range(1, 21)
+    ]
+    body = "\n".join(lines) + "\n\n"
+    r = client.post(
+        "/transactions/bulk",
+        content=body,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    assert r.json() == {"inserted": 20, "errors": []}
+
+    r = client.get("/transactions?from_date=2026-02-01&to_date=2026-02-28", headers=headers)
+    assert len(r.json()) == 20
+
+
+def test_bulk_rejects_non_array_body(client, headers):
+    """Test JSON bodies that are not arrays are rejected."""
+    r = client.post("/transactions/bulk", json={"date": "2026-01-01"}, headers=headers)
+    assert r.status_code == 400
+
+    r = client.post(
+        "/transactions/bulk",
+        content="{not json",
+        headers={**headers, "Content-Type": "application/json"},
+    )
+    assert r.status_code == 400
@@ -0,0 +1,53 @@
+"""Tests for the database engine profile."""
+
+import datetime as dt
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+
+def test_sqlite_pragmas_applied_on_connect(client):
+    """Test every new connection gets the configured PRAGMAs."""
+    from app.db.session import get_engine
+
+    with get_engine().connect() as conn:
+
+        def pragma(name):
+            return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("cache_size") == -64000
+        assert pragma("temp_store") == 2  # MEMORY
+        assert pragma("busy_timeout") == 5000
+        assert pragma("foreign_keys") == 1
+
+
+def test_foreign_keys_enforced(client):
+    """Test a transaction pointing at a missing account is rejected by the database."""
+    from app.db.session import get_session
+    from app.services.ledger import insert_rows
+
+    row = {
+        "date": dt.date(2026, 1, 1),
+        "description": "órfã",
+        "amount_cents": -100,
+        "kind": "EXPENSE",
+        "account_id": 999,
+        "category_id": None,
+    }
+    with get_session() as db:
+        with pytest.raises(IntegrityError):
+            insert_rows(db, [row])
+            db.commit()
+
+
+def test_pool_options_skip_in_memory_sqlite():
+    """Test pool sizing is passed for file databases only."""
+    from app.db.session import _engine_options
+
+    assert "pool_size" in _engine_options("sqlite:///./app.db")
+    assert "pool_size" not in _engine_options("sqlite://")
+    assert "pool_size" not in _engine_options("sqlite:///:memory:")
+    assert "connect_args" not in _engine_options("postgresql://u:p@localhost/db")
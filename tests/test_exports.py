@@ -0,0 +1,55 @@
+"""Tests for streaming transaction exports."""
+
+import csv
+import io
+import json
+
+
+def _add_expenses(ledger):
+    for day, amount, desc in [
+        ("2026-01-05", -10.5, "Padaria"),
+        ("2026-01-20", -99.9, 'Mercado "Central", filial 2'),
+        ("2026-02-03", -5.0, "Café"),
+    ]:
+        ledger.add(day, amount, description=desc)
+
+
+def test_export_ndjson(client, headers, ledger_setup):
+    """Test NDJSON export returns one JSON object per line, newest first."""
+    _add_expenses(ledger_setup)
+
+    r = client.get("/transactions/export?format=ndjson", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [t["date"] for t in lines] == ["2026-02-03", "2026-01-20", "2026-01-05"]
+    assert lines[0]["amount"] == "-5.00"
+    assert lines[1]["description"] == 'Mercado "Central", filial 2'
+
+
+def test_export_csv_with_filters(client, headers, ledger_setup):
+    """Test CSV export honours the same filters as the list endpoint."""
+    _add_expenses(ledger_setup)
+
+    r = client.get(
+        "/transactions/export?format=csv&from_date=2026-01-01&to_date=2026-01-31",
+        headers=headers,
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 2
+    assert rows[0]["description"] == 'Mercado "Central", filial 2'
+    assert rows[0]["amount"] == "-99.90"
+    assert rows[1]["category_id"] != ""
+
+
+def test_export_rejects_invalid_params(client, headers):
+    """Test unknown formats and half-open date ranges are rejected."""
+    r = client.get("/transactions/export?format=xml", headers=headers)
+    assert r.status_code == 422
+
+    r = client.get("/transactions/export?from_date=2026-01-01", headers=headers)
+    assert r.status_code == 400
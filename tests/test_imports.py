@@ -0,0 +1,117 @@
+"""Tests for bank statement imports."""
+
+import io
+from decimal import Decimal
+
+OFX_SGML = """OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+ENCODING:USASCII
+CHARSET:1252
+
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<BANKTRANLIST>
+<DTSTART>20260101<DTEND>20260131
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260105120000[-3:BRT]
+<TRNAMT>-25.90
+<FITID>1
+<MEMO>IFOOD *RESTAURANTE
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260105
+<TRNAMT>-25.90
+<FITID>2
+<MEMO>IFOOD *RESTAURANTE
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20260110
+<TRNAMT>5000,00
+<FITID>3
+<NAME>SALARIO
+</STMTTRN>
+</BANKTRANLIST>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+
+def _params(ledger):
+    return (
+        f"account_id={ledger.account_id}&income_category_id={ledger.income_id}"
+        f"&expense_category_id={ledger.expense_id}"
+    )
+
+
+def test_import_ofx_is_idempotent(client, headers, ledger_setup):
+    """Test OFX import keeps identical lines and skips them on re-import."""
+    params = _params(ledger_setup)
+
+    r = client.post(f"/imports/statement?format=ofx&{params}", content=OFX_SGML, headers=headers)
+    assert r.status_code == 200
+    assert r.json() == {"inserted": 3, "duplicates": 0, "errors": []}
+
+    r = client.post(f"/imports/statement?format=ofx&{params}", content=OFX_SGML, headers=headers)
+    assert r.json() == {"inserted": 0, "duplicates": 3, "errors": []}
+
+    txs = client.get("/transactions", headers=headers).json()
+    assert sorted(t["amount"] for t in txs) == ["-25.90", "-25.90", "5000.00"]
+    assert {t["kind"] for t in txs} == {"INCOME", "EXPENSE"}
+
+
+def test_import_csv_overlapping_statements(client, headers, ledger_setup):
+    """Test overlapping CSV windows only insert the new lines."""
+    params = _params(ledger_setup)
+
+    first = (
+        "Data;Descrição;Valor\n01/02/2026;Padaria  Pão;-12,50\n02/02/2026;PIX recebido;1.200,00\n"
+    )
+    second = (
+        "Data;Descrição;Valor\n"
+        "02/02/2026;pix RECEBIDO;1.200,00\n"
+        "03/02/2026;Mercado;-80,10\n"
+        "xx/02/2026;Quebrada;-1,00\n"
+    )
+
+    r = client.post(f"/imports/statement?format=csv&{params}", content=first, headers=headers)
+    assert r.json()["inserted"] == 2
+
+    r = client.post(f"/imports/statement?format=csv&{params}", content=second, headers=headers)
+    data = r.json()
+    assert data["inserted"] == 1
+    assert data["duplicates"] == 1
+    assert [e["index"] for e in data["errors"]] == [2]
+
+    txs = client.get("/transactions", headers=headers).json()
+    assert sorted((t["amount"] for t in txs), key=Decimal) == ["-80.10", "-12.50", "1200.00"]
+
+
+def test_import_rejects_bad_references(client, headers, ledger_setup):
+    """Test imports fail fast on invalid account or categories."""
+    params = _params(ledger_setup)
+
+    r = client.post(
+        "/imports/statement?format=csv&account_id=999&income_category_id=1&expense_category_id=2",
+        content="data,descricao,valor\n",
+        headers=headers,
+    )
+    assert r.status_code == 400
+
+    r = client.post(f"/imports/statement?format=csv&{params}", content="a,b\n", headers=headers)
+    assert r.status_code == 400
+
+
+def test_ofx_parser_handles_split_reads(monkeypatch):
+    """Test tags split across read boundaries are parsed correctly."""
+    from app.services.imports import iter_ofx_records
+
+    monkeypatch.setattr("app.services.imports._OFX_READ_SIZE", 7)
+
+    records = [rec for _, rec in iter_ofx_records(io.BytesIO(OFX_SGML.encode("cp1252")))]
+    assert len(records) == 3
+    assert records[2].description == "SALARIO"
+    assert str(records[2].amount) == "5000.00"
@@ -0,0 +1,52 @@
+"""Tests for the Prometheus /metrics endpoint and its collectors."""
+
+
+def test_metrics_requires_api_key(client):
+    """Test /metrics is protected like the rest of the API."""
+    assert client.get("/metrics").status_code == 401
+
+
+def test_requests_and_queries_recorded_per_route(client, headers):
+    """Test latency, status and SQL counters are labeled by route template."""
+    from app.core.metrics import DB_QUERIES, DB_QUERIES_PER_REQUEST, HTTP_LATENCY, HTTP_REQUESTS
+
+    route = "/accounts/{account_id}"
+    before_ok = HTTP_REQUESTS.value(("GET", route, "200"))
+    before_missing = HTTP_REQUESTS.value(("GET", route, "404"))
+    before_latency = HTTP_LATENCY.count(("GET", route))
+    before_queries = DB_QUERIES.value((route,))
+    before_requests = DB_QUERIES_PER_REQUEST.count((route,))
+
+    acc = client.post("/accounts", json={"name": "Banco", "type": "BANK"}, headers=headers).json()
+    client.get(f"/accounts/{acc['id']}", headers=headers)
+    client.get("/accounts/999", headers=headers)
+
+    assert HTTP_REQUESTS.value(("GET", route, "200")) == before_ok + 1
+    assert HTTP_REQUESTS.value(("GET", route, "404")) == before_missing + 1
+    assert HTTP_LATENCY.count(("GET", route)) == before_latency + 2
+    assert DB_QUERIES.value((route,)) == before_queries + 2
+    assert DB_QUERIES_PER_REQUEST.count((route,)) == before_requests + 2
+
+    text = client.get("/metrics", headers=headers).text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert 'http_requests_total{method="GET",route="/accounts/{account_id}",status="404"}' in text
+    assert 'db_queries_total{route="/accounts/{account_id}"}' in text
+    assert "db_pool_checkouts_total" in text
+    assert "http_requests_in_progress 1" in text  # the scrape itself
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test histogram buckets are cumulative and end with +Inf, _sum and _count."""
+    from app.core.metrics import Histogram
+
+    hist = Histogram("demo_seconds", "Demo", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value, ("/x",))
+
+    assert hist.render() == [
+        'demo_seconds_bucket{route="/x",le="0.1"} 1',
+        'demo_seconds_bucket{route="/x",le="1"} 3',
+        'demo_seconds_bucket{route="/x",le="+Inf"} 4',
+        'demo_seconds_sum{route="/x"} 4.05',
+        'demo_seconds_count{route="/x"} 4',
+    ]
@@ -0,0 +1,87 @@
+"""Tests for integer-cents money handling."""
+
+import pytest
+
+
+def test_to_cents_is_exact():
+    """Amounts convert to cents without binary floating point error."""
+    from decimal import Decimal
+
+    from app.core.money import format_cents, to_cents, to_decimal
+
+    assert to_cents("0.29") == 29
+    assert to_cents(0.29) == 29
+    assert to_cents(Decimal("-1234.5")) == -123450
+    assert to_cents(7) == 700
+    assert to_decimal(-29) == Decimal("-0.29")
+    assert format_cents(123456789) == "1234567.89"
+    assert format_cents(-5) == "-0.05"
+
+    # Same range as the former Numeric(12, 2) columns
+    assert to_cents("-9999999999.99") == -999999999999
+    for bad in ("1.234", "abc", "NaN", True, 10**10, "-10000000000.00"):
+        with pytest.raises(ValueError):
+            to_cents(bad)
+
+
+def test_amounts_accept_strings_and_stay_exact(client, headers):
+    """String amounts are accepted and sums of cents do not drift."""
+    acc = client.post("/accounts", json={"name": "Banco", "type": "BANK"}, headers=headers).json()
+    cat = client.post(
+        "/categories",
+        json={"name": "Mercado", "kind": "EXPENSE", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+
+    for amount in ("-0.10", -0.2, "-0.1"):
+        r = client.post(
+            "/transactions",
+            json={
+                "date": "2026-03-05",
+                "amount": amount,
+                "kind": "EXPENSE",
+                "account_id": acc["id"],
+                "category_id": cat["id"],
+            },
+            headers=headers,
+        )
+        assert r.status_code == 201, r.text
+    assert r.json()["amount"] == "-0.10"
+
+    # 0.1 + 0.2 + 0.1 in floats is 0.4000000000000001
+    summary = client.get("/reports/monthly-summary?month=2026-03", headers=headers).json()
+    assert summary["expense_total"] == "0.40"
+    assert client.get(f"/accounts/{acc['id']}", headers=headers).json()["balance"] == "-0.40"
+
+    csv_body = client.get("/transactions/export?format=csv", headers=headers).text
+    assert {line.split(",")[3] for line in csv_body.splitlines()[1:]} == {"-0.10", "-0.20"}
+
+
+def test_sub_cent_amounts_are_rejected(client, headers):
+    """Amounts with more than two decimal places are rejected, not rounded."""
+    acc = client.post("/accounts", json={"name": "Banco", "type": "BANK"}, headers=headers).json()
+    cat = client.post(
+        "/categories",
+        json={"name": "Mercado", "kind": "EXPENSE", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+
+    r = client.post(
+        "/transactions",
+        json={
+            "date": "2026-03-05",
+            "amount": -1.005,
+            "kind": "EXPENSE",
+            "account_id": acc["id"],
+            "category_id": cat["id"],
+        },
+        headers=headers,
+    )
+    assert r.status_code == 422
+
+    r = client.post(
+        "/budgets",
+        json={"month": "2026-03", "category_id": cat["id"], "amount_planned": "12.345"},
+        headers=headers,
+    )
+    assert r.status_code == 422
@@ -0,0 +1,149 @@
+"""Tests for the year partitions of the live ledger."""
+
+import re
+
+import pytest
+
+_LEDGER_TABLE = re.compile(r"\btransactions(?:_(\d{4}))?\b(?!_fts)")
+
+
+@pytest.fixture()
+def statements():
+    """Capture the SQL sent to the database while the block runs."""
+    from sqlalchemy import event
+
+    from app.db.session import get_engine
+
+    engine = get_engine()
+    seen: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _tables(seen: list[str]) -> set[str]:
+    """Return the ledger tables (or the view) named by the captured statements."""
+    return {m.group(0) for statement in seen for m in _LEDGER_TABLE.finditer(statement)}
+
+
+def _seed(ledger):
+    dates = ("2024-06-01", "2025-03-10", "2025-11-20", "2026-01-05", "2026-02-14")
+    return [ledger.add(date, -10.0, description=f"Compra {date}")["id"] for date in dates]
+
+
+def test_rows_are_stored_in_the_table_of_their_year(ledger_setup):
+    """Test every write lands in its year's table and the view shows them all."""
+    from sqlalchemy import func, select
+
+    from app.db.models import LedgerPartition, Transaction
+    from app.db.partitions import partition_table
+    from app.db.session import get_session
+
+    ids = _seed(ledger_setup)
+
+    with get_session() as db:
+        counts = {
+            year: db.scalar(select(func.count()).select_from(partition_table(year)))
+            for year in (2024, 2025, 2026)
+        }
+        ranges = {p.year: (p.min_id, p.max_id) for p in db.scalars(select(LedgerPartition))}
+        assert db.scalar(select(func.count()).select_from(Transaction)) == 5
+    assert counts == {2024: 1, 2025: 2, 2026: 2}
+    assert ranges == {2024: (ids[0], ids[0]), 2025: (ids[1], ids[2]), 2026: (ids[3], ids[4])}
+
+
+def test_listing_reads_only_overlapping_partitions(client, headers, ledger_setup, statements):
+    """Test a date filter reads one year's table and pages stay in order across years."""
+    ids = _seed(ledger_setup)
+
+    statements.clear()
+    r = client.get("/transactions?from_date=2025-01-01&to_date=2025-12-31", headers=headers)
+    assert [tx["id"] for tx in r.json()] == [ids[2], ids[1]]
+    assert _tables(statements) == {"transactions_2025"}
+
+    # Newest partition first; the first page never reaches the older years
+    statements.clear()
+    r = client.get("/transactions?limit=2", headers=headers)
+    assert [tx["id"] for tx in r.json()] == [ids[4], ids[3]]
+    assert _tables(statements) == {"transactions_2026", "transactions_2025"}
+
+    seen, cursor = [], None
+    while True:
+        url = "/transactions?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        r = client.get(url, headers=headers)
+        seen += [tx["id"] for tx in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == ids[::-1]
+
+    statements.clear()
+    lines = client.get(
+        "/transactions/export?from_date=2026-01-01&to_date=2026-12-31", headers=headers
+    ).text
+    assert len(lines.splitlines()) == 2
+    assert _tables(statements) == {"transactions_2026"}
+
+
+def test_delete_probes_only_the_partition_of_the_id(client, headers, ledger_setup, statements):
+    """Test a delete by ID looks in one table and removes a transfer's two legs."""
+    from sqlalchemy import func, select
+
+    from app.db.partitions import partition_table
+    from app.db.session import get_session
+
+    ids = _seed(ledger_setup)
+
+    statements.clear()
+    assert client.delete(f"/transactions/{ids[1]}", headers=headers).status_code == 204
+    assert _tables(statements) == {"transactions_2025"}
+    assert client.delete(f"/transactions/{ids[1]}", headers=headers).status_code == 404
+
+    r = client.post(
+        "/transactions/transfer",
+        json={
+            "date": "2024-02-01",
+            "description": "Saque",
+            "amount_abs": 50.0,
+            "from_account_id": ledger_setup.account_id,
+            "to_account_id": ledger_setup.wallet_id,
+        },
+        headers=headers,
+    )
+    assert r.status_code == 201
+    out_id = r.json()["out_id"]
+
+    statements.clear()
+    assert client.delete(f"/transactions/{out_id}", headers=headers).status_code == 204
+    assert _tables(statements) == {"transactions_2024"}
+    with get_session() as db:
+        assert db.scalar(select(func.count()).select_from(partition_table(2024))) == 1
+
+
+def test_monthly_summary_reads_no_ledger_table(client, headers, ledger_setup, statements):
+    """Test the monthly summary is served from the rollups, not the partitions."""
+    _seed(ledger_setup)
+
+    statements.clear()
+    r = client.get("/reports/monthly-summary?month=2025-11", headers=headers)
+    assert r.status_code == 200
+    assert _tables(statements) == set()
+
+
+def test_ids_are_never_reused(client, headers, ledger_setup):
+    """Test IDs keep growing across partitions, deletes and closed months."""
+    ids = _seed(ledger_setup)
+    assert ids == sorted(ids)
+
+    assert client.delete(f"/transactions/{ids[-1]}", headers=headers).status_code == 204
+    assert client.post("/months/2024-06/close", headers=headers).status_code == 200
+    assert ledger_setup.add("2023-12-31", -1.0)["id"] == ids[-1] + 1
+
+    # Reopening puts the archived row back under its own ID
+    assert client.post("/months/2024-06/reopen", headers=headers).status_code == 200
+    listed = client.get("/transactions?from_date=2024-01-01&to_date=2024-12-31", headers=headers)
+    assert [tx["id"] for tx in listed.json()] == [ids[0]]
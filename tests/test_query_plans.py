@@ -0,0 +1,141 @@
+"""Query-plan regression tests for the hot ledger queries.
+
+Each statement is compiled exactly as the services issue it and run through
+EXPLAIN QUERY PLAN. A full scan of a ledger table or a temp B-tree sort means an
+index stopped covering the filter/order and the query now degrades with table size.
+
+The planner weighs indexes by the statistics ANALYZE stores in sqlite_stat1, so
+the plans are taken over a seeded ledger with fresh statistics, as a production
+database would have; on empty tables SQLite falls back to fixed guesses.
+"""
+
+import datetime as dt
+import itertools
+import re
+
+import pytest
+from sqlalchemy import select, text
+
+LEDGER_TABLES = ("transactions_2025", "transactions_2026", "monthly_rollups", "budgets")
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+FILTERS = {
+    "dates": {"from_date": dt.date(2026, 1, 1), "to_date": dt.date(2026, 12, 31)},
+    "account": {"account_id": 1},
+    "category": {"category_id": 1},
+    "kind": {"kind": "EXPENSE"},
+}
+
+
+@pytest.fixture()
+def seeded_ledger(client):
+    """Fill the ledger tables with a couple of years of rows and run ANALYZE."""
+    from app.db.models import Account, Budget, Category
+    from app.db.session import get_session
+    from app.services.ledger import insert_transactions
+
+    start = dt.date(2025, 1, 1)
+    with get_session() as db:
+        db.add_all(Account(name=f"Conta {i}", type="BANK") for i in range(4))
+        db.add_all(
+            Category(name=f"Categoria {i}", kind="INCOME" if i < 3 else "EXPENSE", group="OTHER")
+            for i in range(6)
+        )
+        db.flush()
+        rows = []
+        for i in range(2000):
+            if i % 10 == 0:
+                kind, category_id, pair = "TRANSFER", None, f"pair-{i // 20}"
+            elif i % 3 == 0:
+                kind, category_id, pair = "INCOME", 1 + i % 3, None
+            else:
+                kind, category_id, pair = "EXPENSE", 4 + i % 3, None
+            rows.append(
+                {
+                    "date": start + dt.timedelta(days=i * 3 % 730),
+                    "description": f"Lançamento {i}",
+                    "amount_cents": (1 if kind == "INCOME" else -1) * (100 + i),
+                    "kind": kind,
+                    "account_id": 1 + i % 4,
+                    "category_id": category_id,
+                    "transfer_pair_id": pair,
+                    "fingerprint": f"{i:064x}" if i % 2 else None,
+                }
+            )
+        insert_transactions(db, rows)
+        db.add_all(
+            Budget(month=f"{year}-{month:02d}", category_id=category_id, amount_planned_cents=1)
+            for year in (2025, 2026)
+            for month in range(1, 13)
+            for category_id in (4, 5, 6)
+        )
+        db.commit()
+        db.execute(text("ANALYZE"))
+        db.commit()
+        analyzed = set(db.scalars(text("SELECT DISTINCT tbl FROM sqlite_stat1")))
+    assert analyzed >= set(LEDGER_TABLES)
+
+
+def _plan(stmt) -> list[str]:
+    from app.db.session import get_engine
+
+    engine = get_engine()
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    args = tuple(params[name] for name in compiled.positiontup)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + compiled.string, args).all()
+    return [row[3] for row in rows]
+
+
+def _full_scans(plan: list[str]) -> list[str]:
+    return [line for line in plan if (m := _FULL_SCAN.match(line)) and m.group(1) in LEDGER_TABLES]
+
+
+def _filter_combinations():
+    for size in range(len(FILTERS) + 1):
+        for names in itertools.combinations(FILTERS, size):
+            yield pytest.param(names, id="+".join(names) or "all")
+
+
+@pytest.mark.parametrize("with_cursor", [False, True], ids=["first", "cursor"])
+@pytest.mark.parametrize("names", _filter_combinations())
+def test_transaction_list_uses_index(seeded_ledger, names, with_cursor):
+    """Test every filter combination of the listing seeks an index and needs no sort."""
+    from app.db.partitions import partition_table
+    from app.services.transactions import transaction_list_query
+
+    kwargs = {k: v for name in names for k, v in FILTERS[name].items()}
+    if with_cursor:
+        kwargs["after"] = (dt.date(2026, 6, 1), 500)
+    plan = _plan(transaction_list_query(partition_table(2026), **kwargs).limit(101))
+
+    assert not _full_scans(plan), plan
+    assert not any("TEMP B-TREE" in line for line in plan), plan
+
+
+def test_fingerprint_and_pair_lookups_use_index(seeded_ledger):
+    """Test the import dedupe and transfer-pair lookups are index seeks."""
+    from app.db.partitions import partition_table
+
+    table = partition_table(2026)
+    for stmt in (
+        select(table.c.fingerprint).where(table.c.fingerprint.in_(["a" * 64, "b" * 64])),
+        select(table).where(table.c.transfer_pair_id == "pair", table.c.date == dt.date.today()),
+    ):
+        plan = _plan(stmt)
+        assert plan and all(line.startswith("SEARCH") for line in plan), plan
+
+
+def test_range_report_reads_rollups_by_key(seeded_ledger):
+    """Test the range report seeks rollups and budgets by month."""
+    from app.services.reports import range_summary_query
+
+    plan = _plan(range_summary_query("2025-01", "2026-12"))
+
+    assert not _full_scans(plan), plan
+    assert any("monthly_rollups USING PRIMARY KEY" in line for line in plan), plan
+    # The GROUP BY runs over the UNION ALL of already-aggregated rollup rows and
+    # budgets, so its temp B-tree is bounded by months x categories, not ledger size
+    sorts = [line for line in plan if "TEMP B-TREE" in line]
+    assert all("GROUP BY" in line or "ORDER BY" in line for line in sorts), plan
@@ -0,0 +1,197 @@
+"""Tests for recurring transaction templates."""
+
+
+def _template(client, headers, **payload):
+    r = client.post("/recurring", json=payload, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def _materialize(client, headers, until):
+    r = client.post(f"/recurring/materialize?until={until}", headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_occurrence_dates():
+    """Monthly dates keep the start day, clamped to short months; intervals step."""
+    import datetime as dt
+
+    from app.db.models import RecurringTemplate
+    from app.services.recurring import occurrence_dates
+
+    monthly = RecurringTemplate(unit="MONTH", interval=1, start_date=dt.date(2026, 1, 31))
+    assert occurrence_dates(monthly, after=None, until=dt.date(2026, 4, 30)) == [
+        dt.date(2026, 1, 31),
+        dt.date(2026, 2, 28),
+        dt.date(2026, 3, 31),
+        dt.date(2026, 4, 30),
+    ]
+    assert occurrence_dates(monthly, after=dt.date(2026, 2, 28), until=dt.date(2026, 4, 1)) == [
+        dt.date(2026, 3, 31)
+    ]
+
+    biweekly = RecurringTemplate(
+        unit="WEEK", interval=2, start_date=dt.date(2026, 1, 1), end_date=dt.date(2026, 2, 1)
+    )
+    assert occurrence_dates(biweekly, after=dt.date(2026, 1, 10), until=dt.date(2026, 12, 31)) == [
+        dt.date(2026, 1, 15),
+        dt.date(2026, 1, 29),
+    ]
+
+    quarterly = RecurringTemplate(unit="MONTH", interval=3, start_date=dt.date(2026, 1, 10))
+    assert occurrence_dates(quarterly, after=dt.date(2026, 5, 1), until=dt.date(2026, 12, 31)) == [
+        dt.date(2026, 7, 10),
+        dt.date(2026, 10, 10),
+    ]
+
+
+def test_materialize_is_idempotent(client, headers, ledger_setup):
+    """Repeated runs generate each occurrence once; deleted ones are not regenerated."""
+    acc, rent, salary = ledger_setup.account_id, ledger_setup.expense_id, ledger_setup.income_id
+    _template(
+        client,
+        headers,
+        description="Aluguel",
+        amount=-1500,
+        kind="EXPENSE",
+        account_id=acc,
+        category_id=rent,
+        start_date="2024-01-05",
+    )
+    _template(
+        client,
+        headers,
+        description="Salário",
+        amount=5000,
+        kind="INCOME",
+        account_id=acc,
+        category_id=salary,
+        unit="WEEK",
+        interval=2,
+        start_date="2025-12-05",
+        end_date="2026-01-31",
+    )
+
+    assert _materialize(client, headers, "2025-12-31") == {"generated": 24 + 2, "skipped": 0}
+    assert _materialize(client, headers, "2025-12-31") == {"generated": 0, "skipped": 0}
+    assert _materialize(client, headers, "2026-02-28") == {"generated": 2 + 3, "skipped": 0}
+
+    txs = client.get("/transactions?from_date=2026-01-01&to_date=2026-12-31", headers=headers)
+    assert sorted((tx["date"], tx["amount"]) for tx in txs.json()) == [
+        ("2026-01-02", "5000.00"),
+        ("2026-01-05", "-1500.00"),
+        ("2026-01-16", "5000.00"),
+        ("2026-01-30", "5000.00"),
+        ("2026-02-05", "-1500.00"),
+    ]
+    balance = client.get("/accounts", headers=headers).json()[0]["balance"]
+    assert balance == "-14000.00"  # 5 * 5000 - 26 * 1500
+
+    feb = next(tx for tx in txs.json() if tx["date"] == "2026-02-05")
+    client.delete(f"/transactions/{feb['id']}", headers=headers)
+    assert _materialize(client, headers, "2026-02-28") == {"generated": 0, "skipped": 0}
+
+
+def test_template_validation_and_deactivation(client, headers, ledger_setup):
+    """Templates get the transaction checks; deactivated ones stop generating."""
+    acc, rent, salary = ledger_setup.account_id, ledger_setup.expense_id, ledger_setup.income_id
+    payload = {
+        "description": "Aluguel",
+        "amount": -1500,
+        "kind": "EXPENSE",
+        "account_id": acc,
+        "category_id": rent,
+        "start_date": "2026-01-05",
+    }
+    bad = [
+        ({**payload, "amount": 1500}, 400),
+        ({**payload, "category_id": salary}, 400),
+        ({**payload, "kind": "TRANSFER"}, 400),
+        ({**payload, "interval": 0}, 422),
+        ({**payload, "end_date": "2025-12-31"}, 422),
+    ]
+    for body, status in bad:
+        assert client.post("/recurring", json=body, headers=headers).status_code == status
+
+    template = _template(client, headers, **payload)
+    assert template["amount"] == "-1500.00"
+    assert template["unit"] == "MONTH" and template["interval"] == 1
+
+    client.post("/months/2026-01/close", headers=headers)
+    assert _materialize(client, headers, "2026-02-10") == {"generated": 1, "skipped": 1}
+    # The skip is recorded once; the occurrence waits for the month to reopen
+    assert _materialize(client, headers, "2026-02-10") == {"generated": 0, "skipped": 0}
+    assert client.post("/months/2026-01/reopen", headers=headers).status_code == 200
+    assert _materialize(client, headers, "2026-02-10") == {"generated": 0, "skipped": 0}
+    dates = [tx["date"] for tx in client.get("/transactions", headers=headers).json()]
+    assert dates == ["2026-02-05", "2026-01-05"]
+
+    for until in ("9999-12-31", "2099-01-01"):
+        r = client.post(f"/recurring/materialize?until={until}", headers=headers)
+        assert r.status_code == 400, r.text
+
+    assert client.delete(f"/recurring/{template['id']}", headers=headers).status_code == 204
+    assert _materialize(client, headers, "2026-12-31") == {"generated": 0, "skipped": 0}
+    assert client.get("/recurring", headers=headers).json()[0]["active"] is False
+
+
+def test_pending_occurrences_wait_for_active_references(client, headers, ledger_setup):
+    """A reopened month's occurrence whose account is inactive is created by a later run."""
+    acc, rent = ledger_setup.account_id, ledger_setup.expense_id
+    _template(
+        client,
+        headers,
+        description="Aluguel",
+        amount=-1500,
+        kind="EXPENSE",
+        account_id=acc,
+        category_id=rent,
+        start_date="2026-03-05",
+        end_date="2026-03-05",
+    )
+    client.post("/months/2026-03/close", headers=headers)
+    assert _materialize(client, headers, "2026-03-31") == {"generated": 0, "skipped": 1}
+
+    client.delete(f"/accounts/{acc}", headers=headers)
+    assert client.post("/months/2026-03/reopen", headers=headers).status_code == 200
+    assert client.get("/transactions", headers=headers).json() == []
+
+    client.put(f"/accounts/{acc}", json={"active": True}, headers=headers)
+    assert _materialize(client, headers, "2026-03-31") == {"generated": 1, "skipped": 0}
+    assert _materialize(client, headers, "2026-03-31") == {"generated": 0, "skipped": 0}
+    [tx] = client.get("/transactions", headers=headers).json()
+    assert (tx["date"], tx["amount"]) == ("2026-03-05", "-1500.00")
+
+
+def test_scheduler_materializes_in_background(client, headers, ledger_setup, monkeypatch):
+    """With RECURRING_INTERVAL_SECONDS set, the app generates occurrences by itself."""
+    import time
+
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.main import create_app
+
+    acc, rent = ledger_setup.account_id, ledger_setup.expense_id
+    _template(
+        client,
+        headers,
+        description="Aluguel",
+        amount=-1500,
+        kind="EXPENSE",
+        account_id=acc,
+        category_id=rent,
+        start_date="2026-01-05",
+        end_date="2026-03-05",
+    )
+    monkeypatch.setattr(settings, "recurring_interval_seconds", 0.05)
+
+    with TestClient(create_app()) as scheduled:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            txs = scheduled.get("/transactions", headers=headers).json()
+            if len(txs) == 3:
+                break
+            time.sleep(0.05)
+    assert sorted(tx["date"] for tx in txs) == ["2026-01-05", "2026-02-05", "2026-03-05"]
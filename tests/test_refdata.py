@@ -0,0 +1,96 @@
+"""Tests for the in-process reference-data cache."""
+
+from sqlalchemy import event, update
+
+
+def _expense(client, headers, acc_id, cat_id):
+    return client.post(
+        "/transactions",
+        json={
+            "date": "2026-01-15",
+            "amount": -10.0,
+            "kind": "EXPENSE",
+            "account_id": acc_id,
+            "category_id": cat_id,
+        },
+        headers=headers,
+    )
+
+
+def test_warm_cache_validates_without_queries(client, headers, ledger_setup, monkeypatch):
+    """Test creating a transaction reads no accounts, categories or versions."""
+    from app.core.config import settings
+    from app.db.session import get_engine
+
+    monkeypatch.setattr(settings, "version_check_interval", 60.0)
+    acc_id, cat_id = ledger_setup.account_id, ledger_setup.expense_id
+    assert _expense(client, headers, acc_id, cat_id).status_code == 201
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert _expense(client, headers, acc_id, cat_id).status_code == 201
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    reads = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert not [s for s in reads if "accounts" in s or "categories" in s], reads
+    assert not [s for s in reads if "data_versions" in s], reads
+
+
+def test_router_writes_invalidate_cache(client, headers, ledger_setup, monkeypatch):
+    """Test deactivating an account or category is seen by the next write."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "version_check_interval", 60.0)
+    acc_id, cat_id = ledger_setup.account_id, ledger_setup.expense_id
+    assert _expense(client, headers, acc_id, cat_id).status_code == 201
+
+    client.delete(f"/categories/{cat_id}", headers=headers)
+    r = _expense(client, headers, acc_id, cat_id)
+    assert r.status_code == 400
+    assert "Categoria" in r.json()["detail"]
+
+    budget = client.post(
+        "/budgets",
+        json={"month": "2026-01", "category_id": cat_id, "amount_planned": 100.0},
+        headers=headers,
+    )
+    assert budget.status_code == 400
+
+    client.put(f"/categories/{cat_id}", json={"active": True}, headers=headers)
+    assert _expense(client, headers, acc_id, cat_id).status_code == 201
+
+    client.delete(f"/accounts/{acc_id}", headers=headers)
+    assert _expense(client, headers, acc_id, cat_id).status_code == 400
+
+
+def test_other_worker_changes_seen_after_version_check(client, headers, ledger_setup, monkeypatch):
+    """Test a change committed elsewhere is picked up once the version is rechecked."""
+    from app.core.config import settings
+    from app.db.models import Category
+    from app.db.session import get_session
+    from app.services.refdata import REFDATA_KEY
+    from app.services.versions import bump_versions
+
+    monkeypatch.setattr(settings, "version_check_interval", 60.0)
+    acc_id, cat_id = ledger_setup.account_id, ledger_setup.expense_id
+    assert _expense(client, headers, acc_id, cat_id).status_code == 201
+
+    # Another worker deactivates the category; its after_commit hook runs in
+    # that process, so only the shared version tells this one
+    with get_session() as db:
+        db.execute(update(Category).where(Category.id == cat_id).values(active=False))
+        bump_versions(db, [REFDATA_KEY])
+        db.commit()
+
+    # Within the check interval the snapshot is served as is
+    assert _expense(client, headers, acc_id, cat_id).status_code == 201
+
+    monkeypatch.setattr(settings, "version_check_interval", 0.0)
+    assert _expense(client, headers, acc_id, cat_id).status_code == 400
@@ -0,0 +1,91 @@
+"""Tests for the versioned monthly report cache and its ETags."""
+
+from sqlalchemy import event
+
+
+def _summary(client, headers, month, etag=None):
+    extra = {"If-None-Match": etag} if etag else {}
+    return client.get(f"/reports/monthly-summary?month={month}", headers={**headers, **extra})
+
+
+def test_unchanged_month_returns_304_without_queries(client, headers, ledger_setup, monkeypatch):
+    """Test If-None-Match with the current ETag gets a 304 and runs no SQL."""
+    from app.core.config import settings
+    from app.db.session import get_engine
+
+    monkeypatch.setattr(settings, "version_check_interval", 60.0)
+    ledger_setup.add("2026-01-10", -50.0)
+
+    first = _summary(client, headers, "2026-01")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        cached = _summary(client, headers, "2026-01", etag)
+        repeat = _summary(client, headers, "2026-01")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert repeat.status_code == 200
+    assert repeat.json() == first.json()
+    assert statements == []
+
+
+def test_writes_move_only_their_month(client, headers, ledger_setup):
+    """Test transaction and budget writes change the ETag of their own month only."""
+    cat_id = ledger_setup.expense_id
+    ledger_setup.add("2026-01-10", -50.0)
+
+    jan = _summary(client, headers, "2026-01")
+    feb = _summary(client, headers, "2026-02")
+
+    tx = ledger_setup.add("2026-01-20", -25.0)
+    jan2 = _summary(client, headers, "2026-01", jan.headers["ETag"])
+    assert jan2.status_code == 200
+    assert jan2.json()["expense_total"] == "75.00"
+    assert _summary(client, headers, "2026-02", feb.headers["ETag"]).status_code == 304
+
+    client.post(
+        "/budgets",
+        json={"month": "2026-01", "category_id": cat_id, "amount_planned": 100.0},
+        headers=headers,
+    )
+    jan3 = _summary(client, headers, "2026-01", jan2.headers["ETag"])
+    assert jan3.status_code == 200
+    assert jan3.json()["by_category"][0]["planned"] == "100.00"
+
+    client.delete(f"/transactions/{tx['id']}", headers=headers)
+    jan4 = _summary(client, headers, "2026-01", jan3.headers["ETag"])
+    assert jan4.status_code == 200
+    assert jan4.json()["expense_total"] == "50.00"
+
+    # Renaming a category changes every report that shows it
+    client.put(f"/categories/{cat_id}", json={"name": "Mercado"}, headers=headers)
+    jan5 = _summary(client, headers, "2026-01", jan4.headers["ETag"])
+    assert jan5.status_code == 200
+    assert jan5.json()["by_category"][0]["category_name"] == "Mercado"
+
+
+def test_report_cache_is_bounded_lru():
+    """Test the cache evicts the least recently used entry beyond maxsize."""
+    from app.services.reports import ReportCache
+
+    cache = ReportCache(maxsize=2)
+    cache.put(("a",), {"v": 1})
+    cache.put(("b",), {"v": 2})
+    assert cache.get(("a",)) == {"v": 1}
+
+    cache.put(("c",), {"v": 3})
+    assert len(cache) == 2
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == {"v": 1}
+    assert cache.get(("c",)) == {"v": 3}
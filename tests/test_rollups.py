@@ -0,0 +1,97 @@
+"""Tests for the incrementally maintained monthly rollups."""
+
+from sqlalchemy import select, update
+
+
+def test_rollups_follow_every_write_path(client, headers, ledger_setup):
+    """Test inserts, transfers, bulk rows and deletes keep rollups in sync."""
+    from app.db.models import MonthlyRollup
+    from app.db.session import get_session
+    from app.services.rollups import check_rollups
+
+    a1, a2, expense = ledger_setup.account_id, ledger_setup.wallet_id, ledger_setup.expense_id
+
+    ledger_setup.add("2026-03-01", 1000.0, "INCOME")
+    exp = ledger_setup.add("2026-03-02", -40.0)
+    transfer = client.post(
+        "/transactions/transfer",
+        json={
+            "date": "2026-03-03",
+            "amount_abs": 100.0,
+            "from_account_id": a1,
+            "to_account_id": a2,
+        },
+        headers=headers,
+    ).json()
+    client.post(
+        "/transactions/bulk",
+        json=[
+            {
+                "date": "2026-03-04",
+                "amount": -10.0,
+                "kind": "EXPENSE",
+                "account_id": a2,
+                "category_id": expense,
+            },
+            {
+                "date": "2026-04-01",
+                "amount": -5.0,
+                "kind": "EXPENSE",
+                "account_id": a2,
+                "category_id": expense,
+            },
+        ],
+        headers=headers,
+    )
+
+    with get_session() as db:
+        assert check_rollups(db) == []
+        rows = db.execute(
+            select(MonthlyRollup.kind, MonthlyRollup.amount_sum_cents, MonthlyRollup.tx_count)
+            .where(MonthlyRollup.month == "2026-03")
+            .where(MonthlyRollup.account_id == a1)
+            .order_by(MonthlyRollup.kind)
+        ).all()
+    assert rows == [
+        ("EXPENSE", -4000, 1),
+        ("INCOME", 100000, 1),
+        ("TRANSFER", -10000, 1),
+    ]
+
+    client.delete(f"/transactions/{transfer['out_id']}", headers=headers)
+    client.delete(f"/transactions/{exp['id']}", headers=headers)
+
+    with get_session() as db:
+        assert check_rollups(db) == []
+        kinds = set(
+            db.scalars(select(MonthlyRollup.kind).where(MonthlyRollup.account_id == a1)).all()
+        )
+    # Emptied keys are removed rather than left at zero
+    assert kinds == {"INCOME"}
+
+
+def test_rollups_check_and_rebuild(client, headers, ledger_setup):
+    """Test drift is detected by check and repaired by rebuild (also via the CLI)."""
+    from app.cli import main as cli_main
+    from app.db.models import MonthlyRollup
+    from app.db.session import get_session
+    from app.services.rollups import check_rollups, rebuild_rollups
+
+    ledger_setup.add("2026-05-10", 250.0, "INCOME")
+
+    with get_session() as db:
+        db.execute(update(MonthlyRollup).values(amount_sum_cents=1))
+        db.commit()
+        drift = check_rollups(db)
+    assert len(drift) == 1
+    assert drift[0]["month"] == "2026-05"
+    assert cli_main(["rollups", "check"]) == 1
+
+    with get_session() as db:
+        assert rebuild_rollups(db) == 1
+        assert check_rollups(db) == []
+    assert cli_main(["rollups", "check"]) == 0
+    assert cli_main(["rollups", "rebuild"]) == 0
+
+    r = client.get("/reports/monthly-summary?month=2026-05", headers=headers)
+    assert r.json()["income_total"] == "250.00"
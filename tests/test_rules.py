@@ -0,0 +1,310 @@
+"""Tests for auto-categorization rules."""
+
+CSV = (
+    "data;descricao;valor\n"
+    "2026-01-05;IFOOD *Restaurante;-25,90\n"
+    "2026-01-06;Pagamento Uber Trip;-18,00\n"
+    "2026-01-07;UBER EATS pedido;-40,00\n"
+    "2026-01-08;Posto Shell 123;-250,00\n"
+    "2026-01-09;Posto Shell 124;-20,00\n"
+    "2026-01-10;Salário ACME;5000,00\n"
+    "2026-01-11;Farmácia;-12,00\n"
+)
+
+
+def _rule_categories(ledger):
+    cats = {"Salário": ledger.income_id}
+    for name in ("Delivery", "Transporte", "Combustível", "Conveniência", "Outros"):
+        cats[name] = ledger.category(name)
+    return cats
+
+
+def _rule(client, headers, **payload):
+    r = client.post("/rules", json=payload, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def _categories(client, headers):
+    txs = client.get("/transactions", headers=headers).json()
+    return {tx["description"]: tx["category_id"] for tx in txs}
+
+
+def test_rule_validation(client, headers, ledger_setup):
+    """Rules need a condition, a pattern that can fail, a valid regex and an active category."""
+    cats = _rule_categories(ledger_setup)
+    delivery = cats["Delivery"]
+
+    for payload in (
+        {"category_id": delivery},
+        {"category_id": delivery, "pattern": "ifood"},
+        {"category_id": delivery, "match": "REGEX", "pattern": "(ifood"},
+        # Would match every description
+        {"category_id": delivery, "match": "CONTAINS", "pattern": "   "},
+        {"category_id": delivery, "match": "PREFIX", "pattern": "\u0301\t"},
+        {"category_id": delivery, "match": "REGEX", "pattern": "a*"},
+        {"category_id": delivery, "match": "REGEX", "pattern": "x|"},
+        # keyword is for REGEX rules and cannot be blank
+        {"category_id": delivery, "match": "CONTAINS", "pattern": "ifood", "keyword": "ifood"},
+        {"category_id": delivery, "match": "REGEX", "pattern": "if+ood", "keyword": " \n "},
+        {"category_id": delivery, "min_amount": 10, "max_amount": 5},
+    ):
+        assert client.post("/rules", json=payload, headers=headers).status_code == 422
+
+    r = client.post(
+        "/rules", json={"category_id": 999, "match": "CONTAINS", "pattern": "x"}, headers=headers
+    )
+    assert r.status_code == 400
+
+    rule = _rule(client, headers, category_id=delivery, match="CONTAINS", pattern="ifood")
+    assert rule["priority"] == 100 and rule["active"] is True
+    r = client.put(
+        f"/rules/{rule['id']}",
+        json={"category_id": delivery, "match": "PREFIX", "pattern": "ifood", "active": False},
+        headers=headers,
+    )
+    assert r.json()["match"] == "PREFIX" and r.json()["active"] is False
+    assert client.delete(f"/rules/{rule['id']}", headers=headers).status_code == 204
+    assert client.get("/rules", headers=headers).json() == []
+
+    rule = _rule(
+        client, headers, category_id=delivery, match="REGEX", pattern=r"i\w+d", keyword="iFood"
+    )
+    assert rule["keyword"] == "iFood"
+
+
+def test_import_applies_rules_with_fallback(client, headers, ledger_setup):
+    """Imported lines take the best matching rule's category, else the fallback."""
+    acc, cats = ledger_setup.account_id, _rule_categories(ledger_setup)
+    _rule(client, headers, category_id=cats["Delivery"], match="CONTAINS", pattern="ifood")
+    # Higher priority than the generic "uber" rule
+    _rule(
+        client,
+        headers,
+        category_id=cats["Delivery"],
+        match="REGEX",
+        pattern=r"uber\s+eats",
+        priority=10,
+    )
+    _rule(client, headers, category_id=cats["Transporte"], match="CONTAINS", pattern="UBER")
+    _rule(client, headers, category_id=cats["Combustível"], match="PREFIX", pattern="posto")
+    _rule(
+        client,
+        headers,
+        category_id=cats["Conveniência"],
+        match="PREFIX",
+        pattern="posto",
+        max_amount=50,
+        priority=50,
+    )
+    _rule(client, headers, category_id=cats["Salário"], account_id=acc)
+
+    r = client.post(
+        f"/imports/statement?format=csv&account_id={acc}",
+        content=CSV.encode(),
+        headers=headers,
+    )
+    assert r.status_code == 200
+    result = r.json()
+    assert result["inserted"] == 6
+    assert result["errors"] == [{"index": 6, "detail": "Nenhuma regra de categoria aplicável"}]
+    assert _categories(client, headers) == {
+        "IFOOD *Restaurante": cats["Delivery"],
+        "Pagamento Uber Trip": cats["Transporte"],
+        "UBER EATS pedido": cats["Delivery"],
+        "Posto Shell 123": cats["Combustível"],
+        "Posto Shell 124": cats["Conveniência"],
+        "Salário ACME": cats["Salário"],
+    }
+
+    r = client.post(
+        f"/imports/statement?format=csv&account_id={acc}&expense_category_id={cats['Outros']}",
+        content=CSV.encode(),
+        headers=headers,
+    )
+    assert r.json()["inserted"] == 1
+    assert _categories(client, headers)["Farmácia"] == cats["Outros"]
+
+
+def test_recategorize_updates_rows_and_reports(client, headers, ledger_setup):
+    """Recategorizing moves matching rows and their report totals; no match keeps the row."""
+    acc, cats = ledger_setup.account_id, _rule_categories(ledger_setup)
+    for date, description in (("2026-01-05", "iFood pedido"), ("2026-02-05", "Padaria")):
+        client.post(
+            "/transactions",
+            json={
+                "date": date,
+                "description": description,
+                "amount": -30,
+                "kind": "EXPENSE",
+                "account_id": acc,
+                "category_id": cats["Outros"],
+            },
+            headers=headers,
+        )
+    _rule(client, headers, category_id=cats["Delivery"], match="CONTAINS", pattern="ifood")
+
+    r = client.post(
+        "/transactions/recategorize?from_date=2026-01-01&to_date=2026-12-31", headers=headers
+    )
+    assert r.status_code == 200
+    assert r.json() == {"scanned": 2, "updated": 1}
+    assert _categories(client, headers) == {
+        "iFood pedido": cats["Delivery"],
+        "Padaria": cats["Outros"],
+    }
+    report = client.get("/reports/monthly-summary?month=2026-01", headers=headers).json()
+    realized = {c["category_id"]: c["realized"] for c in report["by_category"]}
+    assert realized[cats["Delivery"]] == "30.00"
+    assert realized.get(cats["Outros"], 0) == 0
+
+    again = client.post(
+        "/transactions/recategorize?from_date=2026-01-01&to_date=2026-12-31", headers=headers
+    )
+    assert again.json() == {"scanned": 2, "updated": 0}
+    r = client.post(
+        "/transactions/recategorize?from_date=2026-02-01&to_date=2026-01-01", headers=headers
+    )
+    assert r.status_code == 400
+
+
+def test_matcher_overlapping_keywords():
+    """Keywords sharing prefixes/suffixes are all found; prefix rules stay anchored."""
+    from app.db.models import CategoryRule
+    from app.services.rules import compile_rules
+
+    def rule(rule_id, category_id, match, pattern, priority=100, keyword=None):
+        return CategoryRule(
+            id=rule_id,
+            category_id=category_id,
+            match=match,
+            pattern=pattern,
+            keyword=keyword,
+            priority=priority,
+        )
+
+    kinds = {1: "EXPENSE", 2: "EXPENSE", 3: "EXPENSE", 4: "INCOME"}
+    many = [rule(100 + i, 3, "CONTAINS", f"loja {i:04d}") for i in range(2000)]
+    matcher = compile_rules(
+        [
+            rule(1, 1, "CONTAINS", "she", priority=20),
+            rule(2, 2, "CONTAINS", "hers", priority=10),
+            rule(3, 2, "PREFIX", "he", priority=5),
+            rule(4, 4, "REGEX", r"^pix\s+recebido", keyword="Recebido"),
+            rule(5, 1, "REGEX", r"\d{4}\s*uber"),
+            *many,
+        ],
+        kinds,
+        (1, 1),
+    )
+    assert matcher.rule_count == 2005
+    assert matcher.match("ushers", "EXPENSE", 1, -100) == 2
+    assert matcher.match("ushe", "EXPENSE", 1, -100) == 1
+    assert matcher.match("Hello", "EXPENSE", 1, -100) == 2
+    assert matcher.match("Loja 1234 centro", "EXPENSE", 1, -100) == 3
+    assert matcher.match("loja 12345", "EXPENSE", 1, -100) == 3
+    assert matcher.match("PIX RECEBIDO fulano", "INCOME", 1, 100) == 4
+    assert matcher.match("PIX RECEBIDO fulano", "EXPENSE", 1, -100) is None
+    assert matcher.match("x pix recebido", "INCOME", 1, 100) is None
+    # REGEX rules without keyword are found through the combined alternation
+    assert matcher.match("compra 1234 UBER", "EXPENSE", 1, -100) == 1
+    assert matcher._each == []
+
+
+def test_matcher_cost_per_row_does_not_grow_with_rules():
+    """Keyword-less regexes and amount ranges hand over only the rules that can match."""
+    import random
+    import re
+
+    from app.db.models import CategoryRule
+    from app.services.rules import compile_rules
+
+    def build(count):
+        rules = []
+        for i in range(count):
+            rules.append(
+                CategoryRule(
+                    id=1 + i, category_id=1, match="REGEX", pattern=rf"nf\s*{i:05d}\b", priority=100
+                )
+            )
+            rules.append(
+                CategoryRule(
+                    id=100_000 + i,
+                    category_id=2,
+                    account_id=1 + i % 3,
+                    min_amount_cents=1000 * i,
+                    max_amount_cents=1000 * i + 499,
+                    priority=1 + i % 7,
+                )
+            )
+        return rules
+
+    kinds = {1: "EXPENSE", 2: "EXPENSE"}
+    counts = []
+    for count in (20, 2000):
+        matcher = compile_rules(build(count), kinds, (1, 1))
+        assert matcher.match("NF 00017 posto", "EXPENSE", 1, -600) == 1
+        assert matcher.match("nf 000171", "EXPENSE", 3, -(17 * 1000 + 100)) == 2
+        assert matcher.match("nf 000171", "EXPENSE", 1, -(17 * 1000 + 600)) is None
+        counts.append(len(matcher.candidates("NF 00017 posto", "EXPENSE", 3, -17_100)))
+    assert counts == [2, 2]
+
+    # Against a rule-by-rule evaluation, with groups, classes and uncombinable patterns
+    rng = random.Random(7)
+    patterns = [
+        r"(ab|cd)+x",
+        r"[(]\d+[)]",
+        r"[]a]b",
+        r"^(?i:pix)\s",
+        r"(?P<n>z)(?P=n)",
+        r"(q)\1",
+        r"(?s)k.m",
+        r"\(y\)",
+        r"w(?=\d)",
+    ]
+    rules = []
+    for i in range(300):
+        low = rng.choice([None, rng.randrange(0, 5000)])
+        high = rng.choice([None, rng.randrange(0, 8000)])
+        if rng.random() < 0.5:
+            fields = {"match": "REGEX", "pattern": rng.choice(patterns)}
+        else:
+            fields = {"account_id": rng.choice([None, 1, 2])}
+            low = low if low is not None or high is not None else 10
+        rules.append(
+            CategoryRule(
+                id=i + 1,
+                category_id=rng.choice([1, 2, 3]),
+                priority=rng.randrange(5),
+                min_amount_cents=low,
+                max_amount_cents=high,
+                **fields,
+            )
+        )
+    kinds = {1: "EXPENSE", 2: "EXPENSE", 3: "INCOME"}
+    matcher = compile_rules(rules, kinds, (1, 1))
+    assert {r.id for r in matcher._each} == {
+        r.id for r in rules if r.pattern in (r"(?P<n>z)(?P=n)", r"(q)\1", r"(?s)k.m")
+    }
+
+    def expected(description, kind, account, amount):
+        for rule in sorted(rules, key=lambda r: (r.priority, r.id)):
+            if kinds[rule.category_id] != kind:
+                continue
+            if rule.account_id is not None and rule.account_id != account:
+                continue
+            if rule.min_amount_cents is not None and abs(amount) < rule.min_amount_cents:
+                continue
+            if rule.max_amount_cents is not None and abs(amount) > rule.max_amount_cents:
+                continue
+            if rule.pattern and not re.search(rule.pattern, description, re.IGNORECASE):
+                continue
+            return rule.category_id
+        return None
+
+    texts = ["abcdx", "(12)", "]b", "PIX x", "zz", "qq", "k\nm", "(y)", "w1", "nada"]
+    for _ in range(2000):
+        description = " ".join(rng.sample(texts, 2))
+        args = (description, rng.choice(["EXPENSE", "INCOME"]), rng.choice([1, 2, 3]))
+        amount = -rng.randrange(0, 9000)
+        assert matcher.match(*args, amount) == expected(*args, amount), (args, amount)
@@ -0,0 +1,144 @@
+"""Tests for full-text search over transaction descriptions."""
+
+
+def _seed(ledger):
+    return {
+        description: ledger.add(date, -10, description=description, account_id=account)["id"]
+        for date, description, account in (
+            ("2026-01-05", "iFood pedido 123", ledger.account_id),
+            ("2026-01-20", "IFOOD *PEDIDO Restaurante", ledger.wallet_id),
+            ("2026-02-03", "Padaria São João", ledger.account_id),
+            ("2026-02-10", "Café da manhã", ledger.account_id),
+            ("2026-03-01", "ifood", ledger.account_id),
+        )
+    }
+
+
+def _search(client, headers, **params):
+    r = client.get("/transactions/search", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    return r
+
+
+def test_search_matches_terms_prefixes_and_accents(client, headers, ledger_setup):
+    """Terms match words regardless of case and accents; term* matches prefixes."""
+    ids = _seed(ledger_setup)
+
+    found = _search(client, headers, q="ifood").json()
+    assert {tx["id"] for tx in found} == {
+        ids["iFood pedido 123"],
+        ids["IFOOD *PEDIDO Restaurante"],
+        ids["ifood"],
+    }
+    # The shortest description is the best bm25 match
+    assert found[0]["id"] == ids["ifood"]
+    assert found[0] == {
+        "id": ids["ifood"],
+        "date": "2026-03-01",
+        "description": "ifood",
+        "amount": "-10.00",
+        "kind": "EXPENSE",
+        "account_id": found[0]["account_id"],
+        "category_id": found[0]["category_id"],
+        "transfer_pair_id": None,
+    }
+
+    assert {tx["id"] for tx in _search(client, headers, q="ifood pedido").json()} == {
+        ids["iFood pedido 123"],
+        ids["IFOOD *PEDIDO Restaurante"],
+    }
+    assert [tx["id"] for tx in _search(client, headers, q="cafe").json()] == [ids["Café da manhã"]]
+    assert [tx["id"] for tx in _search(client, headers, q="pad*").json()] == [
+        ids["Padaria São João"]
+    ]
+    assert _search(client, headers, q="pad").json() == []
+    # FTS5 syntax in the input is treated as plain text
+    assert len(_search(client, headers, q='ifood" OR "x').json()) == 0
+    assert len(_search(client, headers, q="NOT ifood").json()) == 0
+
+    r = client.get("/transactions/search", params={"q": "*** --"}, headers=headers)
+    assert r.status_code == 400
+
+
+def test_search_filters_and_pagination(client, headers, ledger_setup):
+    """Account/date/kind filters apply to matches; pages follow X-Next-Offset."""
+    ids = _seed(ledger_setup)
+
+    found = _search(client, headers, q="ifood", account_id=ledger_setup.wallet_id).json()
+    assert [tx["id"] for tx in found] == [ids["IFOOD *PEDIDO Restaurante"]]
+    found = _search(client, headers, q="ifood", from_date="2026-01-01", to_date="2026-01-31").json()
+    assert len(found) == 2
+    assert _search(client, headers, q="ifood", kind="INCOME").json() == []
+
+    first = _search(client, headers, q="ifood", limit=2)
+    assert first.headers["X-Next-Offset"] == "2"
+    last = _search(client, headers, q="ifood", limit=2, offset=2)
+    assert "X-Next-Offset" not in last.headers
+    paged = [tx["id"] for tx in first.json() + last.json()]
+    assert paged == [tx["id"] for tx in _search(client, headers, q="ifood").json()]
+
+
+def test_search_index_follows_writes_and_closed_months(client, headers, ledger_setup):
+    """Deletes leave the index; closed months stay searchable; rebuild restores all."""
+    from sqlalchemy import text
+
+    from app.db.session import get_session
+    from app.services.search import rebuild_search_index
+
+    ids = _seed(ledger_setup)
+    client.delete(f"/transactions/{ids['ifood']}", headers=headers)
+    assert len(_search(client, headers, q="ifood").json()) == 2
+
+    client.post("/months/2026-01/close", headers=headers)
+    assert len(_search(client, headers, q="ifood").json()) == 2
+    client.post("/months/2026-01/reopen", headers=headers)
+    assert len(_search(client, headers, q="ifood").json()) == 2
+    client.post("/months/2026-01/close", headers=headers)
+
+    with get_session() as db:
+        db.execute(text("DELETE FROM transactions_fts"))
+        db.commit()
+        assert rebuild_search_index(db) == 4
+    assert len(_search(client, headers, q="ifood").json()) == 2
+    assert len(_search(client, headers, q="padaria").json()) == 1
+
+
+def test_search_ranks_every_match(client, headers, ledger_setup):
+    """Without a window, older matches are ranked too and pages follow bm25."""
+    ids = _seed(ledger_setup)
+    # Recorded last, but the weakest match (longest description)
+    latest = ledger_setup.add(
+        "2026-03-05", -10, description="Pedido ifood restaurante centro shopping norte"
+    )["id"]
+
+    found = [tx["id"] for tx in _search(client, headers, q="ifood").json()]
+    assert found == [
+        ids["ifood"],
+        ids["IFOOD *PEDIDO Restaurante"],
+        ids["iFood pedido 123"],
+        latest,
+    ]
+    pages = [
+        tx["id"]
+        for offset in range(4)
+        for tx in _search(client, headers, q="ifood", limit=1, offset=offset).json()
+    ]
+    assert pages == found
+
+
+def test_search_ranks_recent_window_first(client, headers, ledger_setup, monkeypatch):
+    """With SEARCH_RANK_WINDOW, matches past the window follow the ranked ones, newest first."""
+    from app.core.config import settings
+
+    ids = _seed(ledger_setup)
+    monkeypatch.setattr(settings, "search_rank_window", 2)
+
+    found = [tx["id"] for tx in _search(client, headers, q="ifood").json()]
+    # The two most recently recorded matches are ranked, the oldest comes last
+    assert found == [ids["ifood"], ids["IFOOD *PEDIDO Restaurante"], ids["iFood pedido 123"]]
+    pages = [
+        tx["id"]
+        for offset in range(3)
+        for tx in _search(client, headers, q="ifood", limit=1, offset=offset).json()
+    ]
+    assert pages == found
@@ -0,0 +1,93 @@
+"""Tests for the slow-query log."""
+
+import json
+import logging
+import re
+
+import pytest
+
+
+@pytest.fixture()
+def slow_log(monkeypatch, caplog):
+    """Log every statement as slow, with plans, and capture app.slow_query records."""
+    from app.core.config import settings
+    from app.core.slow_queries import rate_limiter
+
+    monkeypatch.setattr(settings, "slow_query_ms", 1e-9)
+    monkeypatch.setattr(settings, "slow_query_explain", True)
+    monkeypatch.setattr(settings, "slow_query_log_interval", 60.0)
+    rate_limiter.reset()
+    caplog.set_level(logging.WARNING, logger="app.slow_query")
+
+    def records(text):
+        return [
+            r.fields
+            for r in caplog.records
+            if r.name == "app.slow_query" and text in r.fields["sql"]
+        ]
+
+    yield records
+    rate_limiter.reset()
+
+
+@pytest.fixture()
+def current_year(ledger_setup):
+    """Record one transaction, so the ledger has a partition for this year."""
+    import datetime as dt
+
+    ledger_setup.add(dt.date.today().isoformat(), -5.0)
+
+
+def test_slow_statement_logged_with_route_shape_and_plan(client, headers, current_year, slow_log):
+    """Test a slow query carries its route, parameter types and query plan."""
+    client.get("/transactions?account_id=7&limit=5", headers=headers)
+
+    (entry,) = slow_log("FROM transactions")
+    assert entry["route"] == "/transactions"
+    assert entry["params"] == ["int", "int", "int"]  # account_id, LIMIT, OFFSET
+    assert entry["duration_ms"] >= 0
+    assert entry["suppressed"] == 0
+    assert any(re.search(r"ix_transactions_\d{4}_account_date", line) for line in entry["plan"])
+
+
+def test_repeated_fingerprint_rate_limited(client, headers, current_year, slow_log, monkeypatch):
+    """Test a hot slow query is logged once per interval, then reports suppressions."""
+    from app.core.config import settings
+
+    for account_id in (1, 2, 3):
+        client.get(f"/transactions?account_id={account_id}", headers=headers)
+    assert len(slow_log("FROM transactions")) == 1
+
+    monkeypatch.setattr(settings, "slow_query_log_interval", 0.0)
+    client.get("/transactions?account_id=4", headers=headers)
+    entries = slow_log("FROM transactions")
+    assert len(entries) == 2
+    assert entries[-1]["suppressed"] == 2
+
+
+def test_fast_statements_not_logged(client, headers, caplog):
+    """Test statements under the default threshold produce no entries."""
+    caplog.set_level(logging.WARNING, logger="app.slow_query")
+    client.get("/accounts", headers=headers)
+    assert not [r for r in caplog.records if r.name == "app.slow_query"]
+
+
+def test_fingerprint_folds_literals_and_in_lists():
+    """Test statements differing only in literals or IN-list length share a fingerprint."""
+    from app.core.slow_queries import fingerprint
+
+    a = fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?) AND x = 10 AND s = 'a'")
+    b = fingerprint("SELECT *\n  FROM t WHERE id IN (?, ?) AND x = 2 AND s = 'b''c'")
+    assert a == b == "SELECT * FROM t WHERE id IN (?+) AND x = ? AND s = ?"
+
+
+def test_json_formatter_includes_fields():
+    """Test structured fields are merged into the JSON log line."""
+    from app.core.logging import JsonFormatter
+
+    record = logging.LogRecord("app.slow_query", logging.WARNING, "", 0, "slow query", (), None)
+    record.fields = {"route": "/x", "duration_ms": 12.5}
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["msg"] == "slow query"
+    assert payload["route"] == "/x"
+    assert payload["duration_ms"] == 12.5
@@ -25,7 +25,7 @@ def test_create_income(client, headers):
         headers=headers,
     )
     assert r.status_code == 201
-    assert r.json()["amount"] == 5000.0
+    assert r.json()["amount"] == "5000.00"
     assert r.json()["kind"] == "INCOME"
 
 
@@ -55,7 +55,7 @@ def test_create_expense(client, headers):
         headers=headers,
     )
     assert r.status_code == 201
-    assert r.json()["amount"] == -150.50
+    assert r.json()["amount"] == "-150.50"
     assert r.json()["kind"] == "EXPENSE"
 
 
@@ -144,4 +144,123 @@ def test_list_transactions_with_date_filter(client, headers):
     r = client.get("/transactions?from_date=2026-01-01&to_date=2026-01-31", headers=headers)
     assert r.status_code == 200
     assert len(r.json()) == 1
-    assert r.json()[0]["amount"] == 1000.0
+    assert r.json()[0]["amount"] == "1000.00"
+
+
+def test_list_transactions_keyset_pagination(client, headers):
+    """Test walking the ledger page by page with limit + cursor."""
+    acc = client.post("/accounts", json={"name": "Banco", "type": "BANK"}, headers=headers).json()
+    cat = client.post(
+        "/categories",
+        json={"name": "Salário", "kind": "INCOME", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+
+    # Several rows share the same date so the id tie-breaker is exercised
+    for i, day in enumerate(["2026-01-10", "2026-01-10", "2026-01-10", "2026-01-11", "2026-01-12"]):
+        client.post(
+            "/transactions",
+            json={
+                "date": day,
+                "amount": 100.0 + i,
+                "kind": "INCOME",
+                "account_id": acc["id"],
+                "category_id": cat["id"],
+            },
+            headers=headers,
+        )
+
+    full = client.get("/transactions", headers=headers).json()
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/transactions?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        r = client.get(url, headers=headers)
+        assert r.status_code == 200
+        assert len(r.json()) <= 2
+        seen.extend(t["id"] for t in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert seen == [t["id"] for t in full]
+    assert len(seen) == 5
+
+    # The envelope carries the same cursor in the body
+    pages = []
+    cursor = None
+    while True:
+        url = "/transactions?limit=2&envelope=true" + (f"&cursor={cursor}" if cursor else "")
+        r = client.get(url, headers=headers)
+        page = r.json()
+        assert set(page) == {"items", "next_cursor"}
+        assert page["next_cursor"] == r.headers.get("X-Next-Cursor")
+        pages.append([t["id"] for t in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == [seen[0:2], seen[2:4], seen[4:]]
+
+
+def test_list_transactions_invalid_cursor(client, headers):
+    """Test that malformed cursors and cursors without limit are rejected."""
+    r = client.get("/transactions?limit=10&cursor=not-a-cursor", headers=headers)
+    assert r.status_code == 400
+
+    r = client.get("/transactions?cursor=MjAyNi0wMS0xMHwx", headers=headers)
+    assert r.status_code == 400
+
+
+def test_list_transactions_matches_schema(client, headers, monkeypatch):
+    """Test the pre-rendered list body equals TransactionOut output, with or without orjson."""
+    import app.core.jsonenc as jsonenc
+    from app.db.models import Transaction
+    from app.db.session import get_session
+    from app.schemas.transactions import TransactionOut
+
+    acc = client.post("/accounts", json={"name": "Banco", "type": "BANK"}, headers=headers).json()
+    acc2 = client.post("/accounts", json={"name": "Cofre", "type": "BANK"}, headers=headers).json()
+    cat = client.post(
+        "/categories",
+        json={"name": "Mercado", "kind": "EXPENSE", "group": "ESSENTIAL"},
+        headers=headers,
+    ).json()
+    client.post(
+        "/transactions",
+        json={
+            "date": "2026-01-10",
+            "description": 'Açaí "especial"',
+            "amount": "-12.30",
+            "kind": "EXPENSE",
+            "account_id": acc["id"],
+            "category_id": cat["id"],
+        },
+        headers=headers,
+    )
+    client.post(
+        "/transactions/transfer",
+        json={
+            "date": "2026-01-11",
+            "amount_abs": 100,
+            "from_account_id": acc["id"],
+            "to_account_id": acc2["id"],
+        },
+        headers=headers,
+    )
+
+    with get_session() as db:
+        expected = [
+            TransactionOut.model_validate(tx).model_dump(mode="json")
+            for tx in db.query(Transaction).order_by(Transaction.date.desc(), Transaction.id.desc())
+        ]
+
+    r = client.get("/transactions", headers=headers)
+    assert r.headers["content-type"] == "application/json"
+    assert r.json() == expected
+
+    page = client.get("/transactions?envelope=true", headers=headers).json()
+    assert page == {"items": expected, "next_cursor": None}
+
+    monkeypatch.setattr(jsonenc, "orjson", None)
+    assert client.get("/transactions", headers=headers).content == r.content
@@ -1,5 +1,8 @@
 """Tests for transfer functionality."""
 
+import json
+from decimal import Decimal
+
 
 def test_transfer_creates_two_transactions(client, headers):
     """Test that transfer creates two linked transactions."""
@@ -38,7 +41,7 @@ def test_transfer_creates_two_transactions(client, headers):
 
     # Verify amounts
     amounts = sorted([t["amount"] for t in pair_txs])
-    assert amounts == [-100.0, 100.0]
+    assert amounts == ["-100.00", "100.00"]
 
 
 def test_delete_transfer_deletes_pair(client, headers):
@@ -121,3 +124,99 @@ def test_transfer_negative_amount_rejected(client, headers):
         headers=headers,
     )
     assert r.status_code == 422  # Pydantic validation error
+
+
+def _accounts(client, headers):
+    return [
+        client.post("/accounts", json={"name": name, "type": "BANK"}, headers=headers).json()["id"]
+        for name in ("Carteira", "Banco")
+    ]
+
+
+def test_writes_skip_reload_queries(client, headers, monkeypatch):
+    """Created rows come back from INSERT ... RETURNING; a transfer is one INSERT."""
+    from sqlalchemy import event
+
+    from app.core.config import settings
+    from app.db.session import get_engine
+
+    monkeypatch.setattr(settings, "version_check_interval", 60.0)
+    a1, a2 = _accounts(client, headers)
+    transfer = {
+        "date": "2026-01-01",
+        "amount_abs": 10.0,
+        "from_account_id": a1,
+        "to_account_id": a2,
+    }
+    assert client.post("/transactions/transfer", json=transfer, headers=headers).status_code == 201
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().upper())
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        acc = client.post("/accounts", json={"name": "Poupança", "type": "BANK"}, headers=headers)
+        r = client.post("/transactions/transfer", json=transfer, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert acc.json()["name"] == "Poupança" and acc.json()["balance"] == "0.00"
+    assert r.json()["out_id"] < r.json()["in_id"]
+    inserts = [s for s in statements if s.startswith("INSERT INTO TRANSACTIONS")]
+    assert len(inserts) == 1
+    # No refresh: nothing is read back by primary key
+    reloads = [s for s in statements if s.startswith("SELECT") and ".ID = ?" in s]
+    assert not reloads, reloads
+
+    txs = {t["id"]: t["amount"] for t in client.get("/transactions", headers=headers).json()}
+    assert txs[r.json()["out_id"]] == "-10.00" and txs[r.json()["in_id"]] == "10.00"
+
+
+def test_bulk_transfers(client, headers):
+    """Valid transfers are created together with one pair ID each; invalid ones are reported."""
+    a1, a2 = _accounts(client, headers)
+    items = [
+        {
+            "date": "2026-01-02",
+            "description": "A",
+            "amount_abs": 100,
+            "from_account_id": a1,
+            "to_account_id": a2,
+        },
+        {"date": "2026-01-03", "amount_abs": 10, "from_account_id": a1, "to_account_id": a1},
+        {"date": "2026-01-04", "amount_abs": 10, "from_account_id": a1, "to_account_id": 999},
+        {"date": "2026-01-05", "amount_abs": -1, "from_account_id": a1, "to_account_id": a2},
+        {
+            "date": "2026-01-06",
+            "description": "B",
+            "amount_abs": 25.5,
+            "from_account_id": a2,
+            "to_account_id": a1,
+        },
+    ]
+    r = client.post("/transactions/transfers/bulk", json=items, headers=headers)
+    assert r.status_code == 200
+    result = r.json()
+    assert result["inserted"] == 2
+    assert [p["index"] for p in result["pairs"]] == [0, 4]
+    assert [e["index"] for e in result["errors"]] == [1, 2, 3]
+    assert result["errors"][1]["detail"] == "Conta destino inválida/inativa"
+
+    txs = client.get("/transactions", headers=headers).json()
+    for pair in result["pairs"]:
+        legs = [Decimal(t["amount"]) for t in txs if t["transfer_pair_id"] == pair["pair_id"]]
+        assert len(legs) == 2 and sum(legs) == 0
+    balances = {a["id"]: a["balance"] for a in client.get("/accounts", headers=headers).json()}
+    assert balances == {a1: "-74.50", a2: "74.50"}
+
+    ndjson = "\n".join(json.dumps(item) for item in items[:1]) + "\n"
+    r = client.post(
+        "/transactions/transfers/bulk",
+        content=ndjson,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert r.json()["inserted"] == 1
+    assert client.post("/transactions/transfers/bulk", json={}, headers=headers).status_code == 400